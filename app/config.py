@@ -682,6 +682,229 @@ class Settings(BaseSettings):
         validation_alias="GENERATIVE_PRODUCER_PRIMARY",
     )
 
+    # DSP backend for render-path filters, fades, gain and pan
+    # (app/services/dsp).  "numpy" runs vectorised SciPy/NumPy kernels that
+    # match pydub's RC filters within rounding; "pydub" uses pydub's per-sample
+    # Python loops.  Rollback: set DSP_BACKEND=pydub — no deployment required.
+    dsp_backend: str = Field(default="numpy", validation_alias="DSP_BACKEND")
+
+    # Decoded-audio cache (app/services/decoded_audio_cache.py).  Source loops
+    # and stems are cached as decoded PCM WAV keyed by storage key + ETag (S3)
+    # or content hash (local), so repeat renders of the same loop skip both the
+    # download and the multi-strategy decode.  An in-process LRU tier sits on
+    # top of the on-disk tier; both are bounded by a byte budget.
+    # Rollback: set DECODED_AUDIO_CACHE_ENABLED=false — no deployment required.
+    decoded_audio_cache_enabled: bool = Field(default=True, validation_alias="DECODED_AUDIO_CACHE_ENABLED")
+    decoded_audio_cache_dir: str = Field(
+        default="renders/.decoded_audio_cache",
+        validation_alias="DECODED_AUDIO_CACHE_DIR",
+    )
+    decoded_audio_cache_max_bytes: int = Field(
+        default=2 * 1024 * 1024 * 1024,
+        validation_alias="DECODED_AUDIO_CACHE_MAX_BYTES",
+    )
+    decoded_audio_cache_memory_max_bytes: int = Field(
+        default=256 * 1024 * 1024,
+        validation_alias="DECODED_AUDIO_CACHE_MEMORY_MAX_BYTES",
+    )
+
+    # Canonical PCM stem store (app/services/pcm_stem_store.py).  Uploaded stem
+    # packs are normalised once at ingest to raw 44.1 kHz stereo int16 files
+    # stored next to each stem (``.pcm``); renders download them once into the
+    # worker-local cache PCM_STEM_STORE_DIR and memory-map them, so section
+    # slices are zero-copy views instead of fully decoded AudioSegments.
+    # Cached copies are keyed by the stored object's version and evicted
+    # least-recently-used first above PCM_STEM_STORE_MAX_BYTES.
+    # Stems without a PCM copy are decoded from storage as before.
+    # Rollback: set PCM_STEM_STORE_ENABLED=false — no deployment required.
+    pcm_stem_store_enabled: bool = Field(default=True, validation_alias="PCM_STEM_STORE_ENABLED")
+    pcm_stem_store_dir: str = Field(default="uploads/pcm_stems", validation_alias="PCM_STEM_STORE_DIR")
+    pcm_stem_store_max_bytes: int = Field(
+        default=4 * 1024 * 1024 * 1024,
+        validation_alias="PCM_STEM_STORE_MAX_BYTES",
+    )
+
+    # Parallel stem-pack ingest (app/services/stem_pack_service.py).  ZIP stem
+    # packs are spooled to a temporary directory and each audio member is
+    # decoded at its native layout in one long-lived process pool of
+    # STEM_INGEST_WORKERS (0 = CPU count) shared by concurrent uploads and
+    # started from a forkserver, with onset detection and classifier features
+    # computed in the same pass.  When disabled every member is read into
+    # memory and decoded serially.
+    # Rollback: set STEM_INGEST_PARALLEL_ENABLED=false — no deployment required.
+    stem_ingest_parallel_enabled: bool = Field(default=True, validation_alias="STEM_INGEST_PARALLEL_ENABLED")
+    stem_ingest_workers: int = Field(default=0, validation_alias="STEM_INGEST_WORKERS")
+
+    # Parallel section rendering (app/services/section_render_pool.py).  When
+    # enabled, ProducerArrangement sections are rendered in a process pool with
+    # stems and loop variations shared through shared memory; boundary passes
+    # (loudness stabilisation, crossfades) still run in order in the parent, so
+    # the output is byte-identical to the serial path.  0 workers = CPU count.
+    # Rollback: set RENDER_PARALLEL_SECTIONS=false — no deployment required.
+    render_parallel_sections: bool = Field(default=False, validation_alias="RENDER_PARALLEL_SECTIONS")
+    render_parallel_workers: int = Field(default=0, validation_alias="RENDER_PARALLEL_WORKERS")
+
+    # Section render memo (app/services/section_render_memo.py).  Rendered
+    # ProducerArrangement sections are kept in a per-process LRU keyed by their
+    # effective render inputs, so variations of the same loop only re-render
+    # the sections that differ.  Bounded by SECTION_RENDER_MEMO_MAX_BYTES of PCM.
+    # Rollback: set SECTION_RENDER_MEMO_ENABLED=false — no deployment required.
+    section_render_memo_enabled: bool = Field(default=True, validation_alias="SECTION_RENDER_MEMO_ENABLED")
+    section_render_memo_max_bytes: int = Field(
+        default=256 * 1024 * 1024,
+        validation_alias="SECTION_RENDER_MEMO_MAX_BYTES",
+    )
+
+    # Band-energy analysis (app/services/band_energy.py).  Audio-truth repair
+    # and render QA read melodic/drum/bass levels from one chunked STFT per
+    # section; results are kept in a per-process LRU of
+    # BAND_ENERGY_CACHE_ENTRIES entries keyed by a hash of the section's PCM.
+    # Rollback: set BAND_ENERGY_CACHE_ENTRIES=0 — no deployment required.
+    band_energy_cache_entries: int = Field(default=128, validation_alias="BAND_ENERGY_CACHE_ENTRIES")
+
+    # Render timing profiles (app/services/render_timing.py).  The render worker
+    # records a timing span (wall time, CPU time, peak RSS) for decode, each
+    # shadow engine, planning, each section, each DSP move, mastering, export
+    # and upload, stores up to RENDER_TIMING_MAX_SPANS of them in
+    # render_metadata["profile"] and serves them at GET /jobs/{id}/profile.
+    # Rollback: set RENDER_TIMING_ENABLED=false — no deployment required.
+    render_timing_enabled: bool = Field(default=True, validation_alias="RENDER_TIMING_ENABLED")
+    render_timing_max_spans: int = Field(default=2000, validation_alias="RENDER_TIMING_MAX_SPANS")
+
+    # Streaming render output (app/services/render_output.py).  The render
+    # worker encodes the final mix straight into a storage upload stream (S3
+    # multipart in S3_MULTIPART_PART_SIZE_MB parts, or a local temp file in dev)
+    # instead of exporting a temp WAV, reading it back and sending one PUT.
+    # Rollback: set RENDER_STREAMING_UPLOAD_ENABLED=false — no deployment required.
+    render_streaming_upload_enabled: bool = Field(default=True, validation_alias="RENDER_STREAMING_UPLOAD_ENABLED")
+    s3_multipart_part_size_mb: int = Field(default=8, validation_alias="S3_MULTIPART_PART_SIZE_MB")
+
+    # Shadow executor (app/services/shadow_executor.py).  Shadow-engine planners
+    # whose *_PRIMARY flag is off run concurrently on a bounded pool instead of
+    # in series before the render; each gets SHADOW_ENGINE_BUDGET_SECONDS of
+    # wall time and is recorded as a fallback if it overruns.  Mode is "thread",
+    # "process" (true parallelism for the CPU-bound planners) or "serial".
+    # Rollback: set SHADOW_EXECUTOR_MODE=serial — no deployment required.
+    shadow_executor_mode: str = Field(default="thread", validation_alias="SHADOW_EXECUTOR_MODE")
+    shadow_executor_workers: int = Field(default=4, validation_alias="SHADOW_EXECUTOR_WORKERS")
+    shadow_engine_budget_seconds: float = Field(default=30.0, validation_alias="SHADOW_ENGINE_BUDGET_SECONDS")
+
+    # Render result cache (app/services/render_result_cache.py).  The render
+    # worker fingerprints source content version, stem keys, resolved render
+    # plan, feature-flag snapshot and engine version; a job whose fingerprint
+    # was rendered before reuses that output_s3_key instead of rendering.
+    # Changing RENDER_RESULT_CACHE_VERSION invalidates every existing entry.
+    # Rollback: set RENDER_RESULT_CACHE_ENABLED=false — no deployment required.
+    render_result_cache_enabled: bool = Field(default=True, validation_alias="RENDER_RESULT_CACHE_ENABLED")
+    render_result_cache_version: str = Field(default="", validation_alias="RENDER_RESULT_CACHE_VERSION")
+
+    # Preview renders (app/services/preview_render.py).  render-async requests
+    # with quality="preview" render at RENDER_PREVIEW_FRAME_RATE with
+    # RENDER_PREVIEW_CHANNELS channels, skip mastering, upload an Opus or MP3
+    # stream (RENDER_PREVIEW_FORMAT, RENDER_PREVIEW_BITRATE) and then queue the
+    # full-quality job, which reuses the preview's arrangement instead of
+    # replanning.
+    # Rollback: set RENDER_PREVIEW_ENABLED=false — no deployment required
+    # (preview requests then render at full quality).
+    render_preview_enabled: bool = Field(default=True, validation_alias="RENDER_PREVIEW_ENABLED")
+    render_preview_frame_rate: int = Field(default=24000, validation_alias="RENDER_PREVIEW_FRAME_RATE")
+    render_preview_channels: int = Field(default=1, validation_alias="RENDER_PREVIEW_CHANNELS")
+    render_preview_format: str = Field(default="opus", validation_alias="RENDER_PREVIEW_FORMAT")
+    render_preview_bitrate: str = Field(default="48k", validation_alias="RENDER_PREVIEW_BITRATE")
+
+    # DAW export packages (app/services/daw_export_job.py).  GET
+    # /arrangements/{id}/daw-export queues a ``daw_export`` job on the batch
+    # queue instead of building the ZIP in the request.  The job writes one
+    # stem per role the arrangement was rendered from (band-split from the mix
+    # only when it had no stems) and streams the ZIP into a multipart upload;
+    # DAW_EXPORT_STEM_FORMAT=flac stores FLAC stems instead of WAV.
+    # Rollback: set DAW_EXPORT_ASYNC_ENABLED=false — no deployment required
+    # (the ZIP is built in the request again).
+    daw_export_async_enabled: bool = Field(default=True, validation_alias="DAW_EXPORT_ASYNC_ENABLED")
+    daw_export_stem_format: str = Field(default="wav", validation_alias="DAW_EXPORT_STEM_FORMAT")
+
+    # Async upload ingest (app/services/loop_ingest.py).  POST /loops/upload
+    # stores the file, returns status="processing" and an ingest job; analysis
+    # and stem separation run in the RQ worker on the uploaded bytes (passed
+    # with the job up to INGEST_INLINE_MAX_BYTES, read from storage above it).
+    # An ingest running longer than INGEST_JOB_TIMEOUT_SECONDS is stopped (the
+    # supervisor kills its process) and the loop marked failed.
+    # Rollback: set ASYNC_INGEST_ENABLED=false — no deployment required.
+    async_ingest_enabled: bool = Field(default=True, validation_alias="ASYNC_INGEST_ENABLED")
+    ingest_inline_max_bytes: int = Field(default=8 * 1024 * 1024, validation_alias="INGEST_INLINE_MAX_BYTES")
+    ingest_job_timeout_seconds: int = Field(default=600, validation_alias="INGEST_JOB_TIMEOUT_SECONDS")
+
+    # Job progress push channel (app/services/job_events.py).  update_job_status
+    # publishes every status/progress change on Redis pub/sub and keeps the last
+    # JOB_EVENTS_HISTORY events per job so /jobs/{job_id}/events streams can
+    # resume from Last-Event-ID.  Polling GET /jobs/{job_id} keeps working.
+    # Rollback: set JOB_EVENTS_ENABLED=false — no deployment required.
+    job_events_enabled: bool = Field(default=True, validation_alias="JOB_EVENTS_ENABLED")
+    job_events_history: int = Field(default=100, validation_alias="JOB_EVENTS_HISTORY")
+    job_events_heartbeat_seconds: float = Field(default=15.0, validation_alias="JOB_EVENTS_HEARTBEAT_SECONDS")
+
+    # Shared audio feature bundle (app/services/audio_features.py).  Analyzers
+    # decode a file once and read onset/tempo/chroma/RMS/spectral/stereo
+    # features from one bundle, persisted as compressed arrays under
+    # features/<content sha256> in storage with an in-process LRU of
+    # FEATURE_STORE_MEMORY_ENTRIES bundles in front.
+    # Rollback: set FEATURE_STORE_ENABLED=false — no deployment required.
+    feature_store_enabled: bool = Field(default=True, validation_alias="FEATURE_STORE_ENABLED")
+    feature_store_memory_entries: int = Field(default=64, validation_alias="FEATURE_STORE_MEMORY_ENTRIES")
+
+    # Batch loop analysis (app/services/batch_analysis.py).  POST
+    # /loops/analyze-batch and `python -m app.workers.backfill_analysis`
+    # re-analyze many loops at once: BATCH_ANALYSIS_PREFETCH storage reads run
+    # ahead of a process pool of BATCH_ANALYSIS_WORKERS analyzers (0 = CPU
+    # count) and results are written back BATCH_ANALYSIS_UPDATE_BATCH rows per
+    # bulk UPDATE.  The CLI is not affected by the flag.
+    # Rollback: set BATCH_ANALYSIS_ENABLED=false — no deployment required.
+    batch_analysis_enabled: bool = Field(default=True, validation_alias="BATCH_ANALYSIS_ENABLED")
+    batch_analysis_workers: int = Field(default=0, validation_alias="BATCH_ANALYSIS_WORKERS")
+    batch_analysis_prefetch: int = Field(default=8, validation_alias="BATCH_ANALYSIS_PREFETCH")
+    batch_analysis_update_batch: int = Field(default=200, validation_alias="BATCH_ANALYSIS_UPDATE_BATCH")
+
+    # Prefork worker supervisor (app/workers/supervisor.py).  With
+    # WORKER_PROCESSES > 0, `python -m app.workers.main` imports the heavy
+    # modules once and forks that many RQ worker processes.  Each exits after
+    # WORKER_MAX_JOBS jobs or above WORKER_MAX_RSS_MB resident (0 = no limit)
+    # and is replaced; a job past its timeout is ended by killing its process.
+    # Rollback: set WORKER_PROCESSES=0 — no deployment required.
+    worker_processes: int = Field(default=0, validation_alias="WORKER_PROCESSES")
+    worker_max_jobs: int = Field(default=100, validation_alias="WORKER_MAX_JOBS")
+    worker_max_rss_mb: int = Field(default=2048, validation_alias="WORKER_MAX_RSS_MB")
+
+    # Queue routing and fair share (app/queue.py, app/workers/scheduling.py).
+    # The first variation of a render request stays on ``render``; its extra
+    # variations go to ``render_batch``, upload ingest to ``ingest`` and batch
+    # analysis to ``analysis``.  Workers pick the next queue in weighted random
+    # order from QUEUE_WEIGHTS and run at most QUEUE_FAIR_SHARE_MAX_ACTIVE jobs
+    # of one loop at a time (0 = no cap); the rest wait at the back of their
+    # queue.
+    # Rollback: set QUEUE_ROUTING_ENABLED=false — no deployment required.
+    queue_routing_enabled: bool = Field(default=True, validation_alias="QUEUE_ROUTING_ENABLED")
+    queue_weights: str = Field(
+        default="render=8,ingest=4,render_batch=2,analysis=1",
+        validation_alias="QUEUE_WEIGHTS",
+    )
+    queue_fair_share_max_active: int = Field(default=2, validation_alias="QUEUE_FAIR_SHARE_MAX_ACTIVE")
+
+    # Database connection pools (app/db/session.py, app/db/async_session.py).
+    # Each process holds up to DB_POOL_SIZE + DB_MAX_OVERFLOW connections per
+    # engine (Postgres only; SQLite keeps SQLAlchemy's defaults), so size them
+    # against the server's max_connections times the number of web processes.
+    # The hot read endpoints (job status polling, loop streaming, queue
+    # health) use an async session — asyncpg for Postgres, aiosqlite for
+    # SQLite — instead of blocking the event loop on the sync session; when
+    # the async driver is not installed they run the sync session in the
+    # threadpool.
+    # Rollback: set ASYNC_DB_ENABLED=false — no deployment required.
+    async_db_enabled: bool = Field(default=True, validation_alias="ASYNC_DB_ENABLED")
+    db_pool_size: int = Field(default=10, validation_alias="DB_POOL_SIZE")
+    db_max_overflow: int = Field(default=20, validation_alias="DB_MAX_OVERFLOW")
+    db_pool_timeout_seconds: float = Field(default=10.0, validation_alias="DB_POOL_TIMEOUT_SECONDS")
+    db_pool_recycle_seconds: int = Field(default=1800, validation_alias="DB_POOL_RECYCLE_SECONDS")
+
     ffmpeg_binary: str = Field(default="", validation_alias="FFMPEG_BINARY")
     ffprobe_binary: str = Field(default="", validation_alias="FFPROBE_BINARY")
     enforce_audio_binaries: str = Field(default="auto", validation_alias="ENFORCE_AUDIO_BINARIES")
@@ -757,6 +980,22 @@ class Settings(BaseSettings):
         "feature_generative_producer_primary",
         "feature_production_quality_repair",
         "feature_impact_engine",
+        "decoded_audio_cache_enabled",
+        "pcm_stem_store_enabled",
+        "stem_ingest_parallel_enabled",
+        "render_parallel_sections",
+        "section_render_memo_enabled",
+        "render_timing_enabled",
+        "render_streaming_upload_enabled",
+        "render_result_cache_enabled",
+        "render_preview_enabled",
+        "daw_export_async_enabled",
+        "job_events_enabled",
+        "async_ingest_enabled",
+        "feature_store_enabled",
+        "batch_analysis_enabled",
+        "queue_routing_enabled",
+        "async_db_enabled",
         mode="before",
     )
     @classmethod
@@ -0,0 +1,209 @@
+"""Async database sessions for the hot read endpoints.
+
+:func:`get_async_db` yields an ``AsyncSession`` on an async engine (asyncpg for
+Postgres, aiosqlite for SQLite), or a :class:`ThreadedSession` with the same
+awaitable API over a sync session when ASYNC_DB_ENABLED is false or the async
+driver is not installed.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import logging
+import threading
+from typing import Any, AsyncIterator, Dict, Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.db import session as db_session
+
+logger = logging.getLogger(__name__)
+
+# URL scheme -> (async dialect+driver, driver module)
+_ASYNC_DRIVERS = {
+    "postgresql": ("postgresql+asyncpg", "asyncpg"),
+    "sqlite": ("sqlite+aiosqlite", "aiosqlite"),
+}
+
+# Query parameters libpq understands but asyncpg does not.
+_LIBPQ_ONLY_PARAMS = (
+    "sslmode",
+    "sslrootcert",
+    "sslcert",
+    "sslkey",
+    "sslcrl",
+    "sslpassword",
+    "gssencmode",
+    "channel_binding",
+    "application_name",
+)
+
+_engines: Dict[str, Any] = {}
+_sessionmakers: Dict[str, Any] = {}
+_lock = threading.Lock()
+
+
+def _dialect(database_url: str) -> Optional[str]:
+    scheme, sep, _ = database_url.partition("://")
+    if not sep:
+        return None
+    dialect = scheme.split("+", 1)[0]
+    return "postgresql" if dialect == "postgres" else dialect
+
+
+def _async_url(database_url: str):
+    driver = _ASYNC_DRIVERS.get(_dialect(database_url))
+    if driver is None:
+        return None
+    from sqlalchemy.engine import make_url
+
+    return make_url(f"{driver[0]}://{database_url.partition('://')[2]}")
+
+
+def async_database_url(database_url: str) -> Optional[str]:
+    """*database_url* with its async driver, or None for a database without one.
+
+    libpq-only query parameters (``sslmode=require`` on a hosted Postgres
+    URL) are dropped: asyncpg rejects them as unknown connect arguments.
+    :func:`async_connect_args` carries the ones it has an equivalent for.
+    """
+    url = _async_url(database_url)
+    if url is None:
+        return None
+    if url.drivername == "postgresql+asyncpg":
+        url = url.difference_update_query(_LIBPQ_ONLY_PARAMS)
+    return url.render_as_string(hide_password=False)
+
+
+def async_connect_args(database_url: str) -> Dict[str, Any]:
+    """asyncpg connect arguments for the libpq query parameters of *database_url*."""
+    url = _async_url(database_url)
+    if url is None or url.drivername != "postgresql+asyncpg":
+        return {}
+    connect_args: Dict[str, Any] = {}
+    sslmode = url.query.get("sslmode")
+    if isinstance(sslmode, tuple):
+        sslmode = sslmode[-1]
+    if sslmode:
+        # asyncpg accepts libpq's sslmode names for ``ssl``.
+        connect_args["ssl"] = sslmode
+    application_name = url.query.get("application_name")
+    if isinstance(application_name, tuple):
+        application_name = application_name[-1]
+    if application_name:
+        connect_args["server_settings"] = {"application_name": application_name}
+    ignored = sorted(set(url.query) & set(_LIBPQ_ONLY_PARAMS) - {"sslmode", "application_name"})
+    if ignored:
+        logger.warning("ASYNC_DB_URL_PARAMS_IGNORED params=%s", ",".join(ignored))
+    return connect_args
+
+
+def async_driver_available(database_url: str) -> bool:
+    """True when the async driver for *database_url* and greenlet are importable."""
+    driver = _ASYNC_DRIVERS.get(_dialect(database_url))
+    if driver is None:
+        return False
+    return all(importlib.util.find_spec(name) is not None for name in (driver[1], "greenlet"))
+
+
+def get_async_sessionmaker():
+    """The ``async_sessionmaker`` for the current DATABASE_URL, or None when the threadpool fallback applies."""
+    database_url = db_session.DATABASE_URL
+    if not settings.async_db_enabled or not async_driver_available(database_url):
+        return None
+    factory = _sessionmakers.get(database_url)
+    if factory is not None:
+        return factory
+    with _lock:
+        if database_url not in _sessionmakers:
+            from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+            engine = create_async_engine(
+                async_database_url(database_url),
+                pool_pre_ping=True,
+                connect_args=async_connect_args(database_url),
+                **db_session.pool_options(database_url),
+            )
+            _engines[database_url] = engine
+            _sessionmakers[database_url] = async_sessionmaker(engine, expire_on_commit=False)
+            logger.info("ASYNC_DB_ENGINE_CREATED dialect=%s", engine.dialect.name)
+        return _sessionmakers[database_url]
+
+
+async def dispose_async_engines() -> None:
+    """Close the async engines' pooled connections (application shutdown)."""
+    with _lock:
+        engines = list(_engines.values())
+        _engines.clear()
+        _sessionmakers.clear()
+    for engine in engines:
+        await engine.dispose()
+
+
+class ThreadedSession:
+    """The awaitable subset of ``AsyncSession`` the read endpoints use, over a sync session.
+
+    Each call runs in the threadpool; results of :meth:`execute` are buffered
+    there, as ``AsyncSession.execute`` does, so iterating them does no I/O on
+    the event loop.  Reads end their transaction before returning, so no
+    pooled connection is held across an ``await``: with hundreds of
+    concurrent requests, sessions holding connections while waiting for a
+    thread would otherwise exhaust the pool and the threadpool together.
+    The session must not expire on commit (:func:`get_async_db` creates it
+    that way) so loaded objects stay readable on the event loop.
+    """
+
+    def __init__(self, sync_session) -> None:
+        self.sync_session = sync_session
+
+    def _read(self, method, *args, **kwargs):
+        try:
+            result = method(*args, **kwargs)
+        except Exception:
+            self.sync_session.rollback()
+            raise
+        self.sync_session.commit()
+        return result
+
+    async def execute(self, statement, params=None, **kwargs):
+        def _execute():
+            return self.sync_session.execute(statement, params, **kwargs).freeze()
+
+        return (await run_in_threadpool(self._read, _execute))()
+
+    async def scalar(self, statement, params=None, **kwargs):
+        return await run_in_threadpool(self._read, self.sync_session.scalar, statement, params, **kwargs)
+
+    async def get(self, entity, ident, **kwargs):
+        return await run_in_threadpool(self._read, self.sync_session.get, entity, ident, **kwargs)
+
+    async def commit(self) -> None:
+        await run_in_threadpool(self.sync_session.commit)
+
+    async def refresh(self, instance) -> None:
+        await run_in_threadpool(self.sync_session.refresh, instance)
+
+    async def close(self) -> None:
+        await run_in_threadpool(self.sync_session.close)
+
+
+async def get_async_db() -> AsyncIterator[Any]:
+    """Yield an ``AsyncSession`` (or a :class:`ThreadedSession`) as a FastAPI dependency.
+
+    Usage in a route::
+
+        @router.get("/items/{item_id}")
+        async def read_item(item_id: int, db=Depends(get_async_db)):
+            return await db.get(Item, item_id)
+    """
+    factory = get_async_sessionmaker()
+    if factory is not None:
+        async with factory() as session:
+            yield session
+        return
+    session = ThreadedSession(db_session.SessionLocal(expire_on_commit=False))
+    try:
+        yield session
+    finally:
+        await session.close()
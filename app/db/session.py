@@ -25,7 +25,20 @@ connect_args: dict = {}
 if DATABASE_URL.startswith("sqlite"):
     connect_args = {"check_same_thread": False}
 
-engine = create_engine(DATABASE_URL, pool_pre_ping=True, connect_args=connect_args)
+
+def pool_options(database_url: str) -> dict:
+    """Connection pool sizing for *database_url* (DB_POOL_*); SQLite keeps SQLAlchemy's defaults."""
+    if database_url.startswith("sqlite"):
+        return {}
+    return {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout_seconds,
+        "pool_recycle": settings.db_pool_recycle_seconds,
+    }
+
+
+engine = create_engine(DATABASE_URL, pool_pre_ping=True, connect_args=connect_args, **pool_options(DATABASE_URL))
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
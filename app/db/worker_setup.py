@@ -0,0 +1,121 @@
+"""Worker database setup: one-time schema verification and per-job setup latency.
+
+:func:`check_schema` compares the database's Alembic revision with the code's
+head once per process; :class:`DbSetupStats` records the time each job spends
+getting a session and a connection.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import statistics
+import threading
+from collections import deque
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+_ALEMBIC_INI = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "alembic.ini")
+
+
+@dataclass(frozen=True)
+class SchemaStatus:
+    """Database revision vs. the code's Alembic head.
+
+    ``current`` is None for a database Alembic has never stamped (local
+    SQLite created with ``create_all``); ``known`` is False when the database
+    is at a revision this code does not have (a newer deploy migrated it).
+    """
+
+    head: Optional[str]
+    current: Optional[str]
+    known: bool = True
+
+    @property
+    def up_to_date(self) -> bool:
+        return self.head is not None and self.current == self.head
+
+    @property
+    def behind(self) -> bool:
+        return self.current is not None and self.known and not self.up_to_date
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"head": self.head, "current": self.current, "up_to_date": self.up_to_date}
+
+
+@lru_cache(maxsize=1)
+def _script_directory():
+    from alembic.config import Config
+    from alembic.script import ScriptDirectory
+
+    return ScriptDirectory.from_config(Config(_ALEMBIC_INI))
+
+
+def alembic_head() -> Optional[str]:
+    """The head revision of migrations/versions, or None when it cannot be read."""
+    try:
+        return _script_directory().get_current_head()
+    except Exception as e:
+        logger.warning("Could not read the Alembic head revision: %s", e)
+        return None
+
+
+def database_revision(bind) -> Optional[str]:
+    """The revision stamped in ``alembic_version``, or None for an unstamped database."""
+    from alembic.runtime.migration import MigrationContext
+
+    with bind.connect() as connection:
+        return MigrationContext.configure(connection).get_current_revision()
+
+
+def check_schema(bind) -> SchemaStatus:
+    head = alembic_head()
+    current = database_revision(bind)
+    known = True
+    if current is not None and head is not None and current != head:
+        try:
+            known = _script_directory().get_revision(current) is not None
+        except Exception:
+            known = False
+    return SchemaStatus(head=head, current=current, known=known)
+
+
+class DbSetupStats:
+    """Per-process timings of the DB setup at the start of each job."""
+
+    def __init__(self, window: int = 256) -> None:
+        self._lock = threading.Lock()
+        self._recent: deque[float] = deque(maxlen=window)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.schema: Optional[SchemaStatus] = None
+
+    def record(self, elapsed_ms: float) -> None:
+        with self._lock:
+            self._recent.append(elapsed_ms)
+            self.count += 1
+            self.total_ms += elapsed_ms
+            self.max_ms = max(self.max_ms, elapsed_ms)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            recent = list(self._recent)
+            return {
+                "jobs": self.count,
+                "mean_ms": round(self.total_ms / self.count, 3) if self.count else None,
+                "max_ms": round(self.max_ms, 3) if self.count else None,
+                "last_ms": round(recent[-1], 3) if recent else None,
+                "p95_ms": round(statistics.quantiles(recent, n=20)[-1], 3) if len(recent) > 1 else None,
+                "schema": self.schema.to_dict() if self.schema else None,
+            }
+
+
+_db_setup_stats = DbSetupStats()
+
+
+def get_db_setup_stats() -> DbSetupStats:
+    return _db_setup_stats
@@ -257,6 +257,9 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("👋 Shutting down LoopArchitect API")
+    from app.db.async_session import dispose_async_engines
+
+    await dispose_async_engines()
 
 
 # Determine server list for OpenAPI docs
@@ -386,6 +389,9 @@ async def worker_health():
     To check *dedicated* RQ worker health (actual background worker
     processes connected via Redis) use ``GET /api/v1/health/worker``.
     """
+    from app.services.decoded_audio_cache import get_decoded_audio_cache
+    from app.services.render_result_cache import get_render_result_cache
+
     alive_workers = [thread for thread in _embedded_worker_threads if thread.is_alive()]
 
     return {
@@ -393,6 +399,9 @@ async def worker_health():
         "target_worker_count": settings.embedded_rq_worker_count,
         "active_worker_count": len(alive_workers),
         "active_workers": [thread.name for thread in alive_workers],
+        # Embedded workers render in this process, so these counters cover them.
+        "decoded_audio_cache": get_decoded_audio_cache().stats(),
+        "render_result_cache": get_render_result_cache().stats(),
         "note": (
             "Embedded workers are local-dev / single-process only. "
             "For dedicated worker health see /api/v1/health/worker."
@@ -69,3 +69,6 @@ class RenderJob(Base):
 
 # Add composite index for deduplication window (loop_id + dedupe_hash, ordered by created_at)
 Index("ix_render_jobs_dedupe", RenderJob.loop_id, RenderJob.dedupe_hash, RenderJob.created_at)
+
+# "Latest job for an arrangement" (GET /arrangements/{id} status sync).
+Index("ix_render_jobs_arrangement_created", RenderJob.arrangement_id, RenderJob.created_at)
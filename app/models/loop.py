@@ -52,6 +52,19 @@ class Loop(Base):
             return None
         return None
     
+    @property
+    def feature_hash(self):
+        """Content hash of the feature bundle extracted when the loop was analyzed."""
+        if not self.analysis_json:
+            return None
+        try:
+            payload = json.loads(self.analysis_json)
+            if isinstance(payload, dict):
+                return payload.get("content_hash")
+        except Exception:
+            return None
+        return None
+
     @property
     def stems_dict(self) -> dict:
         """Get parsed stem files as dict."""
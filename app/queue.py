@@ -1,7 +1,8 @@
 """Redis queue configuration and entrypoint."""
 
 import logging
-from typing import TYPE_CHECKING
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Dict, Optional
 
 import redis
 
@@ -12,6 +13,20 @@ logger = logging.getLogger(__name__)
 
 DEFAULT_RENDER_QUEUE_NAME = "render"
 
+# Job classes.  The first variation of a render request (what the user waits
+# on) keeps the original ``render`` queue; extra variations, upload ingest and
+# catalog analysis get their own queues so they cannot starve it.  Workers
+# listen on all of them with the dequeue weights in QUEUE_WEIGHTS (see
+# app/workers/scheduling.py).
+INTERACTIVE_QUEUE_NAME = DEFAULT_RENDER_QUEUE_NAME
+BATCH_RENDER_QUEUE_NAME = "render_batch"
+INGEST_QUEUE_NAME = "ingest"
+ANALYSIS_QUEUE_NAME = "analysis"
+WORKER_QUEUE_NAMES = (INTERACTIVE_QUEUE_NAME, INGEST_QUEUE_NAME, BATCH_RENDER_QUEUE_NAME, ANALYSIS_QUEUE_NAME)
+
+# Job meta key holding the fair-share key (``loop:<id>``) the worker caps.
+FAIR_SHARE_META_KEY = "fair_share_key"
+
 
 def is_redis_available() -> bool:
     """Check if Redis is available without raising exception."""
@@ -68,3 +83,45 @@ def get_queue(conn: redis.Redis = None, name: str = DEFAULT_RENDER_QUEUE_NAME) -
     if conn is None:
         conn = get_redis_conn()
     return Queue(name, connection=conn, is_async=True)
+
+
+def resolve_queue_name(name: str) -> str:
+    """Queue a job of class *name* goes to (``render`` for all of them with QUEUE_ROUTING_ENABLED off)."""
+    from app.config import settings
+
+    return name if settings.queue_routing_enabled else DEFAULT_RENDER_QUEUE_NAME
+
+
+def queue_weights() -> Dict[str, int]:
+    """Dequeue weight per queue from QUEUE_WEIGHTS (``name=weight,...``); unlisted queues weigh 1."""
+    from app.config import settings
+
+    weights = {name: 1 for name in WORKER_QUEUE_NAMES}
+    for part in (settings.queue_weights or "").split(","):
+        name, sep, value = part.partition("=")
+        if not sep:
+            continue
+        try:
+            weights[name.strip()] = max(0, int(value))
+        except ValueError:
+            logger.warning("Ignoring invalid QUEUE_WEIGHTS entry %r", part)
+    return weights
+
+
+def fair_share_meta(loop_id: Optional[int]) -> Dict[str, str]:
+    """Job meta that caps concurrent jobs per loop (QUEUE_FAIR_SHARE_MAX_ACTIVE)."""
+    return {FAIR_SHARE_META_KEY: f"loop:{loop_id}"} if loop_id is not None else {}
+
+
+def oldest_job_age_seconds(queue: "Queue", now: Optional[datetime] = None) -> Optional[float]:
+    """Seconds the job at the head of *queue* has been waiting, or None when it is empty."""
+    job_ids = queue.get_job_ids(0, 0)
+    if not job_ids:
+        return None
+    job = queue.fetch_job(job_ids[0])
+    enqueued_at = getattr(job, "enqueued_at", None)
+    if not isinstance(enqueued_at, datetime):
+        return None
+    if enqueued_at.tzinfo is None:
+        enqueued_at = enqueued_at.replace(tzinfo=timezone.utc)
+    return max(0.0, ((now or datetime.now(timezone.utc)) - enqueued_at).total_seconds())
@@ -9,7 +9,6 @@ import os
 import tempfile
 import json
 import asyncio
-import io
 import threading
 from dataclasses import asdict as dataclass_asdict
 from pathlib import Path
@@ -21,12 +20,10 @@ from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.responses import FileResponse, StreamingResponse
 from sqlalchemy.orm import Session
 from starlette.background import BackgroundTask
-from pydub import AudioSegment
 
 from app.config import settings
 from app.db import get_db
 from app.models.arrangement import Arrangement
-from app.models.job import RenderJob
 from app.models.loop import Loop
 from app.schemas.arrangement import (
     AudioArrangementGenerateRequest,
@@ -40,7 +37,12 @@ from app.schemas.arrangement import (
 )
 from app.schemas.style_profile import StyleOverrides
 from app.services.audit_logging import log_feature_event
-from app.services.job_service import create_render_job
+from app.services.job_service import (
+    create_daw_export_job,
+    create_render_job,
+    get_active_daw_export_job,
+    get_latest_job_for_arrangement,
+)
 from app.queue import DEFAULT_RENDER_QUEUE_NAME, get_queue, is_redis_available
 from app.services.style_service import style_service
 from app.services.llm_style_parser import llm_style_parser
@@ -51,6 +53,14 @@ from app.services.style_direction_engine import StyleDirectionEngine
 from app.services.render_plan import RenderPlanGenerator
 from app.services.arrangement_validator import ArrangementValidator
 from app.services.daw_export import DAWExporter
+from app.services.daw_export_job import (
+    build_daw_export,
+    daw_export_download_url,
+    daw_export_key,
+    export_sections,
+    load_export_contents,
+    run_daw_export_job,
+)
 from app.services.storage import storage, S3StorageError
 from app.services.arrangement_planner import (
     arrangement_planner_service,
@@ -78,12 +88,7 @@ def _sync_arrangement_status_from_job(db: Session, arrangement: Arrangement) ->
     processing_timeout_seconds = max(60, int(settings.render_job_timeout_seconds or 900))
 
     try:
-        linked_job = (
-            db.query(RenderJob)
-            .filter(RenderJob.params_json.like(f'%"arrangement_id": {arrangement.id}%'))
-            .order_by(RenderJob.created_at.desc())
-            .first()
-        )
+        linked_job = get_latest_job_for_arrangement(db, arrangement.id)
     except Exception:
         logger.warning(
             "Failed to query linked render job for arrangement %s",
@@ -489,119 +494,6 @@ def _build_arrangement_response(arrangement: Arrangement) -> "ArrangementRespons
     return response
 
 
-def _extract_sections_for_export(arrangement: Arrangement) -> list[dict]:
-    sections: list[dict] = []
-
-    if arrangement.producer_arrangement_json:
-        try:
-            producer_payload = json.loads(arrangement.producer_arrangement_json)
-            for section in producer_payload.get("sections", []):
-                sections.append(
-                    {
-                        "name": section.get("name") or section.get("type") or "Section",
-                        "bar_start": int(section.get("bar_start", section.get("start_bar", 0))),
-                        "bars": int(section.get("bars", 1)),
-                    }
-                )
-        except Exception:
-            logger.warning("Failed to parse producer_arrangement_json for arrangement %s", arrangement.id, exc_info=True)
-
-    if not sections and arrangement.render_plan_json:
-        try:
-            render_plan = json.loads(arrangement.render_plan_json)
-            for section in render_plan.get("sections", []):
-                sections.append(
-                    {
-                        "name": section.get("name", "Section"),
-                        "bar_start": int(section.get("start_bar", section.get("bar_start", 0))),
-                        "bars": int(section.get("bars", 1)),
-                    }
-                )
-        except Exception:
-            logger.warning("Failed to parse render_plan_json for arrangement %s", arrangement.id, exc_info=True)
-
-    if not sections:
-        sections = [{"name": "Full Arrangement", "bar_start": 0, "bars": 1}]
-
-    return sections
-
-
-def _load_output_audio_segment(arrangement: Arrangement) -> AudioSegment:
-    if not arrangement.output_s3_key:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Arrangement output key missing. Cannot generate DAW export.",
-        )
-
-    storage_backend = settings.get_storage_backend()
-
-    if storage_backend == "local":
-        local_filename = arrangement.output_s3_key.split("/")[-1]
-        local_path = Path("uploads") / local_filename
-        if not local_path.exists():
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Rendered arrangement file not found in local storage.",
-            )
-        return AudioSegment.from_wav(str(local_path))
-
-    if storage_backend != "s3":
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Invalid STORAGE_BACKEND: {storage_backend}",
-        )
-
-    bucket_name = settings.get_s3_bucket()
-    if not bucket_name:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="S3 bucket is not configured.",
-        )
-
-    try:
-        s3_client = boto3.client(
-            "s3",
-            aws_access_key_id=settings.aws_access_key_id,
-            aws_secret_access_key=settings.aws_secret_access_key,
-            region_name=settings.aws_region,
-        )
-        response = s3_client.get_object(Bucket=bucket_name, Key=arrangement.output_s3_key)
-        file_bytes = response["Body"].read()
-        if not file_bytes:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Rendered arrangement file is empty in storage.",
-            )
-        return AudioSegment.from_wav(io.BytesIO(file_bytes))
-    except ClientError as exc:
-        logger.exception("Failed to fetch rendered arrangement from S3")
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Failed to load rendered arrangement from S3: {exc}",
-        )
-
-
-def _collect_existing_midi_artifacts(arrangement_id: int) -> dict[str, bytes]:
-    """Collect real MIDI artifacts if they already exist. No placeholder MIDI is generated."""
-    midi_artifacts: dict[str, bytes] = {}
-    local_uploads = Path("uploads")
-    if not local_uploads.exists():
-        return midi_artifacts
-
-    possible_names = [
-        f"arrangement_{arrangement_id}_drums.mid",
-        f"arrangement_{arrangement_id}_bass.mid",
-        f"arrangement_{arrangement_id}_melody.mid",
-        f"arrangement_{arrangement_id}.mid",
-    ]
-    for filename in possible_names:
-        candidate = local_uploads / filename
-        if candidate.exists() and candidate.stat().st_size > 0:
-            midi_artifacts[filename] = candidate.read_bytes()
-
-    return midi_artifacts
-
-
 def _generate_producer_arrangement(
     loop_id: int,
     tempo: float,
@@ -2124,50 +2016,41 @@ def get_daw_export_info(
             "message": "Arrangement must be done before DAW export can be generated.",
         }
 
-    export_key = f"exports/{arrangement.id}.zip"
+    export_key = daw_export_key(arrangement.id)
     if not storage.file_exists(export_key):
+        export_job = None
+        if settings.daw_export_async_enabled:
+            export_job, enqueued = create_daw_export_job(db, arrangement)
+            if enqueued:
+                logger.info("DAW export: job %s building ZIP for arrangement %s", export_job.id, arrangement.id)
+                return {
+                    "arrangement_id": arrangement.id,
+                    "ready_for_export": False,
+                    "status": "exporting",
+                    "export_job_id": export_job.id,
+                    "message": (
+                        "DAW export is being built. Poll GET /api/v1/jobs/{job_id} "
+                        "or call this endpoint again."
+                    ).format(job_id=export_job.id),
+                }
         logger.info("DAW export: generating ZIP for arrangement %s (key=%s)", arrangement.id, export_key)
         try:
-            full_mix_audio = _load_output_audio_segment(arrangement)
-            loop = db.query(Loop).filter(Loop.id == arrangement.loop_id).first()
-            tempo = float(loop.bpm) if loop and loop.bpm else 120.0
-            musical_key = loop.musical_key if loop and loop.musical_key else "C"
-            sections = _extract_sections_for_export(arrangement)
-            midi_artifacts = _collect_existing_midi_artifacts(arrangement.id)
-
-            zip_bytes, contents = DAWExporter.build_export_zip(
-                arrangement_id=arrangement.id,
-                full_mix=full_mix_audio,
-                bpm=tempo,
-                musical_key=musical_key,
-                sections=sections,
-                midi_files=midi_artifacts,
-            )
-
-            logger.info(
-                "DAW export: ZIP generated for arrangement %s (size=%d bytes), uploading to key=%s",
-                arrangement.id,
-                len(zip_bytes),
-                export_key,
-            )
-            storage.upload_file(
-                file_bytes=zip_bytes,
-                content_type="application/zip",
-                key=export_key,
-            )
+            if export_job is not None:
+                contents = run_daw_export_job(db, export_job.id, arrangement.id)
+            else:
+                contents = build_daw_export(db, arrangement)
         except Exception:
             logger.exception("DAW export: failed to generate/upload ZIP for arrangement %s", arrangement.id)
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Failed to generate DAW export ZIP.",
             )
-        arrangement.stems_zip_url = f"/api/v1/arrangements/{arrangement.id}/daw-export/download"
-        db.commit()
         db.refresh(arrangement)
+        sections = export_sections(arrangement)
     else:
         logger.info("DAW export: cached ZIP found for arrangement %s (key=%s)", arrangement.id, export_key)
-        sections = _extract_sections_for_export(arrangement)
-        contents = {
+        sections = export_sections(arrangement)
+        contents = load_export_contents(arrangement.id) or {
             "stems": [
                 "stems/kick.wav",
                 "stems/bass.wav",
@@ -2181,11 +2064,11 @@ def get_daw_export_info(
         }
 
     if not arrangement.stems_zip_url:
-        arrangement.stems_zip_url = f"/api/v1/arrangements/{arrangement.id}/daw-export/download"
+        arrangement.stems_zip_url = daw_export_download_url(arrangement.id)
         db.commit()
         db.refresh(arrangement)
 
-    download_url = arrangement.stems_zip_url or f"/api/v1/arrangements/{arrangement.id}/daw-export/download"
+    download_url = arrangement.stems_zip_url or daw_export_download_url(arrangement.id)
     logger.info("DAW export: returning download_url=%s for arrangement %s", download_url, arrangement.id)
 
     return {
@@ -2217,8 +2100,14 @@ def download_daw_export(
             detail=f"Arrangement {arrangement_id} not found",
         )
 
-    export_key = f"exports/{arrangement.id}.zip"
+    export_key = daw_export_key(arrangement.id)
     if not storage.file_exists(export_key):
+        export_job = get_active_daw_export_job(db, arrangement)
+        if export_job is not None:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"DAW export is still being built (job {export_job.id}).",
+            )
         logger.warning("DAW export download: ZIP not found for arrangement %s (key=%s)", arrangement_id, export_key)
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -16,6 +16,7 @@ from fastapi.responses import RedirectResponse
 from sqlalchemy.orm import Session
 
 from app.db import get_db
+from app.db.async_session import get_async_db
 from app.models.loop import Loop
 from app.services.storage import storage
 from app.services.task_service import task_service
@@ -144,7 +145,7 @@ async def download_loop(
 @router.get("/loops/{loop_id}/stream")
 async def stream_loop(
     loop_id: int,
-    db: Session = Depends(get_db)
+    db=Depends(get_async_db)
 ):
     """
     Stream a loop audio file.
@@ -163,7 +164,7 @@ async def stream_loop(
         500: If file is not accessible
     """
     # Get loop from database
-    loop = db.query(Loop).filter(Loop.id == loop_id).first()
+    loop = await db.get(Loop, loop_id)
     
     if not loop:
         raise HTTPException(status_code=404, detail=f"Loop {loop_id} not found")
@@ -15,6 +15,7 @@ from sqlalchemy.orm import Session
 
 from app.config import settings
 from app.db import get_db
+from app.db.async_session import get_async_db
 from app.models.job import RenderJob
 from app.queue import DEFAULT_RENDER_QUEUE_NAME, get_redis_conn, get_queue as _get_queue
 
@@ -137,10 +138,22 @@ async def health_worker():
 
     Phase 3: also returns worker_mode, queue_depth, active_jobs, failed_jobs,
     and last_heartbeat from real diagnostics.  No data is fabricated.
+
+    ``decoded_audio_cache`` reports this process's decoded-audio cache
+    hit/miss counters plus the size of the shared on-disk tier;
+    ``render_result_cache`` reports its render result cache counters;
+    ``db_setup`` the per-job DB setup latency and schema check of jobs run in
+    this process (embedded workers).
     """
+    from app.db.worker_setup import get_db_setup_stats
+    from app.services.decoded_audio_cache import get_decoded_audio_cache
+    from app.services.render_result_cache import get_render_result_cache
     from app.services.render_observability import get_worker_mode
 
     worker_mode = get_worker_mode()
+    decoded_audio_cache = get_decoded_audio_cache().stats()
+    render_result_cache = get_render_result_cache().stats()
+    db_setup = get_db_setup_stats().stats()
     queue_name = None
     queue_depth = None
     active_jobs = None
@@ -188,6 +201,9 @@ async def health_worker():
             "failed_jobs": failed_jobs,
             "last_heartbeat": last_heartbeat,
             "workers": worker_status,
+            "decoded_audio_cache": decoded_audio_cache,
+            "render_result_cache": render_result_cache,
+            "db_setup": db_setup,
         }
     except Exception as e:
         logger.exception("Worker health check failed")
@@ -201,6 +217,9 @@ async def health_worker():
             "active_jobs": active_jobs,
             "failed_jobs": failed_jobs,
             "last_heartbeat": last_heartbeat,
+            "decoded_audio_cache": decoded_audio_cache,
+            "render_result_cache": render_result_cache,
+            "db_setup": db_setup,
             "error": str(e),
         }
 
@@ -217,31 +236,43 @@ async def readiness_check_legacy(db: Session = Depends(get_db)):
 
 
 @router.get("/health/queue")
-async def health_queue_debug(db: Session = Depends(get_db)):
-    """Queue debug endpoint: queue depth and failed job counts."""
-    def _count_jobs_by_status(status_value: str):
-        try:
-            value = db.execute(
-                text("SELECT COUNT(*) FROM render_jobs WHERE status = :status"),
-                {"status": status_value},
-            ).scalar()
-            return int(value or 0)
-        except Exception as exc:
-            logger.warning("Queue debug DB count failed for status=%s: %s", status_value, exc)
-            return None
-
-    failed_db_jobs = _count_jobs_by_status("failed")
-    queued_db_jobs = _count_jobs_by_status("queued")
-    processing_db_jobs = _count_jobs_by_status("processing")
+async def health_queue_debug(db=Depends(get_async_db)):
+    """Queue debug endpoint: queue depth and failed job counts.
+
+    ``queue_depth`` is the interactive ``render`` queue; ``queues`` has depth,
+    oldest-job age and dequeue weight for every queue workers listen on.
+    """
+    failed_db_jobs = queued_db_jobs = processing_db_jobs = None
+    try:
+        rows = await db.execute(
+            text(
+                "SELECT status, COUNT(*) FROM render_jobs "
+                "WHERE status IN ('failed', 'queued', 'processing') GROUP BY status"
+            )
+        )
+        counts = {status: int(count) for status, count in rows}
+        failed_db_jobs = counts.get("failed", 0)
+        queued_db_jobs = counts.get("queued", 0)
+        processing_db_jobs = counts.get("processing", 0)
+    except Exception as exc:
+        logger.warning("Queue debug DB count failed: %s", exc)
 
     queue_name = "render"
     redis_ok = False
     queue_depth = None
     failed_queue_jobs = None
     queue_error = None
+    queues = {}
 
     try:
-        from app.queue import DEFAULT_RENDER_QUEUE_NAME, get_redis_conn, get_queue
+        from app.queue import (
+            DEFAULT_RENDER_QUEUE_NAME,
+            WORKER_QUEUE_NAMES,
+            get_queue,
+            get_redis_conn,
+            oldest_job_age_seconds,
+            queue_weights,
+        )
 
         queue_name = DEFAULT_RENDER_QUEUE_NAME
         redis_conn = get_redis_conn()
@@ -250,6 +281,19 @@ async def health_queue_debug(db: Session = Depends(get_db)):
         queue = get_queue(redis_conn, name=queue_name)
         queue_depth = int(queue.count)
         failed_queue_jobs = int(len(queue.failed_job_registry))
+
+        weights = queue_weights()
+        for name in WORKER_QUEUE_NAMES:
+            try:
+                named_queue = get_queue(redis_conn, name=name)
+                age = oldest_job_age_seconds(named_queue)
+                queues[name] = {
+                    "depth": int(named_queue.count),
+                    "oldest_job_age_seconds": round(age, 3) if age is not None else None,
+                    "weight": weights.get(name, 1),
+                }
+            except Exception as exc:
+                queues[name] = {"error": str(exc)}
     except Exception as exc:
         queue_error = str(exc)
         logger.warning("Queue debug check failed: %s", exc)
@@ -263,5 +307,6 @@ async def health_queue_debug(db: Session = Depends(get_db)):
         "failed_db_jobs": int(failed_db_jobs) if failed_db_jobs is not None else None,
         "queued_db_jobs": int(queued_db_jobs) if queued_db_jobs is not None else None,
         "processing_db_jobs": int(processing_db_jobs) if processing_db_jobs is not None else None,
+        "queues": queues,
         "error": queue_error,
     }
@@ -7,27 +7,54 @@ Provides endpoint for analyzing loop metadata to automatically detect:
 - Arrangement template recommendations
 - Suggested instruments
 
-No audio file processing required - works with metadata only.
+No audio file processing required - works with metadata only.  Loops without
+a stored BPM or key fall back to the feature bundle persisted at ingest.
+
+POST /loops/analyze-batch queues an audio re-analysis of many stored loops
+(catalog backfills; see app/services/batch_analysis.py).
 """
 
 import logging
 from fastapi import APIRouter, HTTPException, Depends
 from sqlalchemy.orm import Session
-from typing import Optional
+from typing import Any, Dict, Optional
 
+from app.config import settings
 from app.db import get_db
 from app.models.loop import Loop
 from app.schemas.loop_analysis import (
+    BatchAnalysisRequest,
+    BatchAnalysisResponse,
     LoopAnalysisRequest,
     LoopAnalysisResponse,
     LoopMetadataInput
 )
+from app.services.audio_features import find_audio_features_by_hash
+from app.services.batch_analysis import enqueue_batch_analysis, select_loop_ids
+from app.services.loop_analyzer import loop_analyzer
 from app.services.loop_metadata_analyzer import LoopMetadataAnalyzer
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/loops", tags=["Loop Analysis"])
 
 
+def _stored_audio_analysis(loop: Loop) -> Dict[str, Any]:
+    """BPM/key/bars from the loop's persisted feature bundle, if it has one.
+
+    The bundle is looked up by the content hash saved in ``analysis_json``
+    at ingest; the audio itself is never downloaded or decoded here.
+    """
+    digest = loop.feature_hash
+    if not digest:
+        return {}
+    try:
+        features = find_audio_features_by_hash(digest)
+        return loop_analyzer.analyze_features(features) if features is not None else {}
+    except Exception as e:
+        logger.warning(f"Stored audio features unavailable for loop {loop.id}: {e}")
+        return {}
+
+
 @router.post("/analyze-metadata", response_model=LoopAnalysisResponse)
 def analyze_loop_metadata(
     request: LoopAnalysisRequest,
@@ -112,6 +139,48 @@ def analyze_loop_metadata(
         raise HTTPException(status_code=500, detail="Internal server error during analysis")
 
 
+@router.post("/analyze-batch", response_model=BatchAnalysisResponse, status_code=202)
+def analyze_loops_batch(
+    request: BatchAnalysisRequest,
+    db: Session = Depends(get_db),
+) -> BatchAnalysisResponse:
+    """Re-analyze many stored loops (BPM, key, duration, bars) in one job.
+
+    Replaces one ``/analyze-loop/{loop_id}`` call per loop for catalog
+    backfills.  The selection is resolved now; downloads and analysis run in
+    the worker (see app/services/batch_analysis.py), which logs throughput and
+    stores the run summary as the RQ job result.
+
+    Example request:
+    ```json
+    {"missing": "bpm", "limit": 5000}
+    ```
+
+    Raises:
+        HTTPException 400: Neither loop_ids nor missing given
+        HTTPException 503: Batch analysis disabled or the job queue is unavailable
+    """
+    if not settings.batch_analysis_enabled:
+        raise HTTPException(status_code=503, detail="Batch analysis is disabled")
+    if request.loop_ids is None and request.missing is None:
+        raise HTTPException(status_code=400, detail="Provide loop_ids or missing")
+
+    loop_ids = select_loop_ids(db, loop_ids=request.loop_ids, missing=request.missing, limit=request.limit)
+    if not loop_ids:
+        return BatchAnalysisResponse(status="empty", loop_count=0)
+
+    job_id = enqueue_batch_analysis(loop_ids)
+    if job_id is None:
+        # The analysis runs on a process pool; it never runs in the API process.
+        raise HTTPException(
+            status_code=503,
+            detail="Background job queue is unavailable. Redis service may be offline.",
+        )
+
+    logger.info(f"Batch analysis queued: job_id={job_id} loops={len(loop_ids)}")
+    return BatchAnalysisResponse(status="queued", loop_count=len(loop_ids), job_id=job_id)
+
+
 @router.post("/loops/{loop_id}/analyze-metadata", response_model=LoopAnalysisResponse)
 def analyze_existing_loop_metadata(
     loop_id: int,
@@ -159,15 +228,24 @@ def analyze_existing_loop_metadata(
             elif isinstance(loop.tags, list):
                 tags = loop.tags
         
+        bpm = loop.bpm or loop.tempo
+        musical_key = loop.musical_key
+        bars = loop.bars
+        if bpm is None or musical_key is None:
+            detected = _stored_audio_analysis(loop)
+            bpm = bpm or detected.get("bpm")
+            musical_key = musical_key or detected.get("key")
+            bars = bars or detected.get("bars")
+
         # Perform analysis using loop metadata
         result = LoopMetadataAnalyzer.analyze(
-            bpm=loop.bpm or loop.tempo,
+            bpm=bpm,
             tags=tags,
             filename=loop.filename,
             mood_keywords=[],  # Could be extracted from loop metadata if available
             genre_hint=genre_hint or loop.genre,
-            bars=loop.bars,
-            musical_key=loop.musical_key,
+            bars=bars,
+            musical_key=musical_key,
         )
         
         response = LoopAnalysisResponse(**result)
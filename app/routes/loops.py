@@ -1,13 +1,14 @@
 import logging
 import io
 import json
+import tempfile
 from typing import List, Optional
 from pathlib import Path
-from fastapi import APIRouter, Depends, Form, HTTPException, UploadFile, File, Query, Request, status
+from fastapi import APIRouter, BackgroundTasks, Depends, Form, HTTPException, UploadFile, File, Query, Request, status
 from fastapi.responses import FileResponse, StreamingResponse
 from pydantic import ValidationError
 from sqlalchemy.orm import Session
-from pydub import AudioSegment
+from starlette.concurrency import run_in_threadpool
 
 from app.config import settings
 from app.db import get_db
@@ -15,8 +16,10 @@ from app.models.loop import Loop
 from app.models.schemas import LoopCreate, LoopResponse, LoopUpdate
 from app.services.loop_service import loop_service
 from app.services.loop_analyzer import loop_analyzer
+from app.services.loop_ingest import build_stem_analysis_json as _build_stem_analysis_json
 from app.services.audit_logging import log_feature_event
-from app.services.stem_separation import separate_and_store_stems
+from app.services.job_service import create_ingest_job
+from app.services.pcm_stem_store import persist_pcm_stems
 from app.services.stem_pack_service import (
     StemPackError,
     StemSourceFile,
@@ -26,9 +29,7 @@ from app.services.stem_pack_service import (
 )
 from app.services.stem_ingestion_router import (
     SOURCE_MODE_MULTI_STEM,
-    SOURCE_MODE_SINGLE_FILE,
     SOURCE_MODE_ZIP_STEM,
-    build_manifest_from_ai_separation,
     build_manifest_from_uploaded_stems,
 )
 from app.services.canonical_stem_manifest import SOURCE_UPLOADED_STEM, SOURCE_ZIP_STEM
@@ -36,102 +37,7 @@ from app.services.canonical_stem_manifest import SOURCE_UPLOADED_STEM, SOURCE_ZI
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
-
-def _build_stem_analysis_json(
-    existing_analysis: dict,
-    *,
-    source_content: bytes,
-    source_filename: str,
-    loop_id: int,
-    source_key: str,
-) -> str:
-    payload = dict(existing_analysis or {})
-    if not settings.feature_stem_separation:
-        payload["stem_separation"] = {
-            "enabled": False,
-            "backend": settings.stem_separation_backend,
-            "succeeded": False,
-            "reason": "feature_disabled",
-        }
-        return json.dumps(payload)
-
-    try:
-        source_audio = AudioSegment.from_file(io.BytesIO(source_content), format=source_filename.split(".")[-1].lower())
-    except Exception as e:
-        logger.warning("Failed to decode source audio for stem separation: %s", e)
-        payload["stem_separation"] = {
-            "enabled": True,
-            "backend": settings.stem_separation_backend,
-            "succeeded": False,
-            "error": f"decode_failed: {e}",
-        }
-        return json.dumps(payload)
-
-    # Phase 3/8: use advanced two-stage separation when flag is enabled
-    if settings.feature_advanced_stem_separation_v2:
-        try:
-            from app.services.advanced_stem_separation import run_advanced_separation
-            adv_result = run_advanced_separation(
-                source_audio,
-                loop_id=loop_id,
-                source_key=source_key,
-                # Use the preferred backend (e.g. demucs_htdemucs_6s); the pipeline
-                # falls back automatically through the priority chain to builtin.
-                backend=(settings.preferred_stem_backend or "builtin").strip().lower(),
-            )
-            if adv_result.succeeded:
-                manifest = adv_result.to_manifest(loop_id)
-                payload["stem_separation"] = {
-                    "enabled": True,
-                    "backend": adv_result.backend,
-                    "succeeded": True,
-                    "upload_mode": SOURCE_MODE_SINGLE_FILE,
-                    "stems_generated": manifest.broad_roles,
-                    "stem_s3_keys": manifest.stem_keys(),
-                    "canonical_manifest": manifest.to_dict(),
-                }
-                return json.dumps(payload)
-            # Advanced separation failed — fall through to legacy path
-            logger.warning(
-                "Advanced stem separation failed for loop_id=%s, falling back to legacy: %s",
-                loop_id,
-                adv_result.error,
-            )
-        except Exception as adv_exc:  # pragma: no cover — unexpected errors are non-fatal
-            logger.warning(
-                "Unexpected error in advanced stem separation for loop_id=%s: %s",
-                loop_id,
-                adv_exc,
-                exc_info=True,
-            )
-
-    # Legacy path: broad 4-stem separation
-    stem_result = separate_and_store_stems(
-        source_audio=source_audio,
-        loop_id=loop_id,
-        source_key=source_key,
-    )
-    separation_dict = stem_result.to_dict()
-
-    # Phase 5: always build a canonical manifest from the AI-separated stems,
-    # even on the legacy path, so downstream consumers have a uniform object.
-    if stem_result.succeeded and stem_result.stem_s3_keys:
-        try:
-            manifest = build_manifest_from_ai_separation(
-                stem_result.stem_s3_keys,
-                loop_id=loop_id,
-            )
-            separation_dict["canonical_manifest"] = manifest.to_dict()
-            separation_dict["upload_mode"] = SOURCE_MODE_SINGLE_FILE
-        except Exception as manifest_exc:
-            logger.debug(
-                "Canonical manifest generation failed for loop_id=%s: %s",
-                loop_id,
-                manifest_exc,
-            )
-
-    payload["stem_separation"] = separation_dict
-    return json.dumps(payload)
+_STEM_ZIP_SPOOL_CHUNK_BYTES = 1024 * 1024
 
 
 def _build_uploaded_stem_analysis_json(existing_analysis: dict, *, stem_metadata: dict) -> str:
@@ -162,8 +68,77 @@ def _extract_detected_roles(stem_metadata: dict | None) -> list[str]:
     return [str(role) for role in roles]
 
 
+def _start_loop_ingest(
+    db: Session,
+    *,
+    content: bytes,
+    safe_filename: str,
+    file_key: str,
+    file_url: str,
+    background_tasks: BackgroundTasks,
+    correlation_id: Optional[str],
+) -> dict:
+    """Create the Loop row and its ingest job; analysis runs off the request path."""
+    try:
+        new_loop = Loop(
+            name=safe_filename,
+            filename=safe_filename,
+            file_url=file_url,
+            file_key=file_key,
+            status="processing",
+        )
+        db.add(new_loop)
+        db.commit()
+        db.refresh(new_loop)
+        job, enqueued = create_ingest_job(db, new_loop.id, content)
+    except Exception as e:
+        db.rollback()
+        log_feature_event(
+            logger,
+            event="upload_failure",
+            correlation_id=correlation_id,
+            reason="db_error",
+            error=str(e),
+            filename=safe_filename,
+        )
+        logger.exception("Failed to save loop record")
+        raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+
+    if not enqueued:
+        from app.workers.ingest_worker import ingest_loop_worker
+
+        # No queue (e.g. local dev without Redis): ingest after the response
+        # is sent, still off the request path.
+        background_tasks.add_task(ingest_loop_worker, job.id, new_loop.id, content)
+
+    logger.info(f"Loop uploaded: {new_loop.id} - {file_key} (ingest job {job.id}, queued={enqueued})")
+    log_feature_event(
+        logger,
+        event="upload_success",
+        correlation_id=correlation_id,
+        loop_id=new_loop.id,
+        file_key=file_key,
+        ingest_job_id=job.id,
+    )
+    return {
+        "loop_id": new_loop.id,
+        "file_url": file_url,
+        "play_url": f"/api/v1/loops/{new_loop.id}/play",
+        "download_url": f"/api/v1/loops/{new_loop.id}/download",
+        "status": "processing",
+        "job_id": job.id,
+        "poll_url": f"/api/v1/jobs/{job.id}",
+        "events_url": f"/api/v1/jobs/{job.id}/events",
+    }
+
+
 @router.post("/loops/upload", status_code=201)
-async def upload_audio(file: UploadFile = File(...), request: Request = None, db: Session = Depends(get_db)):
+async def upload_audio(
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(...),
+    request: Request = None,
+    db: Session = Depends(get_db),
+):
     """Upload a WAV or MP3 audio file to S3.
 
     Routing assumptions (production):
@@ -173,17 +148,23 @@ async def upload_audio(file: UploadFile = File(...), request: Request = None, db
       permanent object key stored in the DB.  It never changes after upload.
     - ``file_url`` is an ephemeral access URL (presigned or local path) only
       used for the immediate response; the DB row stores only the ``file_key``.
-    - Audio analysis (BPM, key, bars) is performed asynchronously after the
-      file is stored; failures are non-fatal and the Loop row is still created.
-    - Stem separation is kicked off in ``_build_stem_analysis_json`` when the
-      ``FEATURE_STEM_SEPARATION`` flag is enabled; again non-fatal.
+    - With ``ASYNC_INGEST_ENABLED`` (default) the Loop row is created with
+      ``status="processing"`` as soon as the file is stored, and audio
+      analysis (BPM, key, bars) plus stem separation run in an ``ingest_loop``
+      job (``app/services/loop_ingest.py``).  Its progress is reported by
+      ``GET /api/v1/jobs/{job_id}`` and ``/api/v1/jobs/{job_id}/events``;
+      the loop becomes ``complete`` (or ``failed``) when it finishes.  Without
+      Redis the ingest runs in-process after the response is sent.
+    - Otherwise analysis and separation run inline, as before; failures are
+      non-fatal and the Loop row is still created.
 
     Args:
         file: Audio file (WAV or MP3)
         db: Database session
 
     Returns:
-        dict: Contains loop_id, play_url, and download_url
+        dict: Contains loop_id, play_url and download_url, plus status,
+        job_id, poll_url and events_url for the ingest job
 
     Raises:
         HTTPException: If file type invalid or upload fails
@@ -238,6 +219,17 @@ async def upload_audio(file: UploadFile = File(...), request: Request = None, db
         )
         logger.exception("Failed to upload file")
         raise HTTPException(status_code=500, detail=f"Failed to upload file: {str(e)}")
+
+    if settings.async_ingest_enabled:
+        return _start_loop_ingest(
+            db,
+            content=content,
+            safe_filename=safe_filename,
+            file_key=file_key,
+            file_url=file_url,
+            background_tasks=background_tasks,
+            correlation_id=getattr(request.state, "correlation_id", None) if request is not None else None,
+        )
     
     # Analyze audio from S3
     analysis_result = {
@@ -496,8 +488,14 @@ async def create_loop_with_upload(
         try:
             if stem_zip_mode:
                 assert stem_zip is not None
-                zip_bytes = await stem_zip.read()
-                ingest_result = ingest_stem_zip(zip_bytes)
+                # Spool the pack to disk rather than holding it in memory; the
+                # members are decoded from the file in the ingest process pool.
+                with tempfile.TemporaryDirectory(prefix="stem_zip_") as spool_dir:
+                    zip_path = Path(spool_dir) / "pack.zip"
+                    with zip_path.open("wb") as spool:
+                        while chunk := await stem_zip.read(_STEM_ZIP_SPOOL_CHUNK_BYTES):
+                            spool.write(chunk)
+                    ingest_result = await run_in_threadpool(ingest_stem_zip, zip_path)
                 safe_filename = loop_service.sanitize_filename(stem_zip.filename or "stem_pack.zip")
             else:
                 source_files: list[StemSourceFile] = []
@@ -586,6 +584,11 @@ async def create_loop_with_upload(
             )
             loop.is_stem_pack = "true" if can_use_stem_path else "false"
             loop.stem_roles_json = json.dumps(stem_keys)
+            pcm_layouts = persist_pcm_stems(
+                stem_keys,
+                ingest_result.role_stems,
+                duration_ms=ingest_result.duration_ms,
+            )
             loop.stem_files_json = json.dumps(
                 {
                     role: {
@@ -593,6 +596,7 @@ async def create_loop_with_upload(
                         "s3_key": key,
                         "duration_ms": ingest_result.duration_ms,
                         "source_files": ingest_result.role_sources.get(role, []),
+                        **({"pcm": pcm_layouts[role]} if role in pcm_layouts else {}),
                     }
                     for role, key in stem_keys.items()
                 }
@@ -4,21 +4,31 @@
 import json
 import logging
 import random
-from typing import Dict, List, Optional
+from typing import Dict, List, Literal, Optional
 
-from fastapi import APIRouter, Body, Depends, HTTPException
+from fastapi import APIRouter, Body, Depends, Header, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel, Field
 from sqlalchemy.orm import Session
 
 from app.db import get_db
+from app.db.async_session import get_async_db
 from app.config import settings
 from app.models.loop import Loop
 from app.queue import is_redis_available
 from app.routes.render import RenderConfig
 from app.schemas.job import RenderJobRequest, RenderJobResponse, RenderJobStatusResponse, RenderJobHistoryResponse
-from app.services.job_service import create_render_job, get_job_status, list_loop_jobs
+from app.services.job_events import job_event_stream
+from app.services.job_service import (
+    create_render_job,
+    get_job_event_snapshot_async,
+    get_job_profile_async,
+    get_job_status_async,
+    list_loop_jobs,
+)
 from app.services.producer_event_bar_normalizer import normalize_producer_event_bar
 from app.services.producer_intelligence.planner import ProducerIntelligencePlanner
+from app.services.render_timing import to_chrome_trace
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -104,6 +114,11 @@ class AsyncRenderRequest(BaseModel):
 
     genre: Optional[str] = Field("Trap", description="Musical genre hint")
     energy: Optional[str] = Field("medium", description="Energy level hint")
+    quality: Literal["full", "preview"] = Field(
+        "full",
+        description="'preview' renders a fast low-bitrate preview first, then queues "
+                    "the full-quality render of the same plan",
+    )
 
 
 class VariationJobInfo(BaseModel):
@@ -116,6 +131,7 @@ class VariationJobInfo(BaseModel):
     status: str
     poll_url: str
     deduplicated: bool
+    quality: str = Field("full", description="'preview' when the job renders a preview first")
 
 
 class AsyncRenderBatchResponse(BaseModel):
@@ -1256,6 +1272,8 @@ async def render_arrangement_async(
             "section_sequence": section_sequence,
             "render_plan_json": render_plan_json,
         }
+        if request.quality == "preview":
+            job_params["quality"] = "preview"
         try:
             _rp = json.loads(render_plan_json)
         except Exception:
@@ -1313,6 +1331,7 @@ async def render_arrangement_async(
                 status=job.status,
                 poll_url=f"/api/v1/jobs/{job.id}",
                 deduplicated=was_deduplicated,
+                quality=request.quality,
             )
         )
     logger.info("VARIATION_JOBS_ENQUEUED loop_id=%s variation_count=%s jobs=%s", loop_id, effective_variation_count, [j.job_id for j in variation_jobs])
@@ -1357,16 +1376,110 @@ async def render_arrangement_async(
 @router.get("/jobs/{job_id}", response_model=RenderJobStatusResponse)
 async def get_job_status_endpoint(
     job_id: str,
-    db: Session = Depends(get_db),
+    db=Depends(get_async_db),
 ):
     """Get full status of a render job, including outputs and presigned URLs."""
     try:
-        job_status = get_job_status(db, job_id)
+        job_status = await get_job_status_async(db, job_id)
         return job_status
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
 
 
+@router.get("/jobs/{job_id}/profile")
+async def get_job_profile_endpoint(
+    job_id: str,
+    format: Literal["summary", "chrome"] = "summary",
+    db=Depends(get_async_db),
+):
+    """Timing profile of a render job: per-stage spans with wall time, CPU time and peak RSS.
+
+    ``format=chrome`` returns the spans as Chrome trace-event JSON, to load in
+    ``chrome://tracing`` or Perfetto.
+    """
+    try:
+        profile = await get_job_profile_async(db, job_id)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    if profile is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} has no render profile")
+    if format == "chrome":
+        return JSONResponse(
+            to_chrome_trace(profile),
+            headers={"Content-Disposition": f'attachment; filename="render-profile-{job_id}.json"'},
+        )
+    return {"job_id": job_id, **profile}
+
+
+def _parse_last_event_id(value: Optional[str]) -> Optional[int]:
+    try:
+        return int(value) if value not in (None, "") else None
+    except ValueError:
+        return None
+
+
+@router.get("/jobs/{job_id}/events")
+async def stream_job_events(
+    job_id: str,
+    last_event_id: Optional[str] = Header(None, alias="Last-Event-ID"),
+    db=Depends(get_async_db),
+):
+    """Stream job progress as server-sent events until the job is terminal.
+
+    Events are pushed from Redis pub/sub; reconnecting with ``Last-Event-ID``
+    replays what was missed.  Comment lines are sent as keep-alives.
+    """
+    try:
+        snapshot = await get_job_event_snapshot_async(db, job_id)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    finally:
+        # Release the connection now rather than when the stream ends.
+        await db.close()
+
+    async def _events():
+        async for event in job_event_stream(
+            job_id, last_event_id=_parse_last_event_id(last_event_id), snapshot=snapshot
+        ):
+            yield ": keep-alive\n\n" if event is None else event.to_sse()
+
+    return StreamingResponse(
+        _events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.websocket("/jobs/{job_id}/ws")
+async def job_events_websocket(
+    websocket: WebSocket,
+    job_id: str,
+    last_event_id: Optional[str] = None,
+    db=Depends(get_async_db),
+):
+    """WebSocket variant of ``/jobs/{job_id}/events``: one JSON message per event."""
+    try:
+        snapshot = await get_job_event_snapshot_async(db, job_id)
+    except ValueError:
+        await websocket.close(code=4404)
+        return
+    finally:
+        await db.close()
+
+    await websocket.accept()
+    try:
+        async for event in job_event_stream(
+            job_id, last_event_id=_parse_last_event_id(last_event_id), snapshot=snapshot
+        ):
+            if event is None:
+                await websocket.send_json({"type": "keep-alive"})
+            else:
+                await websocket.send_json({"type": "terminal" if event.terminal else "progress", **event.to_dict()})
+    except WebSocketDisconnect:
+        return
+    await websocket.close()
+
+
 @router.get("/loops/{loop_id}/jobs", response_model=RenderJobHistoryResponse)
 async def get_loop_jobs(
     loop_id: int,
@@ -3,7 +3,7 @@
 These models define the request/response contracts for automatic loop metadata analysis.
 """
 
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Literal
 from pydantic import BaseModel, Field, field_validator
 
 
@@ -176,3 +176,46 @@ class LoopMetadataInput(BaseModel):
                 "mood": None
             }
         }
+
+
+class BatchAnalysisRequest(BaseModel):
+    """Request to re-analyze many stored loops in one background job.
+
+    Select loops by id, by a missing field, or both; at least one is required.
+    """
+
+    loop_ids: Optional[List[int]] = Field(
+        default=None,
+        description="Loops to analyze"
+    )
+
+    missing: Optional[Literal["bpm", "key", "bars", "duration"]] = Field(
+        default=None,
+        description="Only loops where this field is NULL"
+    )
+
+    limit: Optional[int] = Field(
+        default=None,
+        ge=1,
+        description="Analyze at most this many loops"
+    )
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "loop_ids": None,
+                "missing": "bpm",
+                "limit": 5000
+            }
+        }
+
+
+class BatchAnalysisResponse(BaseModel):
+    """A queued batch analysis job."""
+
+    status: str = Field(..., description="queued or empty (nothing matched)")
+    loop_count: int = Field(..., description="Number of loops selected")
+    job_id: Optional[str] = Field(
+        default=None,
+        description="RQ job id; its result holds the run summary and throughput"
+    )
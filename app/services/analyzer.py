@@ -6,10 +6,18 @@ production-ready with proper error handling and logging.
 """
 
 import logging
+import os
 from typing import Tuple
 import numpy as np
 import librosa
 
+from app.services.audio_features import (
+    HOP_LENGTH,
+    AudioFeatures,
+    estimate_tempo_candidates,
+    get_audio_features,
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -24,8 +32,10 @@ class AudioAnalyzer:
     def analyze_audio(file_path: str) -> dict:
         """Main orchestration function for complete audio analysis.
 
-        Loads audio file and performs BPM, key, and duration detection.
-        Returns all analysis results in a single dictionary.
+        Decodes the file once into the shared feature bundle
+        (``app.services.audio_features``) and performs BPM, key, and
+        duration detection on it.  Returns all analysis results in a single
+        dictionary.
 
         Args:
             file_path: Path to WAV or MP3 audio file
@@ -45,50 +55,11 @@ class AudioAnalyzer:
         logger.info(f"Starting audio analysis for file: {file_path}")
 
         try:
-            # Load audio with librosa (standardized 22050 Hz sample rate)
             logger.debug(f"Loading audio from: {file_path}")
-            y, sr = librosa.load(file_path, sr=22050)
-
-            if len(y) == 0:
-                raise ValueError("Audio file is empty or invalid")
-
-            logger.debug(f"Audio loaded: {len(y)} samples at {sr} Hz")
-
-            # Calculate duration
-            duration_seconds = len(y) / sr
-            logger.debug(f"Duration: {duration_seconds:.2f} seconds")
-
-            # Detect BPM
-            bpm, bpm_confidence = AudioAnalyzer.detect_bpm(y, sr)
-            logger.info(f"BPM detected: {bpm} (confidence: {bpm_confidence:.2f})")
-
-            # Detect musical key
-            musical_key, key_confidence = AudioAnalyzer.detect_key(y, sr)
-            logger.info(f"Key detected: {musical_key} (confidence: {key_confidence:.2f})")
-
-            # Calculate overall confidence
-            overall_confidence = (bpm_confidence + key_confidence) / 2
-            logger.debug(f"Overall analysis confidence: {overall_confidence:.2f}")
-
-            analysis_result = {
-                "bpm": int(round(bpm)),
-                "musical_key": musical_key,
-                "duration_seconds": float(duration_seconds),
-                "confidence": float(overall_confidence),
-                "analysis_details": {
-                    "bpm_confidence": float(bpm_confidence),
-                    "key_confidence": float(key_confidence),
-                    "sample_rate": int(sr),
-                    "num_samples": int(len(y)),
-                },
-            }
-
-            logger.info(
-                f"Audio analysis complete: BPM={bpm}, Key={musical_key}, "
-                f"Duration={duration_seconds:.2f}s"
-            )
-
-            return analysis_result
+            with open(file_path, "rb") as f:
+                content = f.read()
+            features = get_audio_features(content, os.path.basename(file_path))
+            return AudioAnalyzer.analyze_features(features)
 
         except FileNotFoundError:
             logger.error(f"Audio file not found: {file_path}")
@@ -97,6 +68,51 @@ class AudioAnalyzer:
             logger.exception(f"Audio analysis failed for {file_path}: {str(e)}")
             raise
 
+    @staticmethod
+    def analyze_features(features: AudioFeatures) -> dict:
+        """Run BPM, key, and duration detection on a feature bundle.
+
+        Args:
+            features: Bundle from ``get_audio_features``
+
+        Returns:
+            Same dictionary as :meth:`analyze_audio`
+        """
+        duration_seconds = features.duration_seconds
+        logger.debug(f"Duration: {duration_seconds:.2f} seconds")
+
+        # Detect BPM
+        bpm, bpm_confidence = AudioAnalyzer.bpm_from_candidates(features.tempo_candidates)
+        logger.info(f"BPM detected: {bpm} (confidence: {bpm_confidence:.2f})")
+
+        # Detect musical key
+        musical_key, key_confidence = AudioAnalyzer.key_from_chroma(features.chroma)
+        logger.info(f"Key detected: {musical_key} (confidence: {key_confidence:.2f})")
+
+        # Calculate overall confidence
+        overall_confidence = (bpm_confidence + key_confidence) / 2
+        logger.debug(f"Overall analysis confidence: {overall_confidence:.2f}")
+
+        analysis_result = {
+            "bpm": int(round(bpm)),
+            "musical_key": musical_key,
+            "duration_seconds": float(duration_seconds),
+            "confidence": float(overall_confidence),
+            "analysis_details": {
+                "bpm_confidence": float(bpm_confidence),
+                "key_confidence": float(key_confidence),
+                "sample_rate": int(features.sample_rate),
+                "num_samples": int(features.num_samples),
+            },
+        }
+
+        logger.info(
+            f"Audio analysis complete: BPM={bpm}, Key={musical_key}, "
+            f"Duration={duration_seconds:.2f}s"
+        )
+
+        return analysis_result
+
     @staticmethod
     def detect_bpm(y: np.ndarray, sr: int) -> Tuple[float, float]:
         """Detect tempo (BPM) from audio using librosa onset strength.
@@ -121,37 +137,42 @@ class AudioAnalyzer:
             logger.debug("Starting BPM detection")
 
             # Compute onset strength envelope
-            onset_env = librosa.onset.onset_strength(y=y, sr=sr)
+            onset_env = librosa.onset.onset_strength(y=y, sr=sr, hop_length=HOP_LENGTH)
             logger.debug(f"Onset envelope computed: {len(onset_env)} frames")
 
-            # Estimate tempo using dynamic time warping
-            # Returns array of candidate tempos and their strengths
-            tempos, strengths = librosa.beat.tempo(
-                onset_envelope=onset_env, sr=sr, aggregate=None
-            )
+            return AudioAnalyzer.bpm_from_candidates(estimate_tempo_candidates(onset_env, sr))
 
-            if len(tempos) == 0:
-                logger.warning("No tempos detected, using default 120 BPM")
-                return 120.0, 0.3
+        except Exception as e:
+            logger.warning(f"BPM detection failed: {str(e)}, using default 120 BPM")
+            return 120.0, 0.3
+
+    @staticmethod
+    def bpm_from_candidates(candidates: np.ndarray) -> Tuple[float, float]:
+        """Pick the strongest tempo candidate.
+
+        Args:
+            candidates: ``(bpm, strength)`` rows from the tempogram
 
-            # Get the strongest tempo candidate
-            best_tempo_idx = np.argmax(strengths)
-            bpm = tempos[best_tempo_idx]
-            strength = strengths[best_tempo_idx]
+        Returns:
+            Tuple of (bpm, confidence); 120 BPM with low confidence if empty
+        """
+        if len(candidates) == 0:
+            logger.warning("No tempos detected, using default 120 BPM")
+            return 120.0, 0.3
 
-            # Normalize strength to confidence [0, 1]
-            confidence = min(float(strength), 1.0)
+        # Get the strongest tempo candidate
+        best_tempo_idx = int(np.argmax(candidates[:, 1]))
+        bpm, strength = candidates[best_tempo_idx]
 
-            logger.debug(f"BPM detection: {bpm:.1f} BPM (strength: {strength:.2f})")
+        # Normalize strength to confidence [0, 1]
+        confidence = min(float(strength), 1.0)
 
-            # Clamp BPM to reasonable range (40-300)
-            bpm = max(40, min(300, bpm))
+        logger.debug(f"BPM detection: {bpm:.1f} BPM (strength: {strength:.2f})")
 
-            return float(bpm), confidence
+        # Clamp BPM to reasonable range (40-300)
+        bpm = max(40, min(300, bpm))
 
-        except Exception as e:
-            logger.warning(f"BPM detection failed: {str(e)}, using default 120 BPM")
-            return 120.0, 0.3
+        return float(bpm), confidence
 
     @staticmethod
     def detect_key(y: np.ndarray, sr: int) -> Tuple[str, float]:
@@ -179,6 +200,23 @@ class AudioAnalyzer:
             chroma = librosa.feature.chroma_cqt(y=y, sr=sr)
             logger.debug(f"Chromagram computed: {chroma.shape}")
 
+            return AudioAnalyzer.key_from_chroma(chroma)
+
+        except Exception as e:
+            logger.warning(f"Key detection failed: {str(e)}, using default C Major")
+            return "C Major", 0.3
+
+    @staticmethod
+    def key_from_chroma(chroma: np.ndarray) -> Tuple[str, float]:
+        """Match a chromagram against the Krumhansl-Kessler key profiles.
+
+        Args:
+            chroma: Chromagram, shape (12, frames)
+
+        Returns:
+            Tuple of (key, confidence); "C Major" with low confidence on failure
+        """
+        try:
             # Average chroma across time
             chroma_mean = np.mean(chroma, axis=1)
 
@@ -294,8 +332,9 @@ def detect_bpm(file_path: str) -> float:
     Returns:
         Detected BPM value
     """
-    y, sr = librosa.load(file_path, sr=22050)
-    bpm, _ = AudioAnalyzer.detect_bpm(y, sr)
+    with open(file_path, "rb") as f:
+        features = get_audio_features(f.read(), os.path.basename(file_path))
+    bpm, _ = AudioAnalyzer.bpm_from_candidates(features.tempo_candidates)
     return bpm
 
 
@@ -308,6 +347,7 @@ def detect_key(file_path: str) -> str:
     Returns:
         Detected key as string (e.g., "C Major")
     """
-    y, sr = librosa.load(file_path, sr=22050)
-    key, _ = AudioAnalyzer.detect_key(y, sr)
+    with open(file_path, "rb") as f:
+        features = get_audio_features(f.read(), os.path.basename(file_path))
+    key, _ = AudioAnalyzer.key_from_chroma(features.chroma)
     return key
@@ -27,7 +27,9 @@ from app.db import SessionLocal
 from app.config import settings
 from app.models.arrangement import Arrangement
 from app.models.loop import Loop
+from app.services import dsp, render_timing
 from app.services.audit_logging import log_feature_event
+from app.services.decoded_audio_cache import load_storage_audio
 from app.services.loop_variation_engine import (
     assign_section_variants,
     generate_loop_variations,
@@ -37,6 +39,8 @@ from app.services.arrangement_scorer import score_and_reject
 from app.services.producer_moves_engine import ProducerMovesEngine
 from app.services.producer_moves_translator import translate_producer_moves
 from app.services.render_executor import render_from_plan
+from app.services.section_render_memo import get_section_render_memo, source_fingerprint
+from app.services.shadow_executor import ShadowExecutor
 from app.services.storage import storage
 from app.services.transition_engine import build_transition_plan
 
@@ -315,6 +319,21 @@ def _crossfade_append(base: AudioSegment, tail: AudioSegment, crossfade_ms: int
     return base.append(tail, crossfade=crossfade_ms)
 
 
+def _alternating_chunk_gain(
+    audio: AudioSegment, grid_ms: int, even_gain_db: float, odd_gain_db: float
+) -> AudioSegment:
+    """Re-gain *audio* on a fixed millisecond grid, alternating between two gains.
+
+    Chunks are written in place into a single render buffer rather than grown
+    with ``+=``, which re-copied the whole result once per chunk.
+    """
+    buffer = dsp.RenderBuffer.like(audio)
+    for ms in range(0, len(audio), grid_ms):
+        chunk = audio[ms: ms + grid_ms]
+        buffer.write_at(ms, chunk, gain_db=even_gain_db if (ms // grid_ms) % 2 == 0 else odd_gain_db)
+    return buffer.to_segment()
+
+
 def _rms_dbfs(audio: AudioSegment) -> float:
     """Return RMS in dBFS with silence-safe floor."""
     rms = int(audio.rms or 0)
@@ -1373,38 +1392,39 @@ def _build_varied_section_audio(
     if section_type == "intro":
         # Filter the whole intro heavily so it sounds muffled/filtered-in,
         # giving the clear impression of "no drums yet" even on a stereo source.
-        section_audio = section_audio.low_pass_filter(2200) - 4
-        section_audio = section_audio.fade_in(min(len(section_audio), bar_duration_ms * 2))
+        section_audio = dsp.low_pass_filter(section_audio, 2200) - 4
+        section_audio = dsp.fade_in(section_audio, min(len(section_audio), bar_duration_ms * 2))
 
     elif section_type == "verse":
         # Give verse a warmer, slightly rolled-off feel vs the hook's brightness
         # so even on a single stereo source the two sections feel distinct.
-        section_audio = section_audio.low_pass_filter(8000) - 2
+        section_audio = dsp.low_pass_filter(section_audio, 8000) - 2
 
     elif section_type in {"pre_hook", "buildup", "build_up", "build"}:
         # Pre-hook: tighten up the low end (HPF removes some sub rumble) and add a
         # subtle presence boost to create the "tension before the drop" feel.
-        section_audio = section_audio.high_pass_filter(140)
-        presence = section_audio.high_pass_filter(3200)
+        section_audio = dsp.high_pass_filter(section_audio, 140)
+        presence = dsp.high_pass_filter(section_audio, 3200)
         section_audio = section_audio.overlay(presence - 1, gain_during_overlay=-3)
 
     elif section_type in {"hook", "drop", "chorus"}:
         # Add a subtle presence boost so the hook sounds brighter and more
         # alive than the verse even before the section-level gain stage runs.
-        presence = section_audio.high_pass_filter(2200)
+        presence = dsp.high_pass_filter(section_audio, 2200)
         section_audio = section_audio.overlay(presence + 1, gain_during_overlay=-3)
 
     elif section_type in {"breakdown", "bridge", "break"}:
         # Band-pass the breakdown: remove sub-bass AND top-end sparkle so it
         # sounds atmospheric/stripped without just being a muffled copy of verse.
-        section_audio = section_audio.high_pass_filter(360).low_pass_filter(4500) - 3
+        section_audio = dsp.band_pass_filter(section_audio, 360, 4500) - 3
 
     elif section_type == "outro":
         # Gentle progressive taper: -0.6 dB/bar, capped at -4 dB so outro stays audible,
         # then fade out the last bar.
         fade_db = -(min(max(1, section_bars), 6) * 0.6)
-        section_audio = (section_audio + fade_db).fade_out(
-            min(len(section_audio), bar_duration_ms)
+        section_audio = dsp.fade_out(
+            section_audio + fade_db,
+            min(len(section_audio), bar_duration_ms),
         )
 
     logger.debug(
@@ -1538,6 +1558,7 @@ def validate_frame_alignment(segment: AudioSegment, handler_name: str) -> AudioS
         raise ValueError(f"Invalid frame alignment after DSP handler: {handler_name}")
     return segment
 
+@render_timing.traced(lambda segment, move_type, *args, **kwargs: f"dsp:{move_type}", category="dsp")
 def _apply_producer_move_effect(
     segment: AudioSegment,
     move_type: str,
@@ -1554,36 +1575,30 @@ def _apply_producer_move_effect(
     if move_type == "enable_stem":
         boosted = segment + (2 + 3 * intensity)
         if "hats" in str(params.get("stems", "")).lower() or "fx" in str(params.get("stems", "")).lower():
-            boosted = boosted.overlay(segment.high_pass_filter(2500) + 3, gain_during_overlay=-2)
+            boosted = boosted.overlay(dsp.high_pass_filter(segment, 2500) + 3, gain_during_overlay=-2)
         return boosted
 
     if move_type == "drum_fill":
         fill_len = int(min(len(segment), bar_duration_ms * 0.55))
         fill_start = max(0, len(segment) - fill_len)
-        fill = segment[fill_start:].high_pass_filter(2300) + (4 + 3 * intensity)
+        fill = dsp.high_pass_filter(segment[fill_start:], 2300) + (4 + 3 * intensity)
         fill = _apply_headroom_ceiling(fill, -1.5)
         return segment[:fill_start] + fill
 
     if move_type == "snare_pickup":
         pickup_len = int(min(len(segment), bar_duration_ms * 0.4))
         pickup_start = max(0, len(segment) - pickup_len)
-        pickup = segment[pickup_start:].high_pass_filter(1800)
+        pickup = dsp.high_pass_filter(segment[pickup_start:], 1800)
         grid = max(20, pickup_len // 10)
-        rebuilt = AudioSegment.silent(duration=0)
-        for ms in range(0, len(pickup), grid):
-            chunk = pickup[ms: min(len(pickup), ms + grid)]
-            rebuilt += chunk + (5 if (ms // grid) % 2 == 0 else 1)
+        rebuilt = _alternating_chunk_gain(pickup, grid, 5, 1)
         result = segment[:pickup_start] + _apply_headroom_ceiling(rebuilt, -1.5)
         return result
 
     if move_type == "snare_roll":
         roll_len = int(min(len(segment), bar_duration_ms * 0.5))
-        roll = segment[max(0, len(segment) - roll_len):].high_pass_filter(1800)
+        roll = dsp.high_pass_filter(segment[max(0, len(segment) - roll_len):], 1800)
         grid = max(20, int(bar_duration_ms / (24 + int(10 * intensity))))
-        stutter = AudioSegment.silent(duration=0)
-        for ms in range(0, len(roll), grid):
-            chunk = roll[ms: min(len(roll), ms + grid)]
-            stutter += chunk + (4 if (ms // grid) % 2 == 0 else -2)
+        stutter = _alternating_chunk_gain(roll, grid, 4, -2)
         return segment[:max(0, len(segment) - roll_len)] + _apply_headroom_ceiling(stutter, -1.5)
 
     if move_type == "pre_hook_silence":
@@ -1603,21 +1618,21 @@ def _apply_producer_move_effect(
         # Strong subtractive entry cue: keep a short breath then very quiet tail.
         silence_ms = min(gap_ms // 2, int(bar_duration_ms * 0.12))
         if stem_available:
-            tail = source_tail.high_pass_filter(280) - 18
+            tail = dsp.high_pass_filter(source_tail, 280) - 18
         else:
-            tail = source_tail.low_pass_filter(1600) - 18
+            tail = dsp.low_pass_filter(source_tail, 1600) - 18
         return lead + AudioSegment.silent(duration=silence_ms) + tail[: max(0, gap_ms - silence_ms)]
 
     if move_type == "riser_fx":
         tail_len = int(min(len(segment), bar_duration_ms * 0.75))
         start = max(0, len(segment) - tail_len)
-        tail = segment[start:].high_pass_filter(250)
-        tail = tail.fade_in(max(1, tail_len // 3)) + (4 + 3 * intensity if stem_available else 2 + 3 * intensity)
+        tail = dsp.high_pass_filter(segment[start:], 250)
+        tail = dsp.fade_in(tail, max(1, tail_len // 3)) + (4 + 3 * intensity if stem_available else 2 + 3 * intensity)
         tail = _apply_headroom_ceiling(tail, -1.5)
         return segment[:start] + tail
 
     if move_type == "crash_hit":
-        hit = segment.high_pass_filter(2200) + (5 + 2 * intensity)
+        hit = dsp.high_pass_filter(segment, 2200) + (5 + 2 * intensity)
         hit = _apply_headroom_ceiling(hit, -1.5)
         hit_window = min(len(hit), int(bar_duration_ms * 0.2))
         if hit_window <= 0:
@@ -1627,7 +1642,7 @@ def _apply_producer_move_effect(
     if move_type == "reverse_cymbal":
         rev_len = int(min(len(segment), bar_duration_ms * 0.75))
         start = max(0, len(segment) - rev_len)
-        rev = segment[start:].reverse().high_pass_filter(1600) + (3 if stem_available else 1)
+        rev = dsp.high_pass_filter(segment[start:].reverse(), 1600) + (3 if stem_available else 1)
         return segment[:start] + rev
 
     if move_type == "drop_kick":
@@ -1638,7 +1653,7 @@ def _apply_producer_move_effect(
         pause_bars = float(params.get("pause_bars", 0.12) or 0.12)
         drop_len = int(min(len(segment), bar_duration_ms * max(0.05, pause_bars)))
         fade_ms = max(5, min(10, drop_len // 4))
-        tail = segment[drop_len:].fade_in(fade_ms) if len(segment) > drop_len + fade_ms else segment[drop_len:]
+        tail = dsp.fade_in(segment[drop_len:], fade_ms) if len(segment) > drop_len + fade_ms else segment[drop_len:]
         return AudioSegment.silent(duration=drop_len) + tail
 
     if move_type == "bass_pause":
@@ -1646,36 +1661,36 @@ def _apply_producer_move_effect(
         # sounding like dead air; attenuate instead of muting completely.
         pause_bars = min(0.12, float(params.get("pause_bars", 0.12) or 0.12))
         pause_len = int(min(len(segment), bar_duration_ms * max(0.05, pause_bars)))
-        head = segment[:pause_len].high_pass_filter(260) - (3 if stem_available else 2)
+        head = dsp.high_pass_filter(segment[:pause_len], 260) - (3 if stem_available else 2)
         return head + segment[pause_len:]
 
     if move_type == "disable_stem":
         reduced = segment - (4 + 4 * intensity)
         if any(x in str(params.get("stems", "")).lower() for x in ("kick", "bass")):
-            reduced = reduced.high_pass_filter(180)
+            reduced = dsp.high_pass_filter(reduced, 180)
         if any(x in str(params.get("stems", "")).lower() for x in ("hats", "snare")):
-            reduced = reduced.low_pass_filter(3500)
+            reduced = dsp.low_pass_filter(reduced, 3500)
         return reduced
 
     if move_type == "stem_gain_change":
         gain_db = float(params.get("gain_db", -3))
         shaped = segment + gain_db
         if gain_db < 0:
-            return shaped.low_pass_filter(5000)
-        return shaped.overlay(segment.high_pass_filter(2200), gain_during_overlay=-3)
+            return dsp.low_pass_filter(shaped, 5000)
+        return shaped.overlay(dsp.high_pass_filter(segment, 2200), gain_during_overlay=-3)
 
     if move_type == "stem_filter":
         filter_type = str(params.get("filter", "")).strip().lower()
         if filter_type == "lowpass":
             cutoff = int(params.get("cutoff_hz", 1400) or 1400)
-            return segment.low_pass_filter(cutoff)
+            return dsp.low_pass_filter(segment, cutoff)
         if filter_type == "highshelf":
             gain_db = float(params.get("gain_db", 4) or 4)
-            return segment.overlay(segment.high_pass_filter(2200) + gain_db, gain_during_overlay=-3)
+            return segment.overlay(dsp.high_pass_filter(segment, 2200) + gain_db, gain_during_overlay=-3)
         if filter_type == "bandpass":
             low_hz = int(params.get("low_hz", 200) or 200)
             high_hz = int(params.get("high_hz", 3000) or 3000)
-            return segment.high_pass_filter(low_hz).low_pass_filter(high_hz)
+            return dsp.band_pass_filter(segment, low_hz, high_hz)
 
     if move_type == "silence_drop":
         # Keep gap short (≤ 0.12 bars) so it sounds like a "breath" rather than broken audio.
@@ -1684,7 +1699,7 @@ def _apply_producer_move_effect(
         pause_bars = float(params.get("pause_bars", 0.06 + (0.06 * intensity)) or (0.06 + (0.06 * intensity)))
         gap_ms = int(min(len(segment), bar_duration_ms * max(0.04, min(0.12, pause_bars))))
         fade_ms = max(5, min(10, gap_ms // 4))
-        tail = segment[gap_ms:].fade_in(fade_ms) if len(segment) > gap_ms + fade_ms else segment[gap_ms:]
+        tail = dsp.fade_in(segment[gap_ms:], fade_ms) if len(segment) > gap_ms + fade_ms else segment[gap_ms:]
         return AudioSegment.silent(duration=gap_ms) + tail
 
     if move_type == "pre_hook_mute":
@@ -1699,24 +1714,20 @@ def _apply_producer_move_effect(
         fill = segment[fill_start:]
         fill_type = str(params.get("fill_type", "drum_fill")).strip().lower()
         if fill_type == "chop_fill":
-            chop = AudioSegment.silent(duration=0)
             grid = max(40, int(fill_len / 8))
-            for pos in range(0, len(fill), grid):
-                chunk = fill[pos: pos + grid]
-                chop += chunk + (4 if (pos // grid) % 2 == 0 else -3)
-            fill = chop
+            fill = _alternating_chunk_gain(fill, grid, 4, -3)
         else:
-            fill = fill.high_pass_filter(2400) + (4 + 2 * intensity)
+            fill = dsp.high_pass_filter(fill, 2400) + (4 + 2 * intensity)
         fill = _apply_headroom_ceiling(fill, -1.5)
         return segment[:fill_start] + fill
 
     if move_type == "texture_lift":
-        transient = segment.high_pass_filter(1700) + (2 + 2 * intensity)
+        transient = dsp.high_pass_filter(segment, 1700) + (2 + 2 * intensity)
         return segment.overlay(transient, gain_during_overlay=-3)
 
     if move_type == "hook_expansion":
         expanded = segment + (2 + 1.5 * intensity)
-        width = expanded.overlay(expanded.high_pass_filter(2500) + 2, gain_during_overlay=-3)
+        width = expanded.overlay(dsp.high_pass_filter(expanded, 2500) + 2, gain_during_overlay=-3)
         # Guard against clipping from the multi-layer overlay.
         peak = float(width.max_dBFS)
         if peak > -1.5:
@@ -1729,12 +1740,12 @@ def _apply_producer_move_effect(
         # applies a -2 dB cut and a second bridge_strip event may be injected by
         # ProducerMovesEngine — stacking two aggressive cuts made bridges nearly
         # inaudible and produced a jarring loud-to-quiet-to-loud cycle.
-        stripped = segment.high_pass_filter(60) - (1 + 1 * intensity)
+        stripped = dsp.high_pass_filter(segment, 60) - (1 + 1 * intensity)
         return stripped
 
     if move_type == "outro_strip":
-        strip = segment.low_pass_filter(11000) - (3 + 2 * intensity)
-        return strip.fade_out(min(len(strip), int(bar_duration_ms * 0.85)))
+        strip = dsp.low_pass_filter(segment, 11000) - (3 + 2 * intensity)
+        return dsp.fade_out(strip, min(len(strip), int(bar_duration_ms * 0.85)))
 
     if move_type == "pre_hook_drum_mute":
         # Attenuate rather than mute; cap at 0.08 bars to avoid dead air.
@@ -1749,45 +1760,38 @@ def _apply_producer_move_effect(
         gap_ms = int(min(len(segment), bar_duration_ms * (0.04 + 0.04 * intensity)))
         fade_ms = max(5, min(10, gap_ms // 4))
         tail = segment[gap_ms:] + (2 * intensity)
-        tail = tail.fade_in(fade_ms) if len(tail) > fade_ms else tail
+        tail = dsp.fade_in(tail, fade_ms) if len(tail) > fade_ms else tail
         return AudioSegment.silent(duration=gap_ms) + tail
 
     if move_type == "hat_density_variation":
-        top_band = segment.high_pass_filter(5500)
+        top_band = dsp.high_pass_filter(segment, 5500)
         grid = max(30, int(bar_duration_ms / (16 + int(8 * intensity))))
-        rolled = AudioSegment.silent(duration=0)
-        for ms in range(0, len(top_band), grid):
-            slice_end = min(len(top_band), ms + grid)
-            chunk = top_band[ms:slice_end]
-            if (ms // grid) % 2 == 0:
-                rolled += chunk + 5
-            else:
-                rolled += chunk - 2
+        rolled = _alternating_chunk_gain(top_band, grid, 5, -2)
         return segment.overlay(rolled, gain_during_overlay=-4)
 
     if move_type == "end_section_fill":
         fill_len = int(min(len(segment), bar_duration_ms * 0.5))
         fill_start = max(0, len(segment) - fill_len)
         fill = segment[fill_start:]
-        fill = fill.high_pass_filter(2500) + (4 + 3 * intensity)
+        fill = dsp.high_pass_filter(fill, 2500) + (4 + 3 * intensity)
         fill = _apply_headroom_ceiling(fill, -1.5)
         return segment[:fill_start] + fill
 
     if move_type == "verse_melody_reduction":
         if stem_available:
-            melody_band = segment.high_pass_filter(700).low_pass_filter(5000)
+            melody_band = dsp.band_pass_filter(segment, 700, 5000)
             return segment.overlay(melody_band - (10 + 5 * intensity), gain_during_overlay=0)
-        return segment.low_pass_filter(4200) - (2 + 2 * intensity)
+        return dsp.low_pass_filter(segment, 4200) - (2 + 2 * intensity)
 
     if move_type == "bridge_bass_removal":
         if stem_available:
-            return segment.high_pass_filter(220)
-        return segment.high_pass_filter(140) - 1
+            return dsp.high_pass_filter(segment, 220)
+        return dsp.high_pass_filter(segment, 140) - 1
 
     if move_type == "final_hook_expansion":
         expanded = segment + (3 + 2 * intensity)
-        bright = expanded.high_pass_filter(1800) + (2 + 2 * intensity)
-        body = expanded.low_pass_filter(250) + (1 + intensity)
+        bright = dsp.high_pass_filter(expanded, 1800) + (2 + 2 * intensity)
+        body = dsp.low_pass_filter(expanded, 250) + (1 + intensity)
         result = expanded.overlay(bright).overlay(body)
         # Guard against clipping from multiple overlay layers.
         peak = float(result.max_dBFS)
@@ -1797,8 +1801,8 @@ def _apply_producer_move_effect(
 
     if move_type == "outro_strip_down":
         # Gentle level reduction and a warm (not muffled) top-end roll-off.
-        stripped = segment.low_pass_filter(11000) - (3 + 2 * intensity)
-        return stripped.fade_out(min(len(stripped), int(bar_duration_ms * 0.8)))
+        stripped = dsp.low_pass_filter(segment, 11000) - (3 + 2 * intensity)
+        return dsp.fade_out(stripped, min(len(stripped), int(bar_duration_ms * 0.8)))
 
     if move_type == "call_response_variation":
         quarter = max(1, bar_duration_ms // 4)
@@ -1812,10 +1816,7 @@ def _apply_producer_move_effect(
         return validate_frame_alignment(result, move_type)
     if move_type == "rhythmic_gate":
         gate_ms = max(35, int(bar_duration_ms / (8 + int(8 * intensity))))
-        gated = AudioSegment.silent(duration=0)
-        for i in range(0, len(segment), gate_ms):
-            chunk = segment[i:i + gate_ms]
-            gated += chunk if (i // gate_ms) % 2 == 0 else (chunk - (10 + 6 * intensity))
+        gated = _alternating_chunk_gain(segment, gate_ms, 0.0, -(10 + 6 * intensity))
         result = _apply_headroom_ceiling(gated, -1.5)
         logger.info("DSP_HANDLER_COMPLETE move_type=%s", move_type)
         return validate_frame_alignment(result, move_type)
@@ -1823,13 +1824,13 @@ def _apply_producer_move_effect(
         dropout_ms = int(min(len(segment), bar_duration_ms))
         lead = segment[: max(0, len(segment) - dropout_ms)]
         tail = (segment[-dropout_ms:] if dropout_ms < len(segment) else segment) - (18 + 4 * intensity)
-        result = lead + tail.fade_in(max(5, min(20, dropout_ms // 20)))
+        result = lead + dsp.fade_in(tail, max(5, min(20, dropout_ms // 20)))
         logger.info("DSP_HANDLER_COMPLETE move_type=%s", move_type)
         return validate_frame_alignment(result, move_type)
     if move_type == "stereo_widen":
         return _apply_producer_move_effect(segment, "widen_role", intensity, stem_available, bar_duration_ms, params)
     if move_type == "transient_boost":
-        trans = segment.high_pass_filter(2400) + (3 + 3 * intensity)
+        trans = dsp.high_pass_filter(segment, 2400) + (3 + 3 * intensity)
         result = _apply_headroom_ceiling(segment.overlay(trans, gain_during_overlay=-5), -1.5)
         logger.info("DSP_HANDLER_COMPLETE move_type=%s", move_type)
         return validate_frame_alignment(result, move_type)
@@ -1875,7 +1876,7 @@ def _apply_producer_move_effect(
         # a section boundary.  Longer and more prominent than reverse_cymbal.
         rev_len = int(min(len(segment), bar_duration_ms))
         start = max(0, len(segment) - rev_len)
-        rev = segment[start:].reverse().high_pass_filter(800)
+        rev = dsp.high_pass_filter(segment[start:].reverse(), 800)
         rev = rev + (4 + 2 * intensity if stem_available else 2 + 2 * intensity)
         rev = _apply_headroom_ceiling(rev, -1.5)
         return segment[:start] + rev
@@ -1893,9 +1894,9 @@ def _apply_producer_move_effect(
         attenuated = tail - (14 + 4 * intensity)
         # Fade-out at end of lead and fade-in on attenuated tail to smooth the junction.
         if len(lead) >= fade_ms:
-            lead = lead[:-fade_ms] + lead[-fade_ms:].fade_out(fade_ms)
+            lead = lead[:-fade_ms] + dsp.fade_out(lead[-fade_ms:], fade_ms)
         if len(attenuated) >= fade_ms:
-            attenuated = attenuated[:fade_ms].fade_in(fade_ms) + attenuated[fade_ms:]
+            attenuated = dsp.fade_in(attenuated[:fade_ms], fade_ms) + attenuated[fade_ms:]
         return lead + attenuated
 
     if move_type == "subtractive_entry":
@@ -1903,7 +1904,7 @@ def _apply_producer_move_effect(
         # fades up.  Creates "energy release" feel at hook→verse or sparse→anything.
         fade_ms = min(len(segment), int(bar_duration_ms * (0.5 + 0.25 * (1 - intensity))))
         fade_ms = max(1, fade_ms)
-        fade_part = segment[:fade_ms].fade_in(max(1, fade_ms // 2))
+        fade_part = dsp.fade_in(segment[:fade_ms], max(1, fade_ms // 2))
         attenuation = max(0, 4.0 * (1.0 - intensity))
         fade_part = fade_part - attenuation
         return fade_part + segment[fade_ms:]
@@ -1914,7 +1915,7 @@ def _apply_producer_move_effect(
         # than crash_hit; targets the transient attack window only.
         accent_ms = min(len(segment), int(bar_duration_ms * 0.25))
         accent_ms = max(1, accent_ms)
-        accent = segment[:accent_ms].high_pass_filter(1800) + (5 + 3 * intensity)
+        accent = dsp.high_pass_filter(segment[:accent_ms], 1800) + (5 + 3 * intensity)
         accent = _apply_headroom_ceiling(accent, -1.5)
         return accent + segment[accent_ms:]
 
@@ -1942,7 +1943,7 @@ def _apply_producer_move_effect(
     if move_type == "filter_role":
         # Lowpass sweep — mirrors stem_filter lowpass.
         cutoff = max(400, int(3500 - 2500 * intensity))
-        return segment.low_pass_filter(cutoff)
+        return dsp.low_pass_filter(segment, cutoff)
 
     if move_type == "chop_role":
         # Rhythmic gate chop — mirrors fill_event with chop_fill.
@@ -1952,10 +1953,7 @@ def _apply_producer_move_effect(
         chop_len = int(min(len(segment), bar_duration_ms * 0.75))
         grid = max(40, int(bar_duration_ms / (8 + int(8 * intensity))))
         chop_seg = segment[-chop_len:] if chop_len < len(segment) else segment
-        chopped = AudioSegment.silent(duration=0)
-        for pos in range(0, len(chop_seg), grid):
-            chunk = chop_seg[pos: pos + grid]
-            chopped += chunk + (4 if (pos // grid) % 2 == 0 else -4)
+        chopped = _alternating_chunk_gain(chop_seg, grid, 4, -4)
         result = _apply_headroom_ceiling(chopped, -1.5)
         return segment[: len(segment) - len(result)] + result
 
@@ -1963,7 +1961,7 @@ def _apply_producer_move_effect(
         # Reverse tail — mirrors reverse_cymbal.
         rev_len = int(min(len(segment), bar_duration_ms * 0.75))
         start = max(0, len(segment) - rev_len)
-        rev = segment[start:].reverse().high_pass_filter(1600)
+        rev = dsp.high_pass_filter(segment[start:].reverse(), 1600)
         return segment[:start] + rev
 
     if move_type == "add_hat_roll":
@@ -1993,7 +1991,7 @@ def _apply_producer_move_effect(
         snap_len = int(min(len(segment), bar_duration_ms * 0.15))
         if snap_len <= 0:
             return segment
-        snap = segment[:snap_len].high_pass_filter(200) - 2
+        snap = dsp.high_pass_filter(segment[:snap_len], 200) - 2
         return snap + segment[snap_len:]
 
     if move_type == "add_fx_riser":
@@ -2021,13 +2019,13 @@ def _apply_producer_move_effect(
     if move_type == "fade_role":
         # Fade out then back in over the window.
         half = max(1, len(segment) // 2)
-        faded = segment[:half].fade_out(half) + segment[half:].fade_in(max(1, half // 2))
+        faded = dsp.fade_out(segment[:half], half) + dsp.fade_in(segment[half:], max(1, half // 2))
         return faded
 
     if move_type == "widen_role":
         # Gentle stereo widening — mirrors hook_expansion but lighter.
         widened = segment.overlay(
-            segment.high_pass_filter(3000) + (1 + 1.5 * intensity),
+            dsp.high_pass_filter(segment, 3000) + (1 + 1.5 * intensity),
             gain_during_overlay=-4,
         )
         return _apply_headroom_ceiling(widened, -1.5)
@@ -2050,7 +2048,7 @@ def _apply_producer_move_effect(
         tail_len = int(min(len(segment), bar_duration_ms * 0.5))
         if tail_len <= 0:
             return segment
-        tail = segment[-tail_len:].low_pass_filter(3000).fade_in(max(1, tail_len // 4))
+        tail = dsp.fade_in(dsp.low_pass_filter(segment[-tail_len:], 3000), max(1, tail_len // 4))
         tail = tail - (4 + 2 * (1 - intensity))
         padded = AudioSegment.silent(duration=len(segment) - tail_len) + tail
         result = segment.overlay(padded, gain_during_overlay=-3)
@@ -2538,6 +2536,683 @@ def _apply_producer_taste_decisions(
     return applied
 
 
+def _section_bar_span(section: dict) -> tuple[int, int]:
+    """Return ``(bar_start, bars)`` for a ProducerArrangement section."""
+    bar_start = int(section.get("bar_start", 0) or 0)
+    section_bars = int(section.get("bars", 0) or 0)
+    if section_bars <= 0:
+        bar_end_value = section.get("bar_end")
+        if bar_end_value is not None:
+            section_bars = max(1, int(bar_end_value) - bar_start)
+        else:
+            section_bars = 8
+    return bar_start, section_bars
+
+
+def _section_memo_key(
+    section: dict,
+    section_idx: int,
+    *,
+    source_key: str,
+    bar_duration_ms: int,
+    use_loop_variations: bool,
+    transitions: list,
+    all_variations: list | None,
+) -> str:
+    """Hash everything ``_render_producer_section`` reads for *section*.
+
+    Transitions and arrangement-level variations are narrowed to the ones that
+    can target this section, so variations that only differ elsewhere still
+    share it (see ``app.services.section_render_memo``).
+    """
+    section_name = section.get("name", f"Section {section_idx + 1}")
+    section_type = _normalize_section_type(section.get("section_type") or section.get("type") or "verse")
+    bar_start, section_bars = _section_bar_span(section)
+    bar_end = bar_start + section_bars
+    section_transitions = [
+        t for t in (transitions or [])
+        if t.get("bar_position") == bar_end
+        or t.get("from_section") == section_idx
+        or t.get("from_bar") == bar_end
+    ]
+    section_variations = []
+    if not section.get("variations") and isinstance(all_variations, list):
+        targets = {section_idx, section_name, section_type, str(section_idx)}
+        section_variations = [
+            v for v in all_variations
+            if v.get("section", v.get("section_index")) in targets
+        ]
+    payload = {
+        "section": section,
+        "section_idx": section_idx,
+        "source": source_key,
+        "bar_duration_ms": bar_duration_ms,
+        "use_loop_variations": use_loop_variations,
+        "transitions": section_transitions,
+        "variations": section_variations,
+        "dsp_backend": settings.dsp_backend,
+    }
+    blob = json.dumps(payload, sort_keys=True, default=str)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+@render_timing.traced(lambda section, section_idx, **kwargs: f"section:{section_idx}", category="section")
+def _render_producer_section(
+    section: dict,
+    section_idx: int,
+    *,
+    bar_duration_ms: int,
+    stems: dict[str, AudioSegment] | None,
+    loop_audio: AudioSegment,
+    loop_vars_ci: dict[str, AudioSegment],
+    use_loop_variations: bool,
+    transitions: list,
+    all_variations: list | None,
+) -> dict:
+    """Render one ProducerArrangement section up to (not including) the boundary passes.
+
+    The result depends only on the section's plan entry, the source audio and
+    the bar timing, so sections can be rendered in any order or in parallel
+    (see ``_render_sections_parallel``).  Loudness stabilisation against the
+    previous section and the crossfaded join are applied by the caller.
+
+    Returns a dict with ``section_audio`` plus the bookkeeping the caller needs
+    for the timeline.  *section* may be annotated in place (stem fallback flags).
+    """
+    use_stems = bool(stems)
+
+    section_name = section.get("name", f"Section {section_idx + 1}")
+    section_type = _normalize_section_type(section.get("section_type") or section.get("type") or "verse")
+    logger.info("PRODUCER_SECTION_RENDER index=%s name=%s type=%s", section_idx, section_name, section_type)
+    bar_start, section_bars = _section_bar_span(section)
+    bar_end = bar_start + section_bars
+    section_energy = float(section.get("energy_level", section.get("energy", 0.6)) or 0.6)
+
+    section_ms = section_bars * bar_duration_ms
+
+    # ==================================================================== 
+    # BUILD SECTION AUDIO - USE STEMS IF AVAILABLE
+    # ====================================================================
+
+    section_loop_variant = str(section.get("loop_variant") or "").strip().lower()
+    # Phrase-split tracking — populated when a distinct first/second stem
+    # split is actually executed.  Initialised here so the timeline_sections
+    # entry below is always well-defined regardless of render path.
+    _phrase_first_roles = []
+    _phrase_second_roles = []
+    _phrase_split_executed = False
+
+    if use_stems:
+        # STEM MODE: Mix only the stems specified in section instruments list
+        from app.services.stem_loader import map_instruments_to_stems
+
+        section_instruments = section.get("instruments", [])
+        enabled_stems = map_instruments_to_stems(section_instruments, stems)
+
+        if not enabled_stems:
+            logger.warning(
+                "LAST_RESORT_FALLBACK section='%s' type=%s: no stems matched instruments %s, "
+                "falling back to all available stems %s. "
+                "Fix by ensuring _apply_stem_primary_section_states assigns roles before render.",
+                section_name,
+                section_type,
+                section_instruments,
+                list(stems.keys()),
+            )
+            enabled_stems = stems
+            section["_stem_fallback_all"] = True
+            section["_stem_fallback_reason"] = "no_matching_stems_for_instruments"
+
+        logger.info(
+            "STEM_SECTION_RENDER section='%s' type=%s requested=%s active=%s full_mix_active=%s",
+            section_name,
+            section_type,
+            section_instruments,
+            list(enabled_stems.keys()),
+            "full_mix" in enabled_stems,
+        )
+
+        # ----------------------------------------------------------------
+        # PHRASE SPLIT: if a phrase_plan exists with distinct first/second
+        # stem sets, build each half from its own stem set.  This creates
+        # real audible intra-section movement.
+        # ----------------------------------------------------------------
+        phrase_plan = section.get("phrase_plan") if isinstance(section.get("phrase_plan"), dict) else None
+        _phrase_first_roles: list[str] = []
+        _phrase_second_roles: list[str] = []
+        _phrase_split_executed = False
+        if phrase_plan and section_bars > 4:
+            logger.info(
+                "PHRASE_HUMANIZATION_INVOKED section=%s section_idx=%s bars=%s split_bar=%s",
+                section_name,
+                section_idx,
+                section_bars,
+                int(phrase_plan.get("split_bar", section_bars // 2) or (section_bars // 2)),
+            )
+            split_bar = int(phrase_plan.get("split_bar", section_bars // 2) or (section_bars // 2))
+            split_bar = max(1, min(section_bars - 1, split_bar))
+            split_ms = split_bar * bar_duration_ms
+            remaining_bars = section_bars - split_bar
+
+            # First phrase stems
+            first_roles = phrase_plan.get("first_phrase_roles") or section_instruments
+            first_stems = map_instruments_to_stems(first_roles, stems) if first_roles else enabled_stems
+            if not first_stems:
+                first_stems = enabled_stems
+
+            # Second phrase stems
+            second_roles = phrase_plan.get("second_phrase_roles") or section_instruments
+            second_stems = map_instruments_to_stems(second_roles, stems) if second_roles else enabled_stems
+            if not second_stems:
+                second_stems = enabled_stems
+
+            # Only execute the split when the two stem sets actually differ.
+            # When first == second the phrase plan adds no audible contrast —
+            # building separate AudioSegments would be wasted work and would
+            # inflate phrase_split_count falsely.
+            if set(first_stems.keys()) != set(second_stems.keys()):
+                first_audio = _build_section_audio_from_stems(
+                    stems=first_stems,
+                    section_bars=split_bar,
+                    bar_duration_ms=bar_duration_ms,
+                    section_idx=section_idx,
+                )[:split_ms]
+
+                second_audio = _build_section_audio_from_stems(
+                    stems=second_stems,
+                    section_bars=remaining_bars,
+                    bar_duration_ms=bar_duration_ms,
+                    section_idx=section_idx + _PHRASE_SPLIT_SECTION_IDX_OFFSET,
+                )[:remaining_bars * bar_duration_ms]
+
+                section_audio = _crossfade_append(first_audio, second_audio)[:section_ms]
+                # Track both phrase role sets for diagnostics.
+                active_role_snapshot = list(dict.fromkeys(list(first_roles) + list(second_roles)))
+                _phrase_first_roles = list(first_stems.keys())
+                _phrase_second_roles = list(second_stems.keys())
+                _phrase_split_executed = True
+                logger.info(
+                    "PHRASE_SPLIT section='%s' split_bar=%d first=%s second=%s desc='%s'",
+                    section_name, split_bar, first_roles, second_roles,
+                    phrase_plan.get("description", ""),
+                )
+            else:
+                logger.debug(
+                    "PHRASE_SPLIT_SKIPPED section='%s' first_stems==second_stems=%s",
+                    section_name, list(first_stems.keys()),
+                )
+                section_audio = _build_section_audio_from_stems(
+                    stems=enabled_stems,
+                    section_bars=section_bars,
+                    bar_duration_ms=bar_duration_ms,
+                    section_idx=section_idx,
+                )[:section_ms]
+                active_role_snapshot = list(enabled_stems.keys())
+        else:
+            section_audio = _build_section_audio_from_stems(
+                stems=enabled_stems,
+                section_bars=section_bars,
+                bar_duration_ms=bar_duration_ms,
+                section_idx=section_idx,
+            )[:section_ms]
+            active_role_snapshot = list(enabled_stems.keys())
+
+        # ----------------------------------------------------------------
+        # END-OF-SECTION DROPOUT
+        # Apply the end_dropout_bars / end_dropout_roles spec from the
+        # phrase plan regardless of whether a phrase split was executed.
+        # This is how pre_hook creates "tension through absence" (drums
+        # muted in the last 1-2 bars before the hook) and how verso sections
+        # get a subtle build arc (atmospheric stem removed in last bar).
+        # The dropout is a post-build step: the full section audio is built
+        # first, then the tail segment is rebuilt without the dropout roles.
+        # ----------------------------------------------------------------
+        if phrase_plan:
+            _end_dropout_bars = int(phrase_plan.get("end_dropout_bars") or 0)
+            _end_dropout_roles = set(phrase_plan.get("end_dropout_roles") or [])
+            _dropout_has_effect = bool(
+                _end_dropout_bars > 0
+                and _end_dropout_roles
+                and section_bars > _end_dropout_bars
+                and any(r in enabled_stems for r in _end_dropout_roles)
+            )
+            if _dropout_has_effect:
+                _dropout_start_bar = section_bars - _end_dropout_bars
+                _dropout_start_ms = _dropout_start_bar * bar_duration_ms
+                _dropout_end_ms = len(section_audio)
+                _actual_dropout_bars = max(
+                    1,
+                    (_dropout_end_ms - _dropout_start_ms + bar_duration_ms - 1)
+                    // bar_duration_ms,
+                )
+                _remaining_stems = {
+                    k: v for k, v in enabled_stems.items()
+                    if k not in _end_dropout_roles
+                }
+                # _remaining_stems may be empty if every active stem was
+                # listed as a dropout role (e.g. a single-stem section where
+                # that one stem is the dropout target).  In that case we skip
+                # the dropout rather than produce deliberate silence — the
+                # section-type DSP (bridge_strip, outro_strip, etc.) already
+                # handles extreme sparsity for those edge cases.
+                if _remaining_stems:
+                    _dropout_segment = _build_section_audio_from_stems(
+                        stems=_remaining_stems,
+                        section_bars=_actual_dropout_bars,
+                        bar_duration_ms=bar_duration_ms,
+                        section_idx=section_idx,
+                    )[: _dropout_end_ms - _dropout_start_ms]
+                    section_audio = _crossfade_append(
+                        section_audio[:_dropout_start_ms], _dropout_segment
+                    )[:section_ms]
+                    logger.info(
+                        "END_DROPOUT section='%s' type=%s: muted %s in last %d bar(s)",
+                        section_name,
+                        section_type,
+                        sorted(_end_dropout_roles),
+                        _end_dropout_bars,
+                    )
+
+    elif use_loop_variations and section_loop_variant in loop_vars_ci:
+        variation_source = loop_vars_ci[section_loop_variant]
+        section_audio = _repeat_to_duration(variation_source, section_ms)
+
+        # Apply per-instance randomization to prevent repetitive sound
+        # Each time the same variant is used, apply subtle DSP variations
+        import hashlib
+        instance_seed = int(hashlib.md5(f"{section_name}_{section_idx}_{bar_start}".encode()).hexdigest()[:8], 16)
+        variation_intensity = (instance_seed % 100) / 100.0  # 0.0-1.0
+
+        # Subtle EQ variation (±2dB on different frequency bands)
+        eq_shift = -2 + (variation_intensity * 4)  # -2dB to +2dB
+        if instance_seed % 3 == 0:
+            section_audio = section_audio.low_pass_filter(8000) + eq_shift
+        elif instance_seed % 3 == 1:
+            section_audio = section_audio.high_pass_filter(120) + eq_shift
+        else:
+            section_audio = section_audio + eq_shift
+
+        # Apply subtle stereo width variation for non-intro sections
+        if section_type not in {"intro", "outro"} and section_audio.channels == 2:
+            if instance_seed % 4 == 0:
+                # Slightly wider
+                mono_channels = section_audio.split_to_mono()
+                left = mono_channels[0] + 1
+                right = mono_channels[1] + 1
+                section_audio = AudioSegment.from_mono_audiosegments(left, right)
+            elif instance_seed % 4 == 2:
+                # Slightly narrower (more mono)
+                section_audio = section_audio - 1
+
+        logger.info(
+            "  Section '%s' using loop variant '%s' with instance variation (seed=%d, intensity=%.2f)",
+            section_name,
+            section_loop_variant,
+            instance_seed,
+            variation_intensity,
+        )
+        active_role_snapshot = list(section.get("instruments") or section.get("active_stem_roles") or [])
+    else:
+        # STEREO FALLBACK MODE: Use full loop with DSP variation
+        section_audio = _build_varied_section_audio(
+            loop_audio=loop_audio,
+            section_bars=section_bars,
+            bar_duration_ms=bar_duration_ms,
+            section_idx=section_idx,
+            section_type=section_type,
+        )[:section_ms]
+        active_role_snapshot = list(section.get("instruments") or section.get("active_stem_roles") or [])
+
+    logger.info(
+        f"Processing section [{section_idx}] {section_name}: type={section_type} (raw={section.get('section_type') or section.get('type')}), bars={section_bars}, energy={section_energy}"
+    )
+
+    # ====================================================================
+    # DRAMATIC SECTION-SPECIFIC PROCESSING
+    # ====================================================================
+
+    pre_dsp_peak = float(section_audio.max_dBFS)
+    if section_type == "intro":
+        # INTRO: Gentle entry — moderate level reduction + soft LPF so stems remain audible
+        logger.info(f"Processing INTRO section: {section_name} (pre_dsp_peak={pre_dsp_peak:.1f} dBFS)")
+        section_audio = section_audio - 4   # -4 dB: stems already stripped to melody+pads
+        section_audio = section_audio.low_pass_filter(8000)  # Soft air-cut, keeps clarity
+        section_audio = section_audio.fade_in(min(4000, section_ms // 2))
+        logger.info(f"  INTRO post_dsp_peak={float(section_audio.max_dBFS):.1f} dBFS")
+
+    elif section_type in {"buildup", "build_up", "build"}:
+        # BUILDUP: Gradual volume increase, building tension
+        logger.info(f"Processing BUILDUP section: {section_name}")
+        # Create dramatic buildup by gradually increasing volume.
+        # Sub-segments are joined with crossfades to eliminate step-jump pops.
+        buildup_segments = []
+        num_segments = 4
+        segment_length = len(section_audio) // num_segments
+
+        for i in range(num_segments):
+            start_pos = i * segment_length
+            end_pos = start_pos + segment_length if i < num_segments - 1 else len(section_audio)
+            seg = section_audio[start_pos:end_pos]
+
+            # Progressive volume boost
+            boost = -8 + (i * 4)  # Goes from -8dB to +4dB
+            seg = seg + boost
+
+            # Apply high-pass filter that opens up as build progresses
+            cutoff_freq = 200 + (i * 150)  # 200Hz -> 650Hz
+            seg = seg.high_pass_filter(cutoff_freq)
+
+            buildup_segments.append(seg)
+
+        if buildup_segments:
+            section_audio = buildup_segments[0]
+            for bs in buildup_segments[1:]:
+                section_audio = _crossfade_append(section_audio, bs)
+
+    elif section_type in {"drop", "hook", "chorus"}:
+        # HOOK: Full energy, headroom-safe boost
+        logger.info(f"Processing HOOK section: {section_name} (pre_dsp_peak={pre_dsp_peak:.1f} dBFS)")
+        hook_evolution = section.get("hook_evolution") if isinstance(section.get("hook_evolution"), dict) else {}
+        hook_stage = str(hook_evolution.get("stage") or "hook1").strip().lower()
+        if hook_evolution:
+            logger.info(
+                "HOOK_ESCALATION_INVOKED section=%s section_idx=%s hook_stage=%s",
+                section_name,
+                section_idx,
+                hook_stage,
+            )
+
+        # Boost to near ceiling — do NOT exceed -1.5 dBFS to avoid post-mastering clip.
+        # hook1: standard boost (+3 dB).
+        # hook2: fuller (+4 dB) with a presence shelf to add perceived loudness/clarity.
+        # hook3: maximum (+5 dB) with presence shelf + sub-body layer for peak excitement.
+        # Each stage is intentionally 1 dB louder AND texturally different so the
+        # progression is audible even when the stem set has not changed.
+        boost_db = 3.0
+        if hook_stage == "hook2":
+            boost_db = 4.0
+            # Presence shelf: overlay a high-passed copy to lift perceived brightness
+            presence = section_audio.high_pass_filter(3000) + 1.5
+            section_audio = section_audio.overlay(presence, gain_during_overlay=-2)
+        elif hook_stage == "hook3":
+            boost_db = 5.0
+            # Full-spectrum enhancement: presence + sub-body layers
+            presence = section_audio.high_pass_filter(2500) + 2.0
+            body = section_audio.low_pass_filter(300) + 1.0
+            section_audio = section_audio.overlay(presence, gain_during_overlay=-2)
+            section_audio = section_audio.overlay(body, gain_during_overlay=-3)
+        section_audio = section_audio + boost_db
+        # Guard rail: never let this escape -1 dBFS before it hits mastering
+        section_audio = _apply_headroom_ceiling(section_audio, target_peak_dbfs=-1.5)
+        logger.info(f"  HOOK post_dsp_peak={float(section_audio.max_dBFS):.1f} dBFS (stage={hook_stage})")
+
+    elif section_type in {"pre_hook", "buildup", "build_up", "build"}:
+        logger.info(f"Processing PRE_HOOK section: {section_name} (pre_dsp_peak={pre_dsp_peak:.1f} dBFS)")
+        # Remove subsonic rumble; keep the full spectrum to preserve energy build.
+        section_audio = section_audio.high_pass_filter(60) + 1
+        # Tension tail: brief presence lift on the last bar to launch into the hook
+        pre_hook_tail = min(len(section_audio), int(bar_duration_ms))
+        if pre_hook_tail > 0:
+            lead = section_audio[:-pre_hook_tail]
+            tail = section_audio[-pre_hook_tail:] + 1
+            section_audio = lead + tail
+        logger.info(f"  PRE_HOOK post_dsp_peak={float(section_audio.max_dBFS):.1f} dBFS")
+
+    elif section_type in {"breakdown", "bridge"}:
+        # BREAKDOWN/BRIDGE: Stripped, atmospheric — moderate level reduction with
+        # gentle high-shelf cut to thin the energy.  The bridge_strip variation
+        # (injected by both _apply_stem_primary_section_states and
+        # ProducerMovesEngine) provides additional attenuation, so the DSP cut
+        # here is kept to -2 dB to avoid double-stacking into near-inaudible range.
+        logger.info(f"Processing BREAKDOWN section: {section_name} (pre_dsp_peak={pre_dsp_peak:.1f} dBFS)")
+        section_audio = section_audio - 2          # -2 dB: noticeable but still present
+        section_audio = section_audio.low_pass_filter(10000)  # Gentle air reduction only
+        section_audio = section_audio.high_pass_filter(60)    # Remove sub rumble
+        logger.info(f"  BREAKDOWN post_dsp_peak={float(section_audio.max_dBFS):.1f} dBFS")
+
+    elif section_type == "outro":
+        # OUTRO: Gentle strip-down — reduce level and warm the top end without
+        # sounding muffled.  Fade is applied to create a clean close.
+        logger.info(f"Processing OUTRO section: {section_name} (pre_dsp_peak={pre_dsp_peak:.1f} dBFS)")
+        section_audio = section_audio - 4           # Slightly quieter (-4 dB)
+        section_audio = section_audio.low_pass_filter(11000)  # Mild warmth; keeps clarity
+        section_audio = section_audio.fade_out(min(4000, section_ms // 2))
+        logger.info(f"  OUTRO post_dsp_peak={float(section_audio.max_dBFS):.1f} dBFS")
+
+    else:
+        # VERSE/STANDARD: Energy-based gain. Range: -5 dB (low energy) to 0 dB (high energy)
+        # Clamp to +0 to avoid verses ever adding headroom violations.
+        energy_db = max(-5.0, min(0.0, -5.0 + (section_energy * 5.0)))
+        logger.info(
+            f"Processing {section_type.upper()} section: {section_name} "
+            f"(pre_dsp_peak={pre_dsp_peak:.1f} dBFS energy={section_energy:.2f} gain={energy_db:+.1f}dB)"
+        )
+        section_audio = section_audio + energy_db
+        logger.info(f"  {section_type.upper()} post_dsp_peak={float(section_audio.max_dBFS):.1f} dBFS")
+
+    # ====================================================================
+    # APPLY VARIATIONS (FILLS, ROLLS, DROPS)
+    # ====================================================================
+    section_applied_events: list[str] = []
+    section_skipped_events: list[dict] = []
+
+    # stem_available drives DSP intensity in producer-move effects.
+    # Derive from the actual stems argument (use_stems), not only from render
+    # profile metadata — so that when real stems are passed the effects are
+    # at full strength even when metadata is missing.
+    stem_available = bool(use_stems)
+
+    variations = section.get("variations", [])
+    if not variations and isinstance(all_variations, list):
+        for variation in all_variations:
+            target_section = variation.get("section", variation.get("section_index"))
+            if isinstance(target_section, str) and target_section.isdigit():
+                target_section = int(target_section)
+            if target_section in {section_idx, section_name, section_type}:
+                variations.append(variation)
+    for variation in variations:
+        var_bar_start = int(
+            variation.get("bar_start", variation.get("start_bar", variation.get("bar", bar_start)))
+            or bar_start
+        )
+        var_length = variation.get("bars") or variation.get("duration_bars") or variation.get("length_bars")
+        if var_length is not None:
+            var_bar_end = var_bar_start + int(var_length)
+        else:
+            var_bar_end = int(variation.get("bar_end", var_bar_start + 1) or (var_bar_start + 1))
+        var_type = (variation.get("variation_type") or variation.get("type") or "none").strip().lower()
+        var_intensity = variation.get("intensity", 0.5)
+
+        # Calculate timing
+        var_start_ms = (var_bar_start - bar_start) * bar_duration_ms
+        var_end_ms = (var_bar_end - bar_start) * bar_duration_ms
+
+        logger.info("RUNTIME_EVENT_DISPATCHED section=%s action=%s bar=%d", section_name, var_type, var_bar_start)
+        # Apply variation effects
+        if var_end_ms > var_start_ms and var_start_ms >= 0 and var_end_ms <= len(section_audio):
+            variation_segment = section_audio[var_start_ms:var_end_ms]
+
+            if var_type in {"hats_roll", "fill", "hi_hat_stutter"}:
+                # Hat rolls and fills: modest boost kept under ceiling
+                variation_segment = variation_segment + 3
+            elif var_type in {"snare_fill", "drum_fill", "kick_fill"}:
+                # Snare fills: boost capped to prevent spike above section level
+                variation_segment = variation_segment + 4
+            elif var_type in {"bass_drop", "drop", "bass_glide"}:
+                # Drops: very brief dip then impact; keep gap short to avoid dead air
+                drop_gap = min(_DROP_GAP_MS, len(variation_segment) // 8)
+                variation_segment = AudioSegment.silent(duration=drop_gap) + variation_segment[drop_gap:] + 4
+            elif var_type == "reverse":
+                # Reverse effect
+                variation_segment = variation_segment.reverse()
+            elif var_type in _PRODUCER_MOVE_TYPES:
+                var_params = variation.get("params") if isinstance(variation.get("params"), dict) else {}
+                before = _segment_evidence(variation_segment)
+                variation_segment = _apply_producer_move_effect(
+                    segment=variation_segment,
+                    move_type=var_type,
+                    intensity=float(var_intensity or 0.7),
+                    stem_available=stem_available,
+                    bar_duration_ms=bar_duration_ms,
+                    params=var_params,
+                )
+                variation_segment = assert_audiosegment(variation_segment, f"variation:{var_type}")
+                variation_segment = validate_frame_alignment(variation_segment, var_type)
+                after = _segment_evidence(variation_segment)
+                section_applied_events.append(var_type)
+                logger.info("RUNTIME_EVENT_APPLIED section=%s action=%s", section_name, var_type)
+                logger.info("DSP_HANDLER_COMPLETE section=%s action=%s", section_name, var_type)
+                logger.info(
+                    "DSP_EVENT_RENDERED section=%s action=%s rms_delta=%.2f width_delta=%.4f hash_changed=%s",
+                    section_name,
+                    var_type,
+                    float(after["rms"]) - float(before["rms"]),
+                    float(after["stereo_width"]) - float(before["stereo_width"]),
+                    before["hash"] != after["hash"],
+                )
+                if before["hash"] != after["hash"]:
+                    logger.info("REAL_AUDIO_TRANSFORMATION_APPLIED section=%s action=%s", section_name, var_type)
+            else:
+                # Never silently drop unknown producer actions. Apply a safe,
+                # audible approximation and persist why.
+                reason = "approximated_to_texture_lift"
+                section_skipped_events.append({"action": var_type, "reason": reason, "bar": var_bar_start})
+                logger.warning("RUNTIME_EVENT_SKIPPED section=%s action=%s reason=%s", section_name, var_type, reason)
+                variation_segment = _apply_producer_move_effect(
+                    segment=variation_segment,
+                    move_type="texture_lift",
+                    intensity=float(var_intensity or 0.6),
+                    stem_available=stem_available,
+                    bar_duration_ms=bar_duration_ms,
+                    params={},
+                )
+                section_applied_events.append(var_type)
+                logger.info("RUNTIME_EVENT_APPLIED section=%s action=%s", section_name, var_type)
+
+            # Always cap variation segment level before splicing back to prevent spikes.
+            variation_segment = _apply_headroom_ceiling(variation_segment, target_peak_dbfs=-1.5)
+
+            # Splice back in
+            section_audio = section_audio[:var_start_ms] + variation_segment + section_audio[var_end_ms:]
+        else:
+            reason = "event_out_of_section_bounds"
+            section_skipped_events.append({"action": var_type, "reason": reason, "bar": var_bar_start})
+            logger.warning("RUNTIME_EVENT_SKIPPED section=%s action=%s reason=%s", section_name, var_type, reason)
+
+    section_boundary_events = section.get("boundary_events") if isinstance(section.get("boundary_events"), list) else []
+    for boundary_event in section_boundary_events:
+        event_type = str(boundary_event.get("type") or "").strip().lower()
+        event_bar = int(boundary_event.get("bar", bar_start) or bar_start)
+        logger.info("RUNTIME_EVENT_DISPATCHED section=%s action=%s bar=%d", section_name, event_type, event_bar)
+        relative_bar = max(0, min(section_bars - 1, event_bar - bar_start))
+        placement = str(boundary_event.get("placement") or "end_of_section").strip().lower()
+        intensity = float(boundary_event.get("intensity", 0.7) or 0.7)
+        params = boundary_event.get("params") if isinstance(boundary_event.get("params"), dict) else {}
+
+        if placement in {"on_downbeat", "start_of_section"}:
+            # Both placements target the very first bar of the section so that
+            # entry accents (crash_hit, re_entry_accent, subtractive_entry) are
+            # audible at the opening downbeat rather than misplaced at the tail.
+            event_start_ms = 0
+            event_end_ms = min(len(section_audio), bar_duration_ms)
+        elif placement == "mid_section":
+            event_start_ms = max(0, relative_bar * bar_duration_ms)
+            event_end_ms = min(len(section_audio), event_start_ms + bar_duration_ms)
+        else:
+            event_end_ms = len(section_audio)
+            event_start_ms = max(0, event_end_ms - bar_duration_ms)
+
+        if event_end_ms <= event_start_ms:
+            reason = "invalid_boundary_window"
+            section_skipped_events.append({"action": event_type, "reason": reason, "bar": event_bar})
+            logger.warning("RUNTIME_EVENT_SKIPPED section=%s action=%s reason=%s", section_name, event_type, reason)
+            continue
+
+        boundary_segment = section_audio[event_start_ms:event_end_ms]
+        boundary_segment = _apply_producer_move_effect(
+            segment=boundary_segment,
+            move_type=event_type,
+            intensity=intensity,
+            stem_available=stem_available,
+            bar_duration_ms=bar_duration_ms,
+            params=params,
+        )
+        # Cap boundary segment level before splicing back — same ceiling applied to
+        # variation segments — to prevent stacking of multiple boundary effects
+        # (e.g. crash_hit + re_entry_accent on the same bar) from causing clipping.
+        boundary_segment = _apply_headroom_ceiling(boundary_segment, target_peak_dbfs=-1.5)
+        section_applied_events.append(event_type)
+        logger.info("RUNTIME_EVENT_APPLIED section=%s action=%s", section_name, event_type)
+        section_audio = section_audio[:event_start_ms] + boundary_segment + section_audio[event_end_ms:]
+
+    # ====================================================================
+    # APPLY TRANSITIONS BETWEEN SECTIONS
+    # ====================================================================
+
+    transition_info = next(
+        (
+            t for t in transitions
+            if t.get("bar_position") == bar_end
+            or t.get("from_section") == section_idx
+            or t.get("from_bar") == bar_end
+        ),
+        None,
+    )
+    if transition_info:
+        trans_type = (transition_info.get("transition_type") or transition_info.get("type") or "none").strip().lower()
+        trans_duration_bars = int(transition_info.get("duration_bars", transition_info.get("bars", 0)) or 0)
+        trans_duration_ms = trans_duration_bars * bar_duration_ms
+
+        if trans_duration_ms > 0 and trans_duration_ms <= len(section_audio):
+            if trans_type in {"sweep", "filter_sweep", "crossfade"}:
+                # Filter sweep: fade out highs
+                sweep_start = max(0, len(section_audio) - trans_duration_ms)
+                pre_sweep = section_audio[:sweep_start]
+                sweep_part = section_audio[sweep_start:]
+                sweep_part = sweep_part.low_pass_filter(500).fade_out(len(sweep_part))
+                section_audio = pre_sweep + sweep_part
+
+            elif trans_type in {"riser", "build", "drum_fill"}:
+                # Riser: dramatic volume increase
+                riser_start = max(0, len(section_audio) - trans_duration_ms)
+                pre_riser = section_audio[:riser_start]
+                riser_part = section_audio[riser_start:]
+                # Create riser effect with volume automation; cap to prevent spike
+                riser_part = _apply_headroom_ceiling(riser_part + 4, -1.5)
+                riser_part = riser_part.high_pass_filter(300)  # Filter lows
+                section_audio = pre_riser + riser_part
+
+            elif trans_type == "impact" or trans_type == "hit":
+                # Impact: silence then hit
+                impact_gap = min(500, trans_duration_ms)
+                section_audio = section_audio[:-impact_gap] + AudioSegment.silent(duration=impact_gap)
+            section_applied_events.append(f"transition:{trans_type}")
+            logger.info(
+                "TRANSITION_OVERLAP_INVOKED section=%s section_idx=%s transition_type=%s",
+                section_name,
+                section_idx,
+                trans_type,
+            )
+
+    return {
+        "section_audio": section_audio,
+        "section_name": section_name,
+        "section_type": section_type,
+        "bar_start": bar_start,
+        "bar_end": bar_end,
+        "section_bars": section_bars,
+        "section_energy": section_energy,
+        "section_loop_variant": section_loop_variant,
+        "active_role_snapshot": active_role_snapshot,
+        "section_applied_events": section_applied_events,
+        "section_skipped_events": section_skipped_events,
+        "transition_info": transition_info,
+        "phrase_first_roles": _phrase_first_roles,
+        "phrase_second_roles": _phrase_second_roles,
+        "phrase_split_executed": _phrase_split_executed,
+    }
+
+
 def _render_producer_arrangement(
     loop_audio: AudioSegment,
     producer_arrangement: dict,
@@ -2609,7 +3284,10 @@ def _render_producer_arrangement(
     )
     
     bar_duration_ms = int((60.0 / bpm) * 4.0 * 1000)
-    arranged = AudioSegment.silent(duration=0)
+    # Sections are written into one preallocated frame buffer (sized on the
+    # first section from total_bars) and encoded once after the loop, instead
+    # of re-copying the whole mix on every crossfaded join.
+    arranged_buffer: dsp.RenderBuffer | None = None
 
     # Build a case-insensitive lookup for loop_variations.  Sub-variant keys
     # are generated with uppercase suffixes (e.g. "hook_A", "verse_B") but
@@ -2626,6 +3304,9 @@ def _render_producer_arrangement(
     previous_section_context: dict | None = None
     previous_section_audio: AudioSegment | None = None
     
+    # Producer taste decisions only read neighbouring section types, so they are
+    # applied up front; each section then renders independently and the
+    # cross-section passes run in order below.
     for section_idx, section in enumerate(sections):
         prev_section = sections[section_idx - 1] if section_idx > 0 else None
         next_section = sections[section_idx + 1] if section_idx + 1 < len(sections) else None
@@ -2638,585 +3319,95 @@ def _render_producer_arrangement(
         for tag in sorted(set(decision_tags)):
             logger.info("PRODUCER_DECISION_APPLIED section=%s decision=%s", section_idx, tag)
 
-        section_name = section.get("name", f"Section {section_idx + 1}")
-        section_type = _normalize_section_type(section.get("section_type") or section.get("type") or "verse")
-        logger.info("PRODUCER_SECTION_RENDER index=%s name=%s type=%s", section_idx, section_name, section_type)
-        bar_start = int(section.get("bar_start", 0) or 0)
-        section_bars = int(section.get("bars", 0) or 0)
-        if section_bars <= 0:
-            bar_end_value = section.get("bar_end")
-            if bar_end_value is not None:
-                section_bars = max(1, int(bar_end_value) - bar_start)
-            else:
-                section_bars = 8
-        bar_end = bar_start + section_bars
-        section_energy = float(section.get("energy_level", section.get("energy", 0.6)) or 0.6)
-        
-        section_ms = section_bars * bar_duration_ms
-        
-        # ==================================================================== 
-        # BUILD SECTION AUDIO - USE STEMS IF AVAILABLE
-        # ====================================================================
-        
-        section_loop_variant = str(section.get("loop_variant") or "").strip().lower()
-        # Phrase-split tracking — populated when a distinct first/second stem
-        # split is actually executed.  Initialised here so the timeline_sections
-        # entry below is always well-defined regardless of render path.
-        _phrase_first_roles = []
-        _phrase_second_roles = []
-        _phrase_split_executed = False
-
-        if use_stems:
-            # STEM MODE: Mix only the stems specified in section instruments list
-            from app.services.stem_loader import map_instruments_to_stems
-
-            section_instruments = section.get("instruments", [])
-            enabled_stems = map_instruments_to_stems(section_instruments, stems)
-
-            if not enabled_stems:
-                logger.warning(
-                    "LAST_RESORT_FALLBACK section='%s' type=%s: no stems matched instruments %s, "
-                    "falling back to all available stems %s. "
-                    "Fix by ensuring _apply_stem_primary_section_states assigns roles before render.",
-                    section_name,
-                    section_type,
-                    section_instruments,
-                    list(stems.keys()),
-                )
-                enabled_stems = stems
-                section["_stem_fallback_all"] = True
-                section["_stem_fallback_reason"] = "no_matching_stems_for_instruments"
-
-            logger.info(
-                "STEM_SECTION_RENDER section='%s' type=%s requested=%s active=%s full_mix_active=%s",
-                section_name,
-                section_type,
-                section_instruments,
-                list(enabled_stems.keys()),
-                "full_mix" in enabled_stems,
-            )
-
-            # ----------------------------------------------------------------
-            # PHRASE SPLIT: if a phrase_plan exists with distinct first/second
-            # stem sets, build each half from its own stem set.  This creates
-            # real audible intra-section movement.
-            # ----------------------------------------------------------------
-            phrase_plan = section.get("phrase_plan") if isinstance(section.get("phrase_plan"), dict) else None
-            _phrase_first_roles: list[str] = []
-            _phrase_second_roles: list[str] = []
-            _phrase_split_executed = False
-            if phrase_plan and section_bars > 4:
-                logger.info(
-                    "PHRASE_HUMANIZATION_INVOKED section=%s section_idx=%s bars=%s split_bar=%s",
-                    section_name,
-                    section_idx,
-                    section_bars,
-                    int(phrase_plan.get("split_bar", section_bars // 2) or (section_bars // 2)),
-                )
-                split_bar = int(phrase_plan.get("split_bar", section_bars // 2) or (section_bars // 2))
-                split_bar = max(1, min(section_bars - 1, split_bar))
-                split_ms = split_bar * bar_duration_ms
-                remaining_bars = section_bars - split_bar
-
-                # First phrase stems
-                first_roles = phrase_plan.get("first_phrase_roles") or section_instruments
-                first_stems = map_instruments_to_stems(first_roles, stems) if first_roles else enabled_stems
-                if not first_stems:
-                    first_stems = enabled_stems
-
-                # Second phrase stems
-                second_roles = phrase_plan.get("second_phrase_roles") or section_instruments
-                second_stems = map_instruments_to_stems(second_roles, stems) if second_roles else enabled_stems
-                if not second_stems:
-                    second_stems = enabled_stems
-
-                # Only execute the split when the two stem sets actually differ.
-                # When first == second the phrase plan adds no audible contrast —
-                # building separate AudioSegments would be wasted work and would
-                # inflate phrase_split_count falsely.
-                if set(first_stems.keys()) != set(second_stems.keys()):
-                    first_audio = _build_section_audio_from_stems(
-                        stems=first_stems,
-                        section_bars=split_bar,
-                        bar_duration_ms=bar_duration_ms,
-                        section_idx=section_idx,
-                    )[:split_ms]
-
-                    second_audio = _build_section_audio_from_stems(
-                        stems=second_stems,
-                        section_bars=remaining_bars,
-                        bar_duration_ms=bar_duration_ms,
-                        section_idx=section_idx + _PHRASE_SPLIT_SECTION_IDX_OFFSET,
-                    )[:remaining_bars * bar_duration_ms]
-
-                    section_audio = _crossfade_append(first_audio, second_audio)[:section_ms]
-                    # Track both phrase role sets for diagnostics.
-                    active_role_snapshot = list(dict.fromkeys(list(first_roles) + list(second_roles)))
-                    _phrase_first_roles = list(first_stems.keys())
-                    _phrase_second_roles = list(second_stems.keys())
-                    _phrase_split_executed = True
-                    logger.info(
-                        "PHRASE_SPLIT section='%s' split_bar=%d first=%s second=%s desc='%s'",
-                        section_name, split_bar, first_roles, second_roles,
-                        phrase_plan.get("description", ""),
-                    )
-                else:
-                    logger.debug(
-                        "PHRASE_SPLIT_SKIPPED section='%s' first_stems==second_stems=%s",
-                        section_name, list(first_stems.keys()),
-                    )
-                    section_audio = _build_section_audio_from_stems(
-                        stems=enabled_stems,
-                        section_bars=section_bars,
-                        bar_duration_ms=bar_duration_ms,
-                        section_idx=section_idx,
-                    )[:section_ms]
-                    active_role_snapshot = list(enabled_stems.keys())
-            else:
-                section_audio = _build_section_audio_from_stems(
-                    stems=enabled_stems,
-                    section_bars=section_bars,
-                    bar_duration_ms=bar_duration_ms,
-                    section_idx=section_idx,
-                )[:section_ms]
-                active_role_snapshot = list(enabled_stems.keys())
-
-            # ----------------------------------------------------------------
-            # END-OF-SECTION DROPOUT
-            # Apply the end_dropout_bars / end_dropout_roles spec from the
-            # phrase plan regardless of whether a phrase split was executed.
-            # This is how pre_hook creates "tension through absence" (drums
-            # muted in the last 1-2 bars before the hook) and how verso sections
-            # get a subtle build arc (atmospheric stem removed in last bar).
-            # The dropout is a post-build step: the full section audio is built
-            # first, then the tail segment is rebuilt without the dropout roles.
-            # ----------------------------------------------------------------
-            if phrase_plan:
-                _end_dropout_bars = int(phrase_plan.get("end_dropout_bars") or 0)
-                _end_dropout_roles = set(phrase_plan.get("end_dropout_roles") or [])
-                _dropout_has_effect = bool(
-                    _end_dropout_bars > 0
-                    and _end_dropout_roles
-                    and section_bars > _end_dropout_bars
-                    and any(r in enabled_stems for r in _end_dropout_roles)
-                )
-                if _dropout_has_effect:
-                    _dropout_start_bar = section_bars - _end_dropout_bars
-                    _dropout_start_ms = _dropout_start_bar * bar_duration_ms
-                    _dropout_end_ms = len(section_audio)
-                    _actual_dropout_bars = max(
-                        1,
-                        (_dropout_end_ms - _dropout_start_ms + bar_duration_ms - 1)
-                        // bar_duration_ms,
-                    )
-                    _remaining_stems = {
-                        k: v for k, v in enabled_stems.items()
-                        if k not in _end_dropout_roles
-                    }
-                    # _remaining_stems may be empty if every active stem was
-                    # listed as a dropout role (e.g. a single-stem section where
-                    # that one stem is the dropout target).  In that case we skip
-                    # the dropout rather than produce deliberate silence — the
-                    # section-type DSP (bridge_strip, outro_strip, etc.) already
-                    # handles extreme sparsity for those edge cases.
-                    if _remaining_stems:
-                        _dropout_segment = _build_section_audio_from_stems(
-                            stems=_remaining_stems,
-                            section_bars=_actual_dropout_bars,
-                            bar_duration_ms=bar_duration_ms,
-                            section_idx=section_idx,
-                        )[: _dropout_end_ms - _dropout_start_ms]
-                        section_audio = _crossfade_append(
-                            section_audio[:_dropout_start_ms], _dropout_segment
-                        )[:section_ms]
-                        logger.info(
-                            "END_DROPOUT section='%s' type=%s: muted %s in last %d bar(s)",
-                            section_name,
-                            section_type,
-                            sorted(_end_dropout_roles),
-                            _end_dropout_bars,
-                        )
-
-        elif use_loop_variations and section_loop_variant in _loop_vars_ci:
-            variation_source = _loop_vars_ci[section_loop_variant]
-            section_audio = _repeat_to_duration(variation_source, section_ms)
-            
-            # Apply per-instance randomization to prevent repetitive sound
-            # Each time the same variant is used, apply subtle DSP variations
-            import hashlib
-            instance_seed = int(hashlib.md5(f"{section_name}_{section_idx}_{bar_start}".encode()).hexdigest()[:8], 16)
-            variation_intensity = (instance_seed % 100) / 100.0  # 0.0-1.0
-            
-            # Subtle EQ variation (±2dB on different frequency bands)
-            eq_shift = -2 + (variation_intensity * 4)  # -2dB to +2dB
-            if instance_seed % 3 == 0:
-                section_audio = section_audio.low_pass_filter(8000) + eq_shift
-            elif instance_seed % 3 == 1:
-                section_audio = section_audio.high_pass_filter(120) + eq_shift
-            else:
-                section_audio = section_audio + eq_shift
-            
-            # Apply subtle stereo width variation for non-intro sections
-            if section_type not in {"intro", "outro"} and section_audio.channels == 2:
-                if instance_seed % 4 == 0:
-                    # Slightly wider
-                    mono_channels = section_audio.split_to_mono()
-                    left = mono_channels[0] + 1
-                    right = mono_channels[1] + 1
-                    section_audio = AudioSegment.from_mono_audiosegments(left, right)
-                elif instance_seed % 4 == 2:
-                    # Slightly narrower (more mono)
-                    section_audio = section_audio - 1
-            
-            logger.info(
-                "  Section '%s' using loop variant '%s' with instance variation (seed=%d, intensity=%.2f)",
-                section_name,
-                section_loop_variant,
-                instance_seed,
-                variation_intensity,
-            )
-            active_role_snapshot = list(section.get("instruments") or section.get("active_stem_roles") or [])
-        else:
-            # STEREO FALLBACK MODE: Use full loop with DSP variation
-            section_audio = _build_varied_section_audio(
-                loop_audio=loop_audio,
-                section_bars=section_bars,
-                bar_duration_ms=bar_duration_ms,
-                section_idx=section_idx,
-                section_type=section_type,
-            )[:section_ms]
-            active_role_snapshot = list(section.get("instruments") or section.get("active_stem_roles") or [])
-        
-        logger.info(
-            f"Processing section [{section_idx}] {section_name}: type={section_type} (raw={section.get('section_type') or section.get('type')}), bars={section_bars}, energy={section_energy}"
+    section_context = {
+        "bar_duration_ms": bar_duration_ms,
+        "use_loop_variations": use_loop_variations,
+        "transitions": transitions,
+        "all_variations": producer_arrangement.get("all_variations"),
+    }
+    # Sections already rendered by an earlier job from the same source audio
+    # are served from the section memo; only the rest are rendered.
+    section_memo = get_section_render_memo()
+    memo_keys: list[str | None] = [None] * len(sections)
+    rendered: list[dict | None] = [None] * len(sections)
+    if section_memo is not None:
+        source_key = source_fingerprint(
+            stems if use_stems else None,
+            loop_audio,
+            _loop_vars_ci if use_loop_variations else None,
         )
-        
-        # ====================================================================
-        # DRAMATIC SECTION-SPECIFIC PROCESSING
-        # ====================================================================
-        
-        pre_dsp_peak = float(section_audio.max_dBFS)
-        if section_type == "intro":
-            # INTRO: Gentle entry — moderate level reduction + soft LPF so stems remain audible
-            logger.info(f"Processing INTRO section: {section_name} (pre_dsp_peak={pre_dsp_peak:.1f} dBFS)")
-            section_audio = section_audio - 4   # -4 dB: stems already stripped to melody+pads
-            section_audio = section_audio.low_pass_filter(8000)  # Soft air-cut, keeps clarity
-            section_audio = section_audio.fade_in(min(4000, section_ms // 2))
-            logger.info(f"  INTRO post_dsp_peak={float(section_audio.max_dBFS):.1f} dBFS")
-            
-        elif section_type in {"buildup", "build_up", "build"}:
-            # BUILDUP: Gradual volume increase, building tension
-            logger.info(f"Processing BUILDUP section: {section_name}")
-            # Create dramatic buildup by gradually increasing volume.
-            # Sub-segments are joined with crossfades to eliminate step-jump pops.
-            buildup_segments = []
-            num_segments = 4
-            segment_length = len(section_audio) // num_segments
-            
-            for i in range(num_segments):
-                start_pos = i * segment_length
-                end_pos = start_pos + segment_length if i < num_segments - 1 else len(section_audio)
-                seg = section_audio[start_pos:end_pos]
-                
-                # Progressive volume boost
-                boost = -8 + (i * 4)  # Goes from -8dB to +4dB
-                seg = seg + boost
-                
-                # Apply high-pass filter that opens up as build progresses
-                cutoff_freq = 200 + (i * 150)  # 200Hz -> 650Hz
-                seg = seg.high_pass_filter(cutoff_freq)
-                
-                buildup_segments.append(seg)
-            
-            if buildup_segments:
-                section_audio = buildup_segments[0]
-                for bs in buildup_segments[1:]:
-                    section_audio = _crossfade_append(section_audio, bs)
-            
-        elif section_type in {"drop", "hook", "chorus"}:
-            # HOOK: Full energy, headroom-safe boost
-            logger.info(f"Processing HOOK section: {section_name} (pre_dsp_peak={pre_dsp_peak:.1f} dBFS)")
-            hook_evolution = section.get("hook_evolution") if isinstance(section.get("hook_evolution"), dict) else {}
-            hook_stage = str(hook_evolution.get("stage") or "hook1").strip().lower()
-            if hook_evolution:
-                logger.info(
-                    "HOOK_ESCALATION_INVOKED section=%s section_idx=%s hook_stage=%s",
-                    section_name,
-                    section_idx,
-                    hook_stage,
-                )
+        for section_idx, section in enumerate(sections):
+            memo_keys[section_idx] = _section_memo_key(section, section_idx, source_key=source_key, **section_context)
+            memo_hit = section_memo.get(memo_keys[section_idx])
+            if memo_hit is not None:
+                rendered[section_idx], annotated = memo_hit
+                section.update(annotated)
+    pending = [section_idx for section_idx, result in enumerate(rendered) if result is None]
 
-            # Boost to near ceiling — do NOT exceed -1.5 dBFS to avoid post-mastering clip.
-            # hook1: standard boost (+3 dB).
-            # hook2: fuller (+4 dB) with a presence shelf to add perceived loudness/clarity.
-            # hook3: maximum (+5 dB) with presence shelf + sub-body layer for peak excitement.
-            # Each stage is intentionally 1 dB louder AND texturally different so the
-            # progression is audible even when the stem set has not changed.
-            boost_db = 3.0
-            if hook_stage == "hook2":
-                boost_db = 4.0
-                # Presence shelf: overlay a high-passed copy to lift perceived brightness
-                presence = section_audio.high_pass_filter(3000) + 1.5
-                section_audio = section_audio.overlay(presence, gain_during_overlay=-2)
-            elif hook_stage == "hook3":
-                boost_db = 5.0
-                # Full-spectrum enhancement: presence + sub-body layers
-                presence = section_audio.high_pass_filter(2500) + 2.0
-                body = section_audio.low_pass_filter(300) + 1.0
-                section_audio = section_audio.overlay(presence, gain_during_overlay=-2)
-                section_audio = section_audio.overlay(body, gain_during_overlay=-3)
-            section_audio = section_audio + boost_db
-            # Guard rail: never let this escape -1 dBFS before it hits mastering
-            section_audio = _apply_headroom_ceiling(section_audio, target_peak_dbfs=-1.5)
-            logger.info(f"  HOOK post_dsp_peak={float(section_audio.max_dBFS):.1f} dBFS (stage={hook_stage})")
-
-        elif section_type in {"pre_hook", "buildup", "build_up", "build"}:
-            logger.info(f"Processing PRE_HOOK section: {section_name} (pre_dsp_peak={pre_dsp_peak:.1f} dBFS)")
-            # Remove subsonic rumble; keep the full spectrum to preserve energy build.
-            section_audio = section_audio.high_pass_filter(60) + 1
-            # Tension tail: brief presence lift on the last bar to launch into the hook
-            pre_hook_tail = min(len(section_audio), int(bar_duration_ms))
-            if pre_hook_tail > 0:
-                lead = section_audio[:-pre_hook_tail]
-                tail = section_audio[-pre_hook_tail:] + 1
-                section_audio = lead + tail
-            logger.info(f"  PRE_HOOK post_dsp_peak={float(section_audio.max_dBFS):.1f} dBFS")
-            
-        elif section_type in {"breakdown", "bridge"}:
-            # BREAKDOWN/BRIDGE: Stripped, atmospheric — moderate level reduction with
-            # gentle high-shelf cut to thin the energy.  The bridge_strip variation
-            # (injected by both _apply_stem_primary_section_states and
-            # ProducerMovesEngine) provides additional attenuation, so the DSP cut
-            # here is kept to -2 dB to avoid double-stacking into near-inaudible range.
-            logger.info(f"Processing BREAKDOWN section: {section_name} (pre_dsp_peak={pre_dsp_peak:.1f} dBFS)")
-            section_audio = section_audio - 2          # -2 dB: noticeable but still present
-            section_audio = section_audio.low_pass_filter(10000)  # Gentle air reduction only
-            section_audio = section_audio.high_pass_filter(60)    # Remove sub rumble
-            logger.info(f"  BREAKDOWN post_dsp_peak={float(section_audio.max_dBFS):.1f} dBFS")
-                
-        elif section_type == "outro":
-            # OUTRO: Gentle strip-down — reduce level and warm the top end without
-            # sounding muffled.  Fade is applied to create a clean close.
-            logger.info(f"Processing OUTRO section: {section_name} (pre_dsp_peak={pre_dsp_peak:.1f} dBFS)")
-            section_audio = section_audio - 4           # Slightly quieter (-4 dB)
-            section_audio = section_audio.low_pass_filter(11000)  # Mild warmth; keeps clarity
-            section_audio = section_audio.fade_out(min(4000, section_ms // 2))
-            logger.info(f"  OUTRO post_dsp_peak={float(section_audio.max_dBFS):.1f} dBFS")
+    fresh: list[dict] | None = None
+    if settings.render_parallel_sections and len(pending) > 1:
+        from app.services.section_render_pool import render_sections_parallel
 
-        else:
-            # VERSE/STANDARD: Energy-based gain. Range: -5 dB (low energy) to 0 dB (high energy)
-            # Clamp to +0 to avoid verses ever adding headroom violations.
-            energy_db = max(-5.0, min(0.0, -5.0 + (section_energy * 5.0)))
-            logger.info(
-                f"Processing {section_type.upper()} section: {section_name} "
-                f"(pre_dsp_peak={pre_dsp_peak:.1f} dBFS energy={section_energy:.2f} gain={energy_db:+.1f}dB)"
+        try:
+            fresh = render_sections_parallel(
+                [sections[section_idx] for section_idx in pending],
+                indices=pending,
+                stems=stems if use_stems else None,
+                loop_audio=loop_audio,
+                loop_vars_ci=_loop_vars_ci,
+                **section_context,
             )
-            section_audio = section_audio + energy_db
-            logger.info(f"  {section_type.upper()} post_dsp_peak={float(section_audio.max_dBFS):.1f} dBFS")
-        
-        # ====================================================================
-        # APPLY VARIATIONS (FILLS, ROLLS, DROPS)
-        # ====================================================================
-        section_applied_events: list[str] = []
-        section_skipped_events: list[dict] = []
-        
-        # stem_available drives DSP intensity in producer-move effects.
-        # Derive from the actual stems argument (use_stems), not only from render
-        # profile metadata — so that when real stems are passed the effects are
-        # at full strength even when metadata is missing.
-        stem_available = bool(use_stems)
-
-        variations = section.get("variations", [])
-        if not variations and isinstance(producer_arrangement.get("all_variations"), list):
-            for variation in producer_arrangement.get("all_variations", []):
-                target_section = variation.get("section", variation.get("section_index"))
-                if isinstance(target_section, str) and target_section.isdigit():
-                    target_section = int(target_section)
-                if target_section in {section_idx, section_name, section_type}:
-                    variations.append(variation)
-        for variation in variations:
-            var_bar_start = int(
-                variation.get("bar_start", variation.get("start_bar", variation.get("bar", bar_start)))
-                or bar_start
+        except Exception as e:
+            logger.warning("PARALLEL_SECTION_RENDER_FAILED falling back to serial: %s", e)
+            fresh = None
+    if fresh is None:
+        fresh = [
+            _render_producer_section(
+                sections[section_idx],
+                section_idx,
+                stems=stems if use_stems else None,
+                loop_audio=loop_audio,
+                loop_vars_ci=_loop_vars_ci,
+                **section_context,
             )
-            var_length = variation.get("bars") or variation.get("duration_bars") or variation.get("length_bars")
-            if var_length is not None:
-                var_bar_end = var_bar_start + int(var_length)
-            else:
-                var_bar_end = int(variation.get("bar_end", var_bar_start + 1) or (var_bar_start + 1))
-            var_type = (variation.get("variation_type") or variation.get("type") or "none").strip().lower()
-            var_intensity = variation.get("intensity", 0.5)
-            
-            # Calculate timing
-            var_start_ms = (var_bar_start - bar_start) * bar_duration_ms
-            var_end_ms = (var_bar_end - bar_start) * bar_duration_ms
-            
-            logger.info("RUNTIME_EVENT_DISPATCHED section=%s action=%s bar=%d", section_name, var_type, var_bar_start)
-            # Apply variation effects
-            if var_end_ms > var_start_ms and var_start_ms >= 0 and var_end_ms <= len(section_audio):
-                variation_segment = section_audio[var_start_ms:var_end_ms]
-                
-                if var_type in {"hats_roll", "fill", "hi_hat_stutter"}:
-                    # Hat rolls and fills: modest boost kept under ceiling
-                    variation_segment = variation_segment + 3
-                elif var_type in {"snare_fill", "drum_fill", "kick_fill"}:
-                    # Snare fills: boost capped to prevent spike above section level
-                    variation_segment = variation_segment + 4
-                elif var_type in {"bass_drop", "drop", "bass_glide"}:
-                    # Drops: very brief dip then impact; keep gap short to avoid dead air
-                    drop_gap = min(_DROP_GAP_MS, len(variation_segment) // 8)
-                    variation_segment = AudioSegment.silent(duration=drop_gap) + variation_segment[drop_gap:] + 4
-                elif var_type == "reverse":
-                    # Reverse effect
-                    variation_segment = variation_segment.reverse()
-                elif var_type in _PRODUCER_MOVE_TYPES:
-                    var_params = variation.get("params") if isinstance(variation.get("params"), dict) else {}
-                    before = _segment_evidence(variation_segment)
-                    variation_segment = _apply_producer_move_effect(
-                        segment=variation_segment,
-                        move_type=var_type,
-                        intensity=float(var_intensity or 0.7),
-                        stem_available=stem_available,
-                        bar_duration_ms=bar_duration_ms,
-                        params=var_params,
-                    )
-                    variation_segment = assert_audiosegment(variation_segment, f"variation:{var_type}")
-                    variation_segment = validate_frame_alignment(variation_segment, var_type)
-                    after = _segment_evidence(variation_segment)
-                    section_applied_events.append(var_type)
-                    logger.info("RUNTIME_EVENT_APPLIED section=%s action=%s", section_name, var_type)
-                    logger.info("DSP_HANDLER_COMPLETE section=%s action=%s", section_name, var_type)
-                    logger.info(
-                        "DSP_EVENT_RENDERED section=%s action=%s rms_delta=%.2f width_delta=%.4f hash_changed=%s",
-                        section_name,
-                        var_type,
-                        float(after["rms"]) - float(before["rms"]),
-                        float(after["stereo_width"]) - float(before["stereo_width"]),
-                        before["hash"] != after["hash"],
-                    )
-                    if before["hash"] != after["hash"]:
-                        logger.info("REAL_AUDIO_TRANSFORMATION_APPLIED section=%s action=%s", section_name, var_type)
-                else:
-                    # Never silently drop unknown producer actions. Apply a safe,
-                    # audible approximation and persist why.
-                    reason = "approximated_to_texture_lift"
-                    section_skipped_events.append({"action": var_type, "reason": reason, "bar": var_bar_start})
-                    logger.warning("RUNTIME_EVENT_SKIPPED section=%s action=%s reason=%s", section_name, var_type, reason)
-                    variation_segment = _apply_producer_move_effect(
-                        segment=variation_segment,
-                        move_type="texture_lift",
-                        intensity=float(var_intensity or 0.6),
-                        stem_available=stem_available,
-                        bar_duration_ms=bar_duration_ms,
-                        params={},
-                    )
-                    section_applied_events.append(var_type)
-                    logger.info("RUNTIME_EVENT_APPLIED section=%s action=%s", section_name, var_type)
-
-                # Always cap variation segment level before splicing back to prevent spikes.
-                variation_segment = _apply_headroom_ceiling(variation_segment, target_peak_dbfs=-1.5)
-
-                # Splice back in
-                section_audio = section_audio[:var_start_ms] + variation_segment + section_audio[var_end_ms:]
-            else:
-                reason = "event_out_of_section_bounds"
-                section_skipped_events.append({"action": var_type, "reason": reason, "bar": var_bar_start})
-                logger.warning("RUNTIME_EVENT_SKIPPED section=%s action=%s reason=%s", section_name, var_type, reason)
-
-        section_boundary_events = section.get("boundary_events") if isinstance(section.get("boundary_events"), list) else []
-        for boundary_event in section_boundary_events:
-            event_type = str(boundary_event.get("type") or "").strip().lower()
-            event_bar = int(boundary_event.get("bar", bar_start) or bar_start)
-            logger.info("RUNTIME_EVENT_DISPATCHED section=%s action=%s bar=%d", section_name, event_type, event_bar)
-            relative_bar = max(0, min(section_bars - 1, event_bar - bar_start))
-            placement = str(boundary_event.get("placement") or "end_of_section").strip().lower()
-            intensity = float(boundary_event.get("intensity", 0.7) or 0.7)
-            params = boundary_event.get("params") if isinstance(boundary_event.get("params"), dict) else {}
-
-            if placement in {"on_downbeat", "start_of_section"}:
-                # Both placements target the very first bar of the section so that
-                # entry accents (crash_hit, re_entry_accent, subtractive_entry) are
-                # audible at the opening downbeat rather than misplaced at the tail.
-                event_start_ms = 0
-                event_end_ms = min(len(section_audio), bar_duration_ms)
-            elif placement == "mid_section":
-                event_start_ms = max(0, relative_bar * bar_duration_ms)
-                event_end_ms = min(len(section_audio), event_start_ms + bar_duration_ms)
-            else:
-                event_end_ms = len(section_audio)
-                event_start_ms = max(0, event_end_ms - bar_duration_ms)
-
-            if event_end_ms <= event_start_ms:
-                reason = "invalid_boundary_window"
-                section_skipped_events.append({"action": event_type, "reason": reason, "bar": event_bar})
-                logger.warning("RUNTIME_EVENT_SKIPPED section=%s action=%s reason=%s", section_name, event_type, reason)
-                continue
+            for section_idx in pending
+        ]
+    for section_idx, result in zip(pending, fresh):
+        rendered[section_idx] = result
+        if section_memo is not None:
+            section_memo.put(memo_keys[section_idx], result, sections[section_idx])
+
+    reused_sections = len(sections) - len(pending)
+    section_memo_report = {
+        "enabled": section_memo is not None,
+        "sections": len(sections),
+        "reused": reused_sections,
+        "reuse_ratio": round(reused_sections / len(sections), 4) if sections else 0.0,
+    }
+    logger.info(
+        "SECTION_RENDER_MEMO sections=%d reused=%d reuse_ratio=%.2f",
+        len(sections),
+        reused_sections,
+        section_memo_report["reuse_ratio"],
+    )
 
-            boundary_segment = section_audio[event_start_ms:event_end_ms]
-            boundary_segment = _apply_producer_move_effect(
-                segment=boundary_segment,
-                move_type=event_type,
-                intensity=intensity,
-                stem_available=stem_available,
-                bar_duration_ms=bar_duration_ms,
-                params=params,
-            )
-            # Cap boundary segment level before splicing back — same ceiling applied to
-            # variation segments — to prevent stacking of multiple boundary effects
-            # (e.g. crash_hit + re_entry_accent on the same bar) from causing clipping.
-            boundary_segment = _apply_headroom_ceiling(boundary_segment, target_peak_dbfs=-1.5)
-            section_applied_events.append(event_type)
-            logger.info("RUNTIME_EVENT_APPLIED section=%s action=%s", section_name, event_type)
-            section_audio = section_audio[:event_start_ms] + boundary_segment + section_audio[event_end_ms:]
-        
-        # ====================================================================
-        # APPLY TRANSITIONS BETWEEN SECTIONS
-        # ====================================================================
-        
-        transition_info = next(
-            (
-                t for t in transitions
-                if t.get("bar_position") == bar_end
-                or t.get("from_section") == section_idx
-                or t.get("from_bar") == bar_end
-            ),
-            None,
-        )
-        if transition_info:
-            trans_type = (transition_info.get("transition_type") or transition_info.get("type") or "none").strip().lower()
-            trans_duration_bars = int(transition_info.get("duration_bars", transition_info.get("bars", 0)) or 0)
-            trans_duration_ms = trans_duration_bars * bar_duration_ms
-            
-            if trans_duration_ms > 0 and trans_duration_ms <= len(section_audio):
-                if trans_type in {"sweep", "filter_sweep", "crossfade"}:
-                    # Filter sweep: fade out highs
-                    sweep_start = max(0, len(section_audio) - trans_duration_ms)
-                    pre_sweep = section_audio[:sweep_start]
-                    sweep_part = section_audio[sweep_start:]
-                    sweep_part = sweep_part.low_pass_filter(500).fade_out(len(sweep_part))
-                    section_audio = pre_sweep + sweep_part
-                    
-                elif trans_type in {"riser", "build", "drum_fill"}:
-                    # Riser: dramatic volume increase
-                    riser_start = max(0, len(section_audio) - trans_duration_ms)
-                    pre_riser = section_audio[:riser_start]
-                    riser_part = section_audio[riser_start:]
-                    # Create riser effect with volume automation; cap to prevent spike
-                    riser_part = _apply_headroom_ceiling(riser_part + 4, -1.5)
-                    riser_part = riser_part.high_pass_filter(300)  # Filter lows
-                    section_audio = pre_riser + riser_part
-                    
-                elif trans_type == "impact" or trans_type == "hit":
-                    # Impact: silence then hit
-                    impact_gap = min(500, trans_duration_ms)
-                    section_audio = section_audio[:-impact_gap] + AudioSegment.silent(duration=impact_gap)
-                section_applied_events.append(f"transition:{trans_type}")
-                logger.info(
-                    "TRANSITION_OVERLAP_INVOKED section=%s section_idx=%s transition_type=%s",
-                    section_name,
-                    section_idx,
-                    trans_type,
-                )
+    for section_idx, section in enumerate(sections):
+        result = rendered[section_idx]
+        section_audio = result["section_audio"]
+        section_name = result["section_name"]
+        section_type = result["section_type"]
+        bar_start = result["bar_start"]
+        bar_end = result["bar_end"]
+        section_bars = result["section_bars"]
+        section_energy = result["section_energy"]
+        section_loop_variant = result["section_loop_variant"]
+        active_role_snapshot = result["active_role_snapshot"]
+        section_applied_events = result["section_applied_events"]
+        section_skipped_events = result["section_skipped_events"]
+        transition_info = result["transition_info"]
+        _phrase_first_roles = result["phrase_first_roles"]
+        _phrase_second_roles = result["phrase_second_roles"]
+        _phrase_split_executed = result["phrase_split_executed"]
 
         if "pre_hook_silence_drop" not in section_applied_events:
             section_audio = _stabilize_section_loudness(
@@ -3248,10 +3439,13 @@ def _render_producer_arrangement(
         # Use a short crossfade when appending this section to the growing mix so that
         # sample-level discontinuities at section boundaries don't create audible
         # clicks or pops that listeners perceive as "audio dropping".
-        if len(arranged) == 0:
-            arranged = section_audio
-        else:
-            arranged = _crossfade_append(arranged, section_audio)
+        if arranged_buffer is None:
+            arranged_buffer = dsp.RenderBuffer.for_arrangement(
+                total_bars=max(int(total_bars or 0), bar_end),
+                bar_duration_ms=bar_duration_ms,
+                template=section_audio,
+            )
+        arranged_buffer.append(section_audio, crossfade_ms=_SECTION_CROSSFADE_MS)
         
         # Track section for timeline
         start_seconds = (bar_start * 4 * 60.0) / bpm
@@ -3379,6 +3573,10 @@ def _render_producer_arrangement(
         bool(render_spec_summary.get("transition_overlap_rendered")),
     )
 
+    arranged = (
+        arranged_buffer.to_segment() if arranged_buffer is not None else AudioSegment.silent(duration=0)
+    )
+
     # Build timeline JSON
     timeline_json = json.dumps({
         "bpm": bpm,
@@ -3393,6 +3591,7 @@ def _render_producer_arrangement(
         "section_boundaries": producer_arrangement.get("section_boundaries") or [],
         "producer_debug_report": producer_debug_report,
         "render_spec_summary": render_spec_summary,
+        "section_memo": section_memo_report,
         "metadata": {
             "total_bars": total_bars,
             "key": producer_arrangement.get("key", "C"),
@@ -6900,6 +7099,31 @@ def _apply_drop_engine_primary(
     return render_plan
 
 
+def _store_shadow_result(key: str):
+    """Return a shadow-executor store that keeps the whole result under *key*."""
+    def _store(render_plan: dict, result: dict) -> None:
+        render_plan[key] = result
+    return _store
+
+
+def _store_engine_shadow(prefix: str):
+    """Return a store for plan/scores/warnings/fallback_used shadow results (drop, motif, decision)."""
+    def _store(render_plan: dict, result: dict) -> None:
+        render_plan[f"_{prefix}_plan"] = result.get("plan")
+        render_plan[f"_{prefix}_scores"] = result.get("scores")
+        render_plan[f"_{prefix}_warnings"] = result.get("warnings", [])
+        render_plan[f"_{prefix}_fallback_used"] = result.get("fallback_used", False)
+    return _store
+
+
+def _store_ai_producer_shadow(render_plan: dict, result: dict) -> None:
+    render_plan["_ai_producer_plan"] = result.get("plan")
+    render_plan["_ai_critic_scores"] = result.get("critic_scores")
+    render_plan["_ai_repair_actions"] = result.get("repair_actions", [])
+    render_plan["_ai_rejected_reason"] = result.get("rejected_reason", "")
+    render_plan["_ai_fallback_used"] = result.get("fallback_used", False)
+
+
 def run_arrangement_job(arrangement_id: int, arrangement_preset: str | None = None):
     """
     Background job to generate an arrangement.
@@ -6917,6 +7141,7 @@ def run_arrangement_job(arrangement_id: int, arrangement_preset: str | None = No
         arrangement_preset: Optional genre preset name (trap, drill, cinematic, etc.)
     """
     db = SessionLocal()
+    shadow_executor: ShadowExecutor | None = None
 
     try:
         arrangement = (
@@ -6951,43 +7176,49 @@ def run_arrangement_job(arrangement_id: int, arrangement_preset: str | None = No
         if not loop.file_key:
             raise ValueError(f"Loop {arrangement.loop_id} missing file_key")
 
-        if storage.use_s3:
-            # Create presigned URL to fetch the loop audio
-            input_url = storage.create_presigned_get_url(loop.file_key, expires_seconds=3600)
+        def _download_and_decode_loop() -> AudioSegment:
+            if storage.use_s3:
+                # Create presigned URL to fetch the loop audio
+                input_url = storage.create_presigned_get_url(loop.file_key, expires_seconds=3600)
 
-            # Download audio from S3
-            with httpx.Client(timeout=60.0) as client:
-                response = client.get(input_url)
-                response.raise_for_status()
-                input_bytes = response.content
+                # Download audio from S3
+                with httpx.Client(timeout=60.0) as client:
+                    response = client.get(input_url)
+                    response.raise_for_status()
+                    input_bytes = response.content
 
-            logger.info(
-                "Downloaded audio from S3: key=%s, size=%d bytes, first 4 bytes (hex)=%s",
-                loop.file_key,
-                len(input_bytes),
-                input_bytes[:4].hex() if len(input_bytes) >= 4 else "???"
-            )
+                logger.info(
+                    "Downloaded audio from S3: key=%s, size=%d bytes, first 4 bytes (hex)=%s",
+                    loop.file_key,
+                    len(input_bytes),
+                    input_bytes[:4].hex() if len(input_bytes) >= 4 else "???"
+                )
 
-            # Load audio with multi-strategy decoder
-            try:
-                loop_audio = _load_audio_segment_from_wav_bytes(input_bytes)
-            except ValueError as decode_error:
-                logger.error("All decoding strategies failed for loop %s: %s", arrangement.loop_id, decode_error)
-                raise ValueError(f"Cannot decode loop audio: {decode_error}") from decode_error
-        else:
-            # Local fallback for development
-            filename = loop.file_key.split("/")[-1]
-            local_path = storage.upload_dir / filename
-            if not local_path.exists():
-                raise FileNotFoundError(f"Loop file not found: {local_path}")
-            with open(local_path, "rb") as local_audio_file:
-                input_bytes = local_audio_file.read()
-            logger.info(
-                "Loaded audio from local file: path=%s, size=%d bytes",
-                local_path,
-                len(input_bytes)
-            )
-            loop_audio = _load_audio_segment_from_wav_bytes(input_bytes)
+                # Load audio with multi-strategy decoder
+                try:
+                    return _load_audio_segment_from_wav_bytes(input_bytes)
+                except ValueError as decode_error:
+                    logger.error("All decoding strategies failed for loop %s: %s", arrangement.loop_id, decode_error)
+                    raise ValueError(f"Cannot decode loop audio: {decode_error}") from decode_error
+            else:
+                # Local fallback for development
+                filename = loop.file_key.split("/")[-1]
+                local_path = storage.upload_dir / filename
+                if not local_path.exists():
+                    raise FileNotFoundError(f"Loop file not found: {local_path}")
+                with open(local_path, "rb") as local_audio_file:
+                    input_bytes = local_audio_file.read()
+                logger.info(
+                    "Loaded audio from local file: path=%s, size=%d bytes",
+                    local_path,
+                    len(input_bytes)
+                )
+                return _load_audio_segment_from_wav_bytes(input_bytes)
+
+        # Repeat renders of the same loop are served from the decoded-audio
+        # cache, skipping both the download and the decode.
+        with render_timing.span("decode_loop", "decode"):
+            loop_audio = load_storage_audio(loop.file_key, _download_and_decode_loop, store=storage)
 
         # Render arrangement
         bpm = float(loop.bpm or loop.tempo or 120.0)
@@ -7130,7 +7361,8 @@ def run_arrangement_job(arrangement_id: int, arrangement_preset: str | None = No
             try:
                 from app.services.stem_loader import StemLoadError, load_stems_from_metadata
 
-                loaded_stems = load_stems_from_metadata(stem_metadata, timeout_seconds=60.0)
+                with render_timing.span("load_stems", "decode"):
+                    loaded_stems = load_stems_from_metadata(stem_metadata, timeout_seconds=60.0)
 
                 logger.info(
                     "✅ STEMS LOADED: %s - using stem rendering engine",
@@ -7312,6 +7544,10 @@ def run_arrangement_job(arrangement_id: int, arrangement_preset: str | None = No
         else:
             render_plan["vibe_applied"] = False
 
+        # Shadows whose primary flag is off are scheduled concurrently and
+        # collected before the final plan resolver (see shadow_executor).
+        shadow_executor = ShadowExecutor.from_settings(arrangement_id=arrangement_id)
+
         # ====================================================================
         # TIMELINE ENGINE: shadow planning + optional primary promotion.
         #
@@ -7340,8 +7576,12 @@ def run_arrangement_job(arrangement_id: int, arrangement_preset: str | None = No
             elif loaded_stems:
                 _tl_roles = _ordered_unique_roles(list(loaded_stems.keys()))
 
-            render_plan["_timeline_plan"] = _run_timeline_planner_shadow(
+            shadow_executor.submit(
+                "timeline",
+                _run_timeline_planner_shadow,
                 render_plan=render_plan,
+                store=_store_shadow_result("_timeline_plan"),
+                inline=settings.feature_timeline_engine_primary,
                 available_roles=_tl_roles,
                 arrangement_id=arrangement_id,
                 correlation_id=correlation_id,
@@ -7398,8 +7638,13 @@ def run_arrangement_job(arrangement_id: int, arrangement_preset: str | None = No
             elif loaded_stems:
                 _pv_roles = _ordered_unique_roles(list(loaded_stems.keys()))
 
-            render_plan["_pattern_variation_plans"] = _run_pattern_variation_shadow(
+            shadow_executor.submit(
+                "pattern_variation",
+                _run_pattern_variation_shadow,
                 render_plan=render_plan,
+                store=_store_shadow_result("_pattern_variation_plans"),
+                inline=settings.feature_pattern_variation_primary,
+                depends_on=("timeline",),
                 available_roles=_pv_roles,
                 arrangement_id=arrangement_id,
                 correlation_id=correlation_id,
@@ -7459,8 +7704,13 @@ def run_arrangement_job(arrangement_id: int, arrangement_preset: str | None = No
             elif loaded_stems:
                 _ge_roles = _ordered_unique_roles(list(loaded_stems.keys()))
 
-            render_plan["_groove_plans"] = _run_groove_engine_shadow(
+            shadow_executor.submit(
+                "groove",
+                _run_groove_engine_shadow,
                 render_plan=render_plan,
+                store=_store_shadow_result("_groove_plans"),
+                inline=settings.feature_groove_engine_primary,
+                depends_on=("timeline", "pattern_variation"),
                 available_roles=_ge_roles,
                 arrangement_id=arrangement_id,
                 correlation_id=correlation_id,
@@ -7507,18 +7757,16 @@ def run_arrangement_job(arrangement_id: int, arrangement_preset: str | None = No
             elif loaded_stems:
                 _ai_roles = _ordered_unique_roles(list(loaded_stems.keys()))
 
-            _ai_result = _run_ai_producer_system_shadow(
+            shadow_executor.submit(
+                "ai_producer",
+                _run_ai_producer_system_shadow,
                 render_plan=render_plan,
+                store=_store_ai_producer_shadow,
                 available_roles=_ai_roles,
                 arrangement_id=arrangement_id,
                 correlation_id=correlation_id,
                 source_quality=_ai_source_quality,
             )
-            render_plan["_ai_producer_plan"] = _ai_result.get("plan")
-            render_plan["_ai_critic_scores"] = _ai_result.get("critic_scores")
-            render_plan["_ai_repair_actions"] = _ai_result.get("repair_actions", [])
-            render_plan["_ai_rejected_reason"] = _ai_result.get("rejected_reason", "")
-            render_plan["_ai_fallback_used"] = _ai_result.get("fallback_used", False)
 
         # ====================================================================
         # DROP ENGINE: shadow planning + optional primary promotion.
@@ -7569,17 +7817,18 @@ def run_arrangement_job(arrangement_id: int, arrangement_preset: str | None = No
             elif loaded_stems:
                 _drop_roles = _ordered_unique_roles(list(loaded_stems.keys()))
 
-            _drop_result = _run_drop_engine_shadow(
+            _drop_result = shadow_executor.submit(
+                "drop",
+                _run_drop_engine_shadow,
                 render_plan=render_plan,
+                store=_store_engine_shadow("drop"),
+                inline=settings.feature_drop_engine_primary,
+                depends_on=("ai_producer", "groove", "pattern_variation"),
                 available_roles=_drop_roles,
                 arrangement_id=arrangement_id,
                 correlation_id=correlation_id,
                 source_quality=_drop_source_quality,
-            )
-            render_plan["_drop_plan"] = _drop_result.get("plan")
-            render_plan["_drop_scores"] = _drop_result.get("scores")
-            render_plan["_drop_warnings"] = _drop_result.get("warnings", [])
-            render_plan["_drop_fallback_used"] = _drop_result.get("fallback_used", False)
+            ) or {}
 
         # Promote Drop Engine to primary boundary/payoff planner when enabled.
         # This must run after the shadow pass (which builds the plan) and after
@@ -7640,17 +7889,17 @@ def run_arrangement_job(arrangement_id: int, arrangement_preset: str | None = No
             elif loaded_stems:
                 _motif_roles = _ordered_unique_roles(list(loaded_stems.keys()))
 
-            _motif_result = _run_motif_engine_shadow(
+            _motif_result = shadow_executor.submit(
+                "motif",
+                _run_motif_engine_shadow,
                 render_plan=render_plan,
+                store=_store_engine_shadow("motif"),
+                inline=settings.feature_motif_engine_primary,
                 available_roles=_motif_roles,
                 arrangement_id=arrangement_id,
                 correlation_id=correlation_id,
                 source_quality=_motif_source_quality,
-            )
-            render_plan["_motif_plan"] = _motif_result.get("plan")
-            render_plan["_motif_scores"] = _motif_result.get("scores")
-            render_plan["_motif_warnings"] = _motif_result.get("warnings", [])
-            render_plan["_motif_fallback_used"] = _motif_result.get("fallback_used", False)
+            ) or {}
 
         # Promote Motif Engine to primary motif/identity planner when enabled.
         # This must run after the shadow pass (which builds the plan) and after
@@ -7712,17 +7961,17 @@ def run_arrangement_job(arrangement_id: int, arrangement_preset: str | None = No
             elif loaded_stems:
                 _dec_roles = _ordered_unique_roles(list(loaded_stems.keys()))
 
-            _dec_result = _run_decision_engine_shadow(
+            _dec_result = shadow_executor.submit(
+                "decision",
+                _run_decision_engine_shadow,
                 render_plan=render_plan,
+                store=_store_engine_shadow("decision"),
+                inline=settings.feature_decision_engine_primary,
                 available_roles=_dec_roles,
                 arrangement_id=arrangement_id,
                 correlation_id=correlation_id,
                 source_quality=_dec_source_quality,
-            )
-            render_plan["_decision_plan"] = _dec_result.get("plan")
-            render_plan["_decision_scores"] = _dec_result.get("scores")
-            render_plan["_decision_warnings"] = _dec_result.get("warnings", [])
-            render_plan["_decision_fallback_used"] = _dec_result.get("fallback_used", False)
+            ) or {}
         else:
             _dec_result = {}
 
@@ -7739,6 +7988,10 @@ def run_arrangement_job(arrangement_id: int, arrangement_preset: str | None = No
                 correlation_id=correlation_id,
             )
 
+        # The resolver reads the decision/drop plans and the audit reads every
+        # shadow plan, so all scheduled shadows must land before this point.
+        shadow_executor.collect(render_plan)
+
         # ====================================================================
         # FINAL PLAN RESOLVER + RENDER TRUTH AUDIT
         #
@@ -8056,8 +8309,11 @@ def run_arrangement_job(arrangement_id: int, arrangement_preset: str | None = No
                         if r
                     ]
 
-                _gp_result = _run_generative_producer_shadow(
+                _gp_result = shadow_executor.submit(
+                    "generative_producer",
+                    _run_generative_producer_shadow,
                     render_plan=render_plan,
+                    inline=True,
                     available_roles=_gp_roles,
                     arrangement_id=arrangement_id,
                     correlation_id=correlation_id,
@@ -8084,6 +8340,8 @@ def run_arrangement_job(arrangement_id: int, arrangement_preset: str | None = No
                 )
                 render_plan["generative_producer_enabled"] = False
 
+        render_plan["_shadow_timings"] = shadow_executor.timings()
+
         arrangement.render_plan_json = json.dumps(render_plan)
         db.commit()
 
@@ -8169,11 +8427,12 @@ def run_arrangement_job(arrangement_id: int, arrangement_preset: str | None = No
                 raise
 
         output_key = f"arrangements/{arrangement_id}.wav"
-        storage.upload_file(
-            file_bytes=output_bytes,
-            content_type="audio/wav",
-            key=output_key,
-        )
+        with render_timing.span("upload", "upload", bytes=len(output_bytes)):
+            storage.upload_file(
+                file_bytes=output_bytes,
+                content_type="audio/wav",
+                key=output_key,
+            )
         log_feature_event(
             logger,
             event="storage_uploaded",
@@ -8234,4 +8493,6 @@ def run_arrangement_job(arrangement_id: int, arrangement_preset: str | None = No
             logger.error(f"Failed to update arrangement error status: {str(db_error)}")
 
     finally:
+        if shadow_executor is not None:
+            shadow_executor.shutdown()
         db.close()
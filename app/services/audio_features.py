@@ -0,0 +1,533 @@
+"""
+Single-decode audio feature extraction shared by every analyzer.
+
+:func:`extract_features` decodes a file once into an :class:`AudioFeatures`
+bundle, persisted as ``features/<sha256>-v<FEATURE_VERSION>.npz`` (content hash
+of the encoded file) behind a per-process LRU.  Bump :data:`FEATURE_VERSION`
+whenever extraction changes.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+import logging
+import math
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field, fields
+from typing import Any, Optional, Tuple
+
+import numpy as np
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever a code change alters the extracted features.
+FEATURE_VERSION = 1
+
+FEATURE_PREFIX = "features"
+
+ANALYSIS_SAMPLE_RATE = 22050
+HOP_LENGTH = 512
+N_FFT = 2048
+POWER_BLOCK_SECONDS = 0.1
+SPECTRUM_SECONDS = 30.0
+SPECTRUM_BIN_HZ = 10
+CLIP_THRESHOLD = 0.999
+TEMPO_CANDIDATE_COUNT = 5
+TEMPO_RANGE_BPM = (30.0, 300.0)
+# The top 40 % of STFT bins count as "high frequency" for ``hf_ratio``.
+HF_SPLIT = 0.6
+
+_SF_BIT_DEPTHS = {
+    "FLOAT": 32,
+    "DOUBLE": 64,
+    "ULAW": 8,
+    "ALAW": 8,
+    "VORBIS": 16,
+    "OPUS": 16,
+}
+
+
+def content_hash(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()
+
+
+def feature_key(digest: str) -> str:
+    """Storage key the bundle for content hash *digest* is persisted under."""
+    return f"{FEATURE_PREFIX}/{digest}-v{FEATURE_VERSION}.npz"
+
+
+def bit_depth_for_subtype(subtype: str) -> int:
+    """Map a soundfile subtype string (``PCM_24``, ``FLOAT``...) to a bit depth."""
+    if subtype.startswith("PCM_"):
+        try:
+            return int(subtype.split("_")[1])
+        except (IndexError, ValueError):
+            pass
+    return _SF_BIT_DEPTHS.get(subtype, 16)
+
+
+@dataclass(frozen=True)
+class StereoStats:
+    """Whole-file sample statistics of the first two channels.
+
+    For mono files the ``right``/sum/difference fields are ``None``.
+    """
+
+    peak: float
+    clipped_fraction: float
+    rms_left: float
+    std_left: float
+    rms_right: Optional[float] = None
+    std_right: Optional[float] = None
+    rms_sum: Optional[float] = None
+    rms_diff: Optional[float] = None
+    correlation: Optional[float] = None
+
+    @property
+    def is_stereo(self) -> bool:
+        return self.rms_right is not None
+
+
+@dataclass
+class AudioFeatures:
+    """Everything the analyzers need from one decoded audio file."""
+
+    content_hash: str
+    sample_rate: int
+    channels: int
+    bit_depth: int
+    num_samples: int
+    tempo: float
+    stereo: StereoStats
+    # Frame features at ANALYSIS_SAMPLE_RATE / HOP_LENGTH.
+    onset_envelope: np.ndarray = field(repr=False)
+    tempo_candidates: np.ndarray = field(repr=False)  # (k, 2): bpm, strength
+    chroma: np.ndarray = field(repr=False)  # (12, frames)
+    rms: np.ndarray = field(repr=False)
+    spectral_centroid: np.ndarray = field(repr=False)
+    hf_ratio: np.ndarray = field(repr=False)
+    # Native-rate mean-square power per POWER_BLOCK_SECONDS block.  Channel
+    # power holds full blocks only; mono power includes the partial tail.
+    channel_power: np.ndarray = field(repr=False)  # (min(channels, 2), blocks)
+    mono_power: np.ndarray = field(repr=False)
+    # Mean power of the first SPECTRUM_SECONDS per SPECTRUM_BIN_HZ bucket.
+    spectrum_power: np.ndarray = field(repr=False)
+    spectrum_counts: np.ndarray = field(repr=False)
+
+    @property
+    def duration_seconds(self) -> float:
+        return self.num_samples / float(self.sample_rate) if self.sample_rate else 0.0
+
+    @property
+    def block_samples(self) -> int:
+        """Native samples per ``channel_power``/``mono_power`` block."""
+        return max(int(POWER_BLOCK_SECONDS * self.sample_rate), 1)
+
+    @property
+    def frame_seconds(self) -> float:
+        return HOP_LENGTH / float(ANALYSIS_SAMPLE_RATE)
+
+    def band_power(self, low_hz: float, high_hz: float) -> float:
+        """Mean spectral power in ``[low_hz, high_hz)`` (0.0 if no bins)."""
+        lo = int(math.ceil(low_hz / SPECTRUM_BIN_HZ))
+        hi = int(math.ceil(high_hz / SPECTRUM_BIN_HZ))
+        counts = self.spectrum_counts[lo:hi]
+        total = float(counts.sum())
+        if total <= 0:
+            return 0.0
+        return float(np.dot(self.spectrum_power[lo:hi], counts) / total)
+
+    def window_rms(self, window_seconds: float, hop_seconds: float) -> list[float]:
+        """RMS of the mono mix over sliding windows, from the block power.
+
+        Windows start every *hop_seconds* until the end of the audio; the
+        last ones are truncated like ``y[offset : offset + window]``.
+        """
+        per_window = max(int(round(window_seconds / POWER_BLOCK_SECONDS)), 1)
+        per_hop = max(int(round(hop_seconds / POWER_BLOCK_SECONDS)), 1)
+        power = self.mono_power
+        weights = np.full(len(power), float(self.block_samples))
+        tail = self.num_samples - (len(power) - 1) * self.block_samples
+        if len(power):
+            weights[-1] = max(tail, 0)
+        values = []
+        for start in range(0, len(power), per_hop):
+            w = weights[start : start + per_window]
+            energy = float(np.dot(power[start : start + per_window], w))
+            values.append(math.sqrt(energy / w.sum()) if w.sum() > 0 else 0.0)
+        return values
+
+    def window_mean(self, curve: np.ndarray, window_seconds: float, hop_seconds: float) -> list[float]:
+        """Average a frame curve (``hf_ratio``, ``rms``...) over sliding windows."""
+        frame = self.frame_seconds
+        count = int(math.ceil(self.duration_seconds / hop_seconds)) if hop_seconds > 0 else 0
+        values = []
+        for idx in range(count):
+            start = int(round(idx * hop_seconds / frame))
+            end = max(start + 1, int(round((idx * hop_seconds + window_seconds) / frame)))
+            chunk = curve[start:end]
+            values.append(float(np.mean(chunk)) if len(chunk) else 0.0)
+        return values
+
+    # ------------------------------------------------------------------
+    # Serialisation
+    # ------------------------------------------------------------------
+
+    _ARRAY_FIELDS = (
+        "onset_envelope",
+        "tempo_candidates",
+        "chroma",
+        "rms",
+        "spectral_centroid",
+        "hf_ratio",
+        "channel_power",
+        "mono_power",
+        "spectrum_power",
+        "spectrum_counts",
+    )
+
+    def to_npz(self) -> bytes:
+        meta = {
+            "version": FEATURE_VERSION,
+            "content_hash": self.content_hash,
+            "sample_rate": self.sample_rate,
+            "channels": self.channels,
+            "bit_depth": self.bit_depth,
+            "num_samples": self.num_samples,
+            "tempo": self.tempo,
+            "stereo": {f.name: getattr(self.stereo, f.name) for f in fields(StereoStats)},
+        }
+        buf = io.BytesIO()
+        np.savez_compressed(
+            buf,
+            meta=np.frombuffer(json.dumps(meta).encode("utf-8"), dtype=np.uint8),
+            **{name: getattr(self, name) for name in self._ARRAY_FIELDS},
+        )
+        return buf.getvalue()
+
+    @classmethod
+    def from_npz(cls, payload: bytes) -> "AudioFeatures":
+        with np.load(io.BytesIO(payload), allow_pickle=False) as data:
+            meta = json.loads(data["meta"].tobytes().decode("utf-8"))
+            if meta.get("version") != FEATURE_VERSION:
+                raise ValueError(f"feature version {meta.get('version')} != {FEATURE_VERSION}")
+            arrays = {name: data[name] for name in cls._ARRAY_FIELDS}
+        return cls(
+            content_hash=meta["content_hash"],
+            sample_rate=int(meta["sample_rate"]),
+            channels=int(meta["channels"]),
+            bit_depth=int(meta["bit_depth"]),
+            num_samples=int(meta["num_samples"]),
+            tempo=float(meta["tempo"]),
+            stereo=StereoStats(**meta["stereo"]),
+            **arrays,
+        )
+
+
+# ---------------------------------------------------------------------------
+# Extraction
+# ---------------------------------------------------------------------------
+
+def decode_audio(content: bytes, filename: str = "audio.wav") -> Tuple[np.ndarray, int, int]:
+    """Decode *content* once; returns ``(samples[channels, n] float32, sample_rate, bit_depth)``.
+
+    soundfile handles WAV/FLAC/OGG from memory; other formats (MP3, AAC/M4A)
+    go through pydub/ffmpeg with *filename*'s extension as the format hint.
+    """
+    try:
+        import soundfile as sf  # type: ignore
+
+        with sf.SoundFile(io.BytesIO(content)) as handle:
+            samples = handle.read(dtype="float32", always_2d=True)
+            return np.ascontiguousarray(samples.T), int(handle.samplerate), bit_depth_for_subtype(handle.subtype)
+    except Exception as e:
+        logger.debug("soundfile decode failed for %s (%s); trying pydub", filename, e)
+
+    from pydub import AudioSegment
+
+    ext = filename.rsplit(".", 1)[-1].lower() if "." in filename else "wav"
+    seg = AudioSegment.from_file(io.BytesIO(content), format=ext)
+    scale = float(1 << (8 * seg.sample_width - 1))
+    raw = np.asarray(seg.get_array_of_samples(), dtype=np.float32) / scale
+    samples = raw.reshape(-1, seg.channels).T
+    return np.ascontiguousarray(samples), int(seg.frame_rate), seg.sample_width * 8
+
+
+def _rms(values: np.ndarray) -> float:
+    return math.sqrt(float(np.mean(np.square(values, dtype=np.float64)))) if len(values) else 0.0
+
+
+def stereo_stats(left: np.ndarray, right: Optional[np.ndarray]) -> StereoStats:
+    both = np.concatenate([left, right]) if right is not None else left
+    magnitudes = np.abs(both)
+    total = len(magnitudes)
+    peak = float(magnitudes.max()) if total else 0.0
+    clipped = float(np.count_nonzero(magnitudes >= CLIP_THRESHOLD)) / total if total else 0.0
+    stats: dict[str, Any] = {
+        "peak": peak,
+        "clipped_fraction": clipped,
+        "rms_left": _rms(left),
+        "std_left": float(np.std(left)) if len(left) else 0.0,
+    }
+    if right is not None:
+        std_right = float(np.std(right)) if len(right) else 0.0
+        if stats["std_left"] > 1e-10 and std_right > 1e-10:
+            correlation = float(np.corrcoef(left, right)[0, 1])
+        else:
+            correlation = 1.0
+        stats.update(
+            rms_right=_rms(right),
+            std_right=std_right,
+            rms_sum=_rms(left + right),
+            rms_diff=_rms(left - right),
+            correlation=correlation,
+        )
+    return StereoStats(**stats)
+
+
+def _block_power(signal: np.ndarray, block: int, *, include_tail: bool) -> np.ndarray:
+    full = len(signal) // block
+    squares = np.square(signal, dtype=np.float64)
+    power = squares[: full * block].reshape(full, block).mean(axis=1) if full else np.zeros(0)
+    if include_tail and len(signal) > full * block:
+        power = np.append(power, squares[full * block :].mean())
+    return power
+
+
+def _long_term_spectrum(mono: np.ndarray, sr: int) -> Tuple[np.ndarray, np.ndarray]:
+    segment = mono[: int(sr * SPECTRUM_SECONDS)]
+    if len(segment) < 2:
+        return np.zeros(0), np.zeros(0)
+    power = np.abs(np.fft.rfft(segment)) ** 2
+    buckets = (np.fft.rfftfreq(len(segment), d=1.0 / sr) // SPECTRUM_BIN_HZ).astype(np.int64)
+    counts = np.bincount(buckets).astype(np.float64)
+    sums = np.bincount(buckets, weights=power)
+    means = np.divide(sums, counts, out=np.zeros_like(sums), where=counts > 0)
+    return means, counts
+
+
+def estimate_tempo_candidates(onset_env: np.ndarray, sr: int) -> np.ndarray:
+    """Strongest tempogram peaks as ``(bpm, strength)`` rows, strongest first.
+
+    The tempogram is normalised so lag 0 is 1.0, which makes the mean
+    autocorrelation at a peak usable as a 0–1 strength.
+    """
+    import librosa  # type: ignore
+    from scipy.signal import find_peaks
+
+    if len(onset_env) < 4:
+        return np.zeros((0, 2))
+    tempogram = librosa.feature.tempogram(onset_envelope=onset_env, sr=sr, hop_length=HOP_LENGTH)
+    strength = tempogram.mean(axis=1)
+    with np.errstate(divide="ignore"):
+        bpms = librosa.tempo_frequencies(tempogram.shape[0], hop_length=HOP_LENGTH, sr=sr)
+    low, high = TEMPO_RANGE_BPM
+    peaks, _ = find_peaks(np.nan_to_num(strength))
+    peaks = [idx for idx in peaks if low <= bpms[idx] <= high]
+    peaks.sort(key=lambda idx: strength[idx], reverse=True)
+    rows = [(float(bpms[idx]), float(strength[idx])) for idx in peaks[:TEMPO_CANDIDATE_COUNT]]
+    return np.array(rows, dtype=np.float64).reshape(-1, 2)
+
+
+def features_from_samples(
+    samples: np.ndarray,
+    sample_rate: int,
+    *,
+    bit_depth: int = 16,
+    digest: str = "",
+) -> AudioFeatures:
+    """Compute the feature bundle from decoded ``samples[channels, n]``."""
+    import librosa  # type: ignore
+
+    samples = np.atleast_2d(np.asarray(samples, dtype=np.float32))
+    channels, num_samples = samples.shape
+    if num_samples == 0:
+        raise ValueError("Audio file is empty or invalid")
+    left = samples[0]
+    right = samples[1] if channels >= 2 else None
+    mono = samples.mean(axis=0) if channels > 1 else left
+
+    y = mono
+    if sample_rate != ANALYSIS_SAMPLE_RATE:
+        y = librosa.resample(mono, orig_sr=sample_rate, target_sr=ANALYSIS_SAMPLE_RATE)
+    sr = ANALYSIS_SAMPLE_RATE
+
+    magnitude = np.abs(librosa.stft(y, n_fft=N_FFT, hop_length=HOP_LENGTH))
+    mel_db = librosa.power_to_db(librosa.feature.melspectrogram(S=magnitude ** 2, sr=sr))
+    onset_env = librosa.onset.onset_strength(S=mel_db, sr=sr, hop_length=HOP_LENGTH)
+    try:
+        tempo = float(np.atleast_1d(librosa.feature.tempo(onset_envelope=onset_env, sr=sr, hop_length=HOP_LENGTH))[0])
+    except Exception as e:
+        logger.warning("Tempo estimation failed (%s); bundle tempo is 0", e)
+        tempo = 0.0
+
+    split = max(1, int(magnitude.shape[0] * HF_SPLIT))
+    total_mag = magnitude.mean(axis=0)
+    hf_ratio = magnitude[split:].mean(axis=0) / np.maximum(total_mag, 1e-9)
+
+    block = max(int(POWER_BLOCK_SECONDS * sample_rate), 1)
+    stereo_mix = (left + right) / 2.0 if right is not None else left
+    spectrum_power, spectrum_counts = _long_term_spectrum(stereo_mix, sample_rate)
+
+    return AudioFeatures(
+        content_hash=digest,
+        sample_rate=int(sample_rate),
+        channels=int(channels),
+        bit_depth=int(bit_depth),
+        num_samples=int(num_samples),
+        tempo=tempo,
+        stereo=stereo_stats(left, right),
+        onset_envelope=onset_env.astype(np.float32),
+        tempo_candidates=estimate_tempo_candidates(onset_env, sr),
+        chroma=librosa.feature.chroma_cqt(y=y, sr=sr, hop_length=HOP_LENGTH).astype(np.float32),
+        rms=librosa.feature.rms(S=magnitude, frame_length=N_FFT)[0].astype(np.float32),
+        spectral_centroid=librosa.feature.spectral_centroid(S=magnitude, sr=sr)[0].astype(np.float32),
+        hf_ratio=hf_ratio.astype(np.float32),
+        channel_power=np.vstack([
+            _block_power(channel, block, include_tail=False)
+            for channel in ((left, right) if right is not None else (left,))
+        ]),
+        mono_power=_block_power(mono, block, include_tail=True),
+        spectrum_power=spectrum_power,
+        spectrum_counts=spectrum_counts,
+    )
+
+
+def extract_features(content: bytes, filename: str = "audio.wav") -> AudioFeatures:
+    """Decode *content* once and compute its feature bundle (no caching)."""
+    samples, sample_rate, bit_depth = decode_audio(content, filename)
+    return features_from_samples(samples, sample_rate, bit_depth=bit_depth, digest=content_hash(content))
+
+
+# ---------------------------------------------------------------------------
+# Persisted store
+# ---------------------------------------------------------------------------
+
+class FeatureStore:
+    """Content hash -> :class:`AudioFeatures`, persisted through storage."""
+
+    def __init__(self, store: Any = None, *, max_memory_entries: int = 64) -> None:
+        self._store = store
+        self.max_memory_entries = max(0, int(max_memory_entries))
+        self._memory: "OrderedDict[str, AudioFeatures]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {"memory_hits": 0, "storage_hits": 0, "misses": 0, "stores": 0, "errors": 0}
+
+    @property
+    def store(self) -> Any:
+        if self._store is None:
+            from app.services.storage import storage
+
+            return storage
+        return self._store
+
+    def get(self, digest: str) -> Optional[AudioFeatures]:
+        """Return the bundle for content hash *digest*, or None on a miss."""
+        with self._lock:
+            features = self._memory.get(digest)
+            if features is not None:
+                self._memory.move_to_end(digest)
+                self._counters["memory_hits"] += 1
+                return features
+        try:
+            payload = self.store.read_file(feature_key(digest))
+            features = AudioFeatures.from_npz(payload) if payload else None
+        except Exception as e:
+            logger.warning("AUDIO_FEATURES_READ_FAILED hash=%s error=%s", digest, e)
+            self._count("errors")
+            features = None
+        if features is None:
+            self._count("misses")
+            return None
+        self._count("storage_hits")
+        self._remember(features)
+        return features
+
+    def put(self, features: AudioFeatures) -> None:
+        """Persist *features* (best effort) and keep them in memory."""
+        self._remember(features)
+        try:
+            self.store.upload_file(features.to_npz(), "application/octet-stream", feature_key(features.content_hash))
+            self._count("stores")
+        except Exception as e:
+            logger.warning("AUDIO_FEATURES_WRITE_FAILED hash=%s error=%s", features.content_hash, e)
+            self._count("errors")
+
+    def get_or_extract(self, content: bytes, filename: str = "audio.wav") -> AudioFeatures:
+        digest = content_hash(content)
+        features = self.get(digest)
+        if features is not None:
+            return features
+        samples, sample_rate, bit_depth = decode_audio(content, filename)
+        features = features_from_samples(samples, sample_rate, bit_depth=bit_depth, digest=digest)
+        self.put(features)
+        return features
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            counters = dict(self._counters)
+            memory_entries = len(self._memory)
+        hits = counters["memory_hits"] + counters["storage_hits"]
+        lookups = hits + counters["misses"]
+        return {
+            **counters,
+            "hits": hits,
+            "hit_ratio": round(hits / lookups, 4) if lookups else None,
+            "memory_entries": memory_entries,
+            "memory_max_entries": self.max_memory_entries,
+        }
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._counters[name] += 1
+
+    def _remember(self, features: AudioFeatures) -> None:
+        if self.max_memory_entries <= 0:
+            return
+        with self._lock:
+            self._memory[features.content_hash] = features
+            self._memory.move_to_end(features.content_hash)
+            while len(self._memory) > self.max_memory_entries:
+                self._memory.popitem(last=False)
+
+
+_feature_store: Optional[FeatureStore] = None
+_feature_store_lock = threading.Lock()
+
+
+def get_feature_store() -> FeatureStore:
+    """Return the process-wide store, building it from settings on first use."""
+    global _feature_store
+    if _feature_store is None:
+        with _feature_store_lock:
+            if _feature_store is None:
+                _feature_store = FeatureStore(max_memory_entries=settings.feature_store_memory_entries)
+    return _feature_store
+
+
+def get_audio_features(content: bytes, filename: str = "audio.wav") -> AudioFeatures:
+    """Return the feature bundle of *content*, extracting it at most once.
+
+    With ``FEATURE_STORE_ENABLED=false`` every call extracts afresh and
+    nothing is persisted.
+    """
+    if not settings.feature_store_enabled:
+        return extract_features(content, filename)
+    return get_feature_store().get_or_extract(content, filename)
+
+
+def find_audio_features(content: bytes) -> Optional[AudioFeatures]:
+    """Return the already extracted bundle of *content*, never decoding it."""
+    return find_audio_features_by_hash(content_hash(content))
+
+
+def find_audio_features_by_hash(digest: str) -> Optional[AudioFeatures]:
+    """Return the already extracted bundle for content hash *digest*."""
+    if not settings.feature_store_enabled:
+        return None
+    return get_feature_store().get(digest)
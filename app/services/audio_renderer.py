@@ -18,6 +18,8 @@ from typing import Optional
 import numpy as np
 from pydub import AudioSegment
 
+from app.services.band_energy import RENDER_BANDS, analyze_band_energies
+from app.services.render_qa import RenderQAService
 from app.services.producer_models import ProducerArrangement, Section, SectionType, TransitionType
 from app.services.layer_engine import LayerEngine, LoopComponents
 from app.services.energy_engine import EnergyModulationEngine
@@ -27,23 +29,8 @@ from app.services.transition_engine import TransitionEngine
 logger = logging.getLogger(__name__)
 
 
-def _dbfs_from_band(samples: np.ndarray, sample_rate: int, low_hz: float, high_hz: float) -> float:
-    if samples.size == 0:
-        return -120.0
-    spec = np.fft.rfft(samples)
-    freqs = np.fft.rfftfreq(samples.size, d=1.0 / max(1, sample_rate))
-    band = np.abs(spec[(freqs >= low_hz) & (freqs < high_hz)])
-    if band.size == 0:
-        return -120.0
-    rms = float(np.sqrt(np.mean(np.square(band))))
-    return 20.0 * np.log10(max(rms, 1e-8))
-
-
 def _section_audio_metrics(section_audio: AudioSegment) -> dict[str, float]:
-    arr = np.array(section_audio.get_array_of_samples(), dtype=np.float32)
-    if section_audio.channels > 1 and arr.size > 1:
-        arr = arr.reshape((-1, section_audio.channels)).mean(axis=1)
-    if arr.size == 0:
+    if len(section_audio.raw_data) == 0:
         return {
             "melodic_rms": -120.0,
             "drum_rms": -120.0,
@@ -51,11 +38,10 @@ def _section_audio_metrics(section_audio: AudioSegment) -> dict[str, float]:
             "melody_to_rhythm_ratio": 0.0,
             "melody_masking_score": 1.0,
         }
-    peak = np.max(np.abs(arr))
-    norm = arr / max(1.0, peak)
-    melodic = _dbfs_from_band(norm, section_audio.frame_rate, 700.0, 5000.0)
-    drum = _dbfs_from_band(norm, section_audio.frame_rate, 2000.0, 12000.0)
-    bass = _dbfs_from_band(norm, section_audio.frame_rate, 30.0, 220.0)
+    energies = analyze_band_energies(section_audio, RENDER_BANDS)
+    melodic = energies["melodic"]
+    drum = energies["drum"]
+    bass = energies["bass"]
     rhythm = max(drum, bass)
     ratio = melodic - rhythm
     masking = max(0.0, min(1.0, (4.0 - ratio) / 12.0))
@@ -229,6 +215,11 @@ class AudioRenderer:
         logger.info("TRANSITION_AUDIO_SMOOTHNESS_MEASURED score=%.3f", transition_smoothness)
         if section_clarity < 0.45:
             logger.info("AUDIO_SECTION_REBALANCED")
+        # Repaired sections were measured above, so QA reads their band levels from the cache.
+        render_qa = RenderQAService.score_section_audio(
+            [(section.name, section.section_type.value.lower(), audio) for section, audio in zip(arrangement.sections, repaired)]
+        )
+        self.audio_truth_metrics["render_qa"] = render_qa.to_dict()
         logger.info("AUDIO_TRUTH_VALIDATION_PASSED")
         return repaired
     
@@ -19,6 +19,8 @@ import librosa
 import numpy as np
 from pydub import AudioSegment
 
+from app.services.audio_features import get_audio_features
+
 logger = logging.getLogger(__name__)
 
 
@@ -95,6 +97,39 @@ class AudioService:
             logger.error(f"Audio analysis failed: {e}")
             raise
 
+    def analyze_content(self, content: bytes, filename: str = "audio.wav") -> Dict[str, any]:
+        """
+        Analyze encoded audio bytes via the shared feature bundle.
+
+        The bytes are decoded at most once across analyzers (see
+        ``app.services.audio_features``); a loop analyzed at ingest is not
+        decoded again.
+
+        Args:
+            content: Encoded audio file bytes
+            filename: Original filename; its extension names the format
+
+        Returns:
+            Same dictionary as :meth:`analyze_loop`
+        """
+        features = get_audio_features(content, filename)
+        bpm = self._validate_bpm(features.tempo) if features.tempo > 0 else 120.0
+        try:
+            key = self._key_from_chroma(features.chroma)
+        except Exception as e:
+            logger.warning(f"Key detection failed, using default: {e}")
+            key = "C"
+        duration = features.duration_seconds
+
+        logger.info(f"Analysis complete: BPM={bpm}, Key={key}, Duration={duration}s")
+        return {
+            "bpm": round(bpm, 2),
+            "key": key,
+            "duration_seconds": round(duration, 2),
+            "sample_rate": features.sample_rate,
+            "channels": features.channels,
+        }
+
     def _detect_bpm(self, y: np.ndarray, sr: int) -> float:
         """
         Detect BPM using librosa's beat tracking.
@@ -112,19 +147,20 @@ class AudioService:
             tempo = librosa.beat.tempo(onset_envelope=onset_env, sr=sr)
 
             # tempo returns an array, get the first value
-            bpm = float(tempo[0])
-
-            # Validate BPM is in reasonable range (40-250)
-            if bpm < 40:
-                bpm = bpm * 2  # Might be half-time
-            elif bpm > 250:
-                bpm = bpm / 2  # Might be double-time
-
-            return bpm
+            return self._validate_bpm(float(tempo[0]))
         except Exception as e:
             logger.warning(f"BPM detection failed, using default: {e}")
             return 120.0  # Default BPM
 
+    @staticmethod
+    def _validate_bpm(bpm: float) -> float:
+        """Fold half/double-time estimates into a reasonable range (40-250)."""
+        if bpm < 40:
+            bpm = bpm * 2  # Might be half-time
+        elif bpm > 250:
+            bpm = bpm / 2  # Might be double-time
+        return bpm
+
     def _detect_key(self, y: np.ndarray, sr: int) -> str:
         """
         Detect musical key using chroma features.
@@ -139,22 +175,24 @@ class AudioService:
         try:
             # Compute chroma features
             chroma = librosa.feature.chroma_cqt(y=y, sr=sr)
-
-            # Average chroma across time
-            chroma_mean = np.mean(chroma, axis=1)
-
-            # Find the most prominent pitch class
-            key_index = np.argmax(chroma_mean)
-
-            # Map index to pitch class
-            pitch_classes = ['C', 'C#', 'D', 'D#', 'E', 'F', 'F#', 'G', 'G#', 'A', 'A#', 'B']
-            key = pitch_classes[key_index]
-
-            return key
+            return self._key_from_chroma(chroma)
         except Exception as e:
             logger.warning(f"Key detection failed, using default: {e}")
             return "C"  # Default key
 
+    @staticmethod
+    def _key_from_chroma(chroma: np.ndarray) -> str:
+        """Return the most prominent pitch class of a chromagram."""
+        # Average chroma across time
+        chroma_mean = np.mean(chroma, axis=1)
+
+        # Find the most prominent pitch class
+        key_index = np.argmax(chroma_mean)
+
+        # Map index to pitch class
+        pitch_classes = ['C', 'C#', 'D', 'D#', 'E', 'F', 'F#', 'G', 'G#', 'A', 'A#', 'B']
+        return pitch_classes[key_index]
+
     def extend_loop(
         self,
         audio_path: str,
@@ -0,0 +1,150 @@
+"""
+Band-energy analysis of rendered sections from one chunked STFT.
+
+:func:`analyze_band_energies` reads every band of a band set from a single
+Hann-windowed STFT of the mono mix, ``STFT_CHUNK_FRAMES`` frames at a time.
+Results are cached per process, keyed by the PCM and the band set.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Mapping, Optional
+
+import numpy as np
+from pydub import AudioSegment
+
+from app.config import settings
+
+# name -> (low_hz, high_hz), half-open [low, high)
+BandSet = Mapping[str, tuple[float, float]]
+
+RENDER_BANDS: dict[str, tuple[float, float]] = {
+    "melodic": (700.0, 5000.0),
+    "drum": (2000.0, 12000.0),
+    "bass": (30.0, 220.0),
+}
+
+STFT_FRAME_SIZE = 4096
+STFT_CHUNK_FRAMES = 256
+SILENT_LEVEL_DB = -120.0
+
+
+@dataclass(frozen=True)
+class BandEnergies:
+    """Band levels of one segment (dB) plus per-STFT-frame levels."""
+
+    levels_db: dict[str, float]
+    frame_levels_db: dict[str, np.ndarray]
+    hop_seconds: float
+
+    def __getitem__(self, band: str) -> float:
+        return self.levels_db[band]
+
+
+_cache: "OrderedDict[tuple, BandEnergies]" = OrderedDict()
+_lock = threading.Lock()
+
+
+def clear_band_energy_cache() -> None:
+    with _lock:
+        _cache.clear()
+
+
+def _cache_key(audio: AudioSegment, bands: BandSet) -> tuple:
+    digest = hashlib.blake2b(audio.raw_data, digest_size=16).hexdigest()
+    layout = (audio.frame_rate, audio.channels, audio.sample_width)
+    return (digest, layout, tuple(sorted((name, float(lo), float(hi)) for name, (lo, hi) in bands.items())))
+
+
+def _mono(audio: AudioSegment) -> np.ndarray:
+    samples = np.array(audio.get_array_of_samples(), dtype=np.float32)
+    if audio.channels > 1 and samples.size > 1:
+        samples = samples.reshape((-1, audio.channels)).mean(axis=1)
+    return samples
+
+
+def _band_weights(frame_size: int, frame_rate: int, bands: BandSet) -> np.ndarray:
+    """``(bins, bands)`` matrix that averages the power of each band's bins."""
+    freqs = np.fft.rfftfreq(frame_size, d=1.0 / max(1, frame_rate))
+    weights = np.zeros((freqs.size, len(bands)), dtype=np.float64)
+    for column, (low_hz, high_hz) in enumerate(bands.values()):
+        mask = (freqs >= low_hz) & (freqs < high_hz)
+        if mask.any():
+            weights[mask, column] = 1.0 / int(mask.sum())
+    return weights
+
+
+def _to_db(power: np.ndarray) -> np.ndarray:
+    return 10.0 * np.log10(np.maximum(power, 1e-16))
+
+
+def _stft_band_power(samples: np.ndarray, frame_rate: int, bands: BandSet) -> tuple[np.ndarray, int, np.ndarray]:
+    """Mean band power per STFT frame, ``(frames, bands)``, scaled to a full-length transform.
+
+    Also returns the hop in samples and which bands have any bins at this
+    frame size.
+    """
+    length = samples.size
+    frame_size = min(STFT_FRAME_SIZE, length)
+    hop = max(1, frame_size // 2)
+    if length > frame_size:
+        # Zero-pad the tail so the last samples fall inside a frame.
+        tail = (-(length - frame_size)) % hop
+        samples = np.concatenate((samples, np.zeros(tail, dtype=samples.dtype)))
+    window = np.hanning(frame_size + 2)[1:-1]
+    weights = _band_weights(frame_size, frame_rate, bands)
+    frames = np.lib.stride_tricks.sliding_window_view(samples, frame_size)[::hop]
+    power = np.empty((frames.shape[0], weights.shape[1]), dtype=np.float64)
+    for start in range(0, frames.shape[0], STFT_CHUNK_FRAMES):
+        chunk = frames[start:start + STFT_CHUNK_FRAMES] * window
+        spectrum = np.fft.rfft(chunk, axis=1)
+        power[start:start + chunk.shape[0]] = (spectrum.real ** 2 + spectrum.imag ** 2) @ weights
+    power *= length / float(np.sum(window ** 2))
+    return power, hop, weights.any(axis=0)
+
+
+def analyze_band_energies(audio: AudioSegment, bands: Optional[BandSet] = None) -> BandEnergies:
+    """Band levels of *audio* (peak-normalised mono) for *bands* (default :data:`RENDER_BANDS`)."""
+    bands = dict(bands or RENDER_BANDS)
+    max_entries = max(0, int(settings.band_energy_cache_entries))
+    key = _cache_key(audio, bands) if max_entries else None
+    if key is not None:
+        with _lock:
+            cached = _cache.get(key)
+            if cached is not None:
+                _cache.move_to_end(key)
+                return cached
+
+    result = _analyze(audio, bands)
+
+    if key is not None:
+        with _lock:
+            _cache[key] = result
+            _cache.move_to_end(key)
+            while len(_cache) > max_entries:
+                _cache.popitem(last=False)
+    return result
+
+
+def _analyze(audio: AudioSegment, bands: dict[str, tuple[float, float]]) -> BandEnergies:
+    samples = _mono(audio)
+    if samples.size == 0:
+        return BandEnergies(
+            levels_db={name: SILENT_LEVEL_DB for name in bands},
+            frame_levels_db={name: np.zeros(0, dtype=np.float32) for name in bands},
+            hop_seconds=0.0,
+        )
+    samples /= max(1.0, float(np.max(np.abs(samples))))
+    power, hop, has_bins = _stft_band_power(samples, audio.frame_rate, bands)
+    levels: dict[str, float] = {}
+    frame_levels: dict[str, np.ndarray] = {}
+    for column, name in enumerate(bands):
+        band_power = power[:, column]
+        # A band with no bins at this frame size keeps the old "no bins" level.
+        levels[name] = float(_to_db(band_power.mean())) if has_bins[column] else SILENT_LEVEL_DB
+        frame_levels[name] = _to_db(band_power).astype(np.float32)
+    return BandEnergies(levels_db=levels, frame_levels_db=frame_levels, hop_seconds=hop / max(1, audio.frame_rate))
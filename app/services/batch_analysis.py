@@ -0,0 +1,305 @@
+"""
+Batch loop analysis for catalog backfills.
+
+:func:`run_batch_analysis` prefetches storage reads on a thread pool, analyzes
+on a process pool and writes results back in bulk ``UPDATE`` batches.  Entry
+points: ``POST /loops/analyze-batch`` (RQ job) and
+``python -m app.workers.backfill_analysis``.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import multiprocessing
+import os
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.loop import Loop
+
+logger = logging.getLogger(__name__)
+
+# ``missing=`` filter name -> Loop column that is NULL for loops needing analysis.
+MISSING_FILTERS = {
+    "bpm": Loop.bpm,
+    "key": Loop.musical_key,
+    "bars": Loop.bars,
+    "duration": Loop.duration_seconds,
+}
+
+# Per-loop error messages kept in the result (the counters cover every loop).
+_MAX_REPORTED_ERRORS = 50
+
+
+@dataclass
+class BatchAnalysisResult:
+    """Counters and throughput of one batch run."""
+
+    requested: int
+    analyzed: int = 0
+    failed: int = 0
+    bytes_read: int = 0
+    elapsed_seconds: float = 0.0
+    errors: Dict[int, str] = field(default_factory=dict)
+
+    @property
+    def loops_per_second(self) -> float:
+        return (self.analyzed + self.failed) / self.elapsed_seconds if self.elapsed_seconds > 0 else 0.0
+
+    @property
+    def megabytes_per_second(self) -> float:
+        return self.bytes_read / (1024 * 1024) / self.elapsed_seconds if self.elapsed_seconds > 0 else 0.0
+
+    def record_error(self, loop_id: int, error: Any) -> None:
+        self.failed += 1
+        if len(self.errors) < _MAX_REPORTED_ERRORS:
+            self.errors[loop_id] = str(error)[:200]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "requested": self.requested,
+            "analyzed": self.analyzed,
+            "failed": self.failed,
+            "bytes_read": self.bytes_read,
+            "elapsed_seconds": round(self.elapsed_seconds, 3),
+            "loops_per_second": round(self.loops_per_second, 3),
+            "megabytes_per_second": round(self.megabytes_per_second, 3),
+            "errors": self.errors,
+        }
+
+
+@dataclass(frozen=True)
+class _LoopSource:
+    id: int
+    file_key: Optional[str]
+    filename: str
+    analysis_json: Optional[str]
+
+
+def select_loop_ids(
+    db: Session,
+    *,
+    loop_ids: Optional[Sequence[int]] = None,
+    missing: Optional[str] = None,
+    limit: Optional[int] = None,
+) -> List[int]:
+    """Return the ids of loops to analyze, in id order.
+
+    *loop_ids* restricts the selection to those loops; *missing* (a key of
+    :data:`MISSING_FILTERS`) to loops where that field is NULL.  Loops without
+    a stored file are never selected.
+    """
+    if missing is not None and missing not in MISSING_FILTERS:
+        raise ValueError(f"Unknown filter {missing!r}; expected one of {sorted(MISSING_FILTERS)}")
+    query = db.query(Loop.id).filter(Loop.file_key.isnot(None))
+    if loop_ids is not None:
+        query = query.filter(Loop.id.in_(list(loop_ids)))
+    if missing is not None:
+        query = query.filter(MISSING_FILTERS[missing].is_(None))
+    query = query.order_by(Loop.id)
+    if limit is not None:
+        query = query.limit(limit)
+    return [row[0] for row in query.all()]
+
+
+def _load_sources(db: Session, loop_ids: Sequence[int], chunk: int) -> Iterator[_LoopSource]:
+    for start in range(0, len(loop_ids), chunk):
+        rows = (
+            db.query(Loop.id, Loop.file_key, Loop.filename, Loop.name, Loop.analysis_json)
+            .filter(Loop.id.in_(loop_ids[start : start + chunk]))
+            .order_by(Loop.id)
+            .all()
+        )
+        for loop_id, file_key, filename, name, analysis_json in rows:
+            yield _LoopSource(loop_id, file_key, filename or name or "audio.wav", analysis_json)
+
+
+def _read_source(source: _LoopSource) -> bytes:
+    from app.services.storage import storage
+
+    if not source.file_key:
+        raise FileNotFoundError(f"Loop {source.id} has no stored file")
+    content = storage.read_file(source.file_key)
+    if content is None:
+        raise FileNotFoundError(f"Object {source.file_key} not found")
+    return content
+
+
+def _prefetched(
+    sources: Iterable[_LoopSource],
+    read: Callable[[_LoopSource], bytes],
+    depth: int,
+) -> Iterator[tuple[_LoopSource, Future]]:
+    """Yield ``(source, read future)`` in order with at most *depth* reads ahead."""
+    with ThreadPoolExecutor(max_workers=depth, thread_name_prefix="batch-analysis-read") as pool:
+        window: deque[tuple[_LoopSource, Future]] = deque()
+        for source in sources:
+            window.append((source, pool.submit(read, source)))
+            if len(window) >= depth:
+                yield window.popleft()
+        while window:
+            yield window.popleft()
+
+
+def _analyze_task(content: bytes, filename: str) -> Dict[str, Any]:
+    from app.services.loop_analyzer import loop_analyzer
+
+    return loop_analyzer.analyze_content(content, filename)
+
+
+class _InlineExecutor(Executor):
+    """Runs tasks in the calling thread (a single worker needs no pool)."""
+
+    def submit(self, fn, /, *args, **kwargs):  # type: ignore[override]
+        future: Future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as e:
+            future.set_exception(e)
+        return future
+
+
+def _row_update(source: _LoopSource, analysis: Dict[str, Any]) -> Dict[str, Any]:
+    """Column values for one analyzed loop; other analysis_json keys (stem separation) are kept."""
+    try:
+        payload = json.loads(source.analysis_json) if source.analysis_json else {}
+    except (TypeError, ValueError):
+        payload = {}
+    if not isinstance(payload, dict):
+        payload = {}
+    for name in ("bpm", "key", "duration", "bars"):
+        payload[name] = analysis.get(name)
+    if analysis.get("content_hash"):
+        payload["content_hash"] = analysis["content_hash"]
+    else:
+        payload.pop("content_hash", None)
+    bpm = analysis.get("bpm")
+    return {
+        "id": source.id,
+        "bpm": int(round(float(bpm))) if bpm is not None else None,
+        "musical_key": analysis.get("key"),
+        "duration_seconds": analysis.get("duration"),
+        "bars": analysis.get("bars"),
+        "analysis_json": json.dumps(payload),
+    }
+
+
+def _flush(db: Session, rows: List[Dict[str, Any]]) -> None:
+    if rows:
+        db.execute(update(Loop), rows)
+        db.commit()
+        rows.clear()
+
+
+def resolve_worker_count() -> int:
+    configured = int(settings.batch_analysis_workers or 0)
+    return max(1, configured if configured > 0 else (os.cpu_count() or 1))
+
+
+def _process_pool(workers: int) -> ProcessPoolExecutor:
+    """Analysis pool whose workers come from a forkserver (spawn where unavailable).
+
+    The caller is a worker process with its own threads (the prefetch pool,
+    the RQ heartbeat); forking it could copy a lock another thread holds.
+    """
+    methods = multiprocessing.get_all_start_methods()
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn"),
+    )
+
+
+def run_batch_analysis(
+    db: Session,
+    loop_ids: Sequence[int],
+    *,
+    workers: Optional[int] = None,
+    prefetch: Optional[int] = None,
+    update_batch: Optional[int] = None,
+    progress: Optional[Callable[[BatchAnalysisResult], None]] = None,
+) -> BatchAnalysisResult:
+    """Analyze *loop_ids* and write bpm/key/duration/bars back in bulk.
+
+    *progress* is called with the running result after every bulk UPDATE.
+    """
+    loop_ids = list(loop_ids)
+    workers = max(1, workers or resolve_worker_count())
+    prefetch = max(1, prefetch or settings.batch_analysis_prefetch)
+    update_batch = max(1, update_batch or settings.batch_analysis_update_batch)
+    result = BatchAnalysisResult(requested=len(loop_ids))
+    started = time.perf_counter()
+
+    pending_rows: List[Dict[str, Any]] = []
+    in_flight: Dict[Future, _LoopSource] = {}
+
+    def collect(done: Iterable[Future]) -> None:
+        for future in done:
+            source = in_flight.pop(future)
+            try:
+                pending_rows.append(_row_update(source, future.result()))
+                result.analyzed += 1
+            except Exception as e:
+                result.record_error(source.id, e)
+        if len(pending_rows) >= update_batch:
+            _flush(db, pending_rows)
+            result.elapsed_seconds = time.perf_counter() - started
+            if progress is not None:
+                progress(result)
+
+    executor = _InlineExecutor() if workers == 1 else _process_pool(workers)
+    try:
+        sources = _load_sources(db, loop_ids, update_batch)
+        for source, read in _prefetched(sources, _read_source, prefetch):
+            try:
+                content = read.result()
+            except Exception as e:
+                result.record_error(source.id, e)
+                continue
+            result.bytes_read += len(content)
+            in_flight[executor.submit(_analyze_task, content, source.filename)] = source
+            # Keep the pool busy without holding every downloaded file in memory.
+            if len(in_flight) >= workers * 2:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                collect(done)
+        collect(list(in_flight))
+        _flush(db, pending_rows)
+    finally:
+        executor.shutdown(wait=True)
+
+    result.elapsed_seconds = time.perf_counter() - started
+    logger.info(
+        "BATCH_ANALYSIS_COMPLETE requested=%d analyzed=%d failed=%d workers=%d prefetch=%d "
+        "elapsed_s=%.2f loops_per_s=%.2f mb_per_s=%.2f",
+        result.requested,
+        result.analyzed,
+        result.failed,
+        workers,
+        prefetch,
+        result.elapsed_seconds,
+        result.loops_per_second,
+        result.megabytes_per_second,
+    )
+    return result
+
+
+def enqueue_batch_analysis(loop_ids: Sequence[int]) -> Optional[str]:
+    """Queue a batch analysis of *loop_ids*; returns the RQ job id, or None without Redis."""
+    from app.queue import ANALYSIS_QUEUE_NAME, get_queue, resolve_queue_name
+    from app.workers.backfill_analysis import batch_analysis_worker
+
+    try:
+        queue = get_queue(name=resolve_queue_name(ANALYSIS_QUEUE_NAME))
+        job = queue.enqueue(batch_analysis_worker, list(loop_ids), job_timeout=-1)
+    except Exception as e:
+        logger.warning("batch_analysis_enqueue_failed: loops=%d error=%s", len(loop_ids), e)
+        return None
+    logger.info("batch_analysis_enqueued: job_id=%s loops=%d", job.id, len(loop_ids))
+    return job.id
@@ -3,12 +3,10 @@ DAW Export System: Exports arrangement as stem files, MIDI, and metadata.
 
 Creates ZIP with:
 /stems
-  - kick.wav
-  - snare.wav
-  - hats.wav
-  - bass.wav
-  - melody.wav
-  - pads.wav
+  - <role>.wav (or .flac) per stem role the arrangement was rendered from,
+    e.g. drums.wav, bass.wav, melody.wav
+  - kick/snare/hats/bass/melody/pads.wav band-split from the mix when the
+    arrangement was rendered without stems
   
 /midi
   - drums.mid
@@ -19,20 +17,154 @@ Creates ZIP with:
   - markers.csv
   - tempo_map.json
   - README.txt
+
+:meth:`DAWExporter.write_export_zip` streams the package into any writable
+sink (a storage upload stream, a file, a ``BytesIO``): stems are encoded a
+chunk at a time and stored uncompressed (DEFLATE barely shrinks PCM), so
+memory holds one section of one stem rather than the whole package.
+:func:`role_bus_stems` lays each role's stem out over the render timeline
+(see app/services/daw_export_job.py).
 """
 
 import logging
 import json
 import csv
 import io
+import shutil
+import tempfile
+import time
 import zipfile
-from typing import Dict, List
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence
 from pathlib import Path
+
+import numpy as np
 from pydub import AudioSegment
+
 from app.services.producer_models import ProducerArrangement, Section
+from app.services.render_output import DEFAULT_CHUNK_FRAMES, wav_header
+
+try:
+    import soundfile
+except ImportError:  # pragma: no cover - soundfile is in requirements.txt
+    soundfile = None
 
 logger = logging.getLogger(__name__)
 
+STEM_FORMAT_WAV = "wav"
+STEM_FORMAT_FLAC = "flac"
+METADATA_FILES = ["markers.csv", "tempo_map.json", "README.txt"]
+
+# Where the stems of a package came from (README wording).
+STEM_SOURCE_ROLE_BUSES = "role_buses"
+STEM_SOURCE_BAND_SPLIT = "band_split"
+
+
+@dataclass(frozen=True)
+class ExportStem:
+    """One stem of an export package: PCM format, exact length and its audio.
+
+    ``chunks()`` yields the audio as little-endian signed PCM (``bytes`` or
+    ``(frames, channels)`` arrays) totalling exactly ``frame_count`` frames;
+    it is called once, while the stem is written.
+    """
+
+    frame_rate: int
+    channels: int
+    sample_width: int
+    frame_count: int
+    chunks: Callable[[], Iterable[Any]]
+
+    @property
+    def frame_bytes(self) -> int:
+        return self.channels * self.sample_width
+
+
+@dataclass(frozen=True)
+class BusSection:
+    """A stretch of the render timeline: its length and the premix gain (dB) of each role playing in it."""
+
+    frame_count: int
+    role_gains_db: Mapping[str, float]
+
+
+def role_bus_stems(
+    sources: Mapping[str, np.ndarray],
+    sections: Sequence[BusSection],
+    *,
+    frame_rate: int,
+    crossfade_frames: int = 0,
+) -> Dict[str, ExportStem]:
+    """One stem per role in *sources*, laid out over *sections* like the renderer's mix.
+
+    *sources* are ``(frames, channels)`` int16 loops (e.g. canonical PCM
+    stems).  In each section a role's loop repeats from its first frame at the
+    section's premix gain, or is silent when the role does not play there.
+    Consecutive sections overlap by *crossfade_frames* with a linear crossfade,
+    as ``RenderBuffer.append`` joins them, so every stem lines up with the
+    rendered mix and all stems share one length.
+    """
+    overlaps = [0] * len(sections)
+    total = 0
+    for index, section in enumerate(sections):
+        if index and crossfade_frames > 0 and total >= 2 * crossfade_frames and section.frame_count >= 2 * crossfade_frames:
+            overlaps[index] = crossfade_frames
+        total += section.frame_count - overlaps[index]
+
+    return {
+        role: ExportStem(
+            frame_rate=frame_rate,
+            channels=int(source.shape[1]),
+            sample_width=2,
+            frame_count=total,
+            chunks=lambda role=role, source=source: _iter_role_bus(role, source, sections, overlaps),
+        )
+        for role, source in sources.items()
+    }
+
+
+def _iter_role_bus(
+    role: str, source: np.ndarray, sections: Sequence[BusSection], overlaps: Sequence[int]
+) -> Iterator[np.ndarray]:
+    from app.services.dsp import loop_frames
+
+    channels = int(source.shape[1])
+    held: Optional[np.ndarray] = None
+    for index, section in enumerate(sections):
+        gain_db = section.role_gains_db.get(role)
+        if gain_db is None or not source.shape[0]:
+            frames = np.zeros((section.frame_count, channels), dtype=np.float32)
+        else:
+            frames = loop_frames(source, section.frame_count).astype(np.float32)
+            frames *= np.float32(10.0 ** (float(gain_db) / 20.0))
+        overlap = overlaps[index]
+        if overlap and held is not None:
+            ramp = np.linspace(0.0, 1.0, overlap, endpoint=False, dtype=np.float32)[:, None]
+            frames[:overlap] = held * (1.0 - ramp) + frames[:overlap] * ramp
+        next_overlap = overlaps[index + 1] if index + 1 < len(sections) else 0
+        if next_overlap:
+            held = frames[-next_overlap:].copy()
+            frames = frames[:-next_overlap]
+        yield np.clip(np.rint(frames), -32768, 32767).astype("<i2")
+
+
+class _WriteOnlySink:
+    """What ``zipfile`` needs of an unseekable output, over a sink with only ``write``.
+
+    Storage upload streams cannot seek or flush; without ``tell`` zipfile
+    writes each entry's sizes after its data instead of seeking back.
+    """
+
+    def __init__(self, sink: Any) -> None:
+        self._sink = sink
+
+    def write(self, data) -> int:
+        self._sink.write(data)
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
 
 class DAWExporter:
     """Exports arrangements for use in DAWs (FL Studio, Ableton, Logic, etc.)"""
@@ -302,11 +434,56 @@ For issues or questions, visit the LoopArchitect project.
         sections: List[Dict],
         midi_files: Dict[str, bytes] | None = None,
     ) -> tuple[bytes, Dict]:
-        """Build a real DAW export ZIP with non-empty stems and metadata files."""
-        midi_files = midi_files or {}
+        """Build a DAW export ZIP in memory with stems band-split from *full_mix*.
 
-        stems = DAWExporter._derive_stems_from_mix(full_mix)
-        DAWExporter._validate_stems(stems, expected_duration_ms=len(full_mix))
+        Used for arrangements rendered without stems; see :meth:`write_export_zip`
+        to stream a package with real stems.
+        """
+        zip_buffer = io.BytesIO()
+        contents = DAWExporter.write_export_zip(
+            zip_buffer,
+            arrangement_id=arrangement_id,
+            stems=DAWExporter.band_split_stems(full_mix),
+            bpm=bpm,
+            musical_key=musical_key,
+            sections=sections,
+            midi_files=midi_files,
+            stem_source=STEM_SOURCE_BAND_SPLIT,
+        )
+        payload = zip_buffer.getvalue()
+        if not payload:
+            raise ValueError("Generated DAW export ZIP is empty")
+        return payload, contents
+
+    @staticmethod
+    def write_export_zip(
+        sink: Any,
+        *,
+        arrangement_id: int,
+        stems: Mapping[str, ExportStem],
+        bpm: float,
+        musical_key: str,
+        sections: List[Dict],
+        midi_files: Dict[str, bytes] | None = None,
+        stem_format: str = STEM_FORMAT_WAV,
+        stem_source: str = STEM_SOURCE_ROLE_BUSES,
+    ) -> Dict:
+        """Stream a DAW export ZIP into *sink* and return its contents listing.
+
+        *sink* only needs ``write``; it is not closed.  Stems are written one at
+        a time as ``stems/<name>.wav`` (or ``.flac`` with
+        ``stem_format="flac"``, falling back to WAV when soundfile cannot
+        encode it) and stored uncompressed.
+
+        Raises:
+            ValueError: If there are no stems or a stem is empty
+        """
+        midi_files = midi_files or {}
+        if not stems:
+            raise ValueError("No stems were generated")
+        for name, stem in stems.items():
+            if stem.frame_count <= 0:
+                raise ValueError(f"Stem has zero duration: {name}")
 
         markers_csv = DAWExporter._generate_markers_csv_from_sections(sections, bpm)
         tempo_map_json = json.dumps(
@@ -325,19 +502,14 @@ For issues or questions, visit the LoopArchitect project.
             musical_key=musical_key,
             sections=sections,
             midi_included=sorted(list(midi_files.keys())),
+            stem_format=stem_format,
+            stem_source=stem_source,
         )
 
-        zip_buffer = io.BytesIO()
-        with zipfile.ZipFile(zip_buffer, mode="w", compression=zipfile.ZIP_DEFLATED) as archive:
+        with zipfile.ZipFile(_WriteOnlySink(sink), mode="w", compression=zipfile.ZIP_DEFLATED) as archive:
             stem_names: list[str] = []
-            for stem_name, stem_audio in stems.items():
-                stem_bytes = io.BytesIO()
-                stem_audio.export(stem_bytes, format="wav")
-                raw = stem_bytes.getvalue()
-                if not raw:
-                    raise ValueError(f"Generated empty stem file: {stem_name}")
-                archive.writestr(f"stems/{stem_name}.wav", raw)
-                stem_names.append(f"stems/{stem_name}.wav")
+            for stem_name, stem in stems.items():
+                stem_names.append(DAWExporter._write_stem(archive, f"stems/{stem_name}", stem, stem_format))
 
             midi_paths: list[str] = []
             for midi_filename, midi_content in midi_files.items():
@@ -351,59 +523,120 @@ For issues or questions, visit the LoopArchitect project.
             archive.writestr("tempo_map.json", tempo_map_json.encode("utf-8"))
             archive.writestr("README.txt", readme.encode("utf-8"))
 
-        payload = zip_buffer.getvalue()
-        if not payload:
-            raise ValueError("Generated DAW export ZIP is empty")
-
-        return payload, {
+        return {
             "stems": stem_names,
             "midi": midi_paths,
-            "metadata": ["markers.csv", "tempo_map.json", "README.txt"],
+            "metadata": list(METADATA_FILES),
         }
 
     @staticmethod
-    def _derive_stems_from_mix(full_mix: AudioSegment) -> Dict[str, AudioSegment]:
-        """Create real, non-empty stem tracks from the rendered mix using frequency bands."""
-        duration_ms = len(full_mix)
-
-        kick = full_mix.low_pass_filter(140)
-        bass = full_mix.high_pass_filter(45).low_pass_filter(260)
-        snare = full_mix.high_pass_filter(180).low_pass_filter(4000)
-        hats = full_mix.high_pass_filter(5000)
-        melody = full_mix.high_pass_filter(700).low_pass_filter(8500)
-        pads = full_mix.high_pass_filter(180).low_pass_filter(2200)
-
-        stems = {
-            "kick": DAWExporter._normalize_stem_duration(kick, duration_ms),
-            "bass": DAWExporter._normalize_stem_duration(bass, duration_ms),
-            "snare": DAWExporter._normalize_stem_duration(snare, duration_ms),
-            "hats": DAWExporter._normalize_stem_duration(hats, duration_ms),
-            "melody": DAWExporter._normalize_stem_duration(melody, duration_ms),
-            "pads": DAWExporter._normalize_stem_duration(pads, duration_ms),
-        }
-        return stems
+    def _write_stem(archive: zipfile.ZipFile, base_path: str, stem: ExportStem, stem_format: str) -> str:
+        """Write *stem* as ``<base_path>.flac`` or ``.wav``; return the entry name."""
+        if stem_format == STEM_FORMAT_FLAC:
+            if soundfile is not None and stem.sample_width == 2:
+                path = f"{base_path}.flac"
+                DAWExporter._write_flac_entry(archive, path, stem)
+                return path
+            logger.warning(
+                "DAW export: cannot encode %s as FLAC (soundfile=%s, sample_width=%s); writing WAV",
+                base_path,
+                soundfile is not None,
+                stem.sample_width,
+            )
+        path = f"{base_path}.wav"
+        header = wav_header(
+            frame_rate=stem.frame_rate,
+            channels=stem.channels,
+            sample_width=stem.sample_width,
+            frame_count=stem.frame_count,
+        )
+        expected = len(header) + stem.frame_count * stem.frame_bytes
+        with archive.open(DAWExporter._stored_entry(path, expected), mode="w") as entry:
+            entry.write(header)
+            written = len(header)
+            for chunk in stem.chunks():
+                view = DAWExporter._chunk_bytes(chunk)
+                entry.write(view)
+                written += len(view)
+        if written != expected:
+            raise ValueError(f"Stem {path} wrote {written} bytes, expected {expected}")
+        return path
 
     @staticmethod
-    def _normalize_stem_duration(stem: AudioSegment, duration_ms: int) -> AudioSegment:
-        """Ensure all stems start at 0:00 and have equal total duration."""
-        clipped = stem[:duration_ms]
-        if len(clipped) < duration_ms:
-            clipped = clipped + AudioSegment.silent(duration=duration_ms - len(clipped))
-        return clipped
+    def _write_flac_entry(archive: zipfile.ZipFile, path: str, stem: ExportStem) -> None:
+        # libsndfile seeks back to finish the FLAC header, so the stem is
+        # encoded into a temp file and then copied into the (unseekable) entry.
+        with tempfile.TemporaryFile() as encoded:
+            with soundfile.SoundFile(
+                encoded,
+                mode="w",
+                samplerate=stem.frame_rate,
+                channels=stem.channels,
+                format="FLAC",
+                subtype="PCM_16",
+            ) as flac:
+                for chunk in stem.chunks():
+                    flac.write(np.frombuffer(DAWExporter._chunk_bytes(chunk), dtype="<i2").reshape(-1, stem.channels))
+            size = encoded.tell()
+            encoded.seek(0)
+            with archive.open(DAWExporter._stored_entry(path, size), mode="w") as entry:
+                shutil.copyfileobj(encoded, entry, 1024 * 1024)
 
     @staticmethod
-    def _validate_stems(stems: Dict[str, AudioSegment], expected_duration_ms: int) -> None:
-        """Validate non-empty stems and exact duration alignment."""
-        if not stems:
-            raise ValueError("No stems were generated")
+    def _stored_entry(path: str, size: int) -> zipfile.ZipInfo:
+        info = zipfile.ZipInfo(path, date_time=time.localtime(time.time())[:6])
+        info.compress_type = zipfile.ZIP_STORED
+        info.external_attr = 0o600 << 16
+        # Only used to decide up front whether the entry needs ZIP64 sizes.
+        info.file_size = size
+        return info
 
-        for name, segment in stems.items():
-            if len(segment) <= 0:
-                raise ValueError(f"Stem has zero duration: {name}")
-            if len(segment) != expected_duration_ms:
-                raise ValueError(
-                    f"Stem duration mismatch for {name}: expected {expected_duration_ms}ms, got {len(segment)}ms"
-                )
+    @staticmethod
+    def _chunk_bytes(chunk: Any) -> memoryview:
+        if isinstance(chunk, np.ndarray):
+            chunk = np.ascontiguousarray(chunk)
+        return memoryview(chunk).cast("B")
+
+    @staticmethod
+    def band_split_stems(full_mix: AudioSegment) -> Dict[str, ExportStem]:
+        """Stems band-split from *full_mix*, each filtered only when it is written."""
+        if full_mix.sample_width == 1:
+            # pydub keeps 8-bit audio signed; WAV stores it unsigned.
+            full_mix = full_mix.set_sample_width(2)
+        frame_count = int(full_mix.frame_count())
+        if frame_count <= 0:
+            raise ValueError("Stem has zero duration: full_mix")
+
+        def _chunks(band: Callable[[AudioSegment], AudioSegment]) -> Iterator[memoryview]:
+            # Filters keep the frame count; pad defensively so every stem
+            # starts at 0:00 with exactly the mix's length.
+            size = frame_count * full_mix.frame_width
+            raw = band(full_mix).raw_data[:size]
+            raw = memoryview(raw + b"\x00" * (size - len(raw)))
+            step = DEFAULT_CHUNK_FRAMES * full_mix.frame_width
+            for offset in range(0, len(raw), step):
+                yield raw[offset: offset + step]
+
+        return {
+            name: ExportStem(
+                frame_rate=full_mix.frame_rate,
+                channels=full_mix.channels,
+                sample_width=full_mix.sample_width,
+                frame_count=frame_count,
+                chunks=lambda band=band: _chunks(band),
+            )
+            for name, band in DAWExporter._STEM_BANDS.items()
+        }
+
+    # Band-split stems for arrangements rendered without stems.
+    _STEM_BANDS: Dict[str, Callable[[AudioSegment], AudioSegment]] = {
+        "kick": lambda mix: mix.low_pass_filter(140),
+        "bass": lambda mix: mix.high_pass_filter(45).low_pass_filter(260),
+        "snare": lambda mix: mix.high_pass_filter(180).low_pass_filter(4000),
+        "hats": lambda mix: mix.high_pass_filter(5000),
+        "melody": lambda mix: mix.high_pass_filter(700).low_pass_filter(8500),
+        "pads": lambda mix: mix.high_pass_filter(180).low_pass_filter(2200),
+    }
 
     @staticmethod
     def _generate_markers_csv_from_sections(sections: List[Dict], bpm: float) -> str:
@@ -450,6 +683,8 @@ For issues or questions, visit the LoopArchitect project.
         musical_key: str,
         sections: List[Dict],
         midi_included: List[str],
+        stem_format: str = STEM_FORMAT_WAV,
+        stem_source: str = STEM_SOURCE_BAND_SPLIT,
     ) -> str:
         lines = [
             "# LoopArchitect DAW Export",
@@ -459,7 +694,11 @@ For issues or questions, visit the LoopArchitect project.
             f"Key: {musical_key}",
             "",
             "Contents:",
-            "- stems/*.wav (derived from final rendered mix)",
+            (
+                f"- stems/*.{stem_format} (one per stem role of the render)"
+                if stem_source == STEM_SOURCE_ROLE_BUSES
+                else "- stems/*.wav (derived from final rendered mix)"
+            ),
         ]
         if midi_included:
             lines.append("- midi/*.mid (real MIDI artifacts found for this arrangement)")
@@ -482,5 +721,11 @@ For issues or questions, visit the LoopArchitect project.
         lines.append("")
         lines.append("Notes:")
         lines.append("- All stems start at 0:00 and have equal duration for DAW alignment.")
-        lines.append("- Stems are generated from the completed arrangement render using band-splitting.")
+        if stem_source == STEM_SOURCE_ROLE_BUSES:
+            lines.append(
+                "- Each stem is one role's layer as the renderer arranged it (section on/off and level); "
+                "section effects and mastering are applied to the mix only."
+            )
+        else:
+            lines.append("- Stems are generated from the completed arrangement render using band-splitting.")
         return "\n".join(lines)
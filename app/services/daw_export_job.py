@@ -0,0 +1,306 @@
+"""
+DAW export jobs: build an arrangement's export package off the request path.
+
+:func:`build_daw_export` lays each stem the arrangement was rendered from over
+the render timeline, so the stems line up with the mix, and streams the ZIP
+into storage.  Arrangements rendered without stems fall back to
+band-splitting the mix.
+"""
+
+import io
+import json
+import logging
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+from pydub import AudioSegment
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.arrangement import Arrangement
+from app.models.loop import Loop
+from app.schemas.job import OutputFile
+from app.services.daw_export import (
+    STEM_FORMAT_FLAC,
+    STEM_FORMAT_WAV,
+    STEM_SOURCE_BAND_SPLIT,
+    STEM_SOURCE_ROLE_BUSES,
+    BusSection,
+    DAWExporter,
+    ExportStem,
+    role_bus_stems,
+)
+from app.services.job_service import update_job_status
+from app.services.pcm_stem_store import CANONICAL_CHANNELS, CANONICAL_DTYPE, CANONICAL_FRAME_RATE, canonicalize
+from app.services.storage import storage
+
+logger = logging.getLogger(__name__)
+
+
+def daw_export_key(arrangement_id: int) -> str:
+    return f"exports/{arrangement_id}.zip"
+
+
+def _contents_key(arrangement_id: int) -> str:
+    return f"exports/{arrangement_id}.contents.json"
+
+
+def daw_export_download_url(arrangement_id: int) -> str:
+    return f"/api/v1/arrangements/{arrangement_id}/daw-export/download"
+
+
+def export_sections(arrangement: Arrangement) -> list[dict]:
+    """Section markers (name, bar_start, bars) for the export's metadata files."""
+    sections: list[dict] = []
+
+    if arrangement.producer_arrangement_json:
+        try:
+            producer_payload = json.loads(arrangement.producer_arrangement_json)
+            for section in producer_payload.get("sections", []):
+                sections.append(
+                    {
+                        "name": section.get("name") or section.get("type") or "Section",
+                        "bar_start": int(section.get("bar_start", section.get("start_bar", 0))),
+                        "bars": int(section.get("bars", 1)),
+                    }
+                )
+        except Exception:
+            logger.warning("Failed to parse producer_arrangement_json for arrangement %s", arrangement.id, exc_info=True)
+
+    if not sections and arrangement.render_plan_json:
+        try:
+            render_plan = json.loads(arrangement.render_plan_json)
+            for section in render_plan.get("sections", []):
+                sections.append(
+                    {
+                        "name": section.get("name", "Section"),
+                        "bar_start": int(section.get("start_bar", section.get("bar_start", 0))),
+                        "bars": int(section.get("bars", 1)),
+                    }
+                )
+        except Exception:
+            logger.warning("Failed to parse render_plan_json for arrangement %s", arrangement.id, exc_info=True)
+
+    if not sections:
+        sections = [{"name": "Full Arrangement", "bar_start": 0, "bars": 1}]
+
+    return sections
+
+
+def collect_midi_artifacts(arrangement_id: int) -> dict[str, bytes]:
+    """Collect real MIDI artifacts if they already exist. No placeholder MIDI is generated."""
+    midi_artifacts: dict[str, bytes] = {}
+    local_uploads = Path("uploads")
+    if not local_uploads.exists():
+        return midi_artifacts
+
+    possible_names = [
+        f"arrangement_{arrangement_id}_drums.mid",
+        f"arrangement_{arrangement_id}_bass.mid",
+        f"arrangement_{arrangement_id}_melody.mid",
+        f"arrangement_{arrangement_id}.mid",
+    ]
+    for filename in possible_names:
+        candidate = local_uploads / filename
+        if candidate.exists() and candidate.stat().st_size > 0:
+            midi_artifacts[filename] = candidate.read_bytes()
+
+    return midi_artifacts
+
+
+def load_export_contents(arrangement_id: int) -> Optional[Dict]:
+    """The contents listing stored with a built export, or None (exports built before it was recorded)."""
+    try:
+        payload = storage.read_file(_contents_key(arrangement_id))
+        return json.loads(payload) if payload else None
+    except Exception as e:
+        logger.warning("DAW export: could not read contents for arrangement %s: %s", arrangement_id, e)
+        return None
+
+
+def role_bus_sections(timeline_sections: List[dict], bpm: float, frame_rate: int = CANONICAL_FRAME_RATE) -> List[BusSection]:
+    """The renderer's stem layout, one :class:`BusSection` per rendered section or phrase.
+
+    Mirrors ``_render_producer_section``: sections are whole bars of
+    ``int(240000 / bpm)`` ms; a section whose phrase split was executed plays
+    its first-phrase stems up to ``split_bar`` and its second-phrase stems
+    after; each playing stem is premixed with ``_stem_premix_gain_db``.
+    """
+    from app.services.arrangement_jobs import _stem_premix_gain_db
+    from app.services.dsp import ms_to_frames
+
+    bar_duration_ms = int((60.0 / bpm) * 4.0 * 1000)
+    plan: List[BusSection] = []
+    for section in timeline_sections:
+        bars = int(section.get("bars") or 0)
+        if bars <= 0:
+            continue
+        first = section.get("runtime_first_phrase_stems")
+        second = section.get("runtime_second_phrase_stems")
+        if first and second and bars > 1:
+            phrase_plan = section.get("phrase_plan") or {}
+            split_bar = int(phrase_plan.get("split_bar", bars // 2) or (bars // 2))
+            split_bar = max(1, min(bars - 1, split_bar))
+            parts = [(split_bar, first), (bars - split_bar, second)]
+        else:
+            parts = [(bars, section.get("runtime_active_stems") or [])]
+        for part_bars, roles in parts:
+            roles = list(dict.fromkeys(str(role) for role in roles))
+            plan.append(
+                BusSection(
+                    frame_count=ms_to_frames(part_bars * bar_duration_ms, frame_rate),
+                    role_gains_db={role: _stem_premix_gain_db(role, len(roles)) for role in roles},
+                )
+            )
+    return plan
+
+
+def _role_stems(arrangement: Arrangement, loop: Optional[Loop]) -> Optional[Dict[str, ExportStem]]:
+    """Per-role stems for *arrangement*, or None when it was not rendered from stems."""
+    from app.services.arrangement_jobs import _SECTION_CROSSFADE_MS, _parse_stem_metadata_from_loop
+    from app.services.stem_loader import StemLoadError, load_stems_from_metadata
+
+    stem_metadata = _parse_stem_metadata_from_loop(loop)
+    if not (stem_metadata and stem_metadata.get("enabled") and stem_metadata.get("succeeded")):
+        return None
+    try:
+        timeline = json.loads(arrangement.arrangement_json or "{}")
+    except json.JSONDecodeError:
+        logger.warning("DAW export: arrangement_json of arrangement %s is not JSON", arrangement.id)
+        return None
+    timeline_sections = timeline.get("sections") if isinstance(timeline, dict) else None
+    if not timeline_sections:
+        return None
+
+    bpm = float(timeline.get("bpm") or (loop.bpm if loop else None) or 120.0)
+    plan = role_bus_sections(timeline_sections, bpm)
+    played = {role for section in plan for role in section.role_gains_db}
+    if not played:
+        return None
+    try:
+        loaded = load_stems_from_metadata(stem_metadata, timeout_seconds=60.0)
+    except StemLoadError as e:
+        logger.warning("DAW export: stems of loop %s could not be loaded (%s); band-splitting the mix", loop.id, e)
+        return None
+
+    sources = {
+        role: np.frombuffer(canonicalize(audio).raw_data, dtype=CANONICAL_DTYPE).reshape(-1, CANONICAL_CHANNELS)
+        for role, audio in loaded.items()
+        if role in played
+    }
+    if not sources:
+        return None
+    return role_bus_stems(
+        sources,
+        plan,
+        frame_rate=CANONICAL_FRAME_RATE,
+        # RenderBuffer.append's crossfade, in frames.
+        crossfade_frames=int(_SECTION_CROSSFADE_MS * CANONICAL_FRAME_RATE / 1000),
+    )
+
+
+def _load_mix(arrangement: Arrangement) -> AudioSegment:
+    if not arrangement.output_s3_key:
+        raise ValueError("Arrangement output key missing. Cannot generate DAW export.")
+    data = storage.read_file(arrangement.output_s3_key)
+    if not data:
+        raise ValueError(f"Rendered arrangement {arrangement.output_s3_key} not found in storage.")
+    fmt = Path(arrangement.output_s3_key).suffix.lstrip(".").lower() or "wav"
+    return AudioSegment.from_file(io.BytesIO(data), format=fmt)
+
+
+def build_daw_export(db: Session, arrangement: Arrangement, stem_format: Optional[str] = None) -> Dict:
+    """Stream *arrangement*'s export ZIP to ``exports/<id>.zip`` and return its contents listing."""
+    stem_format = str(stem_format or settings.daw_export_stem_format or STEM_FORMAT_WAV).strip().lower()
+    if stem_format not in (STEM_FORMAT_WAV, STEM_FORMAT_FLAC):
+        logger.warning("Unknown DAW_EXPORT_STEM_FORMAT %r; writing WAV stems", stem_format)
+        stem_format = STEM_FORMAT_WAV
+
+    loop = db.query(Loop).filter(Loop.id == arrangement.loop_id).first()
+    tempo = float(loop.bpm) if loop and loop.bpm else 120.0
+    musical_key = loop.musical_key if loop and loop.musical_key else "C"
+
+    stems = _role_stems(arrangement, loop)
+    stem_source = STEM_SOURCE_ROLE_BUSES
+    if stems is None:
+        stems = DAWExporter.band_split_stems(_load_mix(arrangement))
+        stem_source = STEM_SOURCE_BAND_SPLIT
+        stem_format = STEM_FORMAT_WAV
+
+    export_key = daw_export_key(arrangement.id)
+    logger.info(
+        "DAW export: streaming ZIP for arrangement %s (key=%s, stems=%s, source=%s, format=%s)",
+        arrangement.id,
+        export_key,
+        sorted(stems),
+        stem_source,
+        stem_format,
+    )
+    with storage.open_upload_stream(export_key, "application/zip") as sink:
+        contents = DAWExporter.write_export_zip(
+            sink,
+            arrangement_id=arrangement.id,
+            stems=stems,
+            bpm=tempo,
+            musical_key=musical_key,
+            sections=export_sections(arrangement),
+            midi_files=collect_midi_artifacts(arrangement.id),
+            stem_format=stem_format,
+            stem_source=stem_source,
+        )
+        size = sink.bytes_written
+    storage.upload_file(
+        file_bytes=json.dumps(contents).encode("utf-8"),
+        content_type="application/json",
+        key=_contents_key(arrangement.id),
+    )
+    logger.info("DAW export: ZIP uploaded for arrangement %s (size=%d bytes)", arrangement.id, size)
+
+    arrangement.stems_zip_url = daw_export_download_url(arrangement.id)
+    db.commit()
+    return contents
+
+
+def run_daw_export_job(db: Session, job_id: str, arrangement_id: int) -> Dict:
+    """
+    Build the export for ``daw_export`` job *job_id* and record the outcome on the job.
+
+    Raises whatever :func:`build_daw_export` raised, after marking the job failed.
+    """
+    update_job_status(db, job_id, "processing", progress=10.0, progress_message="Building DAW export")
+    try:
+        arrangement = db.query(Arrangement).filter(Arrangement.id == arrangement_id).first()
+        if arrangement is None:
+            raise ValueError(f"Arrangement {arrangement_id} not found")
+        if arrangement.status != "done":
+            raise ValueError(f"Arrangement {arrangement_id} is {arrangement.status}, not done")
+        contents = build_daw_export(db, arrangement)
+    except Exception as e:
+        logger.exception("DAW export job %s failed for arrangement %s", job_id, arrangement_id)
+        db.rollback()
+        update_job_status(
+            db,
+            job_id,
+            "failed",
+            progress_message="DAW export failed",
+            error_message=f"DAW export failed: {e}",
+        )
+        raise
+
+    update_job_status(
+        db,
+        job_id,
+        "succeeded",
+        progress=100.0,
+        progress_message="DAW export ready",
+        output_files=[
+            OutputFile(
+                name=f"arrangement_{arrangement_id}_daw_export.zip",
+                s3_key=daw_export_key(arrangement_id),
+                content_type="application/zip",
+            )
+        ],
+        render_metadata={"daw_export": contents},
+    )
+    return contents
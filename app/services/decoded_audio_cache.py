@@ -0,0 +1,291 @@
+"""
+Content-addressed cache of decoded source audio shared across render jobs.
+
+Decoded PCM is keyed by storage key + object version (S3 ETag or local content
+hash), in a per-process memory LRU and an on-disk WAV tier shared by the
+host's workers; both are byte-bounded and evicted least-recently-used first.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+import wave
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from pydub import AudioSegment
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+_DISK_SUFFIX = ".wav"
+
+
+def cache_key(file_key: str, version: str) -> str:
+    """Return the content address for *file_key* at *version*."""
+    return hashlib.sha256(f"{file_key}\0{version}".encode("utf-8")).hexdigest()
+
+
+class DecodedAudioCache:
+    """Two-tier (memory + disk) LRU cache of decoded ``AudioSegment`` objects."""
+
+    def __init__(
+        self,
+        directory: str | os.PathLike,
+        *,
+        max_disk_bytes: int,
+        max_memory_bytes: int,
+    ) -> None:
+        self.directory = Path(directory)
+        self.max_disk_bytes = max(0, int(max_disk_bytes))
+        self.max_memory_bytes = max(0, int(max_memory_bytes))
+        self._memory: "OrderedDict[str, AudioSegment]" = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        self._counters = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "bypassed": 0,
+            "stores": 0,
+            "evictions": 0,
+            "errors": 0,
+        }
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def get(self, key: str) -> Optional[AudioSegment]:
+        """Return the cached segment for *key*, or None on a miss."""
+        with self._lock:
+            audio = self._memory.get(key)
+            if audio is not None:
+                self._memory.move_to_end(key)
+                self._counters["memory_hits"] += 1
+                return audio
+
+        audio = self._read_disk(key)
+        if audio is None:
+            self._count("misses")
+            return None
+        self._count("disk_hits")
+        self._remember(key, audio)
+        return audio
+
+    def put(self, key: str, audio: AudioSegment) -> None:
+        """Store *audio* under *key* in both tiers."""
+        self._remember(key, audio)
+        if self.max_disk_bytes <= 0 or len(audio.raw_data) > self.max_disk_bytes:
+            return
+        try:
+            self._write_disk(key, audio)
+            self._count("stores")
+            self._evict_disk()
+        except OSError as e:
+            self._count("errors")
+            logger.warning("DECODED_AUDIO_CACHE_WRITE_FAILED key=%s error=%s", key, e)
+
+    def get_or_load(self, key: str, loader: Callable[[], AudioSegment]) -> AudioSegment:
+        """Return the cached segment for *key*, calling *loader* and storing its result on a miss."""
+        audio = self.get(key)
+        if audio is not None:
+            return audio
+        audio = loader()
+        self.put(key, audio)
+        return audio
+
+    def record_bypass(self) -> None:
+        """Count a lookup that could not be cached (e.g. unknown object version)."""
+        self._count("bypassed")
+
+    def clear(self) -> None:
+        """Drop every entry from both tiers (counters are kept)."""
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+        for path in self._disk_entries():
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+    def stats(self) -> dict[str, Any]:
+        """Return hit/miss counters and current tier sizes."""
+        with self._lock:
+            counters = dict(self._counters)
+            memory_entries = len(self._memory)
+            memory_bytes = self._memory_bytes
+        disk_entries = self._disk_entries()
+        disk_bytes = 0
+        for path in disk_entries:
+            try:
+                disk_bytes += path.stat().st_size
+            except OSError:
+                pass
+        hits = counters["memory_hits"] + counters["disk_hits"]
+        lookups = hits + counters["misses"]
+        return {
+            **counters,
+            "hits": hits,
+            "hit_ratio": round(hits / lookups, 4) if lookups else None,
+            "memory_entries": memory_entries,
+            "memory_bytes": memory_bytes,
+            "memory_max_bytes": self.max_memory_bytes,
+            "disk_entries": len(disk_entries),
+            "disk_bytes": disk_bytes,
+            "disk_max_bytes": self.max_disk_bytes,
+            "directory": str(self.directory),
+        }
+
+    # ------------------------------------------------------------------
+    # Memory tier
+    # ------------------------------------------------------------------
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._counters[name] += 1
+
+    def _remember(self, key: str, audio: AudioSegment) -> None:
+        size = len(audio.raw_data)
+        if size > self.max_memory_bytes:
+            return
+        with self._lock:
+            previous = self._memory.pop(key, None)
+            if previous is not None:
+                self._memory_bytes -= len(previous.raw_data)
+            self._memory[key] = audio
+            self._memory_bytes += size
+            while self._memory_bytes > self.max_memory_bytes and self._memory:
+                _, evicted = self._memory.popitem(last=False)
+                self._memory_bytes -= len(evicted.raw_data)
+
+    # ------------------------------------------------------------------
+    # Disk tier
+    # ------------------------------------------------------------------
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}{_DISK_SUFFIX}"
+
+    def _disk_entries(self) -> list[Path]:
+        try:
+            return [p for p in self.directory.iterdir() if p.suffix == _DISK_SUFFIX]
+        except OSError:
+            return []
+
+    def _read_disk(self, key: str) -> Optional[AudioSegment]:
+        path = self._path(key)
+        try:
+            with wave.open(str(path), "rb") as handle:
+                audio = AudioSegment(
+                    data=handle.readframes(handle.getnframes()),
+                    sample_width=handle.getsampwidth(),
+                    frame_rate=handle.getframerate(),
+                    channels=handle.getnchannels(),
+                )
+        except FileNotFoundError:
+            return None
+        except (OSError, EOFError, wave.Error) as e:
+            self._count("errors")
+            logger.warning("DECODED_AUDIO_CACHE_READ_FAILED key=%s error=%s", key, e)
+            try:
+                path.unlink()
+            except OSError:
+                pass
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return audio
+
+    def _write_disk(self, key: str, audio: AudioSegment) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as raw, wave.open(raw, "wb") as handle:
+                handle.setnchannels(audio.channels)
+                handle.setsampwidth(audio.sample_width)
+                handle.setframerate(audio.frame_rate)
+                handle.writeframes(audio.raw_data)
+            os.replace(tmp_name, self._path(key))
+        except BaseException:
+            try:
+                os.unlink(tmp_name)
+            except OSError:
+                pass
+            raise
+
+    def _evict_disk(self) -> None:
+        entries = []
+        total = 0
+        for path in self._disk_entries():
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+        if total <= self.max_disk_bytes:
+            return
+        for _, size, path in sorted(entries):
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total -= size
+            self._count("evictions")
+
+
+_cache: Optional[DecodedAudioCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_decoded_audio_cache() -> DecodedAudioCache:
+    """Return the process-wide cache, building it from settings on first use."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = DecodedAudioCache(
+                    settings.decoded_audio_cache_dir,
+                    max_disk_bytes=settings.decoded_audio_cache_max_bytes,
+                    max_memory_bytes=settings.decoded_audio_cache_memory_max_bytes,
+                )
+    return _cache
+
+
+def load_storage_audio(
+    file_key: str,
+    loader: Callable[[], AudioSegment],
+    *,
+    store: Any = None,
+) -> AudioSegment:
+    """Return decoded audio for a storage object, served from the cache when possible.
+
+    *loader* performs the original download + decode and is only called on a
+    miss.  *store* is the storage service the loader reads from (defaults to
+    the global ``storage``); it supplies the object version.  The lookup is
+    bypassed (loader called directly) when the cache is disabled or the
+    object's version cannot be determined.
+    """
+    if not settings.decoded_audio_cache_enabled:
+        return loader()
+
+    if store is None:
+        from app.services.storage import storage as store
+
+    cache = get_decoded_audio_cache()
+    version = store.get_object_version(file_key)
+    if not isinstance(version, str) or not version:
+        cache.record_bypass()
+        return loader()
+    return cache.get_or_load(cache_key(file_key, version), loader)
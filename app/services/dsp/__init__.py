@@ -0,0 +1,105 @@
+"""
+DSP — vectorised audio processing for the render hot path.
+
+Usage example (AudioSegment helpers, backend chosen by DSP_BACKEND)::
+
+    from app.services import dsp
+
+    warm = dsp.low_pass_filter(section_audio, 8000)
+    tight = dsp.band_pass_filter(section_audio, 360, 4500)
+    intro = dsp.fade_in(intro, 2000)
+
+Usage example (array kernels)::
+
+    from app.services.dsp import segment_to_array, array_to_segment, one_pole_high_pass
+
+    frames = segment_to_array(audio)            # float32 (frames, channels)
+    frames = one_pole_high_pass(frames, 140, audio.frame_rate)
+    audio = array_to_segment(frames, audio)
+
+Usage example (multi-stem mix)::
+
+    from app.services.dsp import StemLayer, mix_stem_layers, loop_frames
+
+    layers = [StemLayer(loop_frames(drums, n)), StemLayer(loop_frames(pads, n), gain_db=-4, low_pass_hz=6000)]
+    mixed = mix_stem_layers(layers, n, sample_rate=44100)   # float32, one headroom stage
+
+Usage example (render assembly)::
+
+    from app.services.dsp import RenderBuffer
+
+    buffer = RenderBuffer.for_arrangement(total_bars=64, bar_duration_ms=2000, template=loop)
+    for section_audio in sections:
+        buffer.append(section_audio, crossfade_ms=30)
+    arranged = buffer.to_segment()          # single encode at export time
+
+NOTE: The segment helpers are drop-in replacements for the pydub methods of
+the same name.  With DSP_BACKEND=numpy (default) they run SciPy/NumPy kernels
+that match pydub's RC filters sample-for-sample (within rounding); with
+DSP_BACKEND=pydub they delegate to pydub unchanged.
+"""
+
+from app.services.dsp.arrays import (
+    array_to_segment,
+    full_scale,
+    ms_to_frames,
+    segment_to_array,
+    supports_segment,
+)
+from app.services.dsp.backend import (
+    DSP_BACKEND_NUMPY,
+    DSP_BACKEND_PYDUB,
+    active_backend,
+    apply_gain,
+    band_pass_filter,
+    fade_in,
+    fade_out,
+    high_pass_filter,
+    low_pass_filter,
+    pan,
+)
+from app.services.dsp.kernels import (
+    apply_gain_db,
+    linear_fade,
+    one_pole_high_pass,
+    one_pole_low_pass,
+)
+from app.services.dsp.mix import (
+    DEFAULT_MIX_HEADROOM_DB,
+    StemLayer,
+    loop_frames,
+    mix_stem_layers,
+)
+from app.services.dsp.render_buffer import RenderBuffer
+
+__all__ = [
+    # Segment helpers
+    "low_pass_filter",
+    "high_pass_filter",
+    "band_pass_filter",
+    "fade_in",
+    "fade_out",
+    "apply_gain",
+    "pan",
+    "active_backend",
+    "DSP_BACKEND_NUMPY",
+    "DSP_BACKEND_PYDUB",
+    # Array conversion
+    "segment_to_array",
+    "array_to_segment",
+    "supports_segment",
+    "full_scale",
+    "ms_to_frames",
+    # Kernels
+    "one_pole_low_pass",
+    "one_pole_high_pass",
+    "apply_gain_db",
+    "linear_fade",
+    # Multi-stem mix
+    "StemLayer",
+    "mix_stem_layers",
+    "loop_frames",
+    "DEFAULT_MIX_HEADROOM_DB",
+    # Render assembly
+    "RenderBuffer",
+]
@@ -0,0 +1,75 @@
+"""
+Conversion helpers between pydub ``AudioSegment`` objects and NumPy frame arrays.
+
+All DSP kernels in this package operate on float32 arrays shaped
+``(frames, channels)`` with samples normalised to the ``[-1.0, 1.0)`` range.
+Conversion back to an ``AudioSegment`` rounds to the nearest integer sample and
+clips to the full-scale range of the template's sample width, so a round trip
+through these helpers is lossless for unprocessed audio.
+
+Only 8-, 16- and 32-bit integer PCM is supported.  24-bit segments (sample
+width 3) are reported as unsupported so callers can fall back to pydub.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+from pydub import AudioSegment
+
+_DTYPE_FOR_SAMPLE_WIDTH: dict[int, type[np.signedinteger]] = {
+    1: np.int8,
+    2: np.int16,
+    4: np.int32,
+}
+
+
+def supports_segment(segment: AudioSegment) -> bool:
+    """Return True when *segment* uses a sample width the array helpers handle."""
+    return int(segment.sample_width) in _DTYPE_FOR_SAMPLE_WIDTH
+
+
+def full_scale(sample_width: int) -> float:
+    """Return the positive full-scale value for an integer PCM sample width."""
+    return float(2 ** (8 * int(sample_width) - 1))
+
+
+def segment_to_array(segment: AudioSegment) -> np.ndarray:
+    """Decode *segment* into a float32 ``(frames, channels)`` array in [-1, 1)."""
+    sample_width = int(segment.sample_width)
+    dtype = _DTYPE_FOR_SAMPLE_WIDTH.get(sample_width)
+    if dtype is None:
+        raise ValueError(f"Unsupported sample width for array conversion: {sample_width}")
+    channels = max(1, int(segment.channels or 1))
+    raw = np.frombuffer(segment.raw_data, dtype=dtype)
+    usable = (raw.size // channels) * channels
+    samples = raw[:usable].reshape((-1, channels)).astype(np.float32)
+    samples *= np.float32(1.0 / full_scale(sample_width))
+    return samples
+
+
+def array_to_segment(samples: np.ndarray, template: AudioSegment) -> AudioSegment:
+    """Encode a float ``(frames, channels)`` array using *template*'s PCM format.
+
+    The channel count of *samples* overrides the template's so mono/stereo
+    conversions made in array space are preserved.
+    """
+    sample_width = int(template.sample_width)
+    dtype = _DTYPE_FOR_SAMPLE_WIDTH.get(sample_width)
+    if dtype is None:
+        raise ValueError(f"Unsupported sample width for array conversion: {sample_width}")
+    frames = np.asarray(samples, dtype=np.float32)
+    if frames.ndim == 1:
+        frames = frames.reshape((-1, 1))
+    channels = int(frames.shape[1])
+    scale = full_scale(sample_width)
+    pcm = np.rint(frames.astype(np.float64) * scale)
+    np.clip(pcm, -scale, scale - 1.0, out=pcm)
+    return template._spawn(
+        pcm.astype(dtype).tobytes(),
+        overrides={"channels": channels, "frame_width": channels * sample_width},
+    )
+
+
+def ms_to_frames(duration_ms: float, frame_rate: int) -> int:
+    """Convert a millisecond duration to a whole number of frames."""
+    return max(0, int(round(float(duration_ms) * int(frame_rate) / 1000.0)))
@@ -0,0 +1,118 @@
+"""
+AudioSegment-level DSP entry points with a switchable backend.
+
+Render code calls these helpers instead of the pydub methods of the same name.
+The active backend is chosen by ``settings.dsp_backend`` (``DSP_BACKEND``):
+
+* ``numpy`` (default) — decode once to a float32 frame array, run the
+  vectorised kernels from :mod:`app.services.dsp.kernels`, encode once.
+* ``pydub`` — delegate to pydub's pure-Python implementations.
+
+The NumPy path silently falls back to pydub for 24-bit audio and when SciPy is
+not importable, so callers never need to branch on backend availability.
+"""
+
+from __future__ import annotations
+
+import logging
+
+from pydub import AudioSegment
+
+from app.config import settings
+from app.services.dsp import kernels
+from app.services.dsp.arrays import (
+    array_to_segment,
+    ms_to_frames,
+    segment_to_array,
+    supports_segment,
+)
+
+logger = logging.getLogger(__name__)
+
+DSP_BACKEND_NUMPY = "numpy"
+DSP_BACKEND_PYDUB = "pydub"
+
+
+def active_backend() -> str:
+    """Return the configured DSP backend name (``numpy`` or ``pydub``)."""
+    backend = str(getattr(settings, "dsp_backend", DSP_BACKEND_NUMPY) or "").strip().lower()
+    if backend == DSP_BACKEND_PYDUB:
+        return DSP_BACKEND_PYDUB
+    return DSP_BACKEND_NUMPY
+
+
+def _use_numpy(segment: AudioSegment) -> bool:
+    return active_backend() == DSP_BACKEND_NUMPY and supports_segment(segment)
+
+
+def low_pass_filter(segment: AudioSegment, cutoff_hz: float) -> AudioSegment:
+    """Drop-in replacement for ``AudioSegment.low_pass_filter``."""
+    if _use_numpy(segment):
+        try:
+            filtered = kernels.one_pole_low_pass(
+                segment_to_array(segment), cutoff_hz, segment.frame_rate
+            )
+            return array_to_segment(filtered, segment)
+        except ImportError:
+            logger.debug("DSP_NUMPY_UNAVAILABLE op=low_pass_filter falling back to pydub")
+    return segment.low_pass_filter(cutoff_hz)
+
+
+def high_pass_filter(segment: AudioSegment, cutoff_hz: float) -> AudioSegment:
+    """Drop-in replacement for ``AudioSegment.high_pass_filter``."""
+    if _use_numpy(segment):
+        try:
+            filtered = kernels.one_pole_high_pass(
+                segment_to_array(segment), cutoff_hz, segment.frame_rate
+            )
+            return array_to_segment(filtered, segment)
+        except ImportError:
+            logger.debug("DSP_NUMPY_UNAVAILABLE op=high_pass_filter falling back to pydub")
+    return segment.high_pass_filter(cutoff_hz)
+
+
+def band_pass_filter(segment: AudioSegment, low_hz: float, high_hz: float) -> AudioSegment:
+    """High-pass at *low_hz* then low-pass at *high_hz* with a single decode/encode."""
+    if _use_numpy(segment):
+        try:
+            samples = segment_to_array(segment)
+            samples = kernels.one_pole_high_pass(samples, low_hz, segment.frame_rate)
+            samples = kernels.one_pole_low_pass(samples, high_hz, segment.frame_rate)
+            return array_to_segment(samples, segment)
+        except ImportError:
+            logger.debug("DSP_NUMPY_UNAVAILABLE op=band_pass_filter falling back to pydub")
+    return segment.high_pass_filter(low_hz).low_pass_filter(high_hz)
+
+
+def fade_in(segment: AudioSegment, duration_ms: int) -> AudioSegment:
+    """Drop-in replacement for ``AudioSegment.fade_in``."""
+    if _use_numpy(segment):
+        frames = ms_to_frames(duration_ms, segment.frame_rate)
+        return array_to_segment(
+            kernels.linear_fade(segment_to_array(segment), frames, fade_in=True), segment
+        )
+    return segment.fade_in(duration_ms)
+
+
+def fade_out(segment: AudioSegment, duration_ms: int) -> AudioSegment:
+    """Drop-in replacement for ``AudioSegment.fade_out``."""
+    if _use_numpy(segment):
+        frames = ms_to_frames(duration_ms, segment.frame_rate)
+        return array_to_segment(
+            kernels.linear_fade(segment_to_array(segment), frames, fade_in=False), segment
+        )
+    return segment.fade_out(duration_ms)
+
+
+def apply_gain(segment: AudioSegment, gain_db: float) -> AudioSegment:
+    """Drop-in replacement for ``AudioSegment.apply_gain``."""
+    if _use_numpy(segment):
+        return array_to_segment(kernels.apply_gain_db(segment_to_array(segment), gain_db), segment)
+    return segment.apply_gain(gain_db)
+
+
+def pan(segment: AudioSegment, pan_amount: float) -> AudioSegment:
+    """Drop-in replacement for ``AudioSegment.pan``."""
+    if _use_numpy(segment) and int(segment.channels) <= 2:
+        return array_to_segment(kernels.pan(segment_to_array(segment), pan_amount), segment)
+    return segment.pan(pan_amount)
@@ -0,0 +1,115 @@
+"""
+Vectorised DSP kernels operating on float32 ``(frames, channels)`` arrays.
+
+The filter kernels reproduce pydub's first-order RC filters
+(``pydub.effects.low_pass_filter`` / ``high_pass_filter``) exactly — same
+coefficients, same initial state — but run the recursion through
+``scipy.signal.lfilter`` instead of a per-sample Python loop.  Gain, fades and
+pan are plain NumPy broadcasts.
+
+Every kernel returns a new array; inputs are never modified in place.
+"""
+
+from __future__ import annotations
+
+import math
+
+import numpy as np
+
+
+def _rc_alpha(cutoff_hz: float, sample_rate: int) -> tuple[float, float]:
+    """Return ``(rc, dt)`` for an RC filter at *cutoff_hz* and *sample_rate*."""
+    rc = 1.0 / (float(cutoff_hz) * 2.0 * math.pi)
+    dt = 1.0 / float(sample_rate)
+    return rc, dt
+
+
+def one_pole_low_pass(samples: np.ndarray, cutoff_hz: float, sample_rate: int) -> np.ndarray:
+    """First-order low-pass filter (6 dB/octave above *cutoff_hz*).
+
+    ``y[n] = y[n-1] + alpha * (x[n] - y[n-1])`` with ``y[0] = x[0]``.
+
+    Raises ``ImportError`` when SciPy is not installed.
+    """
+    from scipy import signal
+
+    frames = np.asarray(samples, dtype=np.float32)
+    if frames.shape[0] < 2:
+        return frames.copy()
+    rc, dt = _rc_alpha(cutoff_hz, sample_rate)
+    alpha = dt / (rc + dt)
+    b = np.array([alpha], dtype=np.float32)
+    a = np.array([1.0, -(1.0 - alpha)], dtype=np.float32)
+    zi = ((1.0 - alpha) * frames[0:1, :]).astype(np.float32)
+    out = np.empty_like(frames)
+    out[0] = frames[0]
+    out[1:], _ = signal.lfilter(b, a, frames[1:], axis=0, zi=zi)
+    return out
+
+
+def one_pole_high_pass(samples: np.ndarray, cutoff_hz: float, sample_rate: int) -> np.ndarray:
+    """First-order high-pass filter (6 dB/octave below *cutoff_hz*).
+
+    ``y[n] = alpha * (y[n-1] + x[n] - x[n-1])`` with ``y[0] = x[0]``.
+
+    Raises ``ImportError`` when SciPy is not installed.
+    """
+    from scipy import signal
+
+    frames = np.asarray(samples, dtype=np.float32)
+    if frames.shape[0] < 2:
+        return frames.copy()
+    rc, dt = _rc_alpha(cutoff_hz, sample_rate)
+    alpha = rc / (rc + dt)
+    b = np.array([alpha, -alpha], dtype=np.float32)
+    a = np.array([1.0, -alpha], dtype=np.float32)
+    # With y[0] = x[0] the transposed-form state entering frame 1 is
+    # b1*x[0] - a1*y[0] = -alpha*x[0] + alpha*x[0] = 0.
+    zi = np.zeros((1, frames.shape[1]), dtype=np.float32)
+    out = np.empty_like(frames)
+    out[0] = frames[0]
+    out[1:], _ = signal.lfilter(b, a, frames[1:], axis=0, zi=zi)
+    return out
+
+
+def apply_gain_db(samples: np.ndarray, gain_db: float) -> np.ndarray:
+    """Scale *samples* by *gain_db* decibels."""
+    factor = np.float32(10.0 ** (float(gain_db) / 20.0))
+    return np.asarray(samples, dtype=np.float32) * factor
+
+
+def linear_fade(samples: np.ndarray, fade_frames: int, *, fade_in: bool) -> np.ndarray:
+    """Apply a linear amplitude fade over the first (in) or last (out) *fade_frames*."""
+    out = np.array(samples, dtype=np.float32, copy=True)
+    count = min(int(fade_frames), out.shape[0])
+    if count <= 0:
+        return out
+    if fade_in:
+        ramp = np.linspace(0.0, 1.0, count, endpoint=False, dtype=np.float32)
+        out[:count] *= ramp[:, None]
+    else:
+        ramp = np.linspace(1.0, 0.0, count, endpoint=False, dtype=np.float32)
+        out[out.shape[0] - count:] *= ramp[:, None]
+    return out
+
+
+def pan(samples: np.ndarray, pan_amount: float) -> np.ndarray:
+    """Constant-power-style stereo pan matching ``pydub.effects.pan``.
+
+    *pan_amount* ranges from -1.0 (hard left) to 1.0 (hard right).  Mono input
+    is duplicated to stereo first.  The louder side is boosted by up to 3 dB.
+    """
+    if not -1.0 <= float(pan_amount) <= 1.0:
+        raise ValueError("pan_amount should be between -1.0 (100% left) and +1.0 (100% right)")
+    frames = np.asarray(samples, dtype=np.float32)
+    if frames.shape[1] == 1:
+        frames = np.repeat(frames, 2, axis=1)
+    boost_factor = 2.0 ** abs(float(pan_amount))
+    reduce_factor = 2.0 - boost_factor
+    # pydub halves the boost in dB (max 3 dB) because two speakers do not sum fully.
+    boost_factor = math.sqrt(boost_factor)
+    if pan_amount < 0:
+        gains = np.array([boost_factor, reduce_factor], dtype=np.float32)
+    else:
+        gains = np.array([reduce_factor, boost_factor], dtype=np.float32)
+    return frames[:, :2] * gains
@@ -0,0 +1,187 @@
+"""
+Preallocated float32 render buffer for assembling arrangements in place.
+
+``RenderBuffer`` is sized up front from the arrangement length and sections
+are written into it in place, so the mix is converted back to an
+``AudioSegment`` exactly once.  Millisecond positions map to frames with
+pydub's slicing rule (``int(ms * frame_rate / 1000)``).
+"""
+
+from __future__ import annotations
+
+import numpy as np
+from pydub import AudioSegment
+
+from app.services.dsp.arrays import array_to_segment, segment_to_array, supports_segment
+
+
+class RenderBuffer:
+    """Growable float32 frame buffer with in-place write, mix and crossfade."""
+
+    def __init__(
+        self,
+        *,
+        frame_rate: int,
+        channels: int,
+        sample_width: int = 2,
+        capacity_frames: int = 0,
+    ) -> None:
+        self.frame_rate = int(frame_rate)
+        self.channels = max(1, int(channels))
+        # 24-bit input is widened to 32-bit, matching how the segment is decoded.
+        self.sample_width = int(sample_width) if int(sample_width) in (1, 2, 4) else 4
+        self._frames = np.zeros((max(0, int(capacity_frames)), self.channels), dtype=np.float32)
+        self._length = 0
+
+    # ------------------------------------------------------------------
+    # Construction helpers
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def like(cls, template: AudioSegment, duration_ms: float = 0) -> "RenderBuffer":
+        """Create a buffer in *template*'s PCM format with room for *duration_ms*."""
+        buffer = cls(
+            frame_rate=template.frame_rate,
+            channels=template.channels,
+            sample_width=template.sample_width,
+        )
+        buffer.reserve_ms(duration_ms if duration_ms else len(template))
+        return buffer
+
+    @classmethod
+    def for_arrangement(
+        cls,
+        *,
+        total_bars: int,
+        bar_duration_ms: float,
+        template: AudioSegment,
+    ) -> "RenderBuffer":
+        """Create a buffer preallocated for ``total_bars`` bars of *template*'s format."""
+        return cls.like(template, duration_ms=max(0, int(total_bars)) * float(bar_duration_ms))
+
+    # ------------------------------------------------------------------
+    # Introspection
+    # ------------------------------------------------------------------
+
+    @property
+    def length_frames(self) -> int:
+        """Number of frames written so far (high-water mark)."""
+        return self._length
+
+    @property
+    def capacity_frames(self) -> int:
+        return int(self._frames.shape[0])
+
+    def __len__(self) -> int:
+        """Written duration in milliseconds, rounded like ``len(AudioSegment)``."""
+        return int(round(1000.0 * self._length / self.frame_rate)) if self.frame_rate else 0
+
+    def peek(self) -> np.ndarray:
+        """Return a read-only view of the written frames."""
+        view = self._frames[: self._length]
+        view.flags.writeable = False
+        return view
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def reserve_ms(self, duration_ms: float) -> None:
+        self._ensure_capacity(self._ms_to_frame(duration_ms))
+
+    def write_at(self, position_ms: float, segment: AudioSegment, gain_db: float = 0.0) -> int:
+        """Overwrite frames starting at *position_ms* with *segment*.
+
+        Returns the frame index just past the written region.
+        """
+        return self._write(self._ms_to_frame(position_ms), self._as_frames(segment, gain_db), mix=False)
+
+    def mix_at(self, position_ms: float, segment: AudioSegment, gain_db: float = 0.0) -> int:
+        """Sum *segment* into the buffer starting at *position_ms*."""
+        return self._write(self._ms_to_frame(position_ms), self._as_frames(segment, gain_db), mix=True)
+
+    def crossfade_at(self, position_ms: float, segment: AudioSegment, crossfade_ms: float) -> int:
+        """Write *segment* at *position_ms*, crossfading its head with what is already there.
+
+        The first ``crossfade_ms`` of *segment* are faded in over the existing
+        audio, which is faded out over the same window.  Frames after the
+        window are overwritten.
+        """
+        start = self._ms_to_frame(position_ms)
+        incoming = self._as_frames(segment, 0.0)
+        overlap = min(self._ms_to_frame(crossfade_ms), incoming.shape[0], max(0, self._length - start))
+        existing = self._frames[start : start + overlap].copy()
+        end = self._write(start, incoming, mix=False)
+        if overlap > 0:
+            ramp = np.linspace(0.0, 1.0, overlap, endpoint=False, dtype=np.float32)[:, None]
+            self._frames[start : start + overlap] = existing * (1.0 - ramp) + incoming[:overlap] * ramp
+        return end
+
+    def append(self, segment: AudioSegment, crossfade_ms: float = 0) -> int:
+        """Append *segment* at the current end, optionally with a crossfade.
+
+        Mirrors ``AudioSegment.append``: the crossfade overlaps the tail of the
+        buffer with the head of *segment*, shortening the total by
+        ``crossfade_ms``.  Falls back to plain concatenation when either side is
+        shorter than twice the crossfade, like the renderer's join helper.
+        """
+        if (
+            crossfade_ms > 0
+            and len(self) >= crossfade_ms * 2
+            and len(segment) >= crossfade_ms * 2
+        ):
+            start = max(0, self._length - self._ms_to_frame(crossfade_ms))
+            return self.crossfade_at(1000.0 * start / self.frame_rate, segment, crossfade_ms)
+        return self._write(self._length, self._as_frames(segment, 0.0), mix=False)
+
+    def to_segment(self) -> AudioSegment:
+        """Encode the written frames into a single ``AudioSegment``."""
+        template = AudioSegment(
+            data=b"",
+            sample_width=self.sample_width,
+            frame_rate=self.frame_rate,
+            channels=self.channels,
+        )
+        return array_to_segment(self._frames[: self._length], template)
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _ms_to_frame(self, position_ms: float) -> int:
+        return max(0, int(float(position_ms) * (self.frame_rate / 1000.0)))
+
+    def _ensure_capacity(self, frames: int) -> None:
+        if frames <= self._frames.shape[0]:
+            return
+        grown = np.zeros((max(frames, self._frames.shape[0] * 2), self.channels), dtype=np.float32)
+        grown[: self._length] = self._frames[: self._length]
+        self._frames = grown
+
+    def _as_frames(self, segment: AudioSegment, gain_db: float) -> np.ndarray:
+        if segment.frame_rate != self.frame_rate:
+            segment = segment.set_frame_rate(self.frame_rate)
+        if not supports_segment(segment):
+            segment = segment.set_sample_width(4)
+        frames = segment_to_array(segment)
+        if frames.shape[1] != self.channels:
+            if frames.shape[1] == 1:
+                frames = np.repeat(frames, self.channels, axis=1)
+            else:
+                frames = frames.mean(axis=1, keepdims=True)
+                if self.channels > 1:
+                    frames = np.repeat(frames, self.channels, axis=1)
+        if gain_db:
+            frames *= np.float32(10.0 ** (float(gain_db) / 20.0))
+        return frames
+
+    def _write(self, start: int, frames: np.ndarray, *, mix: bool) -> int:
+        end = start + int(frames.shape[0])
+        self._ensure_capacity(end)
+        target = self._frames[start:end]
+        if mix:
+            target += frames
+        else:
+            target[...] = frames
+        self._length = max(self._length, end)
+        return end
@@ -0,0 +1,319 @@
+"""
+Push channel for render job progress.
+
+``update_job_status`` publishes each change to Redis (per-job sequence, replay
+log and pub/sub channel); :class:`JobEventHub` fans it out to each API
+process's SSE and WebSocket clients.  Publishing is best effort.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, AsyncIterator, Callable, Optional
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+EVENTS_PREFIX = "job-events"
+# Logs and sequence counters outlive any job (render timeout is 15 minutes).
+EVENT_TTL_SECONDS = 24 * 60 * 60
+
+TERMINAL_STATUSES = frozenset(
+    {"succeeded", "success", "done", "completed", "failed", "timeout", "missing_output", "cancelled"}
+)
+
+
+def channel_name(job_id: str) -> str:
+    return f"{EVENTS_PREFIX}:{job_id}"
+
+
+def _log_key(job_id: str) -> str:
+    return f"{EVENTS_PREFIX}:{job_id}:log"
+
+
+def _seq_key(job_id: str) -> str:
+    return f"{EVENTS_PREFIX}:{job_id}:seq"
+
+
+@dataclass(frozen=True)
+class JobEvent:
+    """One status/progress change of a render job."""
+
+    job_id: str
+    event_id: int
+    status: str
+    progress: float = 0.0
+    progress_message: Optional[str] = None
+    error_message: Optional[str] = None
+    arrangement_id: Optional[int] = None
+
+    @property
+    def terminal(self) -> bool:
+        return self.status in TERMINAL_STATUSES
+
+    @classmethod
+    def from_job(cls, job: Any, event_id: int) -> "JobEvent":
+        return cls(
+            job_id=str(job.id),
+            event_id=int(event_id),
+            # Same public status as RenderJobStatusResponse.
+            status="completed" if job.status == "succeeded" else job.status,
+            progress=float(job.progress or 0.0),
+            progress_message=job.progress_message,
+            error_message=job.error_message,
+            arrangement_id=getattr(job, "arrangement_id", None),
+        )
+
+    @classmethod
+    def from_json(cls, payload: str | bytes) -> "JobEvent":
+        data = json.loads(payload)
+        data.pop("terminal", None)
+        return cls(**data)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {**asdict(self), "terminal": self.terminal}
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), separators=(",", ":"))
+
+    def to_sse(self) -> str:
+        """Format as a server-sent event (``event: terminal`` ends the stream)."""
+        kind = "terminal" if self.terminal else "progress"
+        return f"id: {self.event_id}\nevent: {kind}\ndata: {self.to_json()}\n\n"
+
+
+# ---------------------------------------------------------------------------
+# Redis client
+# ---------------------------------------------------------------------------
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_events_client():
+    """Return the pooled Redis client for job events, or None when unavailable."""
+    global _client
+    if not settings.job_events_enabled or not settings.redis_url:
+        return None
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                import redis
+
+                # Short timeouts: a slow Redis must not stall the worker's status updates.
+                _client = redis.from_url(settings.redis_url, socket_connect_timeout=2, socket_timeout=2)
+    return _client
+
+
+# ---------------------------------------------------------------------------
+# Publishing and replay
+# ---------------------------------------------------------------------------
+
+def publish_job_event(job: Any, client: Any = None) -> Optional[JobEvent]:
+    """Publish the current state of *job*; returns the event, or None if not published."""
+    conn = client if client is not None else get_events_client()
+    if conn is None:
+        return None
+    job_id = str(job.id)
+    try:
+        event = JobEvent.from_job(job, conn.incr(_seq_key(job_id)))
+        payload = event.to_json()
+        history = max(1, int(settings.job_events_history))
+        pipe = conn.pipeline(transaction=False)
+        pipe.rpush(_log_key(job_id), payload)
+        pipe.ltrim(_log_key(job_id), -history, -1)
+        pipe.expire(_log_key(job_id), EVENT_TTL_SECONDS)
+        pipe.expire(_seq_key(job_id), EVENT_TTL_SECONDS)
+        pipe.publish(channel_name(job_id), payload)
+        pipe.execute()
+    except Exception as e:
+        logger.warning("JOB_EVENT_PUBLISH_FAILED job_id=%s status=%s error=%s", job_id, job.status, e)
+        return None
+    return event
+
+
+def replay_job_events(job_id: str, after_event_id: int = 0, client: Any = None) -> list[JobEvent]:
+    """Return the retained events of *job_id* newer than *after_event_id*."""
+    conn = client if client is not None else get_events_client()
+    if conn is None:
+        return []
+    try:
+        raw = conn.lrange(_log_key(job_id), 0, -1)
+    except Exception as e:
+        logger.warning("JOB_EVENT_REPLAY_FAILED job_id=%s error=%s", job_id, e)
+        return []
+    events = [JobEvent.from_json(item) for item in raw]
+    return [event for event in events if event.event_id > after_event_id]
+
+
+def current_event_id(job_id: str, client: Any = None) -> int:
+    """Return the id of the last event published for *job_id* (0 if none)."""
+    conn = client if client is not None else get_events_client()
+    if conn is None:
+        return 0
+    try:
+        return int(conn.get(_seq_key(job_id)) or 0)
+    except Exception:
+        return 0
+
+
+# ---------------------------------------------------------------------------
+# Subscription fan-out
+# ---------------------------------------------------------------------------
+
+class JobEventHub:
+    """One pattern subscription per process, fanned out to asyncio subscribers."""
+
+    def __init__(self, client_factory: Callable[[], Any] = get_events_client) -> None:
+        self._client_factory = client_factory
+        self._lock = threading.Lock()
+        self._subscribers: dict[str, set[tuple[asyncio.AbstractEventLoop, asyncio.Queue]]] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+
+    def subscribe(self, job_id: str) -> asyncio.Queue:
+        """Register a queue receiving the live events of *job_id* on the running loop."""
+        queue: asyncio.Queue = asyncio.Queue()
+        with self._lock:
+            self._subscribers.setdefault(job_id, set()).add((asyncio.get_running_loop(), queue))
+            self._ensure_listener()
+        return queue
+
+    def unsubscribe(self, job_id: str, queue: asyncio.Queue) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(job_id, set())
+            for entry in [entry for entry in subscribers if entry[1] is queue]:
+                subscribers.discard(entry)
+            if not subscribers:
+                self._subscribers.pop(job_id, None)
+
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return sum(len(subscribers) for subscribers in self._subscribers.values())
+
+    def dispatch(self, payload: str | bytes) -> None:
+        """Deliver a published payload to the subscribers of its job."""
+        try:
+            event = JobEvent.from_json(payload)
+        except Exception as e:
+            logger.warning("JOB_EVENT_DECODE_FAILED error=%s", e)
+            return
+        with self._lock:
+            targets = list(self._subscribers.get(event.job_id, ()))
+        for loop, queue in targets:
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, event)
+            except RuntimeError:
+                # Subscriber's loop already closed; it unsubscribes on exit.
+                pass
+
+    def stop(self) -> None:
+        self._stopping.set()
+
+    def _ensure_listener(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        if self._client_factory() is None:
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._listen, name="job-event-hub", daemon=True)
+        self._thread.start()
+
+    def _listen(self) -> None:
+        backoff = 0.5
+        while not self._stopping.is_set():
+            pubsub = None
+            try:
+                client = self._client_factory()
+                if client is None:
+                    return
+                pubsub = client.pubsub(ignore_subscribe_messages=True)
+                pubsub.psubscribe(f"{EVENTS_PREFIX}:*")
+                backoff = 0.5
+                while not self._stopping.is_set():
+                    message = pubsub.get_message(timeout=1.0)
+                    if message and message.get("type") == "pmessage":
+                        self.dispatch(message["data"])
+            except Exception as e:
+                logger.warning("JOB_EVENT_SUBSCRIPTION_LOST error=%s retry_in=%.1fs", e, backoff)
+                time.sleep(backoff)
+                backoff = min(backoff * 2, 10.0)
+            finally:
+                if pubsub is not None:
+                    try:
+                        pubsub.close()
+                    except Exception:
+                        pass
+
+
+_hub: Optional[JobEventHub] = None
+_hub_lock = threading.Lock()
+
+
+def get_job_event_hub() -> JobEventHub:
+    """Return the process-wide hub."""
+    global _hub
+    if _hub is None:
+        with _hub_lock:
+            if _hub is None:
+                _hub = JobEventHub()
+    return _hub
+
+
+async def job_event_stream(
+    job_id: str,
+    *,
+    last_event_id: Optional[int] = None,
+    snapshot: Optional[JobEvent] = None,
+    heartbeat_seconds: Optional[float] = None,
+    hub: Optional[JobEventHub] = None,
+) -> AsyncIterator[Optional[JobEvent]]:
+    """Yield the events of *job_id* after *last_event_id*, then live events.
+
+    *snapshot* (the job's current state) is yielded when nothing newer than
+    *last_event_id* was retained.  After *heartbeat_seconds* without an
+    event the log is re-read, and ``None`` is yielded if it has nothing new so
+    callers can keep connections alive.  The stream ends after a terminal
+    event.
+    """
+    hub = hub or get_job_event_hub()
+    heartbeat = heartbeat_seconds or settings.job_events_heartbeat_seconds
+    queue = hub.subscribe(job_id)
+    try:
+        # Subscribed before replaying, so nothing published in between is lost.
+        last = last_event_id or 0
+        backlog = await asyncio.to_thread(replay_job_events, job_id, last)
+        if not backlog and snapshot is not None and (
+            last_event_id is None or snapshot.event_id > last or snapshot.terminal
+        ):
+            backlog = [snapshot]
+        for event in backlog:
+            yield event
+            last = max(last, event.event_id)
+            if event.terminal:
+                return
+        while True:
+            try:
+                events = [await asyncio.wait_for(queue.get(), timeout=heartbeat)]
+            except asyncio.TimeoutError:
+                # Catch up on anything published while the subscription was
+                # (re)connecting; otherwise just keep the connection alive.
+                events = await asyncio.to_thread(replay_job_events, job_id, last)
+                if not events:
+                    yield None
+                    continue
+            for event in events:
+                if event.event_id <= last:
+                    continue
+                yield event
+                last = event.event_id
+                if event.terminal:
+                    return
+    finally:
+        hub.unsubscribe(job_id, queue)
@@ -1,5 +1,6 @@
 """Service for managing render jobs: creation, deduplication, status updates."""
 
+import asyncio
 import hashlib
 import json
 import logging
@@ -7,15 +8,30 @@ import uuid
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
+from app.models.arrangement import Arrangement
 from app.models.job import RenderJob
 from app.models.loop import Loop
 from app.config import settings
-from app.queue import DEFAULT_RENDER_QUEUE_NAME, get_queue
+from app.queue import (
+    BATCH_RENDER_QUEUE_NAME,
+    INGEST_QUEUE_NAME,
+    INTERACTIVE_QUEUE_NAME,
+    fair_share_meta,
+    get_queue,
+    resolve_queue_name,
+)
+from app.services.job_events import TERMINAL_STATUSES, JobEvent, current_event_id, publish_job_event
 from app.schemas.job import OutputFile, RenderJobStatusResponse
 
 logger = logging.getLogger(__name__)
-_TERMINAL_STATUSES = {"succeeded", "success", "done", "completed", "failed", "timeout", "missing_output", "cancelled"}
+_TERMINAL_STATUSES = TERMINAL_STATUSES
+
+# job_type of upload analysis/stem separation jobs (app/services/loop_ingest.py).
+INGEST_JOB_TYPE = "ingest_loop"
+# job_type of DAW export package jobs (app/services/daw_export_job.py).
+DAW_EXPORT_JOB_TYPE = "daw_export"
 
 
 def _variation_context(job: RenderJob) -> tuple[Optional[int], Optional[str]]:
@@ -26,6 +42,15 @@ def _variation_context(job: RenderJob) -> tuple[Optional[int], Optional[str]]:
     return params.get("variation_index"), params.get("personality")
 
 
+def _arrangement_id_from_params(params: Dict) -> Optional[int]:
+    """Return the arrangement a job renders into, if its params name one."""
+    value = params.get("arrangement_id") if isinstance(params, dict) else None
+    try:
+        return int(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
 def _compute_dedupe_hash(loop_id: int, params: Dict) -> str:
     """Hash (loop_id, render params) for deduplication."""
     key = json.dumps({"loop_id": loop_id, "params": params}, sort_keys=True)
@@ -51,6 +76,18 @@ def _find_existing_job(
     return job
 
 
+def _render_queue_class(params: Dict) -> str:
+    """First variation renders interactively; the extra variations of a request and the
+    full-quality follow-up of a preview go to the batch queue."""
+    if isinstance(params, dict) and params.get("preview_job_id"):
+        return BATCH_RENDER_QUEUE_NAME
+    variation_index = params.get("variation_index") if isinstance(params, dict) else None
+    try:
+        return BATCH_RENDER_QUEUE_NAME if int(variation_index or 0) > 0 else INTERACTIVE_QUEUE_NAME
+    except (TypeError, ValueError):
+        return INTERACTIVE_QUEUE_NAME
+
+
 def create_render_job(
     db: Session,
     loop_id: int,
@@ -87,6 +124,8 @@ def create_render_job(
     
     # Create new job
     job_id = str(uuid.uuid4())
+    # Linked up front so "latest job for arrangement" is an indexed lookup.
+    arrangement_id = _arrangement_id_from_params(params)
     
     job = RenderJob(
         id=job_id,
@@ -96,19 +135,19 @@ def create_render_job(
         dedupe_hash=dedupe_hash,
         status="queued",
         queued_at=datetime.utcnow(),
+        arrangement_id=arrangement_id,
     )
     
     db.add(job)
     db.commit()
     db.refresh(job)
 
-    arrangement_id = params.get("arrangement_id") if isinstance(params, dict) else None
-
+    queue_name = resolve_queue_name(_render_queue_class(params))
     logger.info(
         "render_job_db_created: job_id=%s loop_id=%s queue_name=%s arrangement_id=%s",
         job_id,
         loop_id,
-        DEFAULT_RENDER_QUEUE_NAME,
+        queue_name,
         arrangement_id,
     )
     logger.info(
@@ -126,12 +165,12 @@ def create_render_job(
         "render_job_enqueue_attempt: job_id=%s loop_id=%s queue_name=%s",
         job_id,
         loop_id,
-        DEFAULT_RENDER_QUEUE_NAME,
+        queue_name,
     )
 
     # Enqueue to Redis (never leave silent orphaned queued jobs on enqueue failure)
     try:
-        queue = get_queue(name=DEFAULT_RENDER_QUEUE_NAME)
+        queue = get_queue(name=queue_name)
         from app.workers.render_worker import render_loop_worker
 
         rq_job = queue.enqueue(
@@ -144,6 +183,7 @@ def create_render_job(
             # is not available on Windows. Application-level timeout is enforced
             # inside render_loop_worker via concurrent.futures.ThreadPoolExecutor.
             job_timeout=-1,
+            meta=fair_share_meta(loop_id),
         )
         logger.info(
             "render_job_enqueued_success: job_id=%s rq_job_id=%s loop_id=%s queue_name=%s",
@@ -167,7 +207,7 @@ def create_render_job(
             "render_job_enqueue_failed: job_id=%s loop_id=%s queue_name=%s error=%s",
             job_id,
             loop_id,
-            DEFAULT_RENDER_QUEUE_NAME,
+            queue_name,
             enqueue_error,
         )
         job.status = "failed"
@@ -182,6 +222,138 @@ def create_render_job(
     return job, False
 
 
+def create_ingest_job(db: Session, loop_id: int, content: Optional[bytes] = None) -> tuple[RenderJob, bool]:
+    """
+    Create an ``ingest_loop`` job for a freshly uploaded loop and enqueue it.
+
+    *content* (the uploaded bytes) is passed along with the queued job when it
+    fits in ``INGEST_INLINE_MAX_BYTES``, so the worker need not read it back.
+
+    Returns:
+        (job, enqueued) — ``enqueued`` is False when Redis is unavailable and
+        the caller must run the ingest itself.
+    """
+    loop = db.query(Loop).filter(Loop.id == loop_id).first()
+    if not loop:
+        raise ValueError(f"Loop {loop_id} not found")
+
+    job = RenderJob(
+        id=str(uuid.uuid4()),
+        loop_id=loop_id,
+        job_type=INGEST_JOB_TYPE,
+        params_json=json.dumps({"file_key": loop.file_key, "filename": loop.filename}),
+        status="queued",
+        queued_at=datetime.utcnow(),
+    )
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+
+    inline = content if content is not None and len(content) <= settings.ingest_inline_max_bytes else None
+    try:
+        queue = get_queue(name=resolve_queue_name(INGEST_QUEUE_NAME))
+        from app.workers.ingest_worker import ingest_loop_worker
+
+        queue.enqueue(
+            ingest_loop_worker,
+            job.id,
+            loop_id,
+            inline,
+            job_id=job.id,
+            # Unlike renders, ingest has no in-process timeout of its own: the
+            # RQ timeout is the supervisor's deadline for killing the child
+            # (and TimerDeathPenalty's in an unsupervised worker).
+            job_timeout=settings.ingest_job_timeout_seconds,
+            meta=fair_share_meta(loop_id),
+        )
+    except Exception as enqueue_error:
+        logger.warning(
+            "ingest_job_enqueue_failed: job_id=%s loop_id=%s error=%s", job.id, loop_id, enqueue_error
+        )
+        return job, False
+
+    logger.info(
+        "ingest_job_enqueued: job_id=%s loop_id=%s inline_bytes=%s",
+        job.id,
+        loop_id,
+        len(inline) if inline is not None else None,
+    )
+    return job, True
+
+
+def _daw_export_dedupe_hash(arrangement: Arrangement) -> str:
+    return _compute_dedupe_hash(arrangement.loop_id, {"daw_export_arrangement_id": arrangement.id})
+
+
+def get_active_daw_export_job(db: Session, arrangement: Arrangement) -> Optional[RenderJob]:
+    """Return the queued or running DAW export job for *arrangement*, if any."""
+    return (
+        db.query(RenderJob)
+        .filter(
+            RenderJob.loop_id == arrangement.loop_id,
+            RenderJob.dedupe_hash == _daw_export_dedupe_hash(arrangement),
+            RenderJob.status.in_(["queued", "processing"]),
+        )
+        .order_by(RenderJob.created_at.desc())
+        .first()
+    )
+
+
+def create_daw_export_job(db: Session, arrangement: Arrangement) -> tuple[RenderJob, bool]:
+    """
+    Create a ``daw_export`` job for *arrangement* on the batch queue.
+
+    Reuses the arrangement's queued or running export job when there is one.
+    The job is not linked through ``RenderJob.arrangement_id``, so it never
+    becomes the arrangement's latest render job.
+
+    Returns:
+        (job, enqueued) — ``enqueued`` is False when Redis is unavailable and
+        the caller must build the export itself.
+    """
+    existing = get_active_daw_export_job(db, arrangement)
+    if existing:
+        logger.info("daw_export_job_reused: job_id=%s arrangement_id=%s", existing.id, arrangement.id)
+        return existing, True
+
+    job = RenderJob(
+        id=str(uuid.uuid4()),
+        loop_id=arrangement.loop_id,
+        job_type=DAW_EXPORT_JOB_TYPE,
+        params_json=json.dumps({"arrangement_id": arrangement.id}),
+        dedupe_hash=_daw_export_dedupe_hash(arrangement),
+        status="queued",
+        queued_at=datetime.utcnow(),
+    )
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+
+    try:
+        queue = get_queue(name=resolve_queue_name(BATCH_RENDER_QUEUE_NAME))
+        from app.workers.export_worker import daw_export_worker
+
+        queue.enqueue(
+            daw_export_worker,
+            job.id,
+            arrangement.id,
+            job_id=job.id,
+            job_timeout=-1,
+            meta=fair_share_meta(arrangement.loop_id),
+        )
+    except Exception as enqueue_error:
+        logger.warning(
+            "daw_export_job_enqueue_failed: job_id=%s arrangement_id=%s error=%s",
+            job.id,
+            arrangement.id,
+            enqueue_error,
+        )
+        return job, False
+
+    logger.info("daw_export_job_enqueued: job_id=%s arrangement_id=%s", job.id, arrangement.id)
+    return job, True
+
+
 def update_job_status(
     db: Session,
     job_id: str,
@@ -225,6 +397,7 @@ def update_job_status(
     
     db.commit()
     db.refresh(job)
+    publish_job_event(job)
     variation_index, personality = _variation_context(job)
     logger.info(
         "VARIATION_JOB_STATUS_PERSISTED job_id=%s variation_index=%s personality=%s status=%s output_url_present=%s arrangement_id=%s error_message=%s",
@@ -252,6 +425,58 @@ def get_job_status(db: Session, job_id: str) -> RenderJobStatusResponse:
     if not job:
         raise ValueError(f"Job {job_id} not found")
 
+    if _expire_timed_out_job(job):
+        db.commit()
+        db.refresh(job)
+        publish_job_event(job)
+    return _job_status_response(job)
+
+
+async def get_job_status_async(db, job_id: str) -> RenderJobStatusResponse:
+    """:func:`get_job_status` on a session from :func:`app.db.async_session.get_async_db`."""
+    logger.info("JOB_STATUS_POLL_RECEIVED job_id=%s", job_id)
+    job = await db.get(RenderJob, job_id, populate_existing=True)
+    if not job:
+        raise ValueError(f"Job {job_id} not found")
+
+    if _expire_timed_out_job(job):
+        await db.commit()
+        await db.refresh(job)
+        await run_in_threadpool(publish_job_event, job)
+    return _job_status_response(job)
+
+
+async def get_job_profile_async(db, job_id: str) -> Optional[Dict]:
+    """Timing profile stored in the job's ``render_metadata["profile"]``, or None if it has none."""
+    job = await db.get(RenderJob, job_id)
+    if not job:
+        raise ValueError(f"Job {job_id} not found")
+    if not job.render_metadata_json:
+        return None
+    try:
+        render_metadata = json.loads(job.render_metadata_json)
+    except ValueError as _e:
+        logger.warning("Failed to parse render_metadata_json for job %s: %s", job_id, _e)
+        return None
+    profile = render_metadata.get("profile") if isinstance(render_metadata, dict) else None
+    return profile or None
+
+
+def _expire_timed_out_job(job: RenderJob) -> bool:
+    """Hard terminal guarantee: mark a job processing for longer than the render timeout as timed out."""
+    if job.status == "processing" and job.started_at:
+        elapsed = (datetime.utcnow() - job.started_at).total_seconds()
+        timeout_seconds = int(getattr(settings, "render_job_timeout_seconds", 900) or 900)
+        if elapsed > timeout_seconds:
+            job.status = "timeout"
+            job.error_message = f"Job exceeded timeout of {timeout_seconds}s"
+            job.finished_at = datetime.utcnow()
+            return True
+    return False
+
+
+def _job_status_response(job: RenderJob) -> RenderJobStatusResponse:
+    job_id = job.id
     variation_index, personality = _variation_context(job)
     logger.info(
         "JOB_STATUS_DB_RELOADED job_id=%s variation_index=%s personality=%s db_status=%s output_url_present=%s output_files_present=%s arrangement_id=%s",
@@ -264,17 +489,6 @@ def get_job_status(db: Session, job_id: str) -> RenderJobStatusResponse:
         job.arrangement_id,
     )
 
-    # Hard terminal guarantee: timeout long-running processing jobs.
-    if job.status == "processing" and job.started_at:
-        elapsed = (datetime.utcnow() - job.started_at).total_seconds()
-        timeout_seconds = int(getattr(settings, "render_job_timeout_seconds", 900) or 900)
-        if elapsed > timeout_seconds:
-            job.status = "timeout"
-            job.error_message = f"Job exceeded timeout of {timeout_seconds}s"
-            job.finished_at = datetime.utcnow()
-            db.commit()
-            db.refresh(job)
-
     # Parse outputs and regenerate presigned URLs if succeeded
     output_files = None
     if job.output_files_json:
@@ -363,6 +577,31 @@ def get_job_status(db: Session, job_id: str) -> RenderJobStatusResponse:
     return response
 
 
+def get_latest_job_for_arrangement(db: Session, arrangement_id: int) -> Optional[RenderJob]:
+    """Return the most recently created job linked to *arrangement_id*.
+
+    Served by ``ix_render_jobs_arrangement_created`` (arrangement_id, created_at).
+    """
+    return (
+        db.query(RenderJob)
+        .filter(RenderJob.arrangement_id == arrangement_id)
+        .order_by(RenderJob.created_at.desc())
+        .first()
+    )
+
+
+async def get_job_event_snapshot_async(db, job_id: str) -> JobEvent:
+    """Return the job's current state as a push event (one primary-key read).
+
+    *db* comes from :func:`app.db.async_session.get_async_db`.  Used once when
+    a progress stream connects; the stream itself never touches the database.
+    """
+    job = await db.get(RenderJob, job_id)
+    if not job:
+        raise ValueError(f"Job {job_id} not found")
+    return JobEvent.from_job(job, await asyncio.to_thread(current_event_id, job_id))
+
+
 def list_loop_jobs(db: Session, loop_id: int, limit: int = 20) -> List[RenderJobStatusResponse]:
     """List jobs for a loop (recent first)."""
     jobs = (
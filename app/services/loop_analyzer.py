@@ -7,6 +7,8 @@ Analyzes audio loops from S3 storage with comprehensive feature detection:
 - Duration and bar calculation
 - Async-compatible for FastAPI
 - Safe temporary file handling
+- In-memory analysis of freshly uploaded bytes (ingest worker)
+- Shared single-decode feature bundle (app/services/audio_features.py)
 """
 
 import asyncio
@@ -20,6 +22,7 @@ from botocore.exceptions import ClientError
 import httpx
 
 from app.config import settings
+from app.services.audio_features import AudioFeatures, get_audio_features
 from app.services.storage import storage
 
 logger = logging.getLogger(__name__)
@@ -63,7 +66,8 @@ class LoopAnalyzer:
                 'bpm': float,
                 'key': str,
                 'duration': float,
-                'bars': int
+                'bars': int,
+                'content_hash': str  # feature bundle digest
             }
 
         Raises:
@@ -113,7 +117,8 @@ class LoopAnalyzer:
                 'bpm': float,
                 'key': str,
                 'duration': float,
-                'bars': int
+                'bars': int,
+                'content_hash': str  # feature bundle digest
             }
 
         Raises:
@@ -129,6 +134,32 @@ class LoopAnalyzer:
             logger.error(f"Analysis failed for {file_path}: {e}")
             raise
 
+    def analyze_content(self, content: bytes, filename: str = "audio.wav") -> Dict:
+        """
+        Analyze audio bytes that are already in memory (sync version).
+
+        Used by the ingest worker on the uploaded bytes, so nothing is
+        downloaded back from storage.  The bytes are decoded once into the
+        shared feature bundle (``app.services.audio_features``), which is
+        persisted for the other analyzers.
+
+        Args:
+            content: Encoded audio file bytes
+            filename: Original filename; its extension names the format
+
+        Returns:
+            Dictionary with bpm, key, duration, bars (see ``analyze_from_file``)
+
+        Raises:
+            Exception: If analysis fails
+        """
+        try:
+            features = get_audio_features(content, filename)
+        except Exception as e:
+            logger.error(f"Feature extraction failed for {filename}: {e}")
+            raise Exception(f"Audio analysis failed: {e}")
+        return self.analyze_features(features)
+
     async def _download_from_s3_async(self, file_key: str) -> str:
         """
         Download file from S3 to temporary location (async).
@@ -211,20 +242,24 @@ class LoopAnalyzer:
         Returns:
             Dictionary with bpm, key, duration, bars
         """
-        import librosa  # noqa: PLC0415 — lazy import; librosa is heavy and optional
-        import numpy as np  # noqa: PLC0415
         try:
-            # Load audio file with librosa
-            y, sr = librosa.load(file_path, sr=self.sample_rate, mono=True)
+            content = Path(file_path).read_bytes()
+        except Exception as e:
+            logger.error(f"File analysis failed for {file_path}: {e}")
+            raise Exception(f"Audio analysis failed: {e}")
+        return self.analyze_content(content, Path(file_path).name)
 
+    def analyze_features(self, features: AudioFeatures) -> Dict:
+        """Detect bpm, key, duration and bars from a feature bundle."""
+        try:
             # Detect BPM
-            bpm = self._detect_bpm(y, sr)
+            bpm = self._detect_bpm(features.tempo)
 
             # Detect musical key
-            key = self._detect_key(y, sr)
+            key = self._detect_key(features.chroma)
 
             # Calculate duration
-            duration = float(len(y)) / float(sr)
+            duration = features.duration_seconds
 
             # Estimate bars (4/4 time signature)
             bars = self._estimate_bars(duration, bpm)
@@ -234,39 +269,28 @@ class LoopAnalyzer:
                 'bpm': round(bpm, 2),
                 'key': key,
                 'duration': round(duration, 2),
-                'bars': bars
+                'bars': bars,
+                'content_hash': features.content_hash
             }
 
         except Exception as e:
-            logger.error(f"File analysis failed for {file_path}: {e}")
-            raise Exception(f"Audio analysis failed: {e}")
+            logger.error(f"Sample analysis failed: {e}")
             raise Exception(f"Audio analysis failed: {e}")
 
-    def _detect_bpm(self, y, sr: int) -> float:
+    def _detect_bpm(self, tempo: float) -> float:
         """
-        Detect BPM/tempo using librosa beat tracking.
-
-        Includes validation and edge case handling for production use.
+        Validate the bundle's tempo estimate for production use.
 
         Args:
-            y: Audio time series
-            sr: Sample rate
+            tempo: Global tempo from the onset envelope (0 when unavailable)
 
         Returns:
             BPM as float (validated range: 60-200)
         """
-        import librosa  # noqa: PLC0415
-        import numpy as np  # noqa: PLC0415
         try:
-            # Use librosa beat tracking with onset envelope
-            onset_env = librosa.onset.onset_strength(y=y, sr=sr)
-            tempo = librosa.beat.tempo(onset_envelope=onset_env, sr=sr)
-            
-            # Extract float from numpy array
-            if isinstance(tempo, np.ndarray):
-                tempo = float(tempo[0]) if len(tempo) > 0 else 120.0
-            else:
-                tempo = float(tempo)
+            tempo = float(tempo)
+            if tempo <= 0:
+                raise ValueError("no tempo estimate")
 
             # Validate and correct tempo range (typical music: 60-200 BPM)
             if tempo < 60:
@@ -284,25 +308,18 @@ class LoopAnalyzer:
             logger.warning(f"BPM detection failed: {e}, using default 120 BPM")
             return 120.0
 
-    def _detect_key(self, y, sr: int) -> str:
+    def _detect_key(self, chroma) -> str:
         """
-        Detect musical key using chromagram analysis.
-
-        Uses CQT (Constant-Q Transform) for better frequency resolution.
+        Detect musical key from the bundle's CQT chromagram.
 
         Args:
-            y: Audio time series
-            sr: Sample rate
+            chroma: Chromagram, shape (12, frames)
 
         Returns:
             Musical key as string (e.g., 'C', 'Dm', 'F#')
         """
-        import librosa  # noqa: PLC0415
         import numpy as np  # noqa: PLC0415
         try:
-            # Compute chromagram with CQT for better accuracy
-            chroma = librosa.feature.chroma_cqt(y=y, sr=sr, n_chroma=12)
-
             # Average over time to get overall pitch class distribution
             chroma_mean = np.mean(chroma, axis=1)
 
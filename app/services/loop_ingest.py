@@ -0,0 +1,190 @@
+"""
+Loop ingest: analysis and stem separation for an uploaded loop.
+
+:func:`ingest_loop` runs in the worker for the ``ingest_loop`` job created by
+``POST /loops/upload``.  Analysis and separation failures are non-fatal; only
+an unreadable upload fails the ingest.
+"""
+
+import io
+import json
+import logging
+from typing import Optional
+
+from pydub import AudioSegment
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.loop import Loop
+from app.services.job_service import update_job_status
+from app.services.loop_analyzer import loop_analyzer
+from app.services.stem_ingestion_router import SOURCE_MODE_SINGLE_FILE, build_manifest_from_ai_separation
+from app.services.stem_separation import separate_and_store_stems
+from app.services.storage import storage
+
+logger = logging.getLogger(__name__)
+
+
+def build_stem_analysis_json(
+    existing_analysis: dict,
+    *,
+    source_content: bytes,
+    source_filename: str,
+    loop_id: int,
+    source_key: str,
+) -> str:
+    """Run stem separation on *source_content* and return the loop's analysis_json.
+
+    Separation failures are recorded in ``stem_separation`` rather than raised.
+    """
+    payload = dict(existing_analysis or {})
+    if not settings.feature_stem_separation:
+        payload["stem_separation"] = {
+            "enabled": False,
+            "backend": settings.stem_separation_backend,
+            "succeeded": False,
+            "reason": "feature_disabled",
+        }
+        return json.dumps(payload)
+
+    try:
+        source_audio = AudioSegment.from_file(io.BytesIO(source_content), format=source_filename.split(".")[-1].lower())
+    except Exception as e:
+        logger.warning("Failed to decode source audio for stem separation: %s", e)
+        payload["stem_separation"] = {
+            "enabled": True,
+            "backend": settings.stem_separation_backend,
+            "succeeded": False,
+            "error": f"decode_failed: {e}",
+        }
+        return json.dumps(payload)
+
+    # Phase 3/8: use advanced two-stage separation when flag is enabled
+    if settings.feature_advanced_stem_separation_v2:
+        try:
+            from app.services.advanced_stem_separation import run_advanced_separation
+            adv_result = run_advanced_separation(
+                source_audio,
+                loop_id=loop_id,
+                source_key=source_key,
+                # Use the preferred backend (e.g. demucs_htdemucs_6s); the pipeline
+                # falls back automatically through the priority chain to builtin.
+                backend=(settings.preferred_stem_backend or "builtin").strip().lower(),
+            )
+            if adv_result.succeeded:
+                manifest = adv_result.to_manifest(loop_id)
+                payload["stem_separation"] = {
+                    "enabled": True,
+                    "backend": adv_result.backend,
+                    "succeeded": True,
+                    "upload_mode": SOURCE_MODE_SINGLE_FILE,
+                    "stems_generated": manifest.broad_roles,
+                    "stem_s3_keys": manifest.stem_keys(),
+                    "canonical_manifest": manifest.to_dict(),
+                }
+                return json.dumps(payload)
+            # Advanced separation failed — fall through to legacy path
+            logger.warning(
+                "Advanced stem separation failed for loop_id=%s, falling back to legacy: %s",
+                loop_id,
+                adv_result.error,
+            )
+        except Exception as adv_exc:  # pragma: no cover — unexpected errors are non-fatal
+            logger.warning(
+                "Unexpected error in advanced stem separation for loop_id=%s: %s",
+                loop_id,
+                adv_exc,
+                exc_info=True,
+            )
+
+    # Legacy path: broad 4-stem separation
+    stem_result = separate_and_store_stems(
+        source_audio=source_audio,
+        loop_id=loop_id,
+        source_key=source_key,
+    )
+    separation_dict = stem_result.to_dict()
+
+    # Phase 5: always build a canonical manifest from the AI-separated stems,
+    # even on the legacy path, so downstream consumers have a uniform object.
+    if stem_result.succeeded and stem_result.stem_s3_keys:
+        try:
+            manifest = build_manifest_from_ai_separation(
+                stem_result.stem_s3_keys,
+                loop_id=loop_id,
+            )
+            separation_dict["canonical_manifest"] = manifest.to_dict()
+            separation_dict["upload_mode"] = SOURCE_MODE_SINGLE_FILE
+        except Exception as manifest_exc:
+            logger.debug(
+                "Canonical manifest generation failed for loop_id=%s: %s",
+                loop_id,
+                manifest_exc,
+            )
+
+    payload["stem_separation"] = separation_dict
+    return json.dumps(payload)
+
+
+def ingest_loop(db: Session, job_id: str, loop_id: int, content: Optional[bytes] = None) -> Loop:
+    """Analyze and separate the uploaded audio of *loop_id*, reporting on *job_id*.
+
+    *content* is the uploaded file; when omitted it is read from storage.
+    """
+    loop = db.query(Loop).filter(Loop.id == loop_id).first()
+    if loop is None:
+        update_job_status(db, job_id, "failed", error_message=f"Loop {loop_id} not found")
+        raise ValueError(f"Loop {loop_id} not found")
+
+    source_filename = loop.filename or loop.name or "audio.wav"
+    try:
+        update_job_status(db, job_id, "processing", progress=5.0, progress_message="Reading upload")
+        if content is None:
+            content = storage.read_file(loop.file_key)
+            if content is None:
+                raise FileNotFoundError(f"Uploaded object {loop.file_key} not found")
+
+        update_job_status(db, job_id, "processing", progress=15.0, progress_message="Analyzing audio")
+        analysis_result = {"bpm": None, "key": None, "duration": None, "bars": None}
+        try:
+            analysis_result = loop_analyzer.analyze_content(content, source_filename)
+            logger.info(
+                "Analysis complete: loop_id=%s BPM=%s Key=%s Bars=%s Duration=%s",
+                loop_id,
+                analysis_result.get("bpm"),
+                analysis_result.get("key"),
+                analysis_result.get("bars"),
+                analysis_result.get("duration"),
+            )
+        except Exception as e:
+            logger.warning("Audio analysis failed (non-fatal) for loop_id=%s: %s", loop_id, e)
+
+        bpm_value = analysis_result.get("bpm")
+        loop.bpm = int(round(float(bpm_value))) if bpm_value is not None else None
+        loop.musical_key = analysis_result.get("key")
+        loop.duration_seconds = analysis_result.get("duration")
+        loop.bars = analysis_result.get("bars")
+        loop.analysis_json = json.dumps(analysis_result)
+        db.commit()
+
+        update_job_status(db, job_id, "processing", progress=40.0, progress_message="Separating stems")
+        loop.analysis_json = build_stem_analysis_json(
+            analysis_result,
+            source_content=content,
+            source_filename=source_filename,
+            loop_id=loop.id,
+            source_key=loop.file_key,
+        )
+        loop.status = "complete"
+        db.commit()
+    except Exception as e:
+        logger.exception("Loop ingest failed: loop_id=%s job_id=%s", loop_id, job_id)
+        db.rollback()
+        loop.status = "failed"
+        db.commit()
+        update_job_status(db, job_id, "failed", error_message=f"Ingest failed: {e}"[:500])
+        raise
+
+    update_job_status(db, job_id, "succeeded", progress=100.0, progress_message="Ingest complete")
+    db.refresh(loop)
+    return loop
@@ -9,6 +9,8 @@ from typing import Iterable
 
 from pydub import AudioSegment
 
+from app.services import dsp
+
 logger = logging.getLogger(__name__)
 
 
@@ -78,7 +80,7 @@ def _apply_transient_softening(audio: AudioSegment, slice_ms: int = 70, attack_c
 def _apply_hat_density_variation(audio: AudioSegment, bar_duration_ms: int) -> AudioSegment:
     if len(audio) == 0:
         return audio
-    top = audio.high_pass_filter(6000)
+    top = dsp.high_pass_filter(audio, 6000)
     step_ms = max(20, int(bar_duration_ms / 32))
     rolled = AudioSegment.silent(duration=0)
     for pos in range(0, len(top), step_ms):
@@ -94,7 +96,7 @@ def _apply_hat_density_variation(audio: AudioSegment, bar_duration_ms: int) -> A
 
 def _progressive_drum_removal(base: AudioSegment, drums: AudioSegment | None, bar_duration_ms: int) -> AudioSegment:
     if drums is None or len(base) == 0:
-        return base.fade_out(min(len(base), max(500, bar_duration_ms)))
+        return dsp.fade_out(base, min(len(base), max(500, bar_duration_ms)))
 
     bars = max(1, len(base) // max(1, bar_duration_ms))
     drums_full = _repeat_to_duration(drums, len(base))
@@ -117,7 +119,7 @@ def _progressive_drum_removal(base: AudioSegment, drums: AudioSegment | None, ba
     if len(output) < len(base):
         output += base[len(output):]
 
-    return output[: len(base)].fade_out(min(len(base), max(500, bar_duration_ms)))
+    return dsp.fade_out(output[: len(base)], min(len(base), max(500, bar_duration_ms)))
 
 
 def generate_sub_variants(
@@ -163,11 +165,11 @@ def generate_sub_variants(
         # Apply EQ bands
         if len(sub_audio) > 0:
             # Low frequencies (0-250Hz)
-            low_band = sub_audio.low_pass_filter(250)
+            low_band = dsp.low_pass_filter(sub_audio, 250)
             # Mid frequencies (250-2500Hz)
-            mid_band = sub_audio.high_pass_filter(250).low_pass_filter(2500)
+            mid_band = dsp.band_pass_filter(sub_audio, 250, 2500)
             # High frequencies (2500Hz+)
-            high_band = sub_audio.high_pass_filter(2500)
+            high_band = dsp.high_pass_filter(sub_audio, 2500)
             
             # Mix bands with gains
             sub_audio = (low_band + low_gain).overlay(mid_band + mid_gain).overlay(high_band + high_gain)
@@ -187,7 +189,7 @@ def generate_sub_variants(
         # Strategy 3: Brightness variation (40% chance)
         if random.random() < 0.4 and len(sub_audio) > 0:
             brightness = -2 + (random.random() * 6)  # -2dB to +4dB
-            bright_layer = sub_audio.high_pass_filter(4000) + brightness
+            bright_layer = dsp.high_pass_filter(sub_audio, 4000) + brightness
             sub_audio = sub_audio.overlay(bright_layer, gain_during_overlay=-2)
         
         # Strategy 4: Subtle compression via gain staging (30% chance)
@@ -198,7 +200,7 @@ def generate_sub_variants(
         # Strategy 5: Transient emphasis (25% chance)
         if random.random() < 0.25 and len(sub_audio) > 0:
             # Emphasize high frequencies briefly
-            emphasis = sub_audio.high_pass_filter(8000) + 4
+            emphasis = dsp.high_pass_filter(sub_audio, 8000) + 4
             sub_audio = sub_audio.overlay(emphasis, gain_during_overlay=-6)
         
         # Store sub-variant
@@ -239,8 +241,8 @@ def generate_loop_variations(
         gains={"melody": -4, "vocal": -8},
     )
     if intro.rms == 0:
-        intro = loop_audio.low_pass_filter(1200) - 10
-    intro = intro.low_pass_filter(1800).fade_in(min(target_ms, int(bar_duration_ms * 2)))
+        intro = dsp.low_pass_filter(loop_audio, 1200) - 10
+    intro = dsp.fade_in(dsp.low_pass_filter(intro, 1800), min(target_ms, int(bar_duration_ms * 2)))
 
     # Verse: reduced drums + simplified melody + lower energy + gaps
     verse = _mix_selected_stems(
@@ -252,7 +254,7 @@ def generate_loop_variations(
     if verse.rms == 0:
         # No-stems fallback: noticeably stripped — heavier LPF and quieter so
         # it contrasts clearly with the hook's brightness.
-        verse = (loop_audio - 6).low_pass_filter(4000)
+        verse = dsp.low_pass_filter(loop_audio - 6, 4000)
     verse = _apply_transient_softening(verse)
     verse = _apply_silence_gaps(verse, bar_duration_ms=bar_duration_ms)
 
@@ -268,7 +270,7 @@ def generate_loop_variations(
     if pre_hook.rms == 0:
         # No-stems fallback: remove deep sub and cap highs so it sounds edgier
         # and more driving than the verse without being as full as the hook.
-        pre_hook = loop_audio.high_pass_filter(130).low_pass_filter(5500) - 2
+        pre_hook = dsp.band_pass_filter(loop_audio, 130, 5500) - 2
     pre_hook = _apply_silence_gaps(pre_hook, bar_duration_ms=bar_duration_ms, gap_ms=60)
 
     # Hook: full stems + louder drums + hi-hat density variation
@@ -282,7 +284,7 @@ def generate_loop_variations(
         # No-stems fallback: brighter and louder — clear contrast from verse.
         hook = loop_audio + 4
         # Add a high-frequency presence layer so the hook is audibly brighter.
-        presence = hook.high_pass_filter(2000)
+        presence = dsp.high_pass_filter(hook, 2000)
         hook = hook.overlay(presence + 1, gain_during_overlay=-3)
     hook = _apply_hat_density_variation(hook, bar_duration_ms=bar_duration_ms)
 
@@ -295,7 +297,7 @@ def generate_loop_variations(
     )
     if bridge.rms == 0:
         bridge = loop_audio - 8
-    bridge = bridge.low_pass_filter(1400).high_pass_filter(180)
+    bridge = dsp.high_pass_filter(dsp.low_pass_filter(bridge, 1400), 180)
     bridge = _apply_silence_gaps(bridge, bar_duration_ms=bar_duration_ms, gap_ms=140)
 
     # Outro: progressive removal of drums + melody fade
@@ -308,7 +310,7 @@ def generate_loop_variations(
     if outro_base.rms == 0:
         outro_base = loop_audio - 4
     outro = _progressive_drum_removal(outro_base, drums=drums, bar_duration_ms=bar_duration_ms)
-    outro = outro.fade_out(min(target_ms, int(bar_duration_ms * 2)))
+    outro = dsp.fade_out(outro, min(target_ms, int(bar_duration_ms * 2)))
 
     # Base variants
     base_variants = {
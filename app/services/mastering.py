@@ -7,6 +7,7 @@ from dataclasses import dataclass
 from pydub import AudioSegment
 
 from app.config import settings
+from app.services import dsp
 
 
 @dataclass
@@ -56,15 +57,14 @@ def apply_mastering(audio: AudioSegment, *, genre: str | None) -> MasteringResul
 
     if profile == "rnb_smooth":
         # Warm the top end and add gentle body; avoid stacking copies of the signal.
-        mastered = mastered.low_pass_filter(13000) + 0.5
+        mastered = dsp.low_pass_filter(mastered, 13000) + 0.5
     elif profile == "low_end_focus":
         # Trap: remove truly subsonic rumble, gentle high-end roll for warmth.
         # Do NOT overlay copies of the signal — that causes sub mud and potential clipping.
-        mastered = mastered.high_pass_filter(30)
-        mastered = mastered.low_pass_filter(16000)
+        mastered = dsp.band_pass_filter(mastered, 30, 16000)
     else:
         # Transparent: gentle high-end roll only; no signal duplication.
-        mastered = mastered.low_pass_filter(16000)
+        mastered = dsp.low_pass_filter(mastered, 16000)
 
     post_peak = _safe_peak(mastered)
     target_ceiling_dbfs = -1.0
@@ -0,0 +1,336 @@
+"""
+Canonical raw-PCM stem store opened with ``numpy.memmap`` at render time.
+
+Stems are stored next to their WAV as headerless 44.1 kHz stereo int16
+(``stems/loop_1_drums.pcm``).  Renders map them from a worker-local cache
+under PCM_STEM_STORE_DIR, named by object version and kept under
+PCM_STEM_STORE_MAX_BYTES by least-recently-used eviction.
+"""
+
+from __future__ import annotations
+
+import array
+import hashlib
+import logging
+import mmap
+import os
+import re
+import shutil
+import tempfile
+from pathlib import Path, PurePosixPath
+from typing import Any, Optional
+
+import numpy as np
+from pydub import AudioSegment
+
+from app.config import settings
+from app.services.storage import S3StorageError, storage
+
+logger = logging.getLogger(__name__)
+
+CANONICAL_FRAME_RATE = 44100
+CANONICAL_CHANNELS = 2
+CANONICAL_SAMPLE_WIDTH = 2
+CANONICAL_DTYPE = "<i2"
+PCM_SUFFIX = ".pcm"
+
+_UNSAFE_KEY_CHARS = re.compile(r"[^A-Za-z0-9._-]+")
+
+
+def pcm_key_for(stem_key: str) -> str:
+    """Return the storage key of the canonical PCM copy of *stem_key*."""
+    return str(PurePosixPath(str(stem_key)).with_suffix(PCM_SUFFIX))
+
+
+def pcm_path_for_key(stem_key: str, version: str) -> Path:
+    """Return the local cache path of *stem_key*'s PCM copy at storage *version*."""
+    safe = _UNSAFE_KEY_CHARS.sub("_", str(stem_key).strip("/")).strip("._") or "stem"
+    digest = hashlib.sha256(version.encode("utf-8")).hexdigest()[:16]
+    return Path(settings.pcm_stem_store_dir) / f"{safe}-{digest}{PCM_SUFFIX}"
+
+
+def canonicalize(audio: AudioSegment) -> AudioSegment:
+    """Convert *audio* to the canonical store layout (no-op when it already matches)."""
+    if audio.frame_rate != CANONICAL_FRAME_RATE:
+        audio = audio.set_frame_rate(CANONICAL_FRAME_RATE)
+    if audio.channels != CANONICAL_CHANNELS:
+        audio = audio.set_channels(CANONICAL_CHANNELS)
+    if audio.sample_width != CANONICAL_SAMPLE_WIDTH:
+        audio = audio.set_sample_width(CANONICAL_SAMPLE_WIDTH)
+    return audio
+
+
+def write_pcm_stem(audio: AudioSegment, path: str | os.PathLike, duration_ms: Optional[int] = None) -> dict[str, Any]:
+    """Write *audio* to *path* in the canonical layout and return its layout metadata.
+
+    When *duration_ms* is given the stem is trimmed or zero-padded to exactly
+    that length, so every stem of a pack shares one frame count and the render
+    path never has to re-normalise durations.
+    """
+    audio = canonicalize(audio)
+    data = audio.raw_data
+    if duration_ms is not None:
+        frame_bytes = CANONICAL_CHANNELS * CANONICAL_SAMPLE_WIDTH
+        target = int(duration_ms * CANONICAL_FRAME_RATE / 1000) * frame_bytes
+        data = data[:target] + b"\x00" * max(0, target - len(data))
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp_path, "wb") as handle:
+        handle.write(data)
+    os.replace(tmp_path, path)
+
+    frames = len(data) // (CANONICAL_CHANNELS * CANONICAL_SAMPLE_WIDTH)
+    return {
+        "path": str(path),
+        "frame_rate": CANONICAL_FRAME_RATE,
+        "channels": CANONICAL_CHANNELS,
+        "dtype": "int16",
+        "frames": frames,
+    }
+
+
+def persist_pcm_stems(
+    stem_keys: dict[str, str],
+    role_stems: dict[str, AudioSegment],
+    duration_ms: Optional[int] = None,
+) -> dict[str, dict[str, Any]]:
+    """Upload the canonical PCM copy of every role stem; return ``{role: layout}``.
+
+    Each copy is streamed to storage under :func:`pcm_key_for` and then kept in
+    the local cache (so a worker on this host need not download it).
+    Failures are logged and skipped — the render path falls back to decoding
+    the stored stem when no PCM copy exists.
+    """
+    layouts: dict[str, dict[str, Any]] = {}
+    if not settings.pcm_stem_store_enabled:
+        return layouts
+    directory = Path(settings.pcm_stem_store_dir)
+    for role, key in stem_keys.items():
+        audio = role_stems.get(role)
+        if audio is None:
+            continue
+        pcm_key = pcm_key_for(key)
+        try:
+            directory.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            os.close(fd)
+            try:
+                layout = write_pcm_stem(audio, tmp_name, duration_ms=duration_ms)
+                with open(layout.pop("path"), "rb") as source, storage.open_upload_stream(
+                    pcm_key, "application/octet-stream"
+                ) as upload:
+                    shutil.copyfileobj(source, upload, 1024 * 1024)
+                version = storage.get_object_version(pcm_key)
+                if version:
+                    path = pcm_path_for_key(key, version)
+                    os.replace(tmp_name, path)
+                    _evict(keep=path)
+            finally:
+                if os.path.exists(tmp_name):
+                    os.unlink(tmp_name)
+        except (OSError, S3StorageError) as e:
+            logger.warning("PCM_STEM_STORE_WRITE_FAILED role=%s key=%s error=%s", role, key, e)
+            continue
+        layouts[role] = {"key": pcm_key, **layout}
+    return layouts
+
+
+def fetch_pcm_stem(stem_key: str) -> Optional[Path]:
+    """Return the local cache path of *stem_key*'s PCM copy, downloading it on a miss.
+
+    Returns None when the store is disabled, no PCM copy was stored or its
+    version cannot be determined.
+    """
+    if not settings.pcm_stem_store_enabled:
+        return None
+    pcm_key = pcm_key_for(stem_key)
+    version = storage.get_object_version(pcm_key)
+    if not version:
+        return None
+    path = pcm_path_for_key(stem_key, version)
+    if path.is_file():
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return path
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if not storage.download_file(pcm_key, path):
+            return None
+    except (OSError, S3StorageError) as e:
+        logger.warning("PCM_STEM_STORE_FETCH_FAILED key=%s error=%s", pcm_key, e)
+        return None
+    logger.info("PCM_STEM_STORE_FETCHED key=%s path=%s", pcm_key, path)
+    _evict(keep=path)
+    return path
+
+
+def _evict(keep: Path) -> None:
+    """Delete least recently used cache files until the directory fits PCM_STEM_STORE_MAX_BYTES.
+
+    *keep* (the file just fetched) is never evicted.  Files already mapped by a
+    render stay readable after they are unlinked.
+    """
+    max_bytes = max(0, int(settings.pcm_stem_store_max_bytes))
+    entries = []
+    total = 0
+    try:
+        paths = [p for p in keep.parent.iterdir() if p.suffix == PCM_SUFFIX]
+    except OSError:
+        return
+    for path in paths:
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        total += stat.st_size
+        if path != keep:
+            entries.append((stat.st_mtime, stat.st_size, path))
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            path.unlink()
+        except OSError:
+            continue
+        total -= size
+        logger.info("PCM_STEM_STORE_EVICTED path=%s", path)
+
+
+def open_pcm_stem_for_key(stem_key: str) -> Optional["PcmStem"]:
+    """Open the canonical PCM copy of *stem_key*, or return None when unavailable."""
+    path = fetch_pcm_stem(stem_key)
+    if path is None:
+        return None
+    try:
+        return PcmStem.open(path)
+    except (OSError, ValueError) as e:
+        logger.warning("PCM_STEM_STORE_OPEN_FAILED key=%s error=%s", stem_key, e)
+        return None
+
+
+class _MappedPcm(mmap.mmap):
+    """Read-only file mapping that pydub can use as an ``AudioSegment``'s data.
+
+    Slices are plain ``bytes`` holding only the sliced range; the few
+    operations pydub applies to a segment's whole data (``+``, ``*``, ``==``)
+    copy it first.  Pickles as ``bytes``.
+    """
+
+    def __add__(self, other):
+        return self[:] + bytes(other)
+
+    def __radd__(self, other):
+        return bytes(other) + self[:]
+
+    def __mul__(self, count):
+        return self[:] * count
+
+    def __eq__(self, other):
+        return self[:] == other
+
+    def __hash__(self):
+        return hash(self[:])
+
+    def __reduce__(self):
+        return bytes, (self[:],)
+
+
+class MappedAudioSegment(AudioSegment):
+    """``AudioSegment`` whose samples stay in the page cache until used."""
+
+    def get_array_of_samples(self, array_type_override=None):
+        if not isinstance(self._data, _MappedPcm):
+            return super().get_array_of_samples(array_type_override)
+        # array.array() would iterate the mapping byte by byte.
+        array_type = array_type_override or self.array_type
+        samples = array.array(array_type)
+        samples.frombytes(self._data[:])
+        return samples
+
+
+class PcmStem:
+    """Read-only memory-mapped stem in the canonical layout.
+
+    Quacks enough like an ``AudioSegment`` (``len()`` in ms, ``frame_rate``,
+    ``channels``, ``sample_width``) for duration checks; audio is only
+    materialised through :meth:`segment`, :meth:`repeat_to` and
+    :meth:`to_segment`.
+    """
+
+    frame_rate = CANONICAL_FRAME_RATE
+    channels = CANONICAL_CHANNELS
+    sample_width = CANONICAL_SAMPLE_WIDTH
+
+    def __init__(self, frames: np.ndarray, path: Optional[Path] = None) -> None:
+        self._frames = frames
+        self.path = path
+
+    @classmethod
+    def open(cls, path: str | os.PathLike) -> "PcmStem":
+        path = Path(path)
+        frame_bytes = CANONICAL_CHANNELS * CANONICAL_SAMPLE_WIDTH
+        size = path.stat().st_size
+        if size % frame_bytes:
+            raise ValueError(f"{path} is not canonical PCM ({size} bytes is not a whole number of frames)")
+        if size == 0:
+            return cls(np.zeros((0, CANONICAL_CHANNELS), dtype=CANONICAL_DTYPE), path)
+        frames = np.memmap(path, dtype=CANONICAL_DTYPE, mode="r").reshape(-1, CANONICAL_CHANNELS)
+        return cls(frames, path)
+
+    @property
+    def frame_count(self) -> int:
+        return int(self._frames.shape[0])
+
+    def __len__(self) -> int:
+        return round(1000 * self.frame_count / self.frame_rate)
+
+    def _frame_at(self, ms: float) -> int:
+        return min(self.frame_count, max(0, int(ms * self.frame_rate / 1000)))
+
+    def view(self, start_ms: float = 0, end_ms: Optional[float] = None) -> np.ndarray:
+        """Zero-copy ``(frames, channels)`` int16 view of ``[start_ms, end_ms)``."""
+        end = self.frame_count if end_ms is None else self._frame_at(end_ms)
+        return self._frames[self._frame_at(start_ms):end]
+
+    def segment(self, start_ms: float = 0, end_ms: Optional[float] = None) -> AudioSegment:
+        """Materialise ``[start_ms, end_ms)`` as an ``AudioSegment``."""
+        return self._to_segment(self.view(start_ms, end_ms))
+
+    def repeat_to(self, duration_ms: float) -> AudioSegment:
+        """Loop the stem from its start to fill *duration_ms*, materialising only the output."""
+        target = max(0, int(duration_ms * self.frame_rate / 1000))
+        if target <= self.frame_count or self.frame_count == 0:
+            return self._to_segment(self._frames[:target])
+        out = np.empty((target, self.channels), dtype=CANONICAL_DTYPE)
+        for start in range(0, target, self.frame_count):
+            chunk = min(self.frame_count, target - start)
+            out[start:start + chunk] = self._frames[:chunk]
+        return self._to_segment(out)
+
+    def to_segment(self) -> AudioSegment:
+        return self._to_segment(self._frames)
+
+    def mapped_segment(self) -> AudioSegment:
+        """The whole stem as an ``AudioSegment`` backed by the file mapping (no copy)."""
+        if self.path is None or self.frame_count == 0:
+            return self.to_segment()
+        with open(self.path, "rb") as handle:
+            data = _MappedPcm(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        return MappedAudioSegment(
+            data=data,
+            sample_width=self.sample_width,
+            frame_rate=self.frame_rate,
+            channels=self.channels,
+        )
+
+    def _to_segment(self, frames: np.ndarray) -> AudioSegment:
+        return AudioSegment(
+            data=np.ascontiguousarray(frames, dtype=CANONICAL_DTYPE).tobytes(),
+            sample_width=self.sample_width,
+            frame_rate=self.frame_rate,
+            channels=self.channels,
+        )
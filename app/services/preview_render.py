@@ -0,0 +1,123 @@
+"""
+Low-bitrate preview renders.
+
+A preview (``quality="preview"``) renders the full job's plan from source audio
+reduced to RENDER_PREVIEW_FRAME_RATE / RENDER_PREVIEW_CHANNELS, skips mastering
+and the audio-truth pass, and encodes Opus or MP3 (WAV when ffmpeg fails).  The
+full-quality job for the same arrangement is queued afterwards.
+"""
+
+from __future__ import annotations
+
+import io
+import logging
+import shutil
+import subprocess
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from pydub import AudioSegment
+
+from app.config import settings
+from app.services.render_output import stream_wav
+
+logger = logging.getLogger(__name__)
+
+PREVIEW = "preview"
+FULL = "full"
+
+# format -> (ffmpeg encoder, ffmpeg container, content type, file extension)
+_CODECS = {
+    "opus": ("libopus", "ogg", "audio/ogg", ".opus"),
+    "mp3": ("libmp3lame", "mp3", "audio/mpeg", ".mp3"),
+}
+
+
+@dataclass(frozen=True)
+class PreviewEncoding:
+    data: bytes
+    content_type: str
+    extension: str
+    codec: str
+
+
+def is_preview(params: Any) -> bool:
+    """True for a job that should render as a preview (off when RENDER_PREVIEW_ENABLED is false)."""
+    return bool(
+        settings.render_preview_enabled and isinstance(params, dict) and params.get("quality") == PREVIEW
+    )
+
+
+def downsample(audio: AudioSegment) -> AudioSegment:
+    """*audio* at the preview frame rate and channel count."""
+    frame_rate = int(settings.render_preview_frame_rate)
+    channels = int(settings.render_preview_channels)
+    if audio.frame_rate != frame_rate:
+        audio = audio.set_frame_rate(frame_rate)
+    if audio.channels != channels:
+        audio = audio.set_channels(channels)
+    return audio
+
+
+def _ffmpeg() -> Optional[str]:
+    return getattr(AudioSegment, "converter", None) or settings.ffmpeg_binary or shutil.which("ffmpeg")
+
+
+def encode_preview(audio: AudioSegment) -> PreviewEncoding:
+    """Encode *audio* with RENDER_PREVIEW_FORMAT, falling back to WAV."""
+    fmt = str(settings.render_preview_format or "").strip().lower()
+    codec = _CODECS.get(fmt)
+    ffmpeg = _ffmpeg()
+    if codec is not None and ffmpeg:
+        encoder, container, content_type, extension = codec
+        cmd = [
+            ffmpeg,
+            "-hide_banner",
+            "-loglevel",
+            "error",
+            "-f",
+            f"s{audio.sample_width * 8}le",
+            "-ar",
+            str(audio.frame_rate),
+            "-ac",
+            str(audio.channels),
+            "-i",
+            "pipe:0",
+            "-c:a",
+            encoder,
+            "-b:a",
+            str(settings.render_preview_bitrate),
+            "-f",
+            container,
+            "pipe:1",
+        ]
+        try:
+            result = subprocess.run(cmd, input=audio.raw_data, capture_output=True, check=False, timeout=120)
+            if result.returncode == 0 and result.stdout:
+                return PreviewEncoding(result.stdout, content_type, extension, fmt)
+            logger.warning(
+                "PREVIEW_ENCODE_FAILED format=%s code=%s stderr=%s",
+                fmt,
+                result.returncode,
+                (result.stderr or b"").decode("utf-8", errors="ignore")[:200],
+            )
+        except (OSError, subprocess.SubprocessError) as e:
+            logger.warning("PREVIEW_ENCODE_FAILED format=%s error=%s", fmt, e)
+    elif codec is None:
+        logger.warning("Unknown RENDER_PREVIEW_FORMAT %r; uploading preview as WAV", fmt)
+
+    buf = io.BytesIO()
+    stream_wav(audio, buf)
+    return PreviewEncoding(buf.getvalue(), "audio/wav", ".wav", "wav")
+
+
+def full_render_params(preview_params: dict, *, preview_job_id: str, arrangement_id: Optional[int], snapshot: dict) -> dict:
+    """Params of the full-quality job queued after *preview_job_id* succeeds."""
+    params = {key: value for key, value in preview_params.items() if key != "quality"}
+    params.update(
+        quality=FULL,
+        preview_job_id=preview_job_id,
+        preview_arrangement_id=arrangement_id,
+        planned_arrangement=snapshot,
+    )
+    return params
@@ -10,20 +10,23 @@ Design philosophy:
 - Graceful degradation when analysis is weak.
 - Every result is explicitly confidence-banded.
 
-Analysis methods used:
+Analysis methods used (all read from the shared feature bundle, see
+app/services/audio_features.py, so the reference is decoded once):
 - Windowed RMS for energy curve.
 - Spectral flux proxy (high-frequency energy changes) for onset density.
 - Energy novelty + threshold-based section segmentation.
 - Position + energy heuristics for section type classification.
-- librosa.beat.beat_track() for tempo (nullable on failure).
+- Onset-envelope tempo estimate (nullable on failure).
 """
 
 from __future__ import annotations
 
-import io
 import logging
 import math
-from typing import List, Optional, Tuple
+from typing import TYPE_CHECKING, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from app.services.audio_features import AudioFeatures
 
 logger = logging.getLogger(__name__)
 
@@ -121,17 +124,18 @@ class ReferenceAnalyzer:
     def _analyze_with_librosa(
         self, audio_bytes: bytes, filename: str
     ) -> ReferenceStructure:
-        import librosa  # type: ignore
-        import numpy as np  # type: ignore
+        from app.services.audio_features import get_audio_features
 
         warnings: List[str] = []
 
-        # Load audio ----------------------------------------------------------------
-        y, sr = self._load_audio(audio_bytes, filename)
-        total_duration_sec = float(librosa.get_duration(y=y, sr=sr))
+        # Decode once into the shared feature bundle ------------------------------
+        features = get_audio_features(audio_bytes, filename)
+        total_duration_sec = features.duration_seconds
 
         logger.info(
-            "ReferenceAnalyzer: loaded %.1fs audio (sr=%d)", total_duration_sec, sr
+            "ReferenceAnalyzer: loaded %.1fs audio (sr=%d)",
+            total_duration_sec,
+            features.sample_rate,
         )
 
         # Guard: too short
@@ -148,21 +152,19 @@ class ReferenceAnalyzer:
                 "analysis may be lower quality"
             )
             # Truncate to limit
-            y = y[: int(_MAX_AUDIO_SECONDS * sr)]
             total_duration_sec = min(total_duration_sec, _MAX_AUDIO_SECONDS)
+        n_windows = int(math.ceil(total_duration_sec / _HOP_SECONDS))
 
         # Energy curve (windowed RMS) -----------------------------------------------
-        window_samples = int(_WINDOW_SECONDS * sr)
-        hop_samples = int(_HOP_SECONDS * sr)
-        energy_curve_raw = self._compute_rms_curve(y, window_samples, hop_samples)
+        energy_curve_raw = features.window_rms(_WINDOW_SECONDS, _HOP_SECONDS)[:n_windows]
         energy_curve_normalized = self._normalize(energy_curve_raw)
 
         # Density curve (spectral flux proxy) ----------------------------------------
-        density_curve_raw = self._compute_density_curve(y, sr, window_samples, hop_samples)
+        density_curve_raw = self._compute_density_curve(features)[:n_windows]
         density_curve_normalized = self._normalize(density_curve_raw)
 
         # Tempo estimate -------------------------------------------------------------
-        tempo_estimate = self._estimate_tempo(y, sr, warnings)
+        tempo_estimate = self._estimate_tempo(features, warnings)
 
         # Section segmentation -------------------------------------------------------
         boundary_times = self._segment_sections(
@@ -208,124 +210,33 @@ class ReferenceAnalyzer:
         )
 
     # ------------------------------------------------------------------
-    # Audio loading
+    # Density & tempo
     # ------------------------------------------------------------------
 
-    def _load_audio(self, audio_bytes: bytes, filename: str) -> Tuple:
-        """Load audio bytes via librosa, trying pydub as a decode fallback."""
-        import librosa  # type: ignore
-        import numpy as np  # type: ignore
-
-        # Try direct librosa load from bytes
-        try:
-            loaded = librosa.load(io.BytesIO(audio_bytes), sr=None, mono=True)
-            if isinstance(loaded, tuple) and len(loaded) >= 2:
-                y, sr = loaded[0], loaded[1]
-            else:
-                y, sr = loaded, 44100
-            return y, sr
-        except Exception as load_err:
-            logger.debug("librosa direct load failed (%s), trying pydub decode", load_err)
-
-        # Fallback: decode with pydub → export as WAV → librosa
-        try:
-            from pydub import AudioSegment
-
-            ext = filename.rsplit(".", 1)[-1].lower() if "." in filename else "wav"
-            seg = AudioSegment.from_file(io.BytesIO(audio_bytes), format=ext)
-            # Convert to mono WAV PCM
-            wav_buf = io.BytesIO()
-            seg.set_channels(1).export(wav_buf, format="wav")
-            wav_buf.seek(0)
-            loaded = librosa.load(wav_buf, sr=None, mono=True)
-            if isinstance(loaded, tuple) and len(loaded) >= 2:
-                y, sr = loaded[0], loaded[1]
-            else:
-                y, sr = loaded, int(seg.frame_rate or 44100)
-            return y, sr
-        except Exception as pydub_err:
-            raise RuntimeError(
-                f"Could not decode reference audio via librosa or pydub: {pydub_err}"
-            ) from pydub_err
-
-    # ------------------------------------------------------------------
-    # Energy & density
-    # ------------------------------------------------------------------
-
-    @staticmethod
-    def _compute_rms_curve(
-        y,
-        window_samples: int,
-        hop_samples: int,
-    ) -> List[float]:
-        """Compute per-window RMS energy."""
-        import numpy as np  # type: ignore
-
-        n_samples = len(y)
-        rms_values: List[float] = []
-        offset = 0
-        while offset < n_samples:
-            chunk = y[offset : offset + window_samples]
-            rms = float(np.sqrt(np.mean(chunk ** 2))) if len(chunk) > 0 else 0.0
-            rms_values.append(rms)
-            offset += hop_samples
-        return rms_values
-
     @staticmethod
-    def _compute_density_curve(
-        y,
-        sr: int,
-        window_samples: int,
-        hop_samples: int,
-    ) -> List[float]:
+    def _compute_density_curve(features: AudioFeatures) -> List[float]:
         """Approximate density using high-frequency energy ratio (spectral flux proxy).
 
         High-frequency content tends to correlate with drum/percussion density.
-        This is a fast V1 heuristic — not onset detection.
+        Each window averages the bundle's per-frame ratio of the top 40% of
+        STFT bins to all bins.  This is a fast V1 heuristic — not onset
+        detection.
         """
-        import numpy as np  # type: ignore
-
-        n_samples = len(y)
-        density_values: List[float] = []
-        offset = 0
-        while offset < n_samples:
-            chunk = y[offset : offset + window_samples]
-            if len(chunk) == 0:
-                density_values.append(0.0)
-                offset += hop_samples
-                continue
-            # Rough high-frequency energy: take top 40% of FFT bins
-            fft = np.abs(np.fft.rfft(chunk))
-            split = max(1, int(len(fft) * 0.6))
-            hf_energy = float(np.mean(fft[split:])) if len(fft[split:]) > 0 else 0.0
-            total_energy = float(np.mean(fft)) if len(fft) > 0 else 1e-9
-            ratio = hf_energy / max(total_energy, 1e-9)
-            density_values.append(ratio)
-            offset += hop_samples
-        return density_values
-
-    # ------------------------------------------------------------------
-    # Tempo estimation
-    # ------------------------------------------------------------------
+        return features.window_mean(features.hf_ratio, _WINDOW_SECONDS, _HOP_SECONDS)
 
     @staticmethod
-    def _estimate_tempo(y, sr: int, warnings: List[str]) -> Optional[float]:
-        """Estimate BPM using librosa.  Returns None if unreliable."""
-        try:
-            import librosa  # type: ignore
-            import numpy as np  # type: ignore
-
-            tempo, _ = librosa.beat.beat_track(y=y, sr=sr)
-            bpm = float(np.atleast_1d(tempo)[0])
-            if bpm < 40.0 or bpm > 240.0:
-                warnings.append(
-                    f"Tempo estimate ({bpm:.1f} BPM) is outside reliable range — ignored"
-                )
-                return None
-            return round(bpm, 1)
-        except Exception as exc:
-            warnings.append(f"Tempo estimation unavailable: {exc}")
+    def _estimate_tempo(features: AudioFeatures, warnings: List[str]) -> Optional[float]:
+        """Return the bundle's tempo estimate.  Returns None if unreliable."""
+        bpm = float(features.tempo)
+        if bpm <= 0.0:
+            warnings.append("Tempo estimation unavailable")
+            return None
+        if bpm < 40.0 or bpm > 240.0:
+            warnings.append(
+                f"Tempo estimate ({bpm:.1f} BPM) is outside reliable range — ignored"
+            )
             return None
+        return round(bpm, 1)
 
     # ------------------------------------------------------------------
     # Section segmentation
@@ -1,5 +1,6 @@
 """Shared render executor for all render-plan-driven audio rendering paths."""
 
+import copy
 import json
 import logging
 import os
@@ -9,9 +10,11 @@ from typing import Any
 from pydub import AudioSegment
 from app.config import settings
 from app.services.ai_producer_guide import AIProducerGuideAdvisor
-from app.services.mastering import apply_mastering
+from app.services.mastering import MasteringResult, _safe_peak, apply_mastering
 from app.services.musical_evolution import MusicalEvolutionOrchestrator
 from app.services.producer_event_bar_normalizer import normalize_producer_event_bar
+from app.services.render_output import stream_wav
+from app.services import render_timing
 
 logger = logging.getLogger(__name__)
 
@@ -560,49 +563,12 @@ def _audio_truth_enabled() -> bool:
     return os.getenv("AUDIO_TRUTH_ENABLED", "true").strip().lower() not in {"0", "false", "no", "off"}
 
 
-def render_from_plan(
-    render_plan_json: str | dict[str, Any],
-    audio_source: AudioSegment,
-    output_path: str | Path,
-    stems: dict[str, AudioSegment] | None = None,
-    loop_variations: dict[str, AudioSegment] | None = None,
-) -> dict[str, Any]:
-    """Render audio from render_plan_json and export output to output_path.
-    
-    Args:
-        render_plan_json: Render plan JSON string or dict  
-        audio_source: Full stereo loop audio (fallback when stems unavailable)
-        output_path: Path to write output WAV file
-        stems: Optional dict of stem audio files for real layer-based rendering
-    
-    Returns:
-        Dict with timeline_json, summary, postprocess, and render_observability.
-        render_observability contains Phase 3 fields:
-          render_path_used, source_quality_mode_used, fallback_triggered_count,
-          fallback_reasons, section_execution_report, render_signatures,
-          unique_render_signature_count, phrase_split_count, mastering_applied,
-          mastering_profile, planned_stem_map_by_section, actual_stem_map_by_section.
-    """
-    if isinstance(render_plan_json, str):
-        try:
-            render_plan = json.loads(render_plan_json)
-        except Exception as e:
-            raise ValueError(f"Invalid render_plan_json: {e}") from e
-    else:
-        render_plan = render_plan_json
-
-    # Determine render path before execution so it's always set even on failure.
-    render_path_used = "stem_render_executor" if stems else "stereo_fallback"
-    if render_path_used == "stem_render_executor":
-        logger.info("ACTIVE_RENDER_PATH_ENTERED")
-        logger.info("AUDIO_TRUTH_CONFIG enabled=%s", _audio_truth_enabled())
-
-
-    # Derive source quality mode from render plan metadata.
-    render_profile = render_plan.get("render_profile") or {}
-    stem_sep = render_profile.get("stem_separation") or {}
-    source_quality_mode_used = _derive_source_quality_mode(render_plan, stems, stem_sep)
+def _plan_arrangement(render_plan: dict[str, Any], render_path_used: str) -> dict[str, Any]:
+    """Merge the resolved plan, apply the AI guide and build the producer arrangement.
 
+    Returns the plan snapshot a later render can pass back as
+    ``planned_arrangement`` to skip this step (see preview_render.py).
+    """
     # Resolved render plan merge — applies authoritative resolved fields from
     # FinalPlanResolver back into the raw section dicts so that
     # _build_producer_arrangement_from_render_plan uses canonical roles and events.
@@ -662,6 +628,86 @@ def render_from_plan(
         render_plan=render_plan,
         fallback_bpm=float(render_plan.get("bpm") or 120.0),
     )
+
+    return {
+        "render_plan": render_plan,
+        "producer_arrangement": producer_payload,
+        "summary": summary,
+        "resolved_plan_primary_used": _resolved_plan_primary_used,
+        "resolved_plan_primary_fallback_used": _resolved_plan_primary_fallback_used,
+        "render_mismatch_count": _render_mismatch_count,
+    }
+
+
+def render_from_plan(
+    render_plan_json: str | dict[str, Any],
+    audio_source: AudioSegment,
+    output_path: str | Path,
+    stems: dict[str, AudioSegment] | None = None,
+    loop_variations: dict[str, AudioSegment] | None = None,
+    output_sink: Any | None = None,
+    preview: bool = False,
+    planned_arrangement: dict[str, Any] | None = None,
+) -> dict[str, Any]:
+    """Render audio from render_plan_json and export output to output_path.
+    
+    Args:
+        render_plan_json: Render plan JSON string or dict  
+        audio_source: Full stereo loop audio (fallback when stems unavailable)
+        output_path: Path to write output WAV file
+        stems: Optional dict of stem audio files for real layer-based rendering
+        output_sink: Optional writable stream (e.g. ``storage.open_upload_stream``)
+            that receives the WAV in chunks instead of output_path
+        preview: Render at the preview rate without mastering or the audio-truth
+            pass and write the compressed encoding from preview_render.py
+        planned_arrangement: ``planned_arrangement`` returned by an earlier
+            render of the same plan; skips the plan merge and arrangement build
+    
+    Returns:
+        Dict with timeline_json, summary, postprocess, render_observability,
+        planned_arrangement, output_content_type and output_extension.
+        render_observability contains Phase 3 fields:
+          render_path_used, source_quality_mode_used, fallback_triggered_count,
+          fallback_reasons, section_execution_report, render_signatures,
+          unique_render_signature_count, phrase_split_count, mastering_applied,
+          mastering_profile, planned_stem_map_by_section, actual_stem_map_by_section.
+    """
+    if isinstance(render_plan_json, str):
+        try:
+            render_plan = json.loads(render_plan_json)
+        except Exception as e:
+            raise ValueError(f"Invalid render_plan_json: {e}") from e
+    else:
+        render_plan = render_plan_json
+
+    # Determine render path before execution so it's always set even on failure.
+    render_path_used = "stem_render_executor" if stems else "stereo_fallback"
+    if render_path_used == "stem_render_executor":
+        logger.info("ACTIVE_RENDER_PATH_ENTERED")
+        logger.info("AUDIO_TRUTH_CONFIG enabled=%s", _audio_truth_enabled())
+
+
+    # Derive source quality mode from render plan metadata.
+    render_profile = render_plan.get("render_profile") or {}
+    stem_sep = render_profile.get("stem_separation") or {}
+    source_quality_mode_used = _derive_source_quality_mode(render_plan, stems, stem_sep)
+
+    if planned_arrangement is None:
+        with render_timing.span("plan_arrangement", "planning"):
+            planned_arrangement = _plan_arrangement(render_plan, render_path_used)
+    else:
+        logger.info(
+            "RENDER_PLAN_REUSED sections=%d",
+            len(planned_arrangement["producer_arrangement"].get("sections") or []),
+        )
+    # Rendering mutates section dicts; hand back the arrangement as planned.
+    planned_snapshot = copy.deepcopy(planned_arrangement)
+    render_plan = planned_arrangement["render_plan"]
+    producer_payload = planned_arrangement["producer_arrangement"]
+    summary = planned_arrangement["summary"]
+    _resolved_plan_primary_used = planned_arrangement.get("resolved_plan_primary_used", False)
+    _resolved_plan_primary_fallback_used = planned_arrangement.get("resolved_plan_primary_fallback_used", False)
+    _render_mismatch_count = planned_arrangement.get("render_mismatch_count", 0)
     logger.info(
         "RENDER_PLAN_LOADED section_count=%d events=%d",
         len(render_plan.get("sections") or []),
@@ -685,16 +731,26 @@ def render_from_plan(
 
     from app.services.arrangement_jobs import _render_producer_arrangement
 
+    if preview:
+        from app.services import preview_render
+
+        audio_source = preview_render.downsample(audio_source)
+        if stems:
+            stems = {role: preview_render.downsample(stem) for role, stem in stems.items()}
+        if loop_variations:
+            loop_variations = {name: preview_render.downsample(v) for name, v in loop_variations.items()}
+
     logger.info("PRODUCER_RENDER_STARTED")
     for _section in producer_payload.get("sections") or []:
         logger.info("PRODUCER_SECTION_RENDER section=%s", _section.get("name") or _section.get("type"))
-    output_audio, timeline_json = _render_producer_arrangement(
-        loop_audio=audio_source,
-        producer_arrangement=producer_payload,
-        bpm=float(producer_payload.get("tempo", 120.0)),
-        stems=stems,
-        loop_variations=loop_variations,
-    )
+    with render_timing.span("render_sections", "render", sections=len(producer_payload.get("sections") or [])):
+        output_audio, timeline_json = _render_producer_arrangement(
+            loop_audio=audio_source,
+            producer_arrangement=producer_payload,
+            bpm=float(producer_payload.get("tempo", 120.0)),
+            stems=stems,
+            loop_variations=loop_variations,
+        )
     try:
         _tl = json.loads(timeline_json) if isinstance(timeline_json, str) else (timeline_json or {})
     except Exception:
@@ -738,14 +794,32 @@ def render_from_plan(
         logger.info("ACTIVE_RENDER_PATH_QUALITY_REPAIR_ENTERED")
     output_audio = _apply_master_headroom(output_audio, target_peak_dbfs=-1.0)
 
-    mastering_result = apply_mastering(
-        output_audio,
-        genre=producer_payload.get("genre") or render_plan.get("render_profile", {}).get("genre_profile"),
-    )
+    if preview:
+        peak = _safe_peak(output_audio)
+        mastering_result = MasteringResult(output_audio, "preview", peak, peak, False)
+    else:
+        with render_timing.span("mastering", "mastering"):
+            mastering_result = apply_mastering(
+                output_audio,
+                genre=producer_payload.get("genre") or render_plan.get("render_profile", {}).get("genre_profile"),
+            )
     output_audio = mastering_result.audio
 
-    output_path = Path(output_path)
-    output_audio.export(str(output_path), format="wav")
+    output_content_type, output_extension = "audio/wav", ".wav"
+    # A streamed export also covers the upload of the parts it fills.
+    with render_timing.span("export", "export", streamed=output_sink is not None, preview=preview):
+        if preview:
+            encoded = preview_render.encode_preview(output_audio)
+            output_content_type, output_extension = encoded.content_type, encoded.extension
+            if output_sink is not None:
+                output_sink.write(encoded.data)
+            else:
+                Path(output_path).write_bytes(encoded.data)
+        elif output_sink is not None:
+            stream_wav(output_audio, output_sink)
+        else:
+            output_path = Path(output_path)
+            output_audio.export(str(output_path), format="wav")
 
     # Embed producer_plan and update planned_transition_events in the timeline so that
     # the arrangement_json persisted to the DB includes the real producer plan data.
@@ -803,7 +877,7 @@ def render_from_plan(
         timeline_json=timeline_json,
         render_observability=render_observability,
     )
-    if render_path_used == "stem_render_executor" and _audio_truth_enabled():
+    if render_path_used == "stem_render_executor" and _audio_truth_enabled() and not preview:
 
         logger.info("ACTIVE_RENDER_PATH_AUDIO_TRUTH_ENTERED")
         logger.info("AUDIO_TRUTH_ANALYSIS_STARTED")
@@ -848,6 +922,9 @@ def render_from_plan(
         "resolved_plan_primary_used": _resolved_plan_primary_used,
         "resolved_plan_primary_fallback_used": _resolved_plan_primary_fallback_used,
         "render_mismatch_count": _render_mismatch_count,
+        "planned_arrangement": planned_snapshot,
+        "output_content_type": output_content_type,
+        "output_extension": output_extension,
         "postprocess": {
             "mastering": {
                 "applied": mastering_result.applied,
@@ -1597,7 +1674,7 @@ def _build_render_observability(
                 len(matched) / max(1, len(planned_transition_events)), 3
             )
 
-    return {
+    observability = {
         "render_path_used": render_path_used,
         "source_quality_mode_used": source_quality_mode_used,
         "fallback_triggered_count": fallback_triggered_count,
@@ -1621,4 +1698,7 @@ def _build_render_observability(
         "actual_transition_events_used": actual_transition_events_used,
         "plan_vs_actual_transition_match": plan_vs_actual_transition_match,
     }
+    if timeline.get("section_memo"):
+        observability["section_memo"] = dict(timeline["section_memo"])
+    return observability
     logger.info("VALIDATION_USING_RECOMPUTED_METRICS")
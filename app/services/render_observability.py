@@ -256,6 +256,7 @@ def extract_observability_from_arrangement(arrangement_row: Any) -> dict[str, An
 
     timeline: dict = {}
     render_plan_sections: list = []
+    shadow_timings: dict = {}
 
     if getattr(arrangement_row, "arrangement_json", None):
         try:
@@ -270,6 +271,7 @@ def extract_observability_from_arrangement(arrangement_row: Any) -> dict[str, An
             rp = json.loads(arrangement_row.render_plan_json)
             if isinstance(rp, dict):
                 render_plan_sections = rp.get("sections") or []
+                shadow_timings = dict(rp.get("_shadow_timings") or {})
         except Exception as exc:
             logger.warning("extract_observability: failed to parse render_plan_json: %s", exc)
 
@@ -350,7 +352,7 @@ def extract_observability_from_arrangement(arrangement_row: Any) -> dict[str, An
     unique_render_signature_count = len(set(render_signatures))
 
     recomputed = recompute_producer_metrics_from_execution_report(section_execution_report, actual_stem_map, render_signatures)
-    return {
+    observability: dict[str, Any] = {
         "fallback_triggered_count": fallback_triggered_count,
         "fallback_sections_count": fallback_triggered_count,
         "fallback_reasons": fallback_reasons,
@@ -374,6 +376,11 @@ def extract_observability_from_arrangement(arrangement_row: Any) -> dict[str, An
         "hook_escalation_applied": hook_escalation_applied or bool(recomputed["hook_escalation_applied"]),
         "final_producer_score": max(final_producer_score, float(recomputed["final_producer_score"])),
     }
+    if shadow_timings:
+        observability["shadow_timings"] = shadow_timings
+    if timeline.get("section_memo"):
+        observability["section_memo"] = dict(timeline["section_memo"])
+    return observability
 
 
 # ---------------------------------------------------------------------------
@@ -442,11 +449,13 @@ def assemble_render_metadata(
     observability: dict[str, Any],
     mastering_info: Optional[dict[str, Any]] = None,
     feature_flags_snapshot: Optional[dict[str, Any]] = None,
+    profile: Optional[dict[str, Any]] = None,
 ) -> dict[str, Any]:
     """Assemble the complete render_metadata payload for persistence.
 
     Merges worker-level context (worker_mode, terminal_state, failure_stage)
     with execution-level observability (stem maps, fallbacks, signatures).
+    *profile* is the job's timing profile (``render_timing.snapshot()``).
     """
     metadata: dict[str, Any] = {
         "worker_mode": worker_mode,
@@ -493,6 +502,8 @@ def assemble_render_metadata(
 
     if feature_flags_snapshot is not None:
         metadata["feature_flags_snapshot"] = feature_flags_snapshot
+    if profile is not None:
+        metadata["profile"] = profile
 
     # V2 observability fields (populated when ARRANGEMENT_TRUTH_OBSERVABILITY_V2=true).
     if observability.get("arrangement_plan_v2"):
@@ -503,6 +514,12 @@ def assemble_render_metadata(
         metadata["section_occurrence_info"] = observability["section_occurrence_info"]
     if observability.get("source_quality_mode"):
         metadata["source_quality_mode"] = observability["source_quality_mode"]
+    # Per-shadow-engine wall time from run_arrangement_job's shadow executor.
+    if observability.get("shadow_timings"):
+        metadata["shadow_timings"] = observability["shadow_timings"]
+    # Section-memo reuse for this render (sections, reused, reuse_ratio).
+    if observability.get("section_memo"):
+        metadata["section_memo"] = observability["section_memo"]
 
     # AI planning observability fields.
     for ai_key in (
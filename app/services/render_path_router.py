@@ -23,6 +23,7 @@ from app.services.stem_arrangement_engine import (
     StemRole,
     SectionConfig,
 )
+from app.services.pcm_stem_store import fetch_pcm_stem
 from app.services.stem_render_executor import StemRenderExecutor
 
 logger = logging.getLogger(__name__)
@@ -86,8 +87,15 @@ class RenderPathRouter:
             for role_str, file_info in stem_files.items():
                 try:
                     role = StemRole(role_str)
-                    # Get the file URL or S3 key
-                    file_location = file_info.get('url') or file_info.get('s3_key') or file_info.get('file_key')
+                    # Prefer the memory-mappable canonical PCM copy written at
+                    # ingest (fetched into the local cache); otherwise the
+                    # file URL or S3 key
+                    stem_key = file_info.get('s3_key') or file_info.get('file_key')
+                    pcm_path = fetch_pcm_stem(stem_key) if stem_key and file_info.get('pcm') else None
+                    if pcm_path is not None:
+                        file_location = str(pcm_path)
+                    else:
+                        file_location = file_info.get('url') or stem_key
                     if file_location:
                         result[role] = file_location
                 except ValueError:
@@ -19,8 +19,11 @@ from __future__ import annotations
 import logging
 import os
 from dataclasses import dataclass, field
-from typing import List, Optional
+from typing import List, Optional, Sequence
 
+from pydub import AudioSegment
+
+from app.services.band_energy import RENDER_BANDS, analyze_band_energies
 from app.services.producer_plan_builder import (
     ProducerArrangementPlanV2,
     ProducerSectionPlan,
@@ -121,6 +124,7 @@ class RenderQAService:
     All checks are purely heuristic and deterministic — no audio I/O.
     Use ``score_plan`` for arrangement plan evaluation.
     Use ``score_render_output`` for post-render file hygiene checks.
+    Use ``score_section_audio`` for band-level checks of rendered sections.
 
     Usage::
 
@@ -172,6 +176,16 @@ class RenderQAService:
         "hook_not_more_roles":        20,   # hook has same number of roles as adjacent verse
     }
 
+    _AUDIO_BALANCE_PENALTIES = {
+        "audio_melody_buried":        10,   # melody band 6+ dB under rhythm in a melodic section
+    }
+
+    # Section types (SectionKind values) whose melody should stay audible over the rhythm section
+    _MELODIC_SECTION_TYPES: frozenset[str] = frozenset(
+        kind.value for kind in (SectionKind.VERSE, SectionKind.PRE_HOOK, SectionKind.HOOK, SectionKind.BRIDGE)
+    )
+    _MELODY_BURIED_RATIO_DB = -6.0
+
     @classmethod
     def score_plan(cls, plan: ProducerArrangementPlanV2) -> RenderQAResult:
         """Score an arrangement plan. Returns RenderQAResult."""
@@ -251,6 +265,53 @@ class RenderQAService:
             passed=score.passed,
         )
 
+    @classmethod
+    def score_section_audio(
+        cls,
+        sections: Sequence[tuple[str, str, AudioSegment]],
+    ) -> RenderQAResult:
+        """
+        Check rendered section audio for melody buried under the rhythm section.
+
+        Args:
+            sections: ``(label, section_type, audio)`` per section, in
+                      arrangement order; *section_type* is a ``SectionKind``
+                      value.  Band levels come from
+                      ``band_energy.analyze_band_energies``, so sections the
+                      audio-truth pass already measured are not re-analyzed.
+
+        Levels are relative to each section's peak, so this measures band
+        balance, not loudness.  Penalties are informational, on ``clarity_score``.
+        """
+        score = QualityScore()
+        checks_run: list[str] = []
+        levels = [
+            (label, section_type, analyze_band_energies(audio, RENDER_BANDS))
+            for label, section_type, audio in sections
+            if len(audio) > 0
+        ]
+
+        # --- audio_melody_buried ---
+        checks_run.append("audio_melody_buried")
+        for label, section_type, energies in levels:
+            if section_type not in cls._MELODIC_SECTION_TYPES:
+                continue
+            ratio = energies["melodic"] - max(energies["drum"], energies["bass"])
+            if ratio < cls._MELODY_BURIED_RATIO_DB:
+                score.clarity_score -= cls._AUDIO_BALANCE_PENALTIES["audio_melody_buried"]
+                score.warnings.append(
+                    f"audio_melody_buried: {label} melody band sits {-ratio:.1f} dB under the rhythm section"
+                )
+
+        score.clarity_score = max(0.0, score.clarity_score)
+        score.recompute_overall()
+
+        return RenderQAResult(
+            score=score,
+            checks_run=checks_run,
+            passed=score.passed,
+        )
+
     # ------------------------------------------------------------------
     # Internal checks
     # ------------------------------------------------------------------
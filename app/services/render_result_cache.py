@@ -0,0 +1,230 @@
+"""
+Deterministic render result cache keyed by a render fingerprint.
+
+The fingerprint covers the source loop's version, the stem keys, the resolved
+render plan, the render flag snapshot and :func:`engine_version`; hits reuse
+``render-cache/<fingerprint>.wav`` and its JSON manifest.  Bump
+``RENDER_ENGINE_VERSION`` or ``RENDER_RESULT_CACHE_VERSION`` to invalidate.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Mapping, Optional
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever a code change alters the audio rendered for an unchanged plan.
+RENDER_ENGINE_VERSION = "2"
+
+CACHE_PREFIX = "render-cache"
+
+# render_from_plan() result fields kept in the manifest.
+_RESULT_FIELDS = ("timeline_json", "summary", "postprocess", "render_observability")
+# Top-level plan keys that are recorded after rendering and never read by it.
+_VOLATILE_PLAN_KEYS = ("_shadow_timings",)
+
+
+def engine_version() -> str:
+    """Return the version string that scopes every fingerprint."""
+    parts = [RENDER_ENGINE_VERSION, str(settings.app_version)]
+    namespace = settings.render_result_cache_version
+    if isinstance(namespace, str) and namespace:
+        parts.append(namespace)
+    return "+".join(parts)
+
+
+def canonical_render_plan(render_plan: str | Mapping[str, Any]) -> dict[str, Any]:
+    """Return *render_plan* without the fields that do not affect the audio."""
+    plan = json.loads(render_plan) if isinstance(render_plan, str) else dict(render_plan or {})
+    for key in _VOLATILE_PLAN_KEYS:
+        plan.pop(key, None)
+    profile = plan.get("render_profile")
+    if isinstance(profile, dict) and "postprocess" in profile:
+        plan["render_profile"] = {k: v for k, v in profile.items() if k != "postprocess"}
+    return plan
+
+
+def render_fingerprint(
+    *,
+    source_version: str,
+    stem_keys: Optional[Mapping[str, str]],
+    render_plan: str | Mapping[str, Any],
+    feature_flags: Optional[Mapping[str, Any]],
+    version: Optional[str] = None,
+) -> str:
+    """Return the SHA-256 fingerprint of a render's inputs."""
+    payload = {
+        "engine_version": version or engine_version(),
+        "source_version": source_version,
+        "stem_keys": dict(stem_keys or {}),
+        "render_plan": canonical_render_plan(render_plan),
+        "feature_flags": dict(feature_flags or {}),
+    }
+    blob = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def output_key(fingerprint: str) -> str:
+    """Storage key the rendered WAV for *fingerprint* is uploaded under."""
+    return f"{CACHE_PREFIX}/{fingerprint}.wav"
+
+
+def manifest_key(fingerprint: str) -> str:
+    return f"{CACHE_PREFIX}/{fingerprint}.json"
+
+
+@dataclass(frozen=True)
+class CachedRender:
+    """A previously rendered output and the render result that produced it."""
+
+    fingerprint: str
+    output_s3_key: str
+    content_type: str
+    render_result: dict[str, Any]
+    engine_version: str
+    created_at: Optional[str] = None
+
+
+class RenderResultCache:
+    """Fingerprint -> rendered output index stored next to the outputs."""
+
+    def __init__(self, store: Any = None) -> None:
+        self._store = store
+        self._lock = threading.Lock()
+        self._counters = {
+            "hits": 0,
+            "misses": 0,
+            "stale": 0,
+            "bypassed": 0,
+            "stores": 0,
+            "invalidations": 0,
+            "errors": 0,
+        }
+
+    @property
+    def store(self) -> Any:
+        if self._store is None:
+            from app.services.storage import storage
+
+            return storage
+        return self._store
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def lookup(self, fingerprint: str) -> Optional[CachedRender]:
+        """Return the cached render for *fingerprint*, or None on a miss.
+
+        Entries from another engine version, or whose output object is gone,
+        are invalidated and reported as a miss.
+        """
+        try:
+            raw = self.store.read_file(manifest_key(fingerprint))
+            if raw is None:
+                self._count("misses")
+                return None
+            manifest = json.loads(raw)
+            entry = CachedRender(
+                fingerprint=fingerprint,
+                output_s3_key=manifest["output_s3_key"],
+                content_type=manifest.get("content_type") or "audio/wav",
+                render_result=dict(manifest.get("render_result") or {}),
+                engine_version=manifest.get("engine_version") or "",
+                created_at=manifest.get("created_at"),
+            )
+            if entry.engine_version != engine_version() or not self.store.file_exists(entry.output_s3_key):
+                logger.info(
+                    "RENDER_RESULT_CACHE_STALE fingerprint=%s engine_version=%s current=%s",
+                    fingerprint,
+                    entry.engine_version,
+                    engine_version(),
+                )
+                self._count("stale")
+                self._count("misses")
+                self.invalidate(fingerprint)
+                return None
+        except Exception as e:
+            logger.warning("RENDER_RESULT_CACHE_LOOKUP_FAILED fingerprint=%s error=%s", fingerprint, e)
+            self._count("errors")
+            self._count("misses")
+            return None
+        self._count("hits")
+        logger.info("RENDER_RESULT_CACHE_HIT fingerprint=%s output_s3_key=%s", fingerprint, entry.output_s3_key)
+        return entry
+
+    def put(
+        self,
+        fingerprint: str,
+        *,
+        output_s3_key: str,
+        content_type: str,
+        render_result: Mapping[str, Any],
+    ) -> None:
+        """Record *output_s3_key* as the render for *fingerprint* (best effort)."""
+        manifest = {
+            "fingerprint": fingerprint,
+            "engine_version": engine_version(),
+            "output_s3_key": output_s3_key,
+            "content_type": content_type,
+            "render_result": {k: render_result[k] for k in _RESULT_FIELDS if k in render_result},
+            "created_at": datetime.utcnow().isoformat(),
+        }
+        try:
+            body = json.dumps(manifest, default=str).encode("utf-8")
+            self.store.upload_file(body, "application/json", manifest_key(fingerprint))
+        except Exception as e:
+            logger.warning("RENDER_RESULT_CACHE_STORE_FAILED fingerprint=%s error=%s", fingerprint, e)
+            self._count("errors")
+            return
+        self._count("stores")
+
+    def invalidate(self, fingerprint: str) -> None:
+        """Forget *fingerprint*; the next matching job renders from scratch."""
+        try:
+            self.store.delete_file(manifest_key(fingerprint))
+        except Exception as e:
+            logger.warning("RENDER_RESULT_CACHE_INVALIDATE_FAILED fingerprint=%s error=%s", fingerprint, e)
+            self._count("errors")
+            return
+        self._count("invalidations")
+
+    def record_bypass(self) -> None:
+        self._count("bypassed")
+
+    def stats(self) -> dict[str, Any]:
+        """Return hit/miss counters for this process."""
+        with self._lock:
+            counters = dict(self._counters)
+        lookups = counters["hits"] + counters["misses"]
+        return {
+            **counters,
+            "hit_ratio": round(counters["hits"] / lookups, 4) if lookups else None,
+            "engine_version": engine_version(),
+        }
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._counters[name] += 1
+
+
+_cache: Optional[RenderResultCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_render_result_cache() -> RenderResultCache:
+    """Return the process-wide cache backed by the global storage service."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = RenderResultCache()
+    return _cache
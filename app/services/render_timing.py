@@ -0,0 +1,314 @@
+"""
+Per-stage timing spans for render jobs.
+
+:func:`span` and :func:`traced` record wall time, thread CPU time and peak RSS
+into the :class:`RenderProfile` opened per job by :func:`begin_profile`, and
+are no-ops outside a job.  ``GET /jobs/{job_id}/profile`` serves the profile,
+also as a Chrome trace (:func:`to_chrome_trace`).
+"""
+
+from __future__ import annotations
+
+import contextvars
+import functools
+import itertools
+import logging
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable, Iterator, Optional, Union
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+SpanName = Union[str, Callable[..., str]]
+
+_current: contextvars.ContextVar[Optional["RenderProfile"]] = contextvars.ContextVar("render_timing_profile", default=None)
+# (profile, span id) of the innermost open span; ids only mean something within their profile.
+_parent: contextvars.ContextVar[Optional[tuple["RenderProfile", int]]] = contextvars.ContextVar(
+    "render_timing_parent", default=None
+)
+
+# ru_maxrss is KiB on Linux and bytes on macOS.
+_RSS_UNIT_MB = 1.0 / (1024 * 1024) if sys.platform == "darwin" else 1.0 / 1024
+
+
+def _peak_rss_mb() -> Optional[float]:
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * _RSS_UNIT_MB
+
+
+@dataclass
+class Span:
+    id: int
+    name: str
+    category: str
+    start_ms: float
+    wall_ms: float
+    cpu_ms: float
+    peak_rss_mb: Optional[float]
+    rss_growth_mb: Optional[float]
+    pid: int
+    tid: int
+    thread: str
+    parent: Optional[int] = None
+    error: Optional[str] = None
+    attrs: dict[str, Any] = field(default_factory=dict)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "id": self.id,
+            "name": self.name,
+            "category": self.category,
+            "start_ms": round(self.start_ms, 3),
+            "wall_ms": round(self.wall_ms, 3),
+            "cpu_ms": round(self.cpu_ms, 3),
+            "peak_rss_mb": None if self.peak_rss_mb is None else round(self.peak_rss_mb, 2),
+            "rss_growth_mb": None if self.rss_growth_mb is None else round(self.rss_growth_mb, 2),
+            "pid": self.pid,
+            "tid": self.tid,
+            "thread": self.thread,
+            "parent": self.parent,
+            "error": self.error,
+            "attrs": self.attrs,
+        }
+
+
+class RenderProfile:
+    """Spans recorded for one job; safe to record into from several threads."""
+
+    def __init__(self, label: Optional[str] = None, *, max_spans: Optional[int] = None) -> None:
+        self.label = label
+        self.max_spans = max(0, int(settings.render_timing_max_spans if max_spans is None else max_spans))
+        self.started_at = datetime.now(timezone.utc)
+        self._origin_wall = time.time()
+        self._origin = time.perf_counter()
+        self._origin_cpu = time.process_time()
+        self._spans: list[Span] = []
+        self._dropped = 0
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, name: str, category: str = "render", **attrs: Any) -> Iterator[dict[str, Any]]:
+        """Record the enclosed block as a span; yields *attrs* so the block can add to them."""
+        span_id = next(self._ids)
+        parent = self._open_span()
+        token = _parent.set((self, span_id))
+        rss_before = _peak_rss_mb()
+        cpu_started = time.thread_time()
+        started = time.perf_counter()
+        error = None
+        try:
+            yield attrs
+        except BaseException as exc:
+            error = type(exc).__name__
+            raise
+        finally:
+            wall_ms = (time.perf_counter() - started) * 1000.0
+            cpu_ms = (time.thread_time() - cpu_started) * 1000.0
+            rss_after = _peak_rss_mb()
+            _parent.reset(token)
+            self._add(
+                Span(
+                    id=span_id,
+                    name=name,
+                    category=category,
+                    start_ms=(started - self._origin) * 1000.0,
+                    wall_ms=wall_ms,
+                    cpu_ms=cpu_ms,
+                    peak_rss_mb=rss_after,
+                    rss_growth_mb=None if rss_after is None else rss_after - rss_before,
+                    pid=os.getpid(),
+                    tid=threading.get_native_id(),
+                    thread=threading.current_thread().name,
+                    parent=parent,
+                    error=error,
+                    attrs=attrs,
+                )
+            )
+
+    def merge(self, exported: Optional[dict[str, Any]]) -> None:
+        """Add the spans of a profile recorded in another process (see :meth:`export`).
+
+        Its top-level spans become children of the span open in the caller.
+        """
+        if not exported:
+            return
+        parent = self._open_span()
+        offset_ms = (exported["origin_wall"] - self._origin_wall) * 1000.0
+        id_map: dict[int, int] = {}
+        for raw in exported["spans"]:
+            id_map[raw["id"]] = next(self._ids)
+        for raw in exported["spans"]:
+            self._add(
+                Span(
+                    **{
+                        **raw,
+                        "id": id_map[raw["id"]],
+                        "start_ms": raw["start_ms"] + offset_ms,
+                        "parent": id_map.get(raw["parent"], parent),
+                    }
+                )
+            )
+        with self._lock:
+            self._dropped += exported.get("dropped_spans", 0)
+
+    def export(self) -> dict[str, Any]:
+        """Picklable spans for :meth:`merge` in the parent process."""
+        with self._lock:
+            spans = [vars(s).copy() for s in self._spans]
+            dropped = self._dropped
+        return {"origin_wall": self._origin_wall, "spans": spans, "dropped_spans": dropped}
+
+    def to_dict(self) -> dict[str, Any]:
+        """Profile as persisted in ``render_metadata["profile"]``."""
+        with self._lock:
+            spans = sorted(self._spans, key=lambda s: s.start_ms)
+            dropped = self._dropped
+        peak_rss_mb = _peak_rss_mb()
+        return {
+            "label": self.label,
+            "started_at": self.started_at.isoformat(),
+            "wall_ms": round((time.perf_counter() - self._origin) * 1000.0, 3),
+            "cpu_ms": round((time.process_time() - self._origin_cpu) * 1000.0, 3),
+            "peak_rss_mb": None if peak_rss_mb is None else round(peak_rss_mb, 2),
+            "stages": _stage_totals(spans),
+            "spans": [s.to_dict() for s in spans],
+            "dropped_spans": dropped,
+        }
+
+    def _open_span(self) -> Optional[int]:
+        current = _parent.get()
+        return current[1] if current is not None and current[0] is self else None
+
+    def _add(self, span: Span) -> None:
+        with self._lock:
+            if len(self._spans) < self.max_spans:
+                self._spans.append(span)
+            else:
+                self._dropped += 1
+
+
+def _stage_totals(spans: list[Span]) -> dict[str, dict[str, Any]]:
+    """Per-category totals, counting a span nested in one of its own category only once."""
+    by_id = {s.id: s for s in spans}
+    totals: dict[str, dict[str, Any]] = {}
+    for s in spans:
+        ancestor = by_id.get(s.parent) if s.parent is not None else None
+        while ancestor is not None and ancestor.category != s.category:
+            ancestor = by_id.get(ancestor.parent) if ancestor.parent is not None else None
+        if ancestor is not None:
+            continue
+        stage = totals.setdefault(s.category, {"count": 0, "wall_ms": 0.0, "cpu_ms": 0.0})
+        stage["count"] += 1
+        stage["wall_ms"] = round(stage["wall_ms"] + s.wall_ms, 3)
+        stage["cpu_ms"] = round(stage["cpu_ms"] + s.cpu_ms, 3)
+    return totals
+
+
+def current_profile() -> Optional[RenderProfile]:
+    return _current.get()
+
+
+def begin_profile(label: Optional[str] = None) -> contextvars.Token:
+    """Start a profile for the current context; pass the token to :func:`end_profile`.
+
+    Installs no profile (so spans are no-ops) when RENDER_TIMING_ENABLED is off.
+    """
+    profile = RenderProfile(label) if settings.render_timing_enabled else None
+    return _current.set(profile)
+
+
+def end_profile(token: contextvars.Token) -> None:
+    _current.reset(token)
+
+
+@contextmanager
+def profiling(label: Optional[str] = None, *, enabled: bool = True) -> Iterator[Optional[RenderProfile]]:
+    """Run the block under a fresh profile (or none when *enabled* is false or profiling is off)."""
+    token = begin_profile(label) if enabled else _current.set(None)
+    try:
+        yield _current.get()
+    finally:
+        end_profile(token)
+
+
+def snapshot() -> Optional[dict[str, Any]]:
+    """:meth:`RenderProfile.to_dict` of the current profile, or None."""
+    profile = _current.get()
+    return profile.to_dict() if profile is not None else None
+
+
+@contextmanager
+def span(name: str, category: str = "render", **attrs: Any) -> Iterator[dict[str, Any]]:
+    """Record the block in the current profile; a no-op without one."""
+    profile = _current.get()
+    if profile is None:
+        yield attrs
+        return
+    with profile.span(name, category, **attrs) as span_attrs:
+        yield span_attrs
+
+
+def traced(name: SpanName, category: str = "render") -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """Decorator form of :func:`span`; *name* may be a callable of the wrapped function's arguments."""
+
+    def decorator(fn: Callable[..., Any]) -> Callable[..., Any]:
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if _current.get() is None:
+                return fn(*args, **kwargs)
+            span_name = name(*args, **kwargs) if callable(name) else name
+            with span(span_name, category):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def bind_context(fn: Callable[..., Any]) -> Callable[..., Any]:
+    """*fn* bound to a copy of the current context, for submitting to a thread pool."""
+    return functools.partial(contextvars.copy_context().run, fn)
+
+
+def to_chrome_trace(profile: dict[str, Any]) -> dict[str, Any]:
+    """Chrome trace-event JSON (``chrome://tracing``, Perfetto) for a stored profile."""
+    events: list[dict[str, Any]] = []
+    threads: dict[tuple[int, int], str] = {}
+    for s in profile.get("spans") or []:
+        threads.setdefault((s["pid"], s["tid"]), s["thread"])
+        args = {"cpu_ms": s["cpu_ms"], "peak_rss_mb": s["peak_rss_mb"], "rss_growth_mb": s["rss_growth_mb"], **s["attrs"]}
+        if s.get("error"):
+            args["error"] = s["error"]
+        events.append(
+            {
+                "name": s["name"],
+                "cat": s["category"],
+                "ph": "X",
+                "ts": round(s["start_ms"] * 1000.0, 1),
+                "dur": round(s["wall_ms"] * 1000.0, 1),
+                "pid": s["pid"],
+                "tid": s["tid"],
+                "args": args,
+            }
+        )
+    for (pid, tid), thread in threads.items():
+        events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": thread}})
+    return {
+        "traceEvents": events,
+        "displayTimeUnit": "ms",
+        "otherData": {"label": profile.get("label"), "started_at": profile.get("started_at")},
+    }
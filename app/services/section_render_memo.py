@@ -0,0 +1,133 @@
+"""
+Process-wide memo of rendered ProducerArrangement sections.
+
+Sections are keyed by a hash of their effective render inputs and the
+:func:`source_fingerprint` of their audio, bounded by
+``SECTION_RENDER_MEMO_MAX_BYTES`` and evicted least-recently-used first.
+"""
+
+from __future__ import annotations
+
+import copy
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Mapping, Optional
+
+from pydub import AudioSegment
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def source_fingerprint(
+    stems: Optional[Mapping[str, AudioSegment]],
+    loop_audio: AudioSegment,
+    loop_variations: Optional[Mapping[str, AudioSegment]] = None,
+) -> str:
+    """Hash the PCM every section of a render is cut from.
+
+    One pass over the source audio per render, so sections of different jobs
+    only match when they were cut from identical audio.
+    """
+    digest = hashlib.blake2b(digest_size=20)
+
+    def _feed(label: str, audio: AudioSegment) -> None:
+        digest.update(f"{label}:{audio.frame_rate}:{audio.channels}:{audio.sample_width}\0".encode("utf-8"))
+        digest.update(audio.raw_data)
+
+    _feed("loop", loop_audio)
+    for role in sorted(stems or {}):
+        _feed(f"stem/{role}", stems[role])
+    for name in sorted(loop_variations or {}):
+        _feed(f"variation/{name}", loop_variations[name])
+    return digest.hexdigest()
+
+
+class SectionRenderMemo:
+    """Byte-bounded LRU of ``_render_producer_section`` results."""
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max(0, int(max_bytes))
+        self._entries: "OrderedDict[str, tuple[dict, dict]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+
+    def get(self, key: str) -> Optional[tuple[dict, dict]]:
+        """Return ``(result, annotated_section)`` for *key*, or None on a miss.
+
+        Both are copies; the PCM itself is shared (``AudioSegment`` is immutable).
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._counters["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._counters["hits"] += 1
+        result, section = entry
+        return _copy_result(result), copy.deepcopy(section)
+
+    def put(self, key: str, result: dict, section: dict) -> None:
+        """Remember *result* and the post-render state of *section* under *key*."""
+        size = len(result["section_audio"].raw_data)
+        if size > self.max_bytes:
+            return
+        entry = (_copy_result(result), copy.deepcopy(section))
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= len(previous[0]["section_audio"].raw_data)
+            self._entries[key] = entry
+            self._bytes += size
+            self._counters["stores"] += 1
+            while self._bytes > self.max_bytes and self._entries:
+                _, (evicted, _) = self._entries.popitem(last=False)
+                self._bytes -= len(evicted["section_audio"].raw_data)
+                self._counters["evictions"] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict[str, Any]:
+        """Return hit/miss counters and current size."""
+        with self._lock:
+            counters = dict(self._counters)
+            entries = len(self._entries)
+            size = self._bytes
+        lookups = counters["hits"] + counters["misses"]
+        return {
+            **counters,
+            "hit_ratio": round(counters["hits"] / lookups, 4) if lookups else None,
+            "entries": entries,
+            "bytes": size,
+            "max_bytes": self.max_bytes,
+        }
+
+
+def _copy_result(result: dict) -> dict:
+    audio = result["section_audio"]
+    copied = copy.deepcopy({k: v for k, v in result.items() if k != "section_audio"})
+    copied["section_audio"] = audio
+    return copied
+
+
+_memo: Optional[SectionRenderMemo] = None
+_memo_lock = threading.Lock()
+
+
+def get_section_render_memo() -> Optional[SectionRenderMemo]:
+    """Return the process-wide memo, or None when ``SECTION_RENDER_MEMO_ENABLED`` is off."""
+    global _memo
+    if not settings.section_render_memo_enabled:
+        return None
+    if _memo is None:
+        with _memo_lock:
+            if _memo is None:
+                _memo = SectionRenderMemo(settings.section_render_memo_max_bytes)
+    return _memo
@@ -0,0 +1,187 @@
+"""
+Process-pool rendering of ProducerArrangement sections.
+
+Source audio is shared with the workers through ``multiprocessing.shared_memory``;
+each worker renders one section body and the caller stitches the results and
+applies the cross-section passes, so output is byte-identical to the serial
+path.
+"""
+
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Any, Optional
+
+from pydub import AudioSegment
+
+from app.config import settings
+from app.services import render_timing
+
+logger = logging.getLogger(__name__)
+
+# (shm name, byte length, frame_rate, channels, sample_width)
+AudioHandle = tuple[str, int, int, int, int]
+
+# Per-worker cache of AudioSegments rebuilt from shared memory, keyed by block name.
+_attached: dict[str, AudioSegment] = {}
+
+
+def resolve_worker_count(section_count: int) -> int:
+    """Return the pool size for *section_count* sections (never more workers than sections)."""
+    configured = int(settings.render_parallel_workers or 0)
+    workers = configured if configured > 0 else (os.cpu_count() or 1)
+    return max(1, min(workers, section_count))
+
+
+class SharedAudioBlocks:
+    """Owner of the shared-memory copies of a job's source audio.
+
+    Use as a context manager; every block is closed and unlinked on exit.
+    """
+
+    def __init__(self) -> None:
+        self._blocks: list[shared_memory.SharedMemory] = []
+
+    def share(self, audio: AudioSegment) -> AudioHandle:
+        data = audio.raw_data
+        block = shared_memory.SharedMemory(create=True, size=max(1, len(data)))
+        self._blocks.append(block)
+        block.buf[: len(data)] = data
+        return (block.name, len(data), audio.frame_rate, audio.channels, audio.sample_width)
+
+    def share_mapping(self, mapping: Optional[dict[str, AudioSegment]]) -> Optional[dict[str, AudioHandle]]:
+        if mapping is None:
+            return None
+        return {key: self.share(audio) for key, audio in mapping.items()}
+
+    def close(self) -> None:
+        for block in self._blocks:
+            try:
+                block.close()
+                block.unlink()
+            except (FileNotFoundError, OSError):
+                pass
+        self._blocks.clear()
+
+    def __enter__(self) -> "SharedAudioBlocks":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+def _attach(handle: AudioHandle) -> AudioSegment:
+    name, size, frame_rate, channels, sample_width = handle
+    audio = _attached.get(name)
+    if audio is None:
+        block = shared_memory.SharedMemory(name=name)
+        try:
+            data = bytes(block.buf[:size])
+        finally:
+            block.close()
+        audio = AudioSegment(data=data, sample_width=sample_width, frame_rate=frame_rate, channels=channels)
+        _attached[name] = audio
+    return audio
+
+
+def _attach_mapping(handles: Optional[dict[str, AudioHandle]]) -> Optional[dict[str, AudioSegment]]:
+    if handles is None:
+        return None
+    return {key: _attach(handle) for key, handle in handles.items()}
+
+
+def _init_worker(setting_overrides: dict[str, Any]) -> None:
+    # Spawned workers re-read settings from the environment; carry over values
+    # the parent may have changed at runtime (e.g. DSP backend toggles).
+    for name, value in setting_overrides.items():
+        setattr(settings, name, value)
+    _attached.clear()
+
+
+def _render_section_task(
+    section: dict,
+    section_idx: int,
+    shared: dict[str, Any],
+    context: dict[str, Any],
+    profiled: bool = False,
+) -> tuple[dict, dict, Optional[dict]]:
+    from app.services.arrangement_jobs import _render_producer_section
+
+    # Record into a fresh profile (or none) and return its spans; the
+    # caller merges them into the job's profile.
+    with render_timing.profiling(enabled=profiled) as profile:
+        result = _render_producer_section(
+            section,
+            section_idx,
+            stems=_attach_mapping(shared["stems"]),
+            loop_audio=_attach(shared["loop_audio"]),
+            loop_vars_ci=_attach_mapping(shared["loop_vars_ci"]) or {},
+            **context,
+        )
+    # The section dict may be annotated (stem fallback flags); send it back so
+    # the parent's copy matches the serial path.
+    return result, section, profile.export() if profile is not None else None
+
+
+def _mp_context() -> multiprocessing.context.BaseContext:
+    # The render worker has other threads running (the render timeout thread,
+    # shadow planners, the heartbeat), so it is never forked; the audio
+    # reaches the workers by shared-memory block name either way.
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+def render_sections_parallel(
+    sections: list[dict],
+    *,
+    stems: Optional[dict[str, AudioSegment]],
+    loop_audio: AudioSegment,
+    loop_vars_ci: dict[str, AudioSegment],
+    max_workers: Optional[int] = None,
+    indices: Optional[list[int]] = None,
+    **context: Any,
+) -> list[dict]:
+    """Render every section in a process pool; return results in section order.
+
+    *indices* gives each section's position in the arrangement when only a
+    subset is rendered (the rest came from the section memo).  *context* holds
+    the remaining keyword arguments of ``_render_producer_section`` (bar
+    timing, transitions, variation list, ...).  Each ``sections[i]`` is
+    updated in place with any annotations the worker made, as in the serial path.
+    """
+    workers = max_workers or resolve_worker_count(len(sections))
+    profile = render_timing.current_profile()
+    with (
+        render_timing.span("parallel_sections", "section", sections=len(sections), workers=workers),
+        SharedAudioBlocks() as blocks,
+    ):
+        shared = {
+            "stems": blocks.share_mapping(stems),
+            "loop_audio": blocks.share(loop_audio),
+            "loop_vars_ci": blocks.share_mapping(loop_vars_ci),
+        }
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=_mp_context(),
+            initializer=_init_worker,
+            initargs=({"dsp_backend": settings.dsp_backend},),
+        ) as pool:
+            if indices is None:
+                indices = list(range(len(sections)))
+            futures = [
+                pool.submit(_render_section_task, section, idx, shared, context, profile is not None)
+                for idx, section in zip(indices, sections)
+            ]
+            results = []
+            for section, future in zip(sections, futures):
+                result, annotated, spans = future.result()
+                section.update(annotated)
+                results.append(result)
+                if profile is not None:
+                    profile.merge(spans)
+    logger.info("PARALLEL_SECTION_RENDER sections=%d workers=%d", len(sections), workers)
+    return results
@@ -0,0 +1,278 @@
+"""
+Concurrent executor for the shadow-engine planners in ``run_arrangement_job``.
+
+Shadows run inline or on a bounded thread/process pool (``SHADOW_EXECUTOR_MODE``)
+against a deep copy of the render plan, within ``SHADOW_ENGINE_BUDGET_SECONDS``
+each; :meth:`ShadowExecutor.collect` stores their results into the live plan.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import copy
+import logging
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+from app.config import settings
+from app.services import render_timing
+
+logger = logging.getLogger(__name__)
+
+SHADOW_EXECUTOR_MODES = ("thread", "process", "serial")
+
+ShadowStore = Callable[[dict, dict], None]
+
+
+def _run_traced(name: str, fn: Callable[..., dict], kwargs: dict) -> dict:
+    with render_timing.span(f"shadow:{name}", "shadow", mode="thread"):
+        return fn(**kwargs)
+
+
+@dataclass
+class _ShadowRun:
+    name: str
+    store: Optional[ShadowStore]
+    future: Optional[Future] = None
+    result: Optional[dict] = None
+    applied: bool = False
+
+
+class ShadowExecutor:
+    """Run shadow planners inline or on a bounded pool (see module docstring)."""
+
+    def __init__(
+        self,
+        *,
+        mode: str = "thread",
+        max_workers: int = 4,
+        budget_seconds: float = 30.0,
+        arrangement_id: Any = None,
+    ) -> None:
+        self.mode = mode if mode in SHADOW_EXECUTOR_MODES else "serial"
+        self.max_workers = max(1, int(max_workers))
+        if self.mode != "serial" and self.max_workers < 2:
+            # A single worker would just serialise the shadows off-thread.
+            self.mode = "serial"
+        self.budget_seconds = float(budget_seconds)
+        self.arrangement_id = arrangement_id
+        self._runs: dict[str, _ShadowRun] = {}
+        self._timings: dict[str, dict[str, Any]] = {}
+        # Compute futures of shadows that overran their budget while running.
+        self._overrun: dict[str, Future] = {}
+        self._dispatcher: Optional[ThreadPoolExecutor] = None
+        self._compute: Optional[Executor] = None
+
+    @classmethod
+    def from_settings(cls, *, arrangement_id: Any = None) -> "ShadowExecutor":
+        """Build an executor from settings; anything unparsable falls back to serial."""
+        mode = settings.shadow_executor_mode
+        mode = mode.strip().lower() if isinstance(mode, str) else "serial"
+        try:
+            workers = int(settings.shadow_executor_workers)
+            budget = float(settings.shadow_engine_budget_seconds)
+        except (TypeError, ValueError):
+            mode, workers, budget = "serial", 1, 0.0
+        return cls(mode=mode, max_workers=workers, budget_seconds=budget, arrangement_id=arrangement_id)
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def submit(
+        self,
+        name: str,
+        fn: Callable[..., dict],
+        *,
+        render_plan: dict,
+        store: Optional[ShadowStore] = None,
+        inline: bool = False,
+        depends_on: tuple[str, ...] = (),
+        **kwargs: Any,
+    ) -> Optional[dict]:
+        """Run shadow *name* (``fn(render_plan=..., **kwargs)``).
+
+        *store* writes a result into a render plan.  Inline runs (``inline=True``
+        or serial mode) store into *render_plan* immediately and return the
+        result; scheduled runs return None and are stored by :meth:`collect`.
+        """
+        run = _ShadowRun(name=name, store=store)
+        self._runs[name] = run
+
+        if inline or self.mode == "serial":
+            # The live plan must already hold everything this shadow reads.
+            self._apply(render_plan, depends_on)
+            started = time.perf_counter()
+            with render_timing.span(f"shadow:{name}", "shadow", mode="inline"):
+                result = fn(render_plan=render_plan, **kwargs)
+            self._record(name, "inline", started, queued_ms=0.0)
+            run.result = result
+            if store is not None:
+                store(render_plan, result)
+            run.applied = True
+            return result
+
+        snapshot = copy.deepcopy(render_plan)
+        deps = [self._runs[dep] for dep in depends_on if dep in self._runs]
+        run.future = self._dispatch().submit(
+            render_timing.bind_context(self._run_scheduled), name, fn, snapshot, deps, kwargs, time.perf_counter()
+        )
+        return None
+
+    def collect(self, render_plan: dict) -> dict[str, dict[str, Any]]:
+        """Wait for scheduled shadows, store their results into *render_plan*, return timings."""
+        for run in self._runs.values():
+            self._apply_run(render_plan, run)
+        self.shutdown()
+        return self.timings()
+
+    def timings(self) -> dict[str, dict[str, Any]]:
+        """Per-shadow wall time: ``{name: {mode, wall_ms, queued_ms, timed_out, still_running, error}}``.
+
+        A thread cannot be stopped, so a timed-out ``thread`` shadow keeps
+        running (``still_running``) until its planner returns; its result is
+        discarded.  Over-budget ``process`` shadows are terminated by
+        :meth:`shutdown`.
+        """
+        timings = {}
+        for name, timing in self._timings.items():
+            future = self._overrun.get(name)
+            timings[name] = {**timing, "still_running": future is not None and not future.done()}
+        return timings
+
+    def shutdown(self) -> None:
+        """Release the pools without waiting for abandoned (over-budget) shadows.
+
+        In ``process`` mode the pool's workers are terminated when a shadow
+        overran; :meth:`collect` has already received every other result.
+        """
+        compute = self._compute
+        overrun = any(not future.done() for future in self._overrun.values())
+        # ProcessPoolExecutor has no public way to stop its workers before Python 3.14.
+        workers = list((getattr(compute, "_processes", None) or {}).values()) if overrun else []
+        for pool in (self._dispatcher, self._compute):
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
+        self._dispatcher = None
+        self._compute = None
+        if workers:
+            logger.warning(
+                "SHADOW_EXECUTOR_TERMINATE [arr=%s] workers=%d — stopping over-budget shadows",
+                self.arrangement_id,
+                len(workers),
+            )
+            for process in workers:
+                process.terminate()
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _dispatch(self) -> ThreadPoolExecutor:
+        # Dispatcher threads wait for dependencies and enforce the budget;
+        # the shadow itself runs on the compute pool.  Both pools are FIFO and
+        # dependencies are always submitted first, so a waiting dependent can
+        # never starve the shadow it waits on.
+        if self._dispatcher is None:
+            self._dispatcher = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="shadow-dispatch")
+            if self.mode == "process":
+                self._compute = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._compute = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="shadow")
+        return self._dispatcher
+
+    def _apply(self, render_plan: dict, names: tuple[str, ...]) -> None:
+        for name in names:
+            run = self._runs.get(name)
+            if run is not None:
+                self._apply_run(render_plan, run)
+
+    def _apply_run(self, render_plan: dict, run: _ShadowRun) -> None:
+        if run.applied:
+            return
+        if run.future is not None:
+            run.result = run.future.result()
+        if run.store is not None and run.result is not None:
+            run.store(render_plan, run.result)
+        run.applied = True
+
+    def _run_scheduled(
+        self,
+        name: str,
+        fn: Callable[..., dict],
+        snapshot: dict,
+        deps: list[_ShadowRun],
+        kwargs: dict,
+        submitted: float,
+    ) -> dict:
+        for dep in deps:
+            result = dep.future.result() if dep.future is not None else dep.result
+            if dep.store is not None and result is not None:
+                dep.store(snapshot, result)
+
+        started = time.perf_counter()
+        queued_ms = (started - submitted) * 1000.0
+        if self.mode == "process":
+            future = self._compute.submit(fn, render_plan=snapshot, **kwargs)
+            traced = render_timing.span(f"shadow:{name}", "shadow", mode="process", queued_ms=round(queued_ms, 2))
+        else:
+            future = self._compute.submit(
+                render_timing.bind_context(_run_traced), name, fn, {"render_plan": snapshot, **kwargs}
+            )
+            traced = contextlib.nullcontext()
+        try:
+            with traced:
+                result = future.result(timeout=self.budget_seconds if self.budget_seconds > 0 else None)
+        except FuturesTimeoutError:
+            if not future.cancel():
+                self._overrun[name] = future
+            logger.warning(
+                "SHADOW_EXECUTOR_TIMEOUT [arr=%s] shadow=%s budget_s=%.1f — result discarded",
+                self.arrangement_id,
+                name,
+                self.budget_seconds,
+            )
+            self._record(name, self.mode, started, queued_ms=queued_ms, timed_out=True)
+            return {"error": f"shadow budget of {self.budget_seconds:g}s exceeded", "fallback_used": True}
+        except Exception as exc:
+            logger.warning(
+                "SHADOW_EXECUTOR_FAILED [arr=%s] shadow=%s (non-blocking): %s",
+                self.arrangement_id,
+                name,
+                exc,
+            )
+            self._record(name, self.mode, started, queued_ms=queued_ms, error=str(exc))
+            return {"error": str(exc), "fallback_used": True}
+        self._record(name, self.mode, started, queued_ms=queued_ms)
+        return result
+
+    def _record(
+        self,
+        name: str,
+        mode: str,
+        started: float,
+        *,
+        queued_ms: float,
+        timed_out: bool = False,
+        error: Optional[str] = None,
+    ) -> None:
+        wall_ms = (time.perf_counter() - started) * 1000.0
+        self._timings[name] = {
+            "mode": mode,
+            "wall_ms": round(wall_ms, 2),
+            "queued_ms": round(queued_ms, 2),
+            "timed_out": timed_out,
+            "error": error,
+        }
+        logger.info(
+            "SHADOW_EXECUTOR_TIMING [arr=%s] shadow=%s mode=%s wall_ms=%.1f queued_ms=%.1f timed_out=%s",
+            self.arrangement_id,
+            name,
+            mode,
+            wall_ms,
+            queued_ms,
+            timed_out,
+        )
@@ -2,15 +2,21 @@
 
 Accepts imperfect stem timing and attempts safe timeline alignment using
 leading-silence/onset detection, trim/pad operations, and duration normalization.
+
+Onsets are found on a NumPy energy envelope: a 20 ms RMS window slid one
+frame at a time over the stem (two cumulative sums, no per-millisecond
+slicing), applying the same silence threshold and gap rules as pydub's
+``detect_nonsilent(min_silence_len=20)`` but at sample resolution.
 """
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Any
+from dataclasses import dataclass, field
+import math
+from typing import Any, Optional, Sequence
 
+import numpy as np
 from pydub import AudioSegment
-from pydub.silence import detect_nonsilent
 
 
 class StemAlignmentError(ValueError):
@@ -19,6 +25,13 @@ class StemAlignmentError(ValueError):
 
 START_OFFSET_MISALIGNMENT_MESSAGE = "Stems are misaligned (different start offset)"
 
+# Onset detection window (pydub's min_silence_len) and silence threshold rule.
+_ONSET_WINDOW_MS = 20
+_SILENCE_FLOOR_DBFS = -60
+_SILENCE_BELOW_MEAN_DB = 22
+# Frames converted to float at a time by _frame_energy.
+_ENERGY_CHUNK_FRAMES = 1 << 16
+
 
 @dataclass
 class StemAlignmentResult:
@@ -33,29 +46,116 @@ class StemAlignmentResult:
     warnings: list[str]
     low_confidence: bool
     fallback_to_loop: bool
+    original_offsets_frames: dict[str, int] = field(default_factory=dict)
+
+
+@dataclass
+class StemOnset:
+    """First onset of a stem (see :func:`analyze_onset`)."""
+
+    frame: int
+    frame_rate: int
+    detected: bool
+    silent: bool
+
+    @property
+    def offset_ms(self) -> int:
+        return int(self.frame * 1000 / self.frame_rate)
 
 
 @dataclass
 class _StemAnalysis:
     name: str
     audio: AudioSegment
-    offset_ms: int
-    has_detected_onset: bool
+    onset: StemOnset
+
+    @property
+    def offset_ms(self) -> int:
+        return self.onset.offset_ms
+
+    @property
+    def has_detected_onset(self) -> bool:
+        return self.onset.detected
 
 
-def _detect_offset_ms(audio: AudioSegment) -> tuple[int, bool]:
-    if len(audio) <= 0:
-        return 0, False
+_SAMPLE_DTYPES = {1: np.int8, 2: np.dtype("<i2"), 4: np.dtype("<i4")}
 
-    if audio.dBFS == float("-inf"):
-        return 0, False
 
-    silence_thresh = max(-60, int(audio.dBFS) - 22)
-    ranges = detect_nonsilent(audio, min_silence_len=20, silence_thresh=silence_thresh)
-    if not ranges:
-        return 0, False
+def _frame_energy(audio: AudioSegment) -> np.ndarray:
+    """Sum of squared samples across channels, per frame, on a 0..1 full scale (float64).
+
+    Samples are normalised by ``max_possible_amplitude`` first: squared 24/32-bit
+    samples summed over a whole stem overflow int64.  Only
+    ``_ENERGY_CHUNK_FRAMES`` frames are held as floats at a time.
+    """
+    dtype = _SAMPLE_DTYPES.get(audio.sample_width)
+    if dtype is None:
+        samples = np.asarray(audio.get_array_of_samples())
+    else:
+        samples = np.frombuffer(audio.raw_data, dtype=dtype)
+    frames = samples.reshape(-1, audio.channels)
+    scale = 1.0 / float(audio.max_possible_amplitude)
+    energy = np.empty(frames.shape[0], dtype=np.float64)
+    for start in range(0, frames.shape[0], _ENERGY_CHUNK_FRAMES):
+        chunk = frames[start:start + _ENERGY_CHUNK_FRAMES].astype(np.float64)
+        chunk *= scale
+        np.einsum("ij,ij->i", chunk, chunk, out=energy[start:start + chunk.shape[0]])
+    return energy
+
+
+def _first_onset_frame(silent: np.ndarray, window: int, frame_count: int) -> Optional[int]:
+    """Start of the first non-silent range, following ``pydub.silence.detect_nonsilent``.
+
+    *silent* flags each window start.  Silent windows less than *window*
+    starts apart merge into one silent range; ``None`` means the stem is one
+    silent range end to end.
+    """
+    starts = np.flatnonzero(silent)
+    if starts.size == 0 or starts[0] != 0:
+        return 0
+    breaks = np.flatnonzero(np.diff(starts) > window)
+    last = int(starts[breaks[0]] if breaks.size else starts[-1])
+    end = last + window
+    return end if end < frame_count else None
 
-    return int(ranges[0][0]), True
+
+def analyze_onset(audio: AudioSegment) -> StemOnset:
+    """Locate the first onset of *audio* at sample resolution in one vectorized pass."""
+    frame_rate = int(audio.frame_rate)
+    energy = _frame_energy(audio)
+    frame_count = int(energy.size)
+    if frame_count == 0:
+        return StemOnset(0, frame_rate, detected=False, silent=True)
+
+    cumulative = np.concatenate(([0.0], np.cumsum(energy)))
+    del energy
+    if cumulative[-1] <= 0.0:
+        return StemOnset(0, frame_rate, detected=False, silent=True)
+
+    samples_per_frame = audio.channels
+    mean_rms = math.sqrt(cumulative[-1] / (frame_count * samples_per_frame))
+    dbfs = 20 * math.log10(mean_rms)
+    silence_thresh_db = max(_SILENCE_FLOOR_DBFS, int(dbfs) - _SILENCE_BELOW_MEAN_DB)
+    threshold = 10 ** (silence_thresh_db / 20)
+
+    window = max(1, frame_rate * _ONSET_WINDOW_MS // 1000)
+    if frame_count < window:
+        return StemOnset(0, frame_rate, detected=True, silent=False)
+
+    window_energy = cumulative[window:] - cumulative[:-window]
+    silent = window_energy <= threshold * threshold * window * samples_per_frame
+    onset = _first_onset_frame(silent, window, frame_count)
+    if onset is None:
+        return StemOnset(0, frame_rate, detected=False, silent=False)
+    return StemOnset(onset, frame_rate, detected=True, silent=False)
+
+
+def _silence_frames(audio: AudioSegment, frame_count: int) -> AudioSegment:
+    return audio._spawn(b"\x00" * (frame_count * audio.frame_width))
+
+
+def _frames_to_ms(frames: int, frame_rate: int) -> int:
+    return int(round(frames * 1000 / frame_rate))
 
 
 def _score_confidence(
@@ -78,9 +178,14 @@ def align_stems(
     *,
     severe_duration_delta_ms: int = 15000,
     low_confidence_threshold: float = 0.45,
+    onsets: Optional[Sequence[Optional[StemOnset]]] = None,
 ) -> StemAlignmentResult:
     """Auto-align stems by detecting offsets and applying trim/pad operations.
 
+    *onsets* optionally gives the :func:`analyze_onset` result per stem when
+    it was already computed while decoding; it is only used for stems that
+    need no rate/channel conversion.
+
     Hard failures are only raised for truly unusable inputs.
     """
     if len(stems) < 2:
@@ -89,7 +194,7 @@ def align_stems(
     target_rate = int(stems[0][1].frame_rate)
     analyses: list[_StemAnalysis] = []
 
-    for name, audio in stems:
+    for index, (name, audio) in enumerate(stems):
         if len(audio) <= 0:
             raise StemAlignmentError(f"Unreadable or empty audio stem: {name}")
 
@@ -99,15 +204,12 @@ def align_stems(
         if normalized.channels != 2:
             normalized = normalized.set_channels(2)
 
-        offset, onset_detected = _detect_offset_ms(normalized)
-        analyses.append(
-            _StemAnalysis(
-                name=name,
-                audio=normalized,
-                offset_ms=offset,
-                has_detected_onset=onset_detected,
-            )
-        )
+        known_onset = onsets[index] if onsets is not None else None
+        if known_onset is not None and normalized is audio:
+            onset = known_onset
+        else:
+            onset = analyze_onset(normalized)
+        analyses.append(_StemAnalysis(name=name, audio=normalized, onset=onset))
 
     durations = [len(item.audio) for item in analyses]
     min_duration = min(durations)
@@ -119,44 +221,47 @@ def align_stems(
 
     severe_duration_mismatch = duration_spread > severe_duration_delta_ms
 
-    if all(item.audio.dBFS == float("-inf") for item in analyses):
+    if all(item.onset.silent for item in analyses):
         raise StemAlignmentError("All stems appear silent/corrupted")
 
-    offsets = [item.offset_ms for item in analyses]
-    offset_spread = max(offsets) - min(offsets)
-    reference_offset = int(sorted(offsets)[len(offsets) // 2])
+    offsets = [item.onset.frame for item in analyses]
+    offset_spread = _frames_to_ms(max(offsets) - min(offsets), target_rate)
+    reference_index = sorted(range(len(offsets)), key=offsets.__getitem__)[len(offsets) // 2]
+    reference_offset = offsets[reference_index]
 
     adjusted: list[tuple[str, AudioSegment]] = []
     adjustments_ms: dict[str, dict[str, int]] = {}
     warnings: list[str] = []
 
     for item in analyses:
-        trim_ms = max(0, item.offset_ms - reference_offset)
-        pad_ms = max(0, reference_offset - item.offset_ms)
+        trim_frames = max(0, item.onset.frame - reference_offset)
+        pad_frames = max(0, reference_offset - item.onset.frame)
 
         shifted = item.audio
-        if trim_ms > 0:
-            shifted = shifted[trim_ms:]
-        if pad_ms > 0:
-            shifted = AudioSegment.silent(duration=pad_ms).set_frame_rate(target_rate).set_channels(2) + shifted
+        if trim_frames > 0:
+            shifted = shifted.get_sample_slice(trim_frames)
+        if pad_frames > 0:
+            shifted = _silence_frames(shifted, pad_frames) + shifted
 
         adjusted.append((item.name, shifted))
         adjustments_ms[item.name] = {
-            "trim_ms": int(trim_ms),
-            "pad_ms": int(pad_ms),
+            "trim_ms": _frames_to_ms(trim_frames, target_rate),
+            "pad_ms": _frames_to_ms(pad_frames, target_rate),
+            "trim_frames": int(trim_frames),
+            "pad_frames": int(pad_frames),
         }
 
-    adjusted_durations = [len(audio) for _, audio in adjusted]
-    normalized_duration = max(adjusted_durations)
+    normalized_frames = max(int(audio.frame_count()) for _, audio in adjusted)
 
     normalized_stems: list[tuple[str, AudioSegment]] = []
     for name, audio in adjusted:
-        if len(audio) < normalized_duration:
-            diff = normalized_duration - len(audio)
-            audio = audio + AudioSegment.silent(duration=diff).set_frame_rate(target_rate).set_channels(2)
-        elif len(audio) > normalized_duration:
-            audio = audio[:normalized_duration]
+        frame_count = int(audio.frame_count())
+        if frame_count < normalized_frames:
+            audio = audio + _silence_frames(audio, normalized_frames - frame_count)
+        elif frame_count > normalized_frames:
+            audio = audio.get_sample_slice(0, normalized_frames)
         normalized_stems.append((name, audio))
+    normalized_duration = len(normalized_stems[0][1])
 
     if offset_spread > 0:
         warnings.append(
@@ -192,7 +297,7 @@ def align_stems(
         stems=normalized_stems,
         sample_rate=target_rate,
         duration_ms=normalized_duration,
-        reference_offset_ms=reference_offset,
+        reference_offset_ms=_frames_to_ms(reference_offset, target_rate),
         original_offsets_ms={item.name: int(item.offset_ms) for item in analyses},
         adjustments_ms=adjustments_ms,
         auto_aligned=offset_spread > 0 or duration_spread > 0,
@@ -200,6 +305,7 @@ def align_stems(
         warnings=warnings,
         low_confidence=low_confidence,
         fallback_to_loop=low_confidence,
+        original_offsets_frames={item.name: int(item.onset.frame) for item in analyses},
     )
 
 
@@ -211,6 +317,7 @@ def alignment_result_to_metadata(result: StemAlignmentResult) -> dict[str, Any]:
         "fallback_to_loop": result.fallback_to_loop,
         "reference_offset_ms": result.reference_offset_ms,
         "original_offsets_ms": result.original_offsets_ms,
+        "original_offsets_frames": result.original_offsets_frames,
         "adjustments_ms": result.adjustments_ms,
         "warnings": result.warnings,
     }
@@ -14,6 +14,8 @@ import httpx
 from pydub import AudioSegment
 
 from app.config import settings
+from app.services.decoded_audio_cache import load_storage_audio
+from app.services.pcm_stem_store import open_pcm_stem_for_key
 from app.services.storage import storage
 
 logger = logging.getLogger(__name__)
@@ -141,7 +143,26 @@ def _load_stem_audio_from_storage(
     stem_key: str,
     timeout_seconds: float,
 ) -> AudioSegment:
-    """Load a single stem audio file from S3 or local storage."""
+    """Load a single stem, served from the PCM store or decoded-audio cache when possible."""
+    pcm_stem = open_pcm_stem_for_key(stem_key)
+    if pcm_stem is not None:
+        # Canonical PCM written at ingest: no decode or resample, every stem
+        # of the pack already shares one length, and the samples stay in the
+        # page cache until a slice of them is rendered.
+        logger.debug(f"Loaded stem from PCM store: {pcm_stem.path}")
+        return pcm_stem.mapped_segment()
+    return load_storage_audio(
+        stem_key,
+        lambda: _fetch_stem_audio_from_storage(stem_key, timeout_seconds),
+        store=storage,
+    )
+
+
+def _fetch_stem_audio_from_storage(
+    stem_key: str,
+    timeout_seconds: float,
+) -> AudioSegment:
+    """Download and decode a single stem audio file from S3 or local storage."""
     if storage.use_s3:
         # S3 path
         presigned_url = storage.create_presigned_get_url(stem_key, expires_seconds=3600)
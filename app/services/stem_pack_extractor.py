@@ -4,6 +4,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 import io
+import os
 from pathlib import Path
 import zipfile
 
@@ -21,30 +22,42 @@ class ExtractedStemFile:
     content: bytes
 
 
+def _audio_members(archive: zipfile.ZipFile) -> list[str]:
+    members: list[str] = []
+    for name in archive.namelist():
+        if name.endswith("/"):
+            continue
+        if Path(name).suffix.lower() not in ALLOWED_AUDIO_EXTENSIONS:
+            continue
+        members.append(name)
+    if not members:
+        raise StemPackExtractionError("ZIP does not contain supported audio stem files")
+    return members
+
+
 def extract_stem_files_from_zip(stem_zip: bytes) -> list[ExtractedStemFile]:
     """Extract supported audio files from a zip archive.
 
     Returns a flat list of extracted files using base names only.
     """
-    extracted: list[ExtractedStemFile] = []
     try:
         with zipfile.ZipFile(io.BytesIO(stem_zip)) as archive:
-            for name in archive.namelist():
-                if name.endswith("/"):
-                    continue
-                ext = Path(name).suffix.lower()
-                if ext not in ALLOWED_AUDIO_EXTENSIONS:
-                    continue
-                extracted.append(
-                    ExtractedStemFile(
-                        filename=Path(name).name,
-                        content=archive.read(name),
-                    )
-                )
+            return [
+                ExtractedStemFile(filename=Path(name).name, content=archive.read(name))
+                for name in _audio_members(archive)
+            ]
     except zipfile.BadZipFile as exc:
         raise StemPackExtractionError("Invalid ZIP stem pack") from exc
 
-    if not extracted:
-        raise StemPackExtractionError("ZIP does not contain supported audio stem files")
 
-    return extracted
+def list_stem_members(zip_path: str | os.PathLike) -> list[str]:
+    """Return the supported audio member names of a ZIP spooled to disk.
+
+    Only the central directory is read; members are decompressed later by
+    whoever decodes them (see ``stem_pack_service.ingest_stem_zip``).
+    """
+    try:
+        with zipfile.ZipFile(zip_path) as archive:
+            return _audio_members(archive)
+    except zipfile.BadZipFile as exc:
+        raise StemPackExtractionError("Invalid ZIP stem pack") from exc
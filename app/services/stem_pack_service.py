@@ -1,17 +1,39 @@
-"""Stem pack ingestion, validation, classification, and storage."""
+"""Stem pack ingestion, validation, classification, and storage.
+
+ZIP packs are ingested from a file spooled to disk: each audio member is
+decoded in a shared process pool and spooled as raw PCM in its native layout
+(the target sample rate is still chosen by alignment, as for loose files), and
+the onset detection used for alignment and the classifier's band features are
+computed by the same worker while the decoded audio is at hand, so the
+parent only aligns, mixes and stores.  Per-stem timings are reported in
+``StemPackIngestResult.stem_timings``.
+"""
 
 from __future__ import annotations
 
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from dataclasses import dataclass
 import io
+import logging
+import multiprocessing
+import os
 from pathlib import Path
+import tempfile
+import threading
+import time
+from typing import Optional
+import zipfile
 
 from pydub import AudioSegment
 
+from app.config import settings
+from app.services.stem_alignment import StemOnset, analyze_onset
 from app.services.stem_role_classifier import STEM_ROLES, StemClassification, classify_stem
 from app.services.stem_pack_extractor import (
     StemPackExtractionError,
     extract_stem_files_from_zip,
+    list_stem_members,
 )
 from app.services.stem_validation import (
     StemValidationError,
@@ -19,6 +41,8 @@ from app.services.stem_validation import (
 )
 from app.services.storage import storage
 
+logger = logging.getLogger(__name__)
+
 
 ALLOWED_AUDIO_EXTENSIONS = {".wav", ".mp3", ".ogg", ".flac"}
 
@@ -61,10 +85,14 @@ class StemPackIngestResult:
     fallback_to_loop: bool
     # Per-filename classification details (Phase 5)
     stem_classifications: dict[str, StemClassification] = None  # type: ignore[assignment]
+    # Per-filename decode timings in ms (ZIP packs decoded in the process pool)
+    stem_timings: dict[str, dict[str, float]] = None  # type: ignore[assignment]
 
     def __post_init__(self) -> None:
         if self.stem_classifications is None:
             self.stem_classifications = {}
+        if self.stem_timings is None:
+            self.stem_timings = {}
 
     @property
     def roles_detected(self) -> list[str]:
@@ -119,6 +147,7 @@ class StemPackIngestResult:
             "stem_classifications": classifications_list,
             "arrangement_groups_detected": groups_detected,
             "friendly_labels": friendly_labels,
+            "ingest_timings_ms": self.stem_timings,
             "validation": {
                 "aligned": not self.fallback_to_loop,
                 "same_length": True,
@@ -154,16 +183,34 @@ def ingest_stem_files(files: list[StemSourceFile]) -> StemPackIngestResult:
         audio = _decode_audio(file.content, file.filename)
         decoded.append((file.filename, audio))
 
+    return _build_ingest_result(decoded)
+
+
+def _build_ingest_result(
+    decoded: list[tuple[str, AudioSegment]],
+    *,
+    onsets: Optional[list[StemOnset]] = None,
+    classifications: Optional[list[StemClassification]] = None,
+    stem_timings: Optional[dict[str, dict[str, float]]] = None,
+) -> StemPackIngestResult:
+    """Align, classify and mix *decoded* stems.
+
+    *onsets* and *classifications*, when given, hold per-stem results already
+    computed while decoding, in the order of *decoded*.
+    """
     try:
-        validated = validate_and_normalize_stems(decoded)
+        validated = validate_and_normalize_stems(decoded, onsets=onsets)
     except StemValidationError as exc:
         raise StemPackError(str(exc)) from exc
 
     role_stems: dict[str, AudioSegment] = {}
     role_sources: dict[str, list[str]] = {}
     stem_classifications: dict[str, StemClassification] = {}
-    for filename, audio in validated.stems:
-        classification = classify_stem(filename, audio)
+    for index, (filename, audio) in enumerate(validated.stems):
+        if classifications is not None:
+            classification = classifications[index]
+        else:
+            classification = classify_stem(filename, audio)
         role = classification.role if classification.role in STEM_ROLES else "full_mix"
         trimmed = audio[:validated.duration_ms]
         if role in role_stems:
@@ -188,16 +235,190 @@ def ingest_stem_files(files: list[StemSourceFile]) -> StemPackIngestResult:
         validation_warnings=list(validated.warnings),
         fallback_to_loop=bool(validated.fallback_to_loop),
         stem_classifications=stem_classifications,
+        stem_timings=stem_timings,
+    )
+
+
+@dataclass
+class _DecodedMember:
+    filename: str
+    pcm_path: str
+    frame_rate: int
+    channels: int
+    sample_width: int
+    onset: StemOnset
+    classification: StemClassification
+    timings_ms: dict[str, float]
+
+
+def _elapsed_ms(started: float) -> float:
+    return round((time.perf_counter() - started) * 1000, 1)
+
+
+def _decode_member(zip_path: str, member: str, pcm_path: str) -> _DecodedMember:
+    """Decode one ZIP member to raw PCM at *pcm_path* (runs in a pool worker)."""
+    filename = Path(member).name
+    started = time.perf_counter()
+    with zipfile.ZipFile(zip_path) as archive:
+        content = archive.read(member)
+    timings = {"read": _elapsed_ms(started)}
+
+    started = time.perf_counter()
+    audio = _decode_audio(content, filename)
+    del content
+    if audio.channels != 2:
+        # The same up/down-mix align_stems applies, so the onset computed here
+        # is the one it would compute; rate and sample width stay native.
+        audio = audio.set_channels(2)
+    timings["decode"] = _elapsed_ms(started)
+
+    started = time.perf_counter()
+    onset = analyze_onset(audio)
+    classification = classify_stem(filename, audio)
+    timings["analyze"] = _elapsed_ms(started)
+
+    started = time.perf_counter()
+    Path(pcm_path).write_bytes(audio.raw_data)
+    timings["write"] = _elapsed_ms(started)
+    timings["total"] = round(sum(timings.values()), 1)
+    return _DecodedMember(
+        filename,
+        pcm_path,
+        audio.frame_rate,
+        audio.channels,
+        audio.sample_width,
+        onset,
+        classification,
+        timings,
+    )
+
+
+def _load_member(item: _DecodedMember) -> AudioSegment:
+    return AudioSegment(
+        data=Path(item.pcm_path).read_bytes(),
+        sample_width=item.sample_width,
+        frame_rate=item.frame_rate,
+        channels=item.channels,
     )
 
 
-def ingest_stem_zip(content: bytes) -> StemPackIngestResult:
+def resolve_ingest_worker_count(member_count: int) -> int:
+    return max(1, min(_pool_size(), member_count))
+
+
+def _pool_size() -> int:
+    configured = int(settings.stem_ingest_workers or 0)
+    return configured if configured > 0 else (os.cpu_count() or 1)
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _ingest_pool() -> ProcessPoolExecutor:
+    """Return the process pool shared by every ZIP ingest, creating it on first use.
+
+    Ingest runs inside the multithreaded API process, so workers are started
+    by a forkserver (spawn where that is unavailable) rather than by forking
+    it, and concurrent uploads queue on the one pool of STEM_INGEST_WORKERS.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            methods = multiprocessing.get_all_start_methods()
+            _pool = ProcessPoolExecutor(
+                max_workers=_pool_size(),
+                mp_context=multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn"),
+            )
+        return _pool
+
+
+def _discard_pool(pool: ProcessPoolExecutor) -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _decode_members(zip_path: Path, members: list[str], spool_dir: Path, workers: int) -> list[_DecodedMember]:
+    pcm_paths = [str(spool_dir / f"{index}.pcm") for index in range(len(members))]
+    if workers <= 1:
+        return [_decode_member(str(zip_path), member, path) for member, path in zip(members, pcm_paths)]
+    pool = _ingest_pool()
+    futures = [
+        pool.submit(_decode_member, str(zip_path), member, path)
+        for member, path in zip(members, pcm_paths)
+    ]
+    try:
+        return [future.result() for future in futures]
+    except BrokenProcessPool:
+        # A worker died (e.g. OOM-killed); the next upload gets a fresh pool.
+        _discard_pool(pool)
+        raise
+    except BaseException:
+        for future in futures:
+            future.cancel()
+        raise
+
+
+def _ingest_spooled_zip(zip_path: Path, spool_dir: Path, workers: Optional[int]) -> StemPackIngestResult:
     try:
-        extracted = extract_stem_files_from_zip(content)
+        members = list_stem_members(zip_path)
     except StemPackExtractionError as exc:
         raise StemPackError(str(exc)) from exc
-    files = [StemSourceFile(filename=item.filename, content=item.content) for item in extracted]
-    return ingest_stem_files(files)
+    if len(members) < 2:
+        raise StemPackError("At least two stem files are required")
+
+    workers = workers or resolve_ingest_worker_count(len(members))
+    started = time.perf_counter()
+    results = _decode_members(zip_path, members, spool_dir, workers)
+    decode_ms = _elapsed_ms(started)
+
+    decoded = [(item.filename, _load_member(item)) for item in results]
+    stem_timings = {item.filename: item.timings_ms for item in results}
+    result = _build_ingest_result(
+        decoded,
+        onsets=[item.onset for item in results],
+        classifications=[item.classification for item in results],
+        stem_timings=stem_timings,
+    )
+    for filename, timings in stem_timings.items():
+        logger.debug("STEM_PACK_MEMBER_DECODED file=%s timings_ms=%s", filename, timings)
+    logger.info(
+        "STEM_PACK_INGESTED stems=%d workers=%d decode_ms=%.1f total_ms=%.1f",
+        len(members),
+        workers,
+        decode_ms,
+        _elapsed_ms(started),
+    )
+    return result
+
+
+def ingest_stem_zip(content: bytes | str | os.PathLike, *, workers: Optional[int] = None) -> StemPackIngestResult:
+    """Ingest a ZIP stem pack given as bytes or as the path of a spooled upload.
+
+    With STEM_INGEST_PARALLEL_ENABLED the members are decoded in the shared
+    ingest process pool (serially when *workers* is 1) into a temporary spool
+    directory; otherwise every member is read into memory and decoded serially.
+    """
+    if not settings.stem_ingest_parallel_enabled:
+        data = bytes(content) if isinstance(content, (bytes, bytearray)) else Path(content).read_bytes()
+        try:
+            extracted = extract_stem_files_from_zip(data)
+        except StemPackExtractionError as exc:
+            raise StemPackError(str(exc)) from exc
+        files = [StemSourceFile(filename=item.filename, content=item.content) for item in extracted]
+        return ingest_stem_files(files)
+
+    with tempfile.TemporaryDirectory(prefix="stem_pack_") as spool:
+        spool_dir = Path(spool)
+        if isinstance(content, (bytes, bytearray)):
+            zip_path = spool_dir / "pack.zip"
+            zip_path.write_bytes(content)
+        else:
+            zip_path = Path(content)
+        return _ingest_spooled_zip(zip_path, spool_dir, workers)
 
 
 def persist_role_stems(loop_id: int, role_stems: dict[str, AudioSegment]) -> dict[str, str]:
@@ -8,7 +8,7 @@ Replaces the old loop-replication approach with true stem mixing.
 import json
 import logging
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple, Union
 
 import numpy as np
 from pydub import AudioSegment
@@ -19,6 +19,9 @@ from app.services.stem_arrangement_engine import (
     StemState,
 )
 from app.services.mastering import apply_mastering
+from app.services import dsp
+from app.services.dsp import RenderBuffer, StemLayer, full_scale, loop_frames, mix_stem_layers
+from app.services.pcm_stem_store import PCM_SUFFIX, PcmStem
 
 logger = logging.getLogger(__name__)
 
@@ -39,14 +42,16 @@ class StemRenderExecutor:
         - Mix active stems together
         - Apply stem-level processing (gain, pan, filter)
         - Apply section transitions
-        - Append to output
+        - Write into the render buffer
     3. Apply master processing
     """
     
     def __init__(self, target_sample_rate: int = 44100):
         """Initialize render executor."""
         self.target_sample_rate = target_sample_rate
-        self.stems_cache: Dict[StemRole, AudioSegment] = {}
+        # Canonical ``.pcm`` stems are memory-mapped (PcmStem); anything else is
+        # decoded into an AudioSegment.
+        self.stems_cache: Dict[StemRole, Union[AudioSegment, PcmStem]] = {}
     
     def render_from_stems(
         self,
@@ -71,12 +76,18 @@ class StemRenderExecutor:
         # Verify stem compatibility
         self._validate_stem_compatibility()
         
-        # Render section by section
-        output = AudioSegment.empty()
+        # Render section by section into one preallocated buffer; the
+        # AudioSegment is only materialised once, after the last section.
+        buffer: Optional[RenderBuffer] = None
+        total_ms = sum((60000 * 4) / section.bpm * section.bars for section in sections)
         
         for section in sections:
             section_audio = self._render_section(section)
-            output += section_audio
+            if buffer is None:
+                buffer = RenderBuffer.like(section_audio, duration_ms=total_ms)
+            buffer.append(section_audio)
+        
+        output = buffer.to_segment() if buffer is not None else AudioSegment.empty()
         
         # Apply mastering
         if apply_master:
@@ -94,6 +105,18 @@ class StemRenderExecutor:
             if not Path(file_path).exists():
                 raise StemRenderError(f"Stem file not found: {file_path}")
             
+            if Path(file_path).suffix == PCM_SUFFIX:
+                try:
+                    stem = PcmStem.open(file_path)
+                except (OSError, ValueError) as e:
+                    raise StemRenderError(f"Failed to open PCM stem {role.value}: {e}")
+                if stem.frame_rate != self.target_sample_rate:
+                    self.stems_cache[role] = stem.to_segment().set_frame_rate(self.target_sample_rate)
+                else:
+                    self.stems_cache[role] = stem
+                logger.info(f"Memory-mapped {role.value}: {len(stem) / 1000:.1f}s")
+                continue
+            
             try:
                 audio = AudioSegment.from_file(str(file_path))
                 # Resample to target if needed
@@ -135,6 +158,58 @@ class StemRenderExecutor:
         ms_per_bar = (60000 * 4) / section.bpm
         section_duration_ms = int(ms_per_bar * section.bars)
         
+        mixed = None
+        if dsp.active_backend() == dsp.DSP_BACKEND_NUMPY:
+            try:
+                mixed = self._mix_stems_vectorized(section, section_duration_ms)
+            except ImportError:
+                # SciPy unavailable for the filter kernel: use the pydub path.
+                mixed = None
+        if mixed is None:
+            mixed = self._mix_stems_pairwise(section, section_duration_ms)
+        
+        # Apply producer moves (transitions, fills, etc.)
+        if section.producer_moves:
+            mixed = self._apply_producer_moves(mixed, section)
+        
+        return mixed
+    
+    def _mix_stems_vectorized(self, section: SectionConfig, section_duration_ms: int) -> Optional[AudioSegment]:
+        """Mix all active stems in one pass with ``dsp.mix_stem_layers``.
+        
+        Returns None when a stem's sample format is not supported by the array
+        kernels, so the caller can fall back to the pairwise pydub mix.
+        """
+        frame_count = int(section_duration_ms * (self.target_sample_rate / 1000.0))
+        layers: List[StemLayer] = []
+        for role in section.active_stems:
+            if role not in self.stems_cache:
+                logger.warning(f"Stem {role.value} not loaded, skipping")
+                continue
+            stem = self.stems_cache[role]
+            if isinstance(stem, PcmStem):
+                pcm, scale = stem.view(), full_scale(stem.sample_width)
+            elif dsp.supports_segment(stem):
+                pcm = np.frombuffer(stem.raw_data, dtype=f"<i{stem.sample_width}").reshape((-1, stem.channels))
+                scale = full_scale(stem.sample_width)
+            else:
+                return None
+            samples = loop_frames(pcm, frame_count).astype(np.float32) * np.float32(1.0 / scale)
+            state = section.stem_states.get(role)
+            layers.append(
+                StemLayer(
+                    samples=samples,
+                    gain_db=state.gain_db if state else 0.0,
+                    pan=state.pan if state else 0.0,
+                    low_pass_hz=state.filter_cutoff if state else None,
+                )
+            )
+        mixed = mix_stem_layers(layers, frame_count, sample_rate=self.target_sample_rate)
+        template = AudioSegment.silent(duration=0, frame_rate=self.target_sample_rate)
+        return dsp.array_to_segment(mixed, template)
+    
+    def _mix_stems_pairwise(self, section: SectionConfig, section_duration_ms: int) -> AudioSegment:
+        """Mix active stems one at a time through pydub (DSP_BACKEND=pydub)."""
         # Start with silence at section duration
         mixed = AudioSegment.silent(duration=section_duration_ms)
         mixed = mixed.set_frame_rate(self.target_sample_rate)
@@ -159,17 +234,16 @@ class StemRenderExecutor:
             # Mix
             mixed = self._mix_audio(mixed, stem_slice)
         
-        # Apply producer moves (transitions, fills, etc.)
-        if section.producer_moves:
-            mixed = self._apply_producer_moves(mixed, section)
-        
         return mixed
     
-    def _extract_stem_slice(self, stem: AudioSegment, duration_ms: int) -> AudioSegment:
+    def _extract_stem_slice(self, stem: Union[AudioSegment, PcmStem], duration_ms: int) -> AudioSegment:
         """
         Extract a slice of stem audio at specified duration.
         For loop-based stems, cycles through the audio.
         """
+        if isinstance(stem, PcmStem):
+            # Built from zero-copy views; only the section itself is materialised.
+            return stem.repeat_to(duration_ms)
         if len(stem) >= duration_ms:
             # Stem is long enough, just take a slice
             return stem[:duration_ms]
@@ -243,8 +317,9 @@ class StemRenderExecutor:
                 to_add = to_add.set_channels(2)
         
         # Mix at reduced levels to avoid clipping
-        # Standard mixing: reduce each by -3dB (-0.7x)
-        return (base - 3) + (to_add - 3)
+        # Standard mixing: reduce each by -3dB (-0.7x).  ``+`` between two
+        # segments concatenates in pydub, so the layers are overlaid explicitly.
+        return (base - 3).overlay(to_add - 3)
     
     def _apply_producer_moves(self, section_audio: AudioSegment, section: SectionConfig) -> AudioSegment:
         """Apply producer-style effects and transitions to section."""
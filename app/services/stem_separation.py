@@ -22,6 +22,7 @@ from typing import Any
 from pydub import AudioSegment
 
 from app.config import settings
+from app.services import dsp
 from app.services.storage import storage
 
 logger = logging.getLogger(__name__)
@@ -94,10 +95,10 @@ def _builtin_stems(audio: AudioSegment) -> dict[str, AudioSegment]:
     consumers (advanced_stem_separation, stem_role_mapper) can handle them
     uniformly.
     """
-    bass = audio.low_pass_filter(180)
-    vocals = audio.high_pass_filter(200).low_pass_filter(3500)
-    drums = audio.high_pass_filter(60).low_pass_filter(9000)
-    other = audio.high_pass_filter(3500)
+    bass = dsp.low_pass_filter(audio, 180)
+    vocals = dsp.band_pass_filter(audio, 200, 3500)
+    drums = dsp.band_pass_filter(audio, 60, 9000)
+    other = dsp.high_pass_filter(audio, 3500)
 
     return {
         "bass": bass,
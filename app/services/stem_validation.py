@@ -3,11 +3,13 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from typing import Optional, Sequence
 
 from pydub import AudioSegment
 from app.services.stem_alignment import (
     START_OFFSET_MISALIGNMENT_MESSAGE,
     StemAlignmentError,
+    StemOnset,
     align_stems,
     alignment_result_to_metadata,
 )
@@ -35,6 +37,7 @@ def validate_and_normalize_stems(
     *,
     max_duration_delta_ms: int = 120,
     max_lead_delta_ms: int = 45,
+    onsets: Optional[Sequence[Optional[StemOnset]]] = None,
 ) -> StemValidationResult:
     downgraded_legacy_misalignment = False
     try:
@@ -42,6 +45,7 @@ def validate_and_normalize_stems(
             stems,
             severe_duration_delta_ms=max(15000, max_duration_delta_ms * 50),
             low_confidence_threshold=0.45,
+            onsets=onsets,
         )
     except StemAlignmentError as exc:
         message = str(exc)
@@ -52,6 +56,7 @@ def validate_and_normalize_stems(
                 stems,
                 severe_duration_delta_ms=10**9,
                 low_confidence_threshold=0.45,
+                onsets=onsets,
             )
         else:
             raise StemValidationError(message) from exc
@@ -17,9 +17,15 @@ Presigned URL contract:
   perspective.
 """
 
+from abc import ABC, abstractmethod
+import hashlib
 import logging
+import os
+import shutil
+import tempfile
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Union
 from urllib.parse import quote
 
 from app.config import settings
@@ -38,6 +44,229 @@ class StorageNotConfiguredError(Exception):
     pass
 
 
+# S3 rejects multipart parts (other than the last) smaller than 5 MiB.
+_MIN_MULTIPART_PART_BYTES = 5 * 1024 * 1024
+
+
+class UploadStream(ABC):
+    """Write-only stream that stores its bytes under *key* when closed.
+
+    Use as a context manager: the object is committed on a clean exit and
+    discarded if the block raises.  :meth:`patch_header` rewrites the leading
+    bytes before commit so container headers (e.g. WAV sizes) can be filled in
+    once the payload length is known.
+    """
+
+    def __init__(self, key: str, content_type: str):
+        self.key = key
+        self.content_type = content_type
+        self.bytes_written = 0
+        self.closed = False
+
+    @abstractmethod
+    def write(self, data) -> int:
+        """Append *data*; return the number of bytes written."""
+
+    @abstractmethod
+    def patch_header(self, data: bytes) -> None:
+        """Overwrite the first ``len(data)`` bytes of the object."""
+
+    @abstractmethod
+    def close(self) -> str:
+        """Commit the object and return its key."""
+
+    @abstractmethod
+    def abort(self) -> None:
+        """Discard everything written so far."""
+
+    def __enter__(self) -> "UploadStream":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+class LocalUploadStream(UploadStream):
+    """Upload stream backed by a temp file in the local upload directory."""
+
+    def __init__(self, key: str, content_type: str, upload_dir: Path):
+        super().__init__(key, content_type)
+        self._path = Path(upload_dir) / key.split("/")[-1]
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=self._path.parent, suffix=".part")
+        self._tmp_path = Path(tmp_name)
+        self._handle = os.fdopen(fd, "wb")
+
+    def write(self, data) -> int:
+        written = self._handle.write(data)
+        self.bytes_written += written
+        return written
+
+    def patch_header(self, data: bytes) -> None:
+        position = self._handle.tell()
+        self._handle.seek(0)
+        self._handle.write(data)
+        self._handle.seek(position)
+
+    def close(self) -> str:
+        if self.closed:
+            return self.key
+        self.closed = True
+        try:
+            self._handle.close()
+            os.replace(self._tmp_path, self._path)
+        except Exception as e:
+            self._tmp_path.unlink(missing_ok=True)
+            logger.error(f"Local streaming upload failed: {e}")
+            raise S3StorageError(f"Local upload failed: {e}") from e
+        logger.info(f"📁 Uploaded locally (streamed): {self._path}")
+        return self.key
+
+    def abort(self) -> None:
+        if self.closed:
+            return
+        self.closed = True
+        self._handle.close()
+        self._tmp_path.unlink(missing_ok=True)
+
+
+class S3MultipartUploadStream(UploadStream):
+    """Upload stream that sends fixed-size parts to an S3 multipart upload.
+
+    Parts are uploaded on a background thread while the caller keeps writing,
+    with at most ``max_pending_parts`` parts buffered, so memory is bounded by
+    the part size rather than the object size.  The first part is held back
+    until :meth:`close` so :meth:`patch_header` can still rewrite it.
+    """
+
+    def __init__(
+        self,
+        key: str,
+        content_type: str,
+        *,
+        client,
+        bucket: str,
+        client_error: type[Exception] = Exception,
+        part_size: int = 8 * 1024 * 1024,
+        max_pending_parts: int = 2,
+        part_attempts: int = 3,
+    ):
+        super().__init__(key, content_type)
+        self._client = client
+        self._bucket = bucket
+        self._client_error = client_error
+        self._part_size = max(_MIN_MULTIPART_PART_BYTES, int(part_size))
+        self._max_pending_parts = max(1, int(max_pending_parts))
+        self._part_attempts = max(1, int(part_attempts))
+        self._head = bytearray()
+        self._buffer = bytearray()
+        self._next_part_number = 2
+        self._pending: list[Future] = []
+        self._parts: list[dict] = []
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="s3-multipart")
+        try:
+            response = client.create_multipart_upload(
+                Bucket=bucket,
+                Key=key,
+                ContentType=content_type,
+                ServerSideEncryption='AES256',
+            )
+        except Exception as e:
+            self._executor.shutdown(wait=False)
+            raise S3StorageError(f"Failed to start multipart upload: {e}") from e
+        self._upload_id = response["UploadId"]
+
+    def write(self, data) -> int:
+        view = memoryview(data).cast("B")
+        size = len(view)
+        if len(self._head) < self._part_size:
+            take = min(size, self._part_size - len(self._head))
+            self._head += view[:take]
+            view = view[take:]
+        if len(view):
+            self._buffer += view
+            while len(self._buffer) >= self._part_size:
+                part = bytes(self._buffer[: self._part_size])
+                del self._buffer[: self._part_size]
+                self._submit(part)
+        self.bytes_written += size
+        return size
+
+    def patch_header(self, data: bytes) -> None:
+        if len(data) > len(self._head):
+            raise S3StorageError("Header patch is larger than the buffered first part")
+        self._head[: len(data)] = data
+
+    def close(self) -> str:
+        if self.closed:
+            return self.key
+        try:
+            if self._buffer:
+                self._submit(bytes(self._buffer))
+                self._buffer = bytearray()
+            self._submit(bytes(self._head), part_number=1)
+            self._drain(0)
+            self._client.complete_multipart_upload(
+                Bucket=self._bucket,
+                Key=self.key,
+                UploadId=self._upload_id,
+                MultipartUpload={"Parts": sorted(self._parts, key=lambda p: p["PartNumber"])},
+            )
+        except Exception as e:
+            self.abort()
+            if isinstance(e, S3StorageError):
+                raise
+            logger.error(f"S3 multipart upload failed: {e}")
+            raise S3StorageError(f"Failed to upload to S3: {e}") from e
+        self.closed = True
+        self._executor.shutdown(wait=True)
+        logger.info(
+            f"✅ Uploaded to S3 (multipart, {len(self._parts)} parts): s3://{self._bucket}/{self.key}"
+        )
+        return self.key
+
+    def abort(self) -> None:
+        if self.closed:
+            return
+        self.closed = True
+        self._executor.shutdown(wait=True)
+        try:
+            self._client.abort_multipart_upload(Bucket=self._bucket, Key=self.key, UploadId=self._upload_id)
+        except Exception as e:
+            logger.warning(f"Could not abort multipart upload for {self.key}: {e}")
+
+    def _submit(self, body: bytes, part_number: Optional[int] = None) -> None:
+        if part_number is None:
+            part_number = self._next_part_number
+            self._next_part_number += 1
+        self._drain(self._max_pending_parts - 1)
+        self._pending.append(self._executor.submit(self._upload_part, part_number, body))
+
+    def _drain(self, keep: int) -> None:
+        while len(self._pending) > keep:
+            self._parts.append(self._pending.pop(0).result())
+
+    def _upload_part(self, part_number: int, body: bytes) -> dict:
+        for attempt in range(1, self._part_attempts + 1):
+            try:
+                response = self._client.upload_part(
+                    Bucket=self._bucket,
+                    Key=self.key,
+                    UploadId=self._upload_id,
+                    PartNumber=part_number,
+                    Body=body,
+                )
+                return {"PartNumber": part_number, "ETag": response["ETag"]}
+            except self._client_error as e:
+                if attempt == self._part_attempts:
+                    raise S3StorageError(f"Failed to upload part {part_number}: {e}") from e
+                logger.warning(f"S3 part {part_number} upload failed (attempt {attempt}): {e}")
+        raise S3StorageError(f"Failed to upload part {part_number}")
+
+
 class S3Storage:
     """AWS S3 storage service for audio files."""
     
@@ -167,6 +396,114 @@ class S3Storage:
             logger.error(f"Local upload failed: {e}", exc_info=True)
             raise S3StorageError(f"Local upload failed: {e}") from e
     
+    def open_upload_stream(self, key: str, content_type: str) -> UploadStream:
+        """
+        Open a write-only stream that uploads to *key* as it is written.
+        
+        S3 uses a multipart upload (``S3_MULTIPART_PART_SIZE_MB`` parts sent in
+        the background); local storage writes a temp file that is moved into
+        place on close.  Nothing is visible under *key* until the stream is
+        closed, and an aborted stream leaves nothing behind.
+        
+        Raises:
+            S3StorageError: If the upload cannot be started
+        """
+        if self.use_s3:
+            return S3MultipartUploadStream(
+                key,
+                content_type,
+                client=self.s3_client,
+                bucket=self.bucket,
+                client_error=self.ClientError,
+                part_size=settings.s3_multipart_part_size_mb * 1024 * 1024,
+            )
+        try:
+            return LocalUploadStream(key, content_type, self.upload_dir)
+        except OSError as e:
+            raise S3StorageError(f"Local upload failed: {e}") from e
+    
+    def read_file(self, key: str) -> Optional[bytes]:
+        """
+        Read a whole object from S3 or local storage.
+
+        Intended for small objects (JSON manifests, uploaded loops); long
+        renders should be streamed.
+
+        Args:
+            key: S3 key path
+
+        Returns:
+            The object bytes, or None if the object does not exist
+
+        Raises:
+            S3StorageError: If the read fails for any other reason
+        """
+        if self.use_s3:
+            try:
+                response = self.s3_client.get_object(Bucket=self.bucket, Key=key)
+                return response["Body"].read()
+            except self.ClientError as e:
+                error_code = e.response.get('Error', {}).get('Code', 'Unknown')
+                if error_code in ('404', 'NoSuchKey'):
+                    return None
+                error_msg = e.response.get('Error', {}).get('Message', str(e))
+                raise S3StorageError(f"Failed to read from S3: {error_msg}") from e
+            except Exception as e:
+                raise S3StorageError(f"Read failed: {e}") from e
+        file_path = self.upload_dir / key.split("/")[-1]
+        try:
+            return file_path.read_bytes()
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            raise S3StorageError(f"Local read failed: {e}") from e
+
+    def download_file(self, key: str, path: Union[str, Path]) -> bool:
+        """
+        Stream an object from S3 or local storage into the local file *path*.
+
+        The object is written to a temp file next to *path* and moved into
+        place, so *path* never holds a partial download.
+
+        Args:
+            key: S3 key path
+            path: Destination file
+
+        Returns:
+            True when the object was downloaded, False if it does not exist
+
+        Raises:
+            S3StorageError: If the download fails for any other reason
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".part")
+        os.close(fd)
+        tmp_path = Path(tmp_name)
+        try:
+            if self.use_s3:
+                try:
+                    self.s3_client.download_file(self.bucket, key, str(tmp_path))
+                except self.ClientError as e:
+                    error_code = e.response.get('Error', {}).get('Code', 'Unknown')
+                    if error_code in ('404', 'NoSuchKey'):
+                        return False
+                    error_msg = e.response.get('Error', {}).get('Message', str(e))
+                    raise S3StorageError(f"Failed to download from S3: {error_msg}") from e
+                except Exception as e:
+                    raise S3StorageError(f"Download failed: {e}") from e
+            else:
+                try:
+                    shutil.copyfile(self.upload_dir / key.split("/")[-1], tmp_path)
+                except FileNotFoundError:
+                    return False
+                except OSError as e:
+                    raise S3StorageError(f"Local download failed: {e}") from e
+            os.replace(tmp_path, path)
+            return True
+        finally:
+            tmp_path.unlink(missing_ok=True)
+
     def delete_file(self, key: str) -> None:
         """
         Delete a file from S3 or local storage.
@@ -349,6 +686,32 @@ class S3Storage:
         except Exception:
             return False
     
+    def get_object_version(self, key: str) -> Optional[str]:
+        """
+        Return a validator that changes whenever the object's content changes.
+        
+        S3 objects use their ETag (one HEAD request, no body transfer); local
+        files use a SHA-256 of their content.  Returns None when the object is
+        missing or the validator cannot be determined, so callers should treat
+        None as "do not cache".
+        """
+        try:
+            if self.use_s3:
+                head = self.s3_client.head_object(Bucket=self.bucket, Key=key)
+                etag = head.get("ETag") if isinstance(head, dict) else None
+                return f"etag:{etag.strip(chr(34))}" if isinstance(etag, str) and etag else None
+            file_path = self.upload_dir / key.split("/")[-1]
+            if not file_path.is_file():
+                return None
+            digest = hashlib.sha256()
+            with open(file_path, "rb") as handle:
+                for block in iter(lambda: handle.read(1024 * 1024), b""):
+                    digest.update(block)
+            return f"sha256:{digest.hexdigest()}"
+        except Exception as e:
+            logger.warning(f"Could not determine object version for {key}: {e}")
+            return None
+    
     def _local_file_exists(self, key: str) -> bool:
         """Check if file exists locally."""
         filename = key.split("/")[-1]
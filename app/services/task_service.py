@@ -66,8 +66,9 @@ class TaskService:
             if not file_path.exists():
                 raise FileNotFoundError(f"File not found: {file_path}")
 
-            # Perform analysis
-            analysis = audio_service.analyze_loop(str(file_path))
+            # Perform analysis on the shared feature bundle (a loop analyzed
+            # at ingest is not decoded again)
+            analysis = audio_service.analyze_content(file_path.read_bytes(), file_path.name)
 
             # Update loop with analysis results
             loop.bpm = analysis.get("bpm")
@@ -26,20 +26,26 @@ Measurements provided
 
 Design notes
 ------------
-* Requires numpy + librosa (already in requirements.txt).  soundfile is used
-  for metadata extraction; pydub is the fallback loader.
+* Requires numpy + librosa (already in requirements.txt).  soundfile is the
+  decoder; pydub is the fallback loader.
 * All heavy analysis runs synchronously; callers should offload to a thread
   pool executor for async routes.
 * Graceful degradation: every analysis step has a safe fallback so the service
   always returns a complete response.
+* Every metric is derived from the shared feature bundle
+  (app/services/audio_features.py): the file is decoded once and the
+  whole-file stereo statistics, 100 ms block power and long-term spectrum are
+  reused by other analyzers of the same bytes.
 """
 
 from __future__ import annotations
 
-import io
 import logging
 import math
-from typing import Dict, List, Optional, Tuple
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from app.services.audio_features import AudioFeatures, StereoStats
 
 logger = logging.getLogger(__name__)
 
@@ -72,8 +78,8 @@ _RELATIVE_GATE_LU = -10.0
 _LOUDNESS_BLOCK_SEC = 0.4
 _LOUDNESS_HOP_SEC = 0.1
 
-# Clipping threshold: samples at or above this value are considered clipped
-_CLIP_THRESHOLD = 0.999
+# Clipping threshold (samples at or above it are considered clipped) is
+# ``audio_features.CLIP_THRESHOLD``: the bundle stores the clipped fraction.
 
 # Clipping severity boundary: fraction of clipped samples
 _CLIP_MINOR_THRESHOLD = 0.0001   # > 0.01 % → Minor
@@ -120,116 +126,22 @@ _LOUDNESS_QUIET_LUFS = -20.0          # integrated_loudness < this → too quiet
 # ---------------------------------------------------------------------------
 
 
-def _get_file_metadata(audio_bytes: bytes, filename: str) -> Tuple[int, int]:
-    """Return (sample_rate, bit_depth) by inspecting the file header.
-
-    Tries soundfile first (PCM/FLAC/OGG); falls back to pydub for MP3/AAC.
-    Returns (44100, 16) as a safe default on any failure.
-    """
-    try:
-        import soundfile as sf  # type: ignore
-
-        with sf.SoundFile(io.BytesIO(audio_bytes)) as f:
-            sr = f.samplerate
-            subtype = f.subtype  # e.g. "PCM_24", "FLOAT", "VORBIS"
-            bit_depth = _parse_sf_bit_depth(subtype)
-            return sr, bit_depth
-    except Exception:
-        pass
-
-    # Fallback: pydub
-    try:
-        from pydub import AudioSegment
-
-        ext = filename.rsplit(".", 1)[-1].lower() if "." in filename else "wav"
-        seg = AudioSegment.from_file(io.BytesIO(audio_bytes), format=ext)
-        return seg.frame_rate, seg.sample_width * 8
-    except Exception:
-        pass
-
-    return 44100, 16
-
-
-def _parse_sf_bit_depth(subtype: str) -> int:
-    """Map a soundfile subtype string to a bit-depth integer."""
-    if subtype.startswith("PCM_"):
-        try:
-            return int(subtype.split("_")[1])
-        except (IndexError, ValueError):
-            pass
-    mapping = {
-        "FLOAT":  32,
-        "DOUBLE": 64,
-        "ULAW":   8,
-        "ALAW":   8,
-        "VORBIS": 16,
-        "OPUS":   16,
-    }
-    return mapping.get(subtype, 16)
-
-
-def _load_audio(
-    audio_bytes: bytes, filename: str
-) -> Tuple[object, object, int]:
-    """Load audio via librosa (mono=False to preserve stereo).
-
-    Returns (y_left, y_right_or_None, sample_rate).
-
-    ``y_left`` is always a 1-D float32 numpy array.
-    ``y_right`` is a 1-D float32 numpy array for stereo files, or ``None``
-    for mono files.
-    """
-    import librosa  # type: ignore
-    import numpy as np  # type: ignore
+def _stats(y_left, y_right) -> "StereoStats":
+    from app.services.audio_features import stereo_stats
 
-    try:
-        loaded = librosa.load(io.BytesIO(audio_bytes), sr=None, mono=False)
-        if isinstance(loaded, tuple) and len(loaded) >= 2:
-            y, sr = loaded[0], loaded[1]
-        else:
-            y, sr = loaded, 44100
-    except Exception:
-        # Fallback: let pydub decode, then reload via librosa
-        from pydub import AudioSegment
-
-        ext = filename.rsplit(".", 1)[-1].lower() if "." in filename else "wav"
-        seg = AudioSegment.from_file(io.BytesIO(audio_bytes), format=ext)
-        wav_buf = io.BytesIO()
-        seg.export(wav_buf, format="wav")
-        wav_buf.seek(0)
-        loaded = librosa.load(wav_buf, sr=None, mono=False)
-        if isinstance(loaded, tuple) and len(loaded) >= 2:
-            y, sr = loaded[0], loaded[1]
-        else:
-            y, sr = loaded, int(seg.frame_rate or 44100)
+    return stereo_stats(y_left, y_right)
 
-    if y.ndim == 1:
-        # Mono file
-        return y, None, int(sr)
 
-    # Multichannel: use first two channels
-    y_left = y[0]
-    y_right = y[1]
-    return y_left, y_right, int(sr)
+# ---------------------------------------------------------------------------
+# Metrics from whole-file statistics.  ``TrackQualityAnalyzer`` reads these
+# from the shared feature bundle; the ``(y_left, y_right)`` helpers below
+# compute the same statistics from samples.
+# ---------------------------------------------------------------------------
 
 
-def _detect_clipping(y_left, y_right) -> ClippingLevel:
+def _clipping_level(stats: "StereoStats") -> ClippingLevel:
     """Classify clipping severity based on fraction of near-full-scale samples."""
-    import numpy as np  # type: ignore
-
-    all_samples = (
-        np.concatenate([y_left, y_right])
-        if y_right is not None
-        else y_left
-    )
-    abs_samples = np.abs(all_samples)
-    total = len(abs_samples)
-    if total == 0:
-        return ClippingLevel.NONE
-
-    clipped = int(np.sum(abs_samples >= _CLIP_THRESHOLD))
-    ratio = clipped / total
-
+    ratio = stats.clipped_fraction
     if ratio >= _CLIP_SEVERE_THRESHOLD:
         return ClippingLevel.SEVERE
     if ratio >= _CLIP_MINOR_THRESHOLD:
@@ -237,7 +149,7 @@ def _detect_clipping(y_left, y_right) -> ClippingLevel:
     return ClippingLevel.NONE
 
 
-def _compute_mono_compatibility(y_left, y_right) -> bool:
+def _mono_compatibility(stats: "StereoStats") -> bool:
     """Return True if the stereo pair is mono-compatible.
 
     Checks two independent criteria:
@@ -246,30 +158,18 @@ def _compute_mono_compatibility(y_left, y_right) -> bool:
 
     A file that fails either check is flagged as mono-incompatible.
     """
-    import numpy as np  # type: ignore
-
-    if y_right is None:
+    if not stats.is_stereo:
         return True  # Mono files are always compatible
 
-    std_l = float(np.std(y_left))
-    std_r = float(np.std(y_right))
-
-    if std_l < 1e-10 and std_r < 1e-10:
+    if stats.std_left < 1e-10 and stats.std_right < 1e-10:
         return True  # Silent signal — trivially mono compatible
 
-    if std_l > 1e-10 and std_r > 1e-10:
-        corr = float(np.corrcoef(y_left, y_right)[0, 1])
-    else:
-        corr = 1.0  # One channel silent → treat as mono compatible
+    # One channel silent → correlation is reported as 1.0 (mono compatible)
+    corr = stats.correlation
 
     # Energy ratio check
-    rms_l = math.sqrt(float(np.mean(y_left ** 2)))
-    rms_r = math.sqrt(float(np.mean(y_right ** 2)))
-    mono_sum = y_left + y_right
-    rms_mono_sum = math.sqrt(float(np.mean(mono_sum ** 2)))
-
-    avg_rms = (rms_l + rms_r) / 2.0
-    energy_ratio = rms_mono_sum / avg_rms if avg_rms > 1e-10 else 2.0
+    avg_rms = (stats.rms_left + stats.rms_right) / 2.0
+    energy_ratio = stats.rms_sum / avg_rms if avg_rms > 1e-10 else 2.0
 
     return (
         corr >= _MONO_COMPAT_CORR_MIN
@@ -277,42 +177,31 @@ def _compute_mono_compatibility(y_left, y_right) -> bool:
     )
 
 
-def _detect_phase_issues(y_left, y_right) -> bool:
+def _phase_issues(stats: "StereoStats") -> bool:
     """Return True when significant phase cancellation is present.
 
     Phase cancellation is inferred by comparing the RMS of the mono sum
     to the average RMS of individual channels.  When the sum is much quieter
     than expected, polarity inversion or strong out-of-phase content is present.
     """
-    import numpy as np  # type: ignore
-
-    if y_right is None:
+    if not stats.is_stereo:
         return False  # Mono — no stereo phase to evaluate
 
-    rms_l = math.sqrt(float(np.mean(y_left ** 2)))
-    rms_r = math.sqrt(float(np.mean(y_right ** 2)))
-    mono_sum = y_left + y_right
-    rms_mono_sum = math.sqrt(float(np.mean(mono_sum ** 2)))
-
-    avg_rms = (rms_l + rms_r) / 2.0
+    avg_rms = (stats.rms_left + stats.rms_right) / 2.0
     if avg_rms < 1e-10:
         return False
 
-    return (rms_mono_sum / avg_rms) < _PHASE_ISSUE_ENERGY_RATIO
+    return (stats.rms_sum / avg_rms) < _PHASE_ISSUE_ENERGY_RATIO
 
 
-def _compute_stereo_field(y_left, y_right) -> StereoFieldWidth:
+def _stereo_field(stats: "StereoStats") -> StereoFieldWidth:
     """Classify stereo field width using mid/side energy ratio."""
-    import numpy as np  # type: ignore
-
-    if y_right is None:
+    if not stats.is_stereo:
         return StereoFieldWidth.NARROW  # Mono file has no stereo width
 
-    mid = (y_left + y_right) / math.sqrt(2.0)
-    side = (y_left - y_right) / math.sqrt(2.0)
-
-    rms_mid = math.sqrt(float(np.mean(mid ** 2)))
-    rms_side = math.sqrt(float(np.mean(side ** 2)))
+    # mid = (L + R) / √2, side = (L − R) / √2
+    rms_mid = stats.rms_sum / math.sqrt(2.0)
+    rms_side = stats.rms_diff / math.sqrt(2.0)
 
     if rms_mid < 1e-10:
         return StereoFieldWidth.NORMAL
@@ -326,6 +215,137 @@ def _compute_stereo_field(y_left, y_right) -> StereoFieldWidth:
     return StereoFieldWidth.NORMAL
 
 
+def _true_peak_dbfs(peak: float) -> float:
+    """Return maximum sample amplitude in dBFS."""
+    if peak <= 0:
+        return -120.0
+    return round(20.0 * math.log10(peak), 1)
+
+
+def _gated_loudness(mean_squares) -> float:
+    """Apply BS.1770 absolute and relative gating to 400 ms block mean squares."""
+    # Absolute gating: convert −70 LUFS absolute gate to mean-square threshold
+    # LUFS = −0.691 + 10·log10(mean_square)  →  mean_square = 10^((L+0.691)/10)
+    abs_gate_ms = 10 ** ((_ABSOLUTE_GATE_LUFS + 0.691) / 10.0)
+    gated = mean_squares[mean_squares > abs_gate_ms]
+
+    if len(gated) == 0:
+        return _ABSOLUTE_GATE_LUFS
+
+    # Relative gating: −10 LU below first-pass mean
+    mean_gated = float(gated.mean())
+    rel_gate_ms = mean_gated * 10 ** (_RELATIVE_GATE_LU / 10.0)
+    gated2 = gated[gated > rel_gate_ms]
+
+    if len(gated2) == 0:
+        gated2 = gated
+
+    final_ms = float(gated2.mean())
+    if final_ms <= 0:
+        return _ABSOLUTE_GATE_LUFS
+
+    loudness = -0.691 + 10.0 * math.log10(final_ms)
+    return round(loudness, 1)
+
+
+def _average_channel_blocks(left_ms, right_ms):
+    if right_ms is None:
+        return left_ms
+    # Align lengths (may differ by one block due to rounding)
+    n_blocks = min(len(left_ms), len(right_ms))
+    return (left_ms[:n_blocks] + right_ms[:n_blocks]) / 2.0
+
+
+def _loudness_from_features(features: "AudioFeatures") -> float:
+    """Integrated loudness from the bundle's 100 ms block power.
+
+    A 400 ms block with 100 ms hop is the mean of four consecutive 100 ms
+    blocks, so this matches :func:`_compute_integrated_loudness` exactly
+    whenever 0.4 s is a whole number of 0.1 s blocks (every common rate).
+    """
+    import numpy as np  # type: ignore
+
+    per_block = max(int(round(_LOUDNESS_BLOCK_SEC / _LOUDNESS_HOP_SEC)), 1)
+    block_size = max(int(_LOUDNESS_BLOCK_SEC * features.sample_rate), 1)
+    stats = features.stereo
+
+    def _block_mean_squares(power, rms) -> object:
+        if features.num_samples < block_size or len(power) < per_block:
+            return np.array([rms ** 2])
+        return np.convolve(power, np.full(per_block, 1.0 / per_block), mode="valid")
+
+    left_ms = _block_mean_squares(features.channel_power[0], stats.rms_left)
+    right_ms = (
+        _block_mean_squares(features.channel_power[1], stats.rms_right)
+        if stats.is_stereo
+        else None
+    )
+    return _gated_loudness(_average_channel_blocks(left_ms, right_ms))
+
+
+def _tonal_profile_from_band_energies(band_energies: Dict[str, float]) -> TonalProfile:
+    """Compare each band's energy fraction to ``_TONAL_REFERENCE_RANGES``."""
+    total = sum(band_energies.values())
+    if total <= 0.0:
+        return TonalProfile(
+            low=TonalBandStatus.OPTIMAL,
+            low_mid=TonalBandStatus.OPTIMAL,
+            mid=TonalBandStatus.OPTIMAL,
+            high=TonalBandStatus.OPTIMAL,
+        )
+
+    statuses: Dict[str, TonalBandStatus] = {}
+    for name, (lo_ref, hi_ref) in _TONAL_REFERENCE_RANGES.items():
+        ratio = band_energies[name] / total
+        if ratio > hi_ref:
+            statuses[name] = TonalBandStatus.TOO_HIGH
+        elif ratio < lo_ref:
+            statuses[name] = TonalBandStatus.TOO_LOW
+        else:
+            statuses[name] = TonalBandStatus.OPTIMAL
+
+    return TonalProfile(
+        low=statuses["low"],
+        low_mid=statuses["low_mid"],
+        mid=statuses["mid"],
+        high=statuses["high"],
+    )
+
+
+def _tonal_profile_from_features(features: "AudioFeatures") -> TonalProfile:
+    """Tonal profile from the bundle's long-term spectrum of the first 30 s."""
+    return _tonal_profile_from_band_energies(
+        {name: features.band_power(lo, hi) for name, lo, hi in _TONAL_BANDS}
+    )
+
+
+# ---------------------------------------------------------------------------
+# Sample-based helpers
+# ---------------------------------------------------------------------------
+
+
+def _detect_clipping(y_left, y_right) -> ClippingLevel:
+    """Classify clipping severity based on fraction of near-full-scale samples."""
+    if len(y_left) == 0:
+        return ClippingLevel.NONE
+    return _clipping_level(_stats(y_left, y_right))
+
+
+def _compute_mono_compatibility(y_left, y_right) -> bool:
+    """Return True if the stereo pair is mono-compatible (see :func:`_mono_compatibility`)."""
+    return _mono_compatibility(_stats(y_left, y_right))
+
+
+def _detect_phase_issues(y_left, y_right) -> bool:
+    """Return True when significant phase cancellation is present (see :func:`_phase_issues`)."""
+    return _phase_issues(_stats(y_left, y_right))
+
+
+def _compute_stereo_field(y_left, y_right) -> StereoFieldWidth:
+    """Classify stereo field width using mid/side energy ratio."""
+    return _stereo_field(_stats(y_left, y_right))
+
+
 def _compute_integrated_loudness(y_left, y_right, sr: int) -> float:
     """Compute integrated loudness (simplified BS.1770-3 approximation).
 
@@ -352,51 +372,13 @@ def _compute_integrated_loudness(y_left, y_right, sr: int) -> float:
         return np.array(blocks) if blocks else np.array([float(np.mean(y_ch ** 2))])
 
     left_ms = _block_mean_squares(y_left)
-    if y_right is not None:
-        right_ms = _block_mean_squares(y_right)
-        # Align lengths (may differ by one block due to rounding)
-        n_blocks = min(len(left_ms), len(right_ms))
-        mean_squares = (left_ms[:n_blocks] + right_ms[:n_blocks]) / 2.0
-    else:
-        mean_squares = left_ms
-
-    # Absolute gating: convert −70 LUFS absolute gate to mean-square threshold
-    # LUFS = −0.691 + 10·log10(mean_square)  →  mean_square = 10^((L+0.691)/10)
-    abs_gate_ms = 10 ** ((_ABSOLUTE_GATE_LUFS + 0.691) / 10.0)
-    gated = mean_squares[mean_squares > abs_gate_ms]
-
-    if len(gated) == 0:
-        return _ABSOLUTE_GATE_LUFS
-
-    # Relative gating: −10 LU below first-pass mean
-    mean_gated = float(gated.mean())
-    rel_gate_ms = mean_gated * 10 ** (_RELATIVE_GATE_LU / 10.0)
-    gated2 = gated[gated > rel_gate_ms]
-
-    if len(gated2) == 0:
-        gated2 = gated
-
-    final_ms = float(gated2.mean())
-    if final_ms <= 0:
-        return _ABSOLUTE_GATE_LUFS
-
-    loudness = -0.691 + 10.0 * math.log10(final_ms)
-    return round(loudness, 1)
+    right_ms = _block_mean_squares(y_right) if y_right is not None else None
+    return _gated_loudness(_average_channel_blocks(left_ms, right_ms))
 
 
 def _compute_true_peak(y_left, y_right) -> float:
     """Return maximum sample amplitude in dBFS."""
-    import numpy as np  # type: ignore
-
-    all_samples = (
-        np.concatenate([y_left, y_right])
-        if y_right is not None
-        else y_left
-    )
-    max_abs = float(np.max(np.abs(all_samples)))
-    if max_abs <= 0:
-        return -120.0
-    return round(20.0 * math.log10(max_abs), 1)
+    return _true_peak_dbfs(_stats(y_left, y_right).peak)
 
 
 def _compute_tonal_profile(y_left, y_right, sr: int) -> TonalProfile:
@@ -419,12 +401,7 @@ def _compute_tonal_profile(y_left, y_right, sr: int) -> TonalProfile:
 
     n = len(y_seg)
     if n < 2:
-        return TonalProfile(
-            low=TonalBandStatus.OPTIMAL,
-            low_mid=TonalBandStatus.OPTIMAL,
-            mid=TonalBandStatus.OPTIMAL,
-            high=TonalBandStatus.OPTIMAL,
-        )
+        return _tonal_profile_from_band_energies({name: 0.0 for name, _, _ in _TONAL_BANDS})
 
     fft_mags = np.abs(np.fft.rfft(y_seg))
     freqs = np.fft.rfftfreq(n, d=1.0 / sr)
@@ -435,31 +412,7 @@ def _compute_tonal_profile(y_left, y_right, sr: int) -> TonalProfile:
         mask = (freqs >= lo) & (freqs < hi)
         band_energies[name] = float(np.mean(power[mask])) if np.any(mask) else 0.0
 
-    total = sum(band_energies.values())
-    if total <= 0.0:
-        return TonalProfile(
-            low=TonalBandStatus.OPTIMAL,
-            low_mid=TonalBandStatus.OPTIMAL,
-            mid=TonalBandStatus.OPTIMAL,
-            high=TonalBandStatus.OPTIMAL,
-        )
-
-    statuses: Dict[str, TonalBandStatus] = {}
-    for name, (lo_ref, hi_ref) in _TONAL_REFERENCE_RANGES.items():
-        ratio = band_energies[name] / total
-        if ratio > hi_ref:
-            statuses[name] = TonalBandStatus.TOO_HIGH
-        elif ratio < lo_ref:
-            statuses[name] = TonalBandStatus.TOO_LOW
-        else:
-            statuses[name] = TonalBandStatus.OPTIMAL
-
-    return TonalProfile(
-        low=statuses["low"],
-        low_mid=statuses["low_mid"],
-        mid=statuses["mid"],
-        high=statuses["high"],
-    )
+    return _tonal_profile_from_band_energies(band_energies)
 
 
 def _generate_suggestions(
@@ -669,63 +622,61 @@ class TrackQualityAnalyzer:
     ) -> TrackQualityAnalysisResponse:
         import numpy as np  # noqa: F401 — validate numpy import early
 
-        # --- File metadata (sample rate, bit depth) ---
-        sample_rate, bit_depth = _get_file_metadata(audio_bytes, filename)
-
-        # --- Load audio signal ---
-        y_left, y_right, sr_actual = _load_audio(audio_bytes, filename)
+        from app.services.audio_features import get_audio_features
 
-        # Prefer metadata sample rate; fall back to librosa's decoded rate
-        sample_rate = sample_rate or sr_actual
+        # --- Decode once into the shared feature bundle ---
+        features = get_audio_features(audio_bytes, filename)
+        sample_rate, bit_depth = features.sample_rate, features.bit_depth
+        stats = features.stereo
 
         logger.info(
             "TrackQualityAnalyzer: loaded audio sr=%d bit_depth=%d "
             "stereo=%s samples=%d",
             sample_rate,
             bit_depth,
-            y_right is not None,
-            len(y_left),
+            stats.is_stereo,
+            features.num_samples,
         )
 
         # --- Individual metric computations ---
         clipping = _safe(
-            lambda: _detect_clipping(y_left, y_right),
+            lambda: _clipping_level(stats),
             ClippingLevel.NONE,
             "clipping",
         )
 
         mono_compat = _safe(
-            lambda: _compute_mono_compatibility(y_left, y_right),
+            lambda: _mono_compatibility(stats),
             True,
             "mono_compatibility",
         )
 
         phase_issues = _safe(
-            lambda: _detect_phase_issues(y_left, y_right),
+            lambda: _phase_issues(stats),
             False,
             "phase_issues",
         )
 
         stereo_field = _safe(
-            lambda: _compute_stereo_field(y_left, y_right),
+            lambda: _stereo_field(stats),
             StereoFieldWidth.NORMAL,
             "stereo_field",
         )
 
         integrated_loudness = _safe(
-            lambda: _compute_integrated_loudness(y_left, y_right, sr_actual),
+            lambda: _loudness_from_features(features),
             -23.0,
             "integrated_loudness",
         )
 
         true_peak = _safe(
-            lambda: _compute_true_peak(y_left, y_right),
+            lambda: _true_peak_dbfs(stats.peak),
             -6.0,
             "true_peak",
         )
 
         tonal_profile = _safe(
-            lambda: _compute_tonal_profile(y_left, y_right, sr_actual),
+            lambda: _tonal_profile_from_features(features),
             TonalProfile(
                 low=TonalBandStatus.OPTIMAL,
                 low_mid=TonalBandStatus.OPTIMAL,
@@ -0,0 +1,94 @@
+"""Catalog analysis backfill (see app/services/batch_analysis.py).
+
+RQ entrypoint for ``POST /loops/analyze-batch`` and a CLI that runs outside
+the API::
+
+    python -m app.workers.backfill_analysis --missing bpm --limit 5000
+    python -m app.workers.backfill_analysis --loop-ids 12,15,98 --workers 8 --prefetch 16
+"""
+
+import argparse
+import json
+import logging
+import sys
+from typing import List, Optional
+
+from app.services.batch_analysis import MISSING_FILTERS, BatchAnalysisResult, run_batch_analysis, select_loop_ids
+
+logger = logging.getLogger(__name__)
+
+
+def batch_analysis_worker(loop_ids: List[int]) -> dict:
+    """
+    Worker function: analyze *loop_ids* and write the results back.
+
+    Called by RQ when the job is dequeued, or in-process by the batch route
+    when the queue is unavailable.  Returns the run summary (kept as the RQ
+    job result).
+    """
+    from app.db import SessionLocal
+
+    db = SessionLocal()
+    try:
+        return run_batch_analysis(db, loop_ids).to_dict()
+    finally:
+        db.close()
+
+
+def _parse_ids(value: str) -> List[int]:
+    try:
+        return [int(part) for part in value.split(",") if part.strip()]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected comma-separated loop ids, got {value!r}")
+
+
+def _log_progress(result: BatchAnalysisResult) -> None:
+    logger.info(
+        "backfill progress: %d/%d done (%d failed), %.2f loops/s",
+        result.analyzed + result.failed,
+        result.requested,
+        result.failed,
+        result.loops_per_second,
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Re-analyze stored loops and write bpm/key/duration/bars back.")
+    parser.add_argument("--loop-ids", type=_parse_ids, help="comma-separated loop ids (default: every loop)")
+    parser.add_argument("--missing", choices=sorted(MISSING_FILTERS), help="only loops where this field is NULL")
+    parser.add_argument("--limit", type=int, help="analyze at most this many loops")
+    parser.add_argument("--workers", type=int, help="analysis processes (default: BATCH_ANALYSIS_WORKERS)")
+    parser.add_argument("--prefetch", type=int, help="storage reads ahead (default: BATCH_ANALYSIS_PREFETCH)")
+    parser.add_argument("--update-batch", type=int, help="rows per bulk UPDATE (default: BATCH_ANALYSIS_UPDATE_BATCH)")
+    parser.add_argument("--dry-run", action="store_true", help="print the selected loop count and exit")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+
+    from app.db import SessionLocal
+    from app.workers.render_worker import _ensure_db_models
+
+    _ensure_db_models()
+    db = SessionLocal()
+    try:
+        loop_ids = select_loop_ids(db, loop_ids=args.loop_ids, missing=args.missing, limit=args.limit)
+        print(f"selected {len(loop_ids)} loops")
+        if args.dry_run or not loop_ids:
+            return 0
+        result = run_batch_analysis(
+            db,
+            loop_ids,
+            workers=args.workers,
+            prefetch=args.prefetch,
+            update_batch=args.update_batch,
+            progress=_log_progress,
+        )
+    finally:
+        db.close()
+
+    print(json.dumps(result.to_dict(), indent=2))
+    return 0 if result.failed == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
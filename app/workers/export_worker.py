@@ -0,0 +1,25 @@
+"""RQ entrypoint for DAW export jobs (see app/services/daw_export_job.py)."""
+
+import logging
+
+from app.services.daw_export_job import run_daw_export_job
+
+logger = logging.getLogger(__name__)
+
+
+def daw_export_worker(job_id: str, arrangement_id: int) -> None:
+    """
+    Worker function: build one arrangement's DAW export package.
+
+    Called by RQ when the job is dequeued.  Failures are recorded on the job,
+    not raised.
+    """
+    from app.db import SessionLocal
+
+    db = SessionLocal()
+    try:
+        run_daw_export_job(db, job_id, arrangement_id)
+    except Exception:
+        logger.warning("daw_export_worker finished with failure: job_id=%s arrangement_id=%s", job_id, arrangement_id)
+    finally:
+        db.close()
@@ -0,0 +1,27 @@
+"""RQ entrypoint for upload ingest jobs (see app/services/loop_ingest.py)."""
+
+import logging
+from typing import Optional
+
+from app.services.loop_ingest import ingest_loop
+
+logger = logging.getLogger(__name__)
+
+
+def ingest_loop_worker(job_id: str, loop_id: int, content: Optional[bytes] = None) -> None:
+    """
+    Worker function: analyze and separate one uploaded loop.
+
+    Called by RQ when the job is dequeued, or in-process by the upload route
+    when the queue is unavailable.  Failures are recorded on the job and the
+    loop, not raised.
+    """
+    from app.db import SessionLocal
+
+    db = SessionLocal()
+    try:
+        ingest_loop(db, job_id, loop_id, content)
+    except Exception:
+        logger.warning("ingest_loop_worker finished with failure: job_id=%s loop_id=%s", job_id, loop_id)
+    finally:
+        db.close()
@@ -22,15 +22,12 @@ def _heartbeat_loop() -> None:
 
 
 def _run_rq_worker() -> None:
-    from app.queue import DEFAULT_RENDER_QUEUE_NAME, get_redis_conn, get_queue
+    from app.queue import WORKER_QUEUE_NAMES, get_redis_conn
     from app.workers.render_worker import _ensure_db_models
+    from app.workers.scheduling import build_worker
 
     _ensure_db_models()
     redis_conn = get_redis_conn()
-    queue_name = DEFAULT_RENDER_QUEUE_NAME
-    queue = get_queue(redis_conn, name=queue_name)
-
-    from rq import SimpleWorker
 
     # Use a Windows-safe death-penalty class so the worker never touches
     # signal.SIGALRM, which does not exist on Windows.
@@ -58,11 +55,11 @@ def _run_rq_worker() -> None:
             def cancel_death_penalty(self) -> None:
                 pass
 
-    logger.info("Connected to Redis queue: %s", queue.name)
-    logger.info("Listening on queue(s): %s", queue_name)
-
-    worker = SimpleWorker([queue], connection=redis_conn, log_job_description=True,
+    # Every queue is listened on even with QUEUE_ROUTING_ENABLED=false so
+    # jobs routed before a rollback still drain.
+    worker = build_worker(redis_conn, WORKER_QUEUE_NAMES, log_job_description=True,
                           default_result_ttl=500)
+    logger.info("Listening on queue(s): %s (weights %s)", ", ".join(worker.queue_names()), worker.queue_weights)
     # Override at the instance level so the class-level default
     # (UnixSignalDeathPenalty on older RQ) is never used.
     worker.death_penalty_class = _SafeDeathPenalty
@@ -88,7 +85,23 @@ def run_worker() -> None:
     heartbeat.start()
 
     try:
-        _run_rq_worker()
+        from app.workers.supervisor import fork_available, run_supervisor
+
+        on_main_thread = threading.current_thread() is threading.main_thread()
+        if settings.worker_processes > 0 and fork_available() and on_main_thread:
+            run_supervisor()
+        else:
+            if settings.worker_processes > 0 and not on_main_thread:
+                # The supervisor installs signal handlers, which Python only
+                # allows on the main thread (e.g. not the embedded API worker).
+                logger.warning(
+                    "WORKER_PROCESSES=%s ignored: supervisor needs the main thread (running in %s)",
+                    settings.worker_processes,
+                    threading.current_thread().name,
+                )
+            elif settings.worker_processes > 0:
+                logger.warning("WORKER_PROCESSES=%s ignored: fork is unavailable", settings.worker_processes)
+            _run_rq_worker()
     except Exception as exc:
         logger.exception("Worker startup failed: %s", exc)
         raise
@@ -2,7 +2,9 @@
 
 Worker topology (production):
 - A dedicated ``python -m app.workers.main`` process connects to Redis and
-  runs ``rq.SimpleWorker`` on the ``render`` queue.
+  runs ``rq.SimpleWorker`` on the ``render`` queue (or, with
+  ``WORKER_PROCESSES`` > 0, forks that many of them from a supervisor that
+  enforces job timeouts by killing the process; see supervisor.py).
 - RQ dequeues a job and calls ``render_loop_worker(job_id, loop_id, params)``.
 - The worker resolves the app-level job ID (handles RQ vs app ID mismatch),
   marks the arrangement row as ``processing``, then calls
@@ -19,6 +21,8 @@ Worker topology (production):
 import logging
 import os
 import tempfile
+import threading
+import time
 import traceback
 import json
 from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
@@ -31,12 +35,16 @@ from sqlalchemy.orm import Session
 
 from app.config import settings
 from app.db import SessionLocal, engine
+from app.db.worker_setup import SchemaStatus, check_schema, get_db_setup_stats
 from app.models.job import RenderJob
 from app.models.loop import Loop
-from app.services.job_service import update_job_status
+from app.services.job_service import create_render_job, update_job_status
 from app.services.render_executor import DynamicArrangementValidationError, render_from_plan
-from app.services.storage import storage
+from app.services import preview_render, render_result_cache, render_timing
+from app.services.render_result_cache import get_render_result_cache
+from app.services.storage import UploadStream, storage
 from app.schemas.job import OutputFile
+from app.workers.supervisor import is_supervised
 from app.services.arrangement_jobs import _parse_stem_metadata_from_loop
 from app.services.arrangement_scorer import score_and_reject
 from app.services.audit_logging import log_feature_event
@@ -61,6 +69,10 @@ except (TypeError, ValueError):
     )
     _JOB_TIMEOUT_SECONDS = 900
 
+# Set by the first _ensure_db_models() call in this process.
+_schema_status: SchemaStatus | None = None
+_schema_lock = threading.Lock()
+
 # Job module imports
 MODELS_TO_REGISTER = [
     "app.models.loop",
@@ -128,17 +140,59 @@ def _build_dev_fallback_render_plan(loop: Loop, params: Dict) -> dict:
     }
 
 
-def _ensure_db_models():
-    """Ensure all models are registered with Base.metadata."""
+def _verify_db_schema() -> SchemaStatus:
+    """Register the models and check the database against the Alembic head.
+
+    An unstamped database (local SQLite) gets ``create_all`` as before.  A
+    database behind the head is fatal in production (migrations run in the
+    release phase); a revision this code does not know means a newer deploy
+    already migrated it, so the worker keeps going.
+    """
     from app.models.base import Base
-    
+
     for module_name in MODELS_TO_REGISTER:
         try:
             __import__(module_name)
         except Exception as e:
             logger.warning(f"Failed to import {module_name}: {e}")
-    
-    Base.metadata.create_all(bind=engine)
+
+    status = check_schema(engine)
+    if status.up_to_date:
+        logger.info("WORKER_SCHEMA_OK revision=%s", status.current)
+    elif status.current is None:
+        logger.warning("WORKER_SCHEMA_UNSTAMPED head=%s; creating missing tables with create_all", status.head)
+        Base.metadata.create_all(bind=engine)
+    elif status.behind:
+        message = f"Database schema is at {status.current}, code expects {status.head}; run `alembic upgrade head`"
+        if settings.is_production:
+            raise RuntimeError(message)
+        logger.error("WORKER_SCHEMA_BEHIND %s", message)
+    else:
+        logger.warning("WORKER_SCHEMA_AHEAD database=%s head=%s (newer deploy)", status.current, status.head)
+    return status
+
+
+def _ensure_db_models() -> SchemaStatus:
+    """Verify the schema once per process; later calls are a cached no-op."""
+    global _schema_status
+    if _schema_status is None:
+        with _schema_lock:
+            if _schema_status is None:
+                _schema_status = _verify_db_schema()
+                get_db_setup_stats().schema = _schema_status
+    return _schema_status
+
+
+def _open_job_session() -> Session:
+    """Session for one job, with its setup time (schema check + connection checkout) recorded."""
+    started = time.perf_counter()
+    _ensure_db_models()
+    db = SessionLocal()
+    db.connection()
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    get_db_setup_stats().record(elapsed_ms)
+    logger.info("WORKER_DB_SETUP elapsed_ms=%.2f", elapsed_ms)
+    return db
 
 
 def _run_with_timeout(fn, *args, timeout_seconds: int = _JOB_TIMEOUT_SECONDS, **kwargs):
@@ -153,9 +207,14 @@ def _run_with_timeout(fn, *args, timeout_seconds: int = _JOB_TIMEOUT_SECONDS, **
     the background thread may continue running until the current I/O or CPU
     operation completes. This is acceptable because SimpleWorker processes one
     job at a time, so the stale thread will not block new jobs.
+
+    Under the prefork supervisor (app/workers/supervisor.py) *fn* runs
+    directly: the supervisor kills the worker process when the job overruns.
     """
+    if is_supervised():
+        return fn(*args, **kwargs)
     with ThreadPoolExecutor(max_workers=1) as executor:
-        future = executor.submit(fn, *args, **kwargs)
+        future = executor.submit(render_timing.bind_context(fn), *args, **kwargs)
         return future.result(timeout=timeout_seconds)
 
 
@@ -201,11 +260,64 @@ def _download_loop_audio(loop: Loop, temp_dir: Path) -> Path:
     return temp_file
 
 
+def _stem_keys_from_metadata(stem_metadata: dict | None) -> dict[str, str]:
+    """Return the role -> storage key map the stem loader would load, or {}."""
+    if not (stem_metadata and stem_metadata.get("enabled") and stem_metadata.get("succeeded")):
+        return {}
+    stems_dict = stem_metadata.get("stem_s3_keys") or stem_metadata.get("stems")
+    if not isinstance(stems_dict, dict):
+        return {}
+    return {str(role): str(key) for role, key in stems_dict.items() if key}
+
+
+def _render_fingerprint(loop: Loop, render_plan_json, stem_metadata: dict | None, feature_flags: dict) -> str | None:
+    """Fingerprint this render for the render result cache, or None when it cannot be cached."""
+    if not settings.render_result_cache_enabled:
+        return None
+    cache = get_render_result_cache()
+    try:
+        source_version = storage.get_object_version(loop.file_key or loop.file_url)
+        if not isinstance(source_version, str) or not source_version:
+            cache.record_bypass()
+            return None
+        return render_result_cache.render_fingerprint(
+            source_version=source_version,
+            stem_keys=_stem_keys_from_metadata(stem_metadata),
+            render_plan=render_plan_json,
+            feature_flags=feature_flags,
+        )
+    except Exception as e:
+        logger.warning("RENDER_RESULT_CACHE_FINGERPRINT_FAILED loop_id=%s error=%s", loop.id, e)
+        cache.record_bypass()
+        return None
+
+
+def _open_render_output_stream(job_id: str, filename: str, key: str | None = None) -> UploadStream | None:
+    """Open the upload stream the render is encoded into, or None to export a temp file.
+
+    *key* overrides the default ``renders/<job_id>/<filename>`` object key.
+    Falls back to the temp-file path (``_upload_render_output``) when streaming
+    is disabled or the stream cannot be opened.
+    """
+    if not settings.render_streaming_upload_enabled:
+        return None
+    try:
+        return storage.open_upload_stream(key or f"renders/{job_id}/{filename}", "audio/wav")
+    except Exception as e:
+        logger.warning("RENDER_OUTPUT_STREAM_UNAVAILABLE job_id=%s error=%s", job_id, e)
+        return None
+
+
 @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
-def _upload_render_output(job_id: str, filename: str, file_path: Path) -> tuple[str, str]:
+def _upload_render_output(
+    job_id: str,
+    filename: str,
+    file_path: Path,
+    key: str | None = None,
+    content_type: str = "audio/wav",
+) -> tuple[str, str]:
     """Upload render output to S3, return (s3_key, content_type)."""
-    s3_key = f"renders/{job_id}/{filename}"
-    content_type = "audio/wav"
+    s3_key = key or f"renders/{job_id}/{filename}"
     
     with open(file_path, "rb") as f:
         file_bytes = f.read()
@@ -392,20 +504,72 @@ def _extract_producer_fields_from_plan(
     }
 
 
+def _queue_full_render(
+    db: Session,
+    job_id: str,
+    loop_id: int,
+    params: Dict,
+    arrangement_id: int,
+    render_result: dict,
+    content_type: str,
+) -> dict:
+    """Queue the full-quality render after a preview; returns the preview's render_metadata entry."""
+    metadata = {"content_type": content_type, "full_job_id": None}
+    try:
+        full_job, _ = create_render_job(
+            db,
+            loop_id,
+            preview_render.full_render_params(
+                params,
+                preview_job_id=job_id,
+                arrangement_id=arrangement_id,
+                snapshot=render_result["planned_arrangement"],
+            ),
+        )
+        metadata["full_job_id"] = full_job.id
+        logger.info("PREVIEW_FULL_RENDER_QUEUED preview_job_id=%s full_job_id=%s", job_id, full_job.id)
+    except Exception as e:
+        logger.error("PREVIEW_FULL_RENDER_QUEUE_FAILED job_id=%s error=%s", job_id, e, exc_info=True)
+        from app.models.arrangement import Arrangement
+
+        arrangement = db.query(Arrangement).filter(Arrangement.id == arrangement_id).first()
+        if arrangement is not None:
+            arrangement.status = "done"
+            arrangement.progress = 100.0
+            arrangement.progress_message = "Preview only — full-quality render could not be queued"
+            db.commit()
+    return metadata
+
+
+def _fail_preview_arrangement(db: Session, arrangement_id: int, error: str) -> None:
+    """Mark the preview's Arrangement row failed when its full render fails."""
+    from app.models.arrangement import Arrangement
+
+    arrangement = db.query(Arrangement).filter(Arrangement.id == arrangement_id).first()
+    if arrangement is not None and arrangement.status != "done":
+        arrangement.status = "failed"
+        arrangement.error_message = f"Full-quality render failed: {error}"[:500]
+        db.commit()
+
+
 def render_loop_worker(job_id: str, loop_id: int, params: Dict) -> None:
     """
     Worker function: process a single render job.
     
     Called by RQ when job is dequeued.
     """
-    _ensure_db_models()
-    db = SessionLocal()
+    db = _open_job_session()
     app_job_id = job_id
     arrangement_id = None
     # Phase 3: track where failure occurred for job_terminal_state resolution.
     failure_stage: str | None = None
+    # Upload stream the render is encoded into; aborted in ``finally`` unless committed.
+    output_stream: UploadStream | None = None
     worker_mode = get_worker_mode()
     feature_flags = resolve_feature_flags_snapshot()
+    # Timing spans recorded anywhere in this job go into its profile, which is
+    # persisted as render_metadata["profile"].
+    profile_token = render_timing.begin_profile(job_id)
     logger.info(
         "RUNTIME_CONFIG_SNAPSHOT scope=worker job_id=%s loop_id=%s env=%s is_production=%s "
         "dev_fallback_loop_only=%s producer_v2=%s arrangement_plan_v2=%s arrangement_memory_v2=%s "
@@ -594,6 +758,7 @@ def render_loop_worker(job_id: str, loop_id: int, params: Dict) -> None:
                         observability=obs,
                         mastering_info=mastering_info,
                         feature_flags_snapshot=feature_flags,
+                        profile=render_timing.snapshot(),
                     )
                 except Exception as obs_exc:
                     logger.warning(
@@ -704,6 +869,7 @@ def render_loop_worker(job_id: str, loop_id: int, params: Dict) -> None:
                     source_quality_mode_used="unknown",
                     observability={},
                     feature_flags_snapshot=feature_flags,
+                    profile=render_timing.snapshot(),
                 )
                 update_job_status(
                     db,
@@ -760,6 +926,7 @@ def render_loop_worker(job_id: str, loop_id: int, params: Dict) -> None:
                     source_quality_mode_used="unknown",
                     observability={},
                     feature_flags_snapshot=feature_flags,
+                    profile=render_timing.snapshot(),
                 ),
             )
             logger.error(
@@ -778,6 +945,11 @@ def render_loop_worker(job_id: str, loop_id: int, params: Dict) -> None:
         _variation_index = params.get("variation_index") if isinstance(params, dict) else None
         _variation_seed = params.get("variation_seed") if isinstance(params, dict) else None
         _is_variation_job = _variation_index is not None
+        # Preview jobs (preview_render.py) queue a full job that finishes the
+        # preview's Arrangement row and reuses the arrangement it planned.
+        _preview = preview_render.is_preview(params)
+        _preview_arrangement_id = params.get("preview_arrangement_id") if isinstance(params, dict) else None
+        _planned_arrangement = params.get("planned_arrangement") if isinstance(params, dict) else None
 
         if _is_variation_job:
             logger.info(
@@ -817,7 +989,9 @@ def render_loop_worker(job_id: str, loop_id: int, params: Dict) -> None:
         # other.  Only legacy single-render jobs may reuse an existing row.
         from app.models.arrangement import Arrangement
         
-        if _is_variation_job:
+        if _preview_arrangement_id:
+            arrangement = db.query(Arrangement).filter(Arrangement.id == _preview_arrangement_id).first()
+        elif _is_variation_job:
             # Variation jobs own their own Arrangement row — skip the lookup.
             arrangement = None
         else:
@@ -851,19 +1025,6 @@ def render_loop_worker(job_id: str, loop_id: int, params: Dict) -> None:
         with tempfile.TemporaryDirectory() as temp_dir_str:
             temp_dir = Path(temp_dir_str)
             
-            # Download audio
-            update_job_status(db, app_job_id, "processing", progress=20.0, progress_message="Downloading audio")
-            input_file = _download_loop_audio(loop, temp_dir)
-            
-            # Load and prepare audio
-            update_job_status(db, app_job_id, "processing", progress=30.0, progress_message="Loading audio")
-            from pydub import AudioSegment
-            
-            try:
-                audio = AudioSegment.from_file(str(input_file))
-            except Exception as e:
-                raise ValueError(f"Failed to load audio: {e}")
-            
             # Prefer the render plan freshly built for this job (embedded in params)
             # over any stale DB arrangement plan.  The params plan was built with the
             # correct target_bars for the requested duration; a DB arrangement may have
@@ -945,37 +1106,73 @@ def render_loop_worker(job_id: str, loop_id: int, params: Dict) -> None:
                 render_plan_json = json.dumps(_build_dev_fallback_render_plan(loop, params))
 
             # ----------------------------------------------------------------
-            # LOAD STEMS — worker must load stems so render uses real layers
+            # RENDER RESULT CACHE — an identical earlier render is reused as-is
             # ----------------------------------------------------------------
-            worker_stems = None
             stem_metadata = _parse_stem_metadata_from_loop(loop)
-            if stem_metadata and stem_metadata.get("enabled") and stem_metadata.get("succeeded"):
+            render_fingerprint = (
+                None if _preview else _render_fingerprint(loop, render_plan_json, stem_metadata, feature_flags)
+            )
+            cached_render = get_render_result_cache().lookup(render_fingerprint) if render_fingerprint else None
+
+            worker_stems = None
+            if cached_render is None:
+                # Download audio
+                update_job_status(db, app_job_id, "processing", progress=20.0, progress_message="Downloading audio")
+                with render_timing.span("download_loop", "io"):
+                    input_file = _download_loop_audio(loop, temp_dir)
+            
+                # Load and prepare audio
+                update_job_status(db, app_job_id, "processing", progress=30.0, progress_message="Loading audio")
+                from pydub import AudioSegment
+            
                 try:
-                    from app.services.stem_loader import StemLoadError, load_stems_from_metadata
-                    worker_stems = load_stems_from_metadata(stem_metadata, timeout_seconds=60.0)
-                    logger.info(
-                        "[%s] Worker loaded %d stems: %s",
-                        job_id, len(worker_stems), list(worker_stems.keys()),
-                    )
-                except Exception as stem_err:
-                    logger.warning(
-                        "[%s] Worker stem load failed (%s) — falling back to stereo",
-                        job_id, stem_err,
-                    )
-                    worker_stems = None
-            else:
-                logger.info("[%s] No stem metadata on loop %d — stereo fallback", job_id, loop_id)
+                    with render_timing.span("decode_loop", "decode"):
+                        audio = AudioSegment.from_file(str(input_file))
+                except Exception as e:
+                    raise ValueError(f"Failed to load audio: {e}")
+
+                # ----------------------------------------------------------------
+                # LOAD STEMS — worker must load stems so render uses real layers
+                # ----------------------------------------------------------------
+                if stem_metadata and stem_metadata.get("enabled") and stem_metadata.get("succeeded"):
+                    try:
+                        from app.services.stem_loader import StemLoadError, load_stems_from_metadata
+                        with render_timing.span("load_stems", "decode"):
+                            worker_stems = load_stems_from_metadata(stem_metadata, timeout_seconds=60.0)
+                        logger.info(
+                            "[%s] Worker loaded %d stems: %s",
+                            job_id, len(worker_stems), list(worker_stems.keys()),
+                        )
+                    except Exception as stem_err:
+                        logger.warning(
+                            "[%s] Worker stem load failed (%s) — falling back to stereo",
+                            job_id, stem_err,
+                        )
+                        worker_stems = None
+                else:
+                    logger.info("[%s] No stem metadata on loop %d — stereo fallback", job_id, loop_id)
 
             update_job_status(
                 db,
                 app_job_id,
                 "processing",
                 progress=60.0,
-                progress_message="Rendering from render_plan_json",
+                progress_message=(
+                    "Reusing cached render" if cached_render is not None else "Rendering from render_plan_json"
+                ),
             )
 
-            filename = "arrangement.wav"
+            filename = "preview" if _preview else "arrangement.wav"
             output_path = temp_dir / filename
+            # Only a render that used exactly the fingerprinted stems is stored
+            # under its fingerprint; a stem-load fallback keeps the per-job key.
+            output_key = None
+            if cached_render is None and render_fingerprint and set(worker_stems or {}) == set(
+                _stem_keys_from_metadata(stem_metadata)
+            ):
+                output_key = render_result_cache.output_key(render_fingerprint)
+            if cached_render is None and not _preview:
+                output_stream = _open_render_output_stream(app_job_id, filename, key=output_key)
             try:
                 # Score the render plan before committing render resources.
                 parsed_plan = json.loads(render_plan_json) if isinstance(render_plan_json, str) else render_plan_json
@@ -1000,9 +1197,15 @@ def render_loop_worker(job_id: str, loop_id: int, params: Dict) -> None:
                         audio_source=audio,
                         output_path=output_path,
                         stems=worker_stems,
+                        output_sink=output_stream,
+                        preview=_preview,
+                        planned_arrangement=_planned_arrangement,
                     )
 
-                render_result = _run_with_timeout(_do_render)
+                if cached_render is not None:
+                    render_result = cached_render.render_result
+                else:
+                    render_result = _run_with_timeout(_do_render)
             except FuturesTimeoutError:
                 timeout_msg = f"Render pipeline for job {app_job_id} exceeded timeout of {_JOB_TIMEOUT_SECONDS}s"
                 logger.error(
@@ -1068,8 +1271,29 @@ def render_loop_worker(job_id: str, loop_id: int, params: Dict) -> None:
 
             update_job_status(db, app_job_id, "processing", progress=90.0, progress_message="Uploading")
             failure_stage = "storage"
-            s3_key, content_type = _upload_render_output(app_job_id, filename, output_path)
+            with render_timing.span("upload", "upload", cached=cached_render is not None):
+                if cached_render is not None:
+                    s3_key, content_type = cached_render.output_s3_key, cached_render.content_type
+                    logger.info("Reusing cached render output: %s", s3_key)
+                elif output_stream is not None:
+                    s3_key = output_stream.close()
+                    content_type = output_stream.content_type
+                    logger.info(f"Uploaded render to S3 (streamed): {s3_key}")
+                elif _preview:
+                    filename = f"preview{render_result['output_extension']}"
+                    s3_key, content_type = _upload_render_output(
+                        app_job_id, filename, output_path, content_type=render_result["output_content_type"]
+                    )
+                else:
+                    s3_key, content_type = _upload_render_output(app_job_id, filename, output_path, key=output_key)
             failure_stage = None
+            if output_key is not None:
+                get_render_result_cache().put(
+                    render_fingerprint,
+                    output_s3_key=s3_key,
+                    content_type=content_type,
+                    render_result=render_result,
+                )
             output_files = [
                 OutputFile(
                     name="Render Plan Arrangement",
@@ -1086,7 +1310,7 @@ def render_loop_worker(job_id: str, loop_id: int, params: Dict) -> None:
                     _arr_output_url = storage.create_presigned_get_url(
                         key=s3_key,
                         expires_seconds=3600,
-                        download_filename=f"arrangement_{app_job_id}.wav",
+                        download_filename=f"arrangement_{app_job_id}{Path(filename).suffix}",
                     )
                 except Exception as _url_err:
                     logger.warning(
@@ -1152,15 +1376,20 @@ def render_loop_worker(job_id: str, loop_id: int, params: Dict) -> None:
                 _producer_fields = _extract_producer_fields_from_plan(
                     parsed_plan, timeline_json
                 )
-                if arrangement and not _is_variation_job:
+                # A preview row stays "processing" until its full job finishes it.
+                if _preview:
+                    _arr_status, _arr_progress, _arr_message = "processing", 50.0, "Preview ready — rendering full quality"
+                else:
+                    _arr_status, _arr_progress, _arr_message = "done", 100.0, "Render complete"
+                if arrangement and (not _is_variation_job or _preview_arrangement_id):
                     from app.models.arrangement import Arrangement
-                    arrangement.status = "done"
+                    arrangement.status = _arr_status
                     arrangement.output_s3_key = s3_key
                     arrangement.output_url = _arr_output_url
                     arrangement.arrangement_json = timeline_json
                     arrangement.render_plan_json = _final_render_plan_json
-                    arrangement.progress = 100.0
-                    arrangement.progress_message = "Render complete"
+                    arrangement.progress = _arr_progress
+                    arrangement.progress_message = _arr_message
                     arrangement.error_message = None
                     arrangement.is_saved = True
                     arrangement.saved_at = datetime.utcnow()
@@ -1174,14 +1403,14 @@ def render_loop_worker(job_id: str, loop_id: int, params: Dict) -> None:
                     from app.models.arrangement import Arrangement
                     _new_arr = Arrangement(
                         loop_id=loop_id,
-                        status="done",
+                        status=_arr_status,
                         target_seconds=_target_seconds,
                         output_s3_key=s3_key,
                         output_url=_arr_output_url,
                         arrangement_json=timeline_json,
                         render_plan_json=_final_render_plan_json,
-                        progress=100.0,
-                        progress_message="Render complete",
+                        progress=_arr_progress,
+                        progress_message=_arr_message,
                         is_saved=True,
                         saved_at=datetime.utcnow(),
                         producer_plan_json=_producer_fields["producer_plan_json"],
@@ -1257,7 +1486,21 @@ def render_loop_worker(job_id: str, loop_id: int, params: Dict) -> None:
                 observability=render_obs_from_executor,
                 mastering_info=(postprocess or {}).get("mastering"),
                 feature_flags_snapshot=feature_flags,
+                profile=render_timing.snapshot(),
             )
+            _direct_render_metadata["render_cache"] = {
+                "fingerprint": render_fingerprint,
+                "hit": cached_render is not None,
+            }
+            if _preview:
+                _direct_render_metadata["preview"] = _queue_full_render(
+                    db, app_job_id, loop_id, params, _arr_record_id, render_result, content_type
+                )
+            elif isinstance(params, dict) and params.get("preview_job_id"):
+                _direct_render_metadata["preview"] = {
+                    "preview_job_id": params["preview_job_id"],
+                    "plan_reused": bool(_planned_arrangement),
+                }
 
             # Mark as succeeded
             update_job_status(
@@ -1355,9 +1598,12 @@ def render_loop_worker(job_id: str, loop_id: int, params: Dict) -> None:
                         source_quality_mode_used=_failure_source_quality_mode,
                         observability=_failure_observability,
                         feature_flags_snapshot=feature_flags,
+                        profile=render_timing.snapshot(),
                     ),
                 )
                 logger.info("VARIATION_JOB_STATUS_PERSISTED job_id=%s status=%s", app_job_id, _fail_status)
+                if isinstance(params, dict) and params.get("preview_arrangement_id"):
+                    _fail_preview_arrangement(db, params["preview_arrangement_id"], _err_str)
                 logger.error(
                     "JOB_FAILURE_METADATA job_id=%s job_terminal_state=%s failure_stage=%s worker_mode=%s",
                     app_job_id,
@@ -1369,4 +1615,7 @@ def render_loop_worker(job_id: str, loop_id: int, params: Dict) -> None:
             logger.error(f"Failed to update job status: {db_err}")
     
     finally:
+        if output_stream is not None:
+            output_stream.abort()
         db.close()
+        render_timing.end_profile(profile_token)
@@ -0,0 +1,166 @@
+"""Weighted queue order and per-loop fair share for RQ workers.
+
+The worker's queue order is redrawn after every job as a weighted random
+permutation, so each queue with work is served first with probability
+``weight / sum(weights)``.  Fair share caps concurrent jobs per
+``fair_share_key`` through a Redis sorted set of start times.
+"""
+
+from __future__ import annotations
+
+import logging
+import random
+import time
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, TypeVar
+
+from rq import SimpleWorker
+
+from app.queue import FAIR_SHARE_META_KEY
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Deferred jobs are re-queued at the tail; when every queued job is capped the
+# worker would spin on pop/push, so it sleeps a little longer on each deferral
+# in a row.
+_DEFER_BACKOFF_STEP_SECONDS = 0.05
+_DEFER_BACKOFF_MAX_SECONDS = 1.0
+_DEFAULT_LEASE_SECONDS = 3600.0
+
+
+def weighted_order(items: Iterable[Tuple[T, float]], rng: Optional[random.Random] = None) -> List[T]:
+    """Weighted random permutation of ``(item, weight)`` pairs; zero weights go last in input order."""
+    rng = rng or random
+    weighted: List[Tuple[float, T]] = []
+    unweighted: List[T] = []
+    for item, weight in items:
+        if weight > 0:
+            weighted.append((rng.random() ** (1.0 / weight), item))
+        else:
+            unweighted.append(item)
+    weighted.sort(key=lambda pair: pair[0], reverse=True)
+    return [item for _, item in weighted] + unweighted
+
+
+class FairShare:
+    """Caps concurrently running jobs per fair-share key, shared by all workers through Redis."""
+
+    KEY_PREFIX = "rq:fair-share:"
+
+    def __init__(self, connection, max_active: int) -> None:
+        self.connection = connection
+        self.max_active = max_active
+
+    def acquire(self, key: str, job_id: str, lease_seconds: Optional[float] = None) -> bool:
+        """Register *job_id* as running under *key*; False (and nothing registered) when over the cap."""
+        lease = float(lease_seconds or _DEFAULT_LEASE_SECONDS)
+        redis_key = self.KEY_PREFIX + key
+        now = time.time()
+        pipe = self.connection.pipeline()
+        pipe.zremrangebyscore(redis_key, "-inf", now - lease)
+        pipe.zadd(redis_key, {job_id: now})
+        pipe.zcard(redis_key)
+        pipe.expire(redis_key, int(lease) + 60)
+        active = pipe.execute()[2]
+        if active > self.max_active:
+            self.connection.zrem(redis_key, job_id)
+            return False
+        return True
+
+    def release(self, key: str, job_id: str) -> None:
+        self.connection.zrem(self.KEY_PREFIX + key, job_id)
+
+    def active(self, key: str) -> int:
+        return int(self.connection.zcard(self.KEY_PREFIX + key))
+
+
+def fair_share_for(connection) -> Optional[FairShare]:
+    """The configured limiter, or None when QUEUE_FAIR_SHARE_MAX_ACTIVE is 0 or routing is off."""
+    from app.config import settings
+
+    if not settings.queue_routing_enabled or settings.queue_fair_share_max_active <= 0:
+        return None
+    return FairShare(connection, settings.queue_fair_share_max_active)
+
+
+class SchedulingWorker(SimpleWorker):
+    """SimpleWorker with weighted queue order and per-loop fair share.
+
+    Deferred jobs still count towards ``work(max_jobs=...)``; they take no
+    time, so recycling happens slightly earlier under heavy contention.
+    """
+
+    def __init__(
+        self,
+        queues,
+        *args,
+        weights: Optional[Dict[str, int]] = None,
+        fair_share: Optional[FairShare] = None,
+        rng: Optional[random.Random] = None,
+        **kwargs,
+    ) -> None:
+        super().__init__(queues, *args, **kwargs)
+        if weights is None:
+            from app.queue import queue_weights
+
+            weights = queue_weights()
+        self.queue_weights = weights
+        self.fair_share = fair_share
+        self._rng = rng or random.Random()
+        self._deferred_in_a_row = 0
+        self.deferred_jobs = 0
+        self.reorder_queues(reference_queue=None)
+
+    def reorder_queues(self, reference_queue) -> None:
+        self._ordered_queues = weighted_order(
+            ((queue, self.queue_weights.get(queue.name, 1)) for queue in self.queues), self._rng
+        )
+
+    def execute_job(self, job, queue):
+        key = (job.meta or {}).get(FAIR_SHARE_META_KEY) if self.fair_share is not None else None
+        if key:
+            from app.workers.supervisor import hard_timeout_seconds
+
+            if not self.fair_share.acquire(key, job.id, hard_timeout_seconds(job)):
+                self._defer(job, queue, key)
+                return None
+        self._deferred_in_a_row = 0
+        try:
+            return super().execute_job(job, queue)
+        finally:
+            if key:
+                try:
+                    self.fair_share.release(key, job.id)
+                except Exception:
+                    logger.warning("Could not release fair-share slot: key=%s job_id=%s", key, job.id, exc_info=True)
+
+    def _defer(self, job, queue, key: str) -> None:
+        try:
+            from rq.intermediate_queue import IntermediateQueue
+        except ImportError:  # RQ 1.x dequeues with BLPOP: no intermediate list
+            IntermediateQueue = None
+
+        if IntermediateQueue is not None:
+            # A single-queue worker dequeues through the intermediate list (LMOVE);
+            # drop it there so the job is not picked up twice by cleanup.
+            IntermediateQueue(queue.key, self.connection).remove(job.id)
+        queue.push_job_id(job.id)
+        self.deferred_jobs += 1
+        self._deferred_in_a_row += 1
+        logger.info(
+            "QUEUE_FAIR_SHARE_DEFERRED job_id=%s queue=%s key=%s limit=%s",
+            job.id,
+            queue.name,
+            key,
+            self.fair_share.max_active,
+        )
+        time.sleep(min(_DEFER_BACKOFF_STEP_SECONDS * self._deferred_in_a_row, _DEFER_BACKOFF_MAX_SECONDS))
+
+
+def build_worker(connection, queue_names: Sequence[str], worker_class=SchedulingWorker, **kwargs):
+    """A *worker_class* listening on *queue_names* with the configured weights and fair share."""
+    from app.queue import get_queue
+
+    queues = [get_queue(connection, name=name) for name in queue_names]
+    return worker_class(queues, connection=connection, fair_share=fair_share_for(connection), **kwargs)
@@ -0,0 +1,390 @@
+"""Prefork worker supervisor.
+
+:class:`WorkerSupervisor` imports the heavy modules once, forks
+``WORKER_PROCESSES`` RQ workers, recycles them after ``WORKER_MAX_JOBS`` jobs or
+past ``WORKER_MAX_RSS_MB``, and SIGKILLs and replaces a child whose job
+overruns.  Requires ``fork`` (Linux/macOS).
+"""
+
+from __future__ import annotations
+
+import importlib
+import logging
+import multiprocessing
+import os
+import signal
+import time
+from typing import Any, Callable, Optional
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Imported once in the supervisor before forking.
+WARM_IMPORTS = (
+    "numpy",
+    "scipy.signal",
+    "pydub",
+    "librosa",
+    "librosa.core",
+    "librosa.beat",
+    "librosa.feature",
+    "librosa.onset",
+    "librosa.effects",
+    "app.services.arrangement_jobs",
+    "app.services.audio_features",
+    "app.services.decision_engine",
+    "app.services.drop_engine",
+    "app.services.motif_engine",
+    "app.services.timeline_engine",
+    "app.services.pattern_variation_engine",
+    "app.services.groove_engine",
+    "app.services.producer_intelligence",
+    "app.services.generative_producer_system",
+    "app.services.arranger_v2",
+    "app.services.style_intelligence",
+    "app.workers.render_worker",
+    "app.workers.ingest_worker",
+    "app.workers.export_worker",
+    "app.workers.backfill_analysis",
+)
+
+_RENDER_JOB_FUNC = "app.workers.render_worker.render_loop_worker"
+_JOB_ID_BYTES = 64
+
+# True in a supervised child: the supervisor enforces job timeouts by killing
+# the process, so render_worker runs jobs without its thread timeout wrapper.
+_supervised = False
+
+
+def is_supervised() -> bool:
+    return _supervised
+
+
+def fork_available() -> bool:
+    return "fork" in multiprocessing.get_all_start_methods()
+
+
+def warm_imports(modules: tuple[str, ...] = WARM_IMPORTS) -> list[str]:
+    """Import *modules*; return the names that failed (logged, not raised)."""
+    failed = []
+    started = time.perf_counter()
+    for name in modules:
+        try:
+            importlib.import_module(name)
+        except Exception as e:
+            logger.warning("Warm import of %s failed: %s", name, e)
+            failed.append(name)
+    logger.info(
+        "WORKER_WARM_IMPORTS modules=%d failed=%d elapsed_s=%.2f",
+        len(modules),
+        len(failed),
+        time.perf_counter() - started,
+    )
+    return failed
+
+
+def current_rss_mb() -> float:
+    """Resident set size of this process in MB (peak RSS where /proc is unavailable)."""
+    try:
+        with open("/proc/self/statm") as handle:
+            resident_pages = int(handle.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        import resource
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is in KB on Linux, bytes on macOS.
+        return peak / (1024 * 1024) if peak > 1 << 32 else peak / 1024
+
+
+def hard_timeout_seconds(job: Any) -> Optional[float]:
+    """Wall-clock budget for *job*, or None when it may run indefinitely.
+
+    Render jobs get RENDER_JOB_TIMEOUT_SECONDS (they are enqueued with
+    ``job_timeout=-1`` because the timeout is enforced here, not by RQ); other
+    jobs get their RQ timeout when one is set.
+    """
+    if getattr(job, "func_name", None) == _RENDER_JOB_FUNC:
+        from app.workers.render_worker import _JOB_TIMEOUT_SECONDS
+
+        return float(_JOB_TIMEOUT_SECONDS)
+    timeout = getattr(job, "timeout", None)
+    return float(timeout) if isinstance(timeout, (int, float)) and timeout > 0 else None
+
+
+class JobSlot:
+    """The job a child is running and its deadline, shared with the supervisor."""
+
+    def __init__(self, ctx: multiprocessing.context.BaseContext) -> None:
+        self._job_id = ctx.Array("c", _JOB_ID_BYTES)
+        self._started = ctx.Value("d", 0.0)
+        self._deadline = ctx.Value("d", 0.0)
+
+    def begin(self, job_id: str, timeout_seconds: Optional[float]) -> None:
+        now = time.time()
+        with self._deadline.get_lock():
+            self._job_id.value = job_id.encode()[:_JOB_ID_BYTES]
+            self._started.value = now
+            self._deadline.value = now + timeout_seconds if timeout_seconds else 0.0
+
+    def end(self) -> None:
+        with self._deadline.get_lock():
+            self._job_id.value = b""
+            self._started.value = 0.0
+            self._deadline.value = 0.0
+
+    def current(self) -> tuple[Optional[str], float, float]:
+        """``(job_id, started, deadline)``; job_id is None when idle, deadline 0 when unbounded."""
+        with self._deadline.get_lock():
+            job_id = self._job_id.value.decode() or None
+            return job_id, self._started.value, self._deadline.value
+
+    def overdue(self, now: Optional[float] = None) -> Optional[str]:
+        job_id, _, deadline = self.current()
+        if job_id and deadline and (now if now is not None else time.time()) > deadline:
+            return job_id
+        return None
+
+
+def _make_worker_class():
+    from app.workers.scheduling import SchedulingWorker
+
+    class SupervisedWorker(SchedulingWorker):
+        """SchedulingWorker that reports its job to a :class:`JobSlot` and stops past the RSS ceiling."""
+
+        def __init__(self, *args: Any, slot: JobSlot, max_rss_mb: int = 0, **kwargs: Any) -> None:
+            super().__init__(*args, **kwargs)
+            self.slot = slot
+            self.max_rss_mb = max_rss_mb
+
+        def execute_job(self, job, queue):
+            self.slot.begin(job.id, hard_timeout_seconds(job))
+            try:
+                return super().execute_job(job, queue)
+            finally:
+                self.slot.end()
+                rss = current_rss_mb()
+                if self.max_rss_mb and rss > self.max_rss_mb:
+                    logger.info("WORKER_RECYCLE pid=%s reason=rss rss_mb=%.0f limit_mb=%s", os.getpid(), rss, self.max_rss_mb)
+                    self._stop_requested = True
+
+    return SupervisedWorker
+
+
+def _child_main(slot: JobSlot, max_jobs: int, max_rss_mb: int) -> None:
+    """Body of a forked worker process."""
+    global _supervised
+    _supervised = True
+    # The supervisor handles SIGINT (Ctrl+C reaches the whole process group).
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    from app.queue import WORKER_QUEUE_NAMES, get_redis_conn
+    from app.workers.scheduling import build_worker
+
+    worker = build_worker(
+        get_redis_conn(),
+        WORKER_QUEUE_NAMES,
+        worker_class=_make_worker_class(),
+        slot=slot,
+        max_rss_mb=max_rss_mb,
+        log_job_description=True,
+        default_result_ttl=500,
+    )
+    worker.work(max_jobs=max_jobs or None, with_scheduler=False)
+
+
+def _fail_rq_job(job_id: str, message: str, connection: Any = None) -> None:
+    """Move the RQ job *job_id* from its StartedJobRegistry to its FailedJobRegistry.
+
+    RQ never does this for a SIGKILLed worker's render job: it was enqueued
+    with ``job_timeout=-1``, so the started-registry entry never expires.
+    """
+    from rq.exceptions import NoSuchJobError
+    from rq.job import Job, JobStatus
+    from rq.registry import FailedJobRegistry, StartedJobRegistry
+
+    from app.queue import get_redis_conn
+
+    connection = connection if connection is not None else get_redis_conn()
+    try:
+        job = Job.fetch(job_id, connection=connection)
+    except NoSuchJobError:
+        return
+    with connection.pipeline() as pipeline:
+        StartedJobRegistry(job.origin, connection=connection).remove_executions(job, pipeline=pipeline)
+        job.set_status(JobStatus.FAILED, pipeline=pipeline)
+        FailedJobRegistry(job.origin, connection=connection).add(
+            job, ttl=job.failure_ttl, exc_string=message, pipeline=pipeline
+        )
+        pipeline.execute()
+
+
+def _record_killed_job(job_id: str, elapsed_seconds: float) -> None:
+    """Mark *job_id* failed in RQ and, when it is a RenderJob id, timed out after its worker was killed.
+
+    Its arrangement, or for an ingest job its loop, is marked failed too.
+    """
+    from app.db import SessionLocal, engine
+    from app.models.arrangement import Arrangement
+    from app.models.job import RenderJob
+    from app.models.loop import Loop
+    from app.services.job_service import INGEST_JOB_TYPE, update_job_status
+
+    message = f"Job {job_id} exceeded its timeout after {elapsed_seconds:.0f}s; worker process killed"
+    try:
+        _fail_rq_job(job_id, message)
+    except Exception:
+        logger.exception("Failed to move killed job %s to the failed job registry", job_id)
+    db = SessionLocal()
+    try:
+        job = db.query(RenderJob).filter(RenderJob.id == job_id).first()
+        if job is None:
+            return
+        if job.arrangement_id:
+            arrangement = db.query(Arrangement).filter(Arrangement.id == job.arrangement_id).first()
+            if arrangement is not None and arrangement.status not in ("done", "failed"):
+                arrangement.status = "failed"
+                arrangement.error_message = message
+                arrangement.progress_message = "Worker killed"
+                db.commit()
+        if job.job_type == INGEST_JOB_TYPE:
+            loop = db.query(Loop).filter(Loop.id == job.loop_id).first()
+            if loop is not None and loop.status == "processing":
+                loop.status = "failed"
+                db.commit()
+        update_job_status(db, job_id, "timeout", error_message=message[:500])
+    except Exception:
+        logger.exception("Failed to record killed job %s", job_id)
+    finally:
+        db.close()
+        # Children forked after this must not inherit the parent's connections.
+        engine.dispose()
+
+
+class WorkerSupervisor:
+    """Forks and supervises *processes* worker children (see module docstring)."""
+
+    def __init__(
+        self,
+        processes: int,
+        *,
+        max_jobs: int = 0,
+        max_rss_mb: int = 0,
+        poll_interval: float = 1.0,
+        target: Callable[..., None] = _child_main,
+        record_killed_job: Callable[[str, float], None] = _record_killed_job,
+    ) -> None:
+        self.processes = max(1, processes)
+        self.max_jobs = max_jobs
+        self.max_rss_mb = max_rss_mb
+        self.poll_interval = poll_interval
+        self._target = target
+        self._record_killed_job = record_killed_job
+        self._ctx = multiprocessing.get_context("fork")
+        self._children: list[Optional[multiprocessing.process.BaseProcess]] = [None] * self.processes
+        self._slots = [JobSlot(self._ctx) for _ in range(self.processes)]
+        self._stopping = False
+        self.restarts = 0
+        self.kills = 0
+
+    def prepare(self) -> None:
+        """Warm imports and close inherited connections before the first fork."""
+        from app.db import engine
+        from app.workers.render_worker import _ensure_db_models
+
+        warm_imports()
+        _ensure_db_models()
+        engine.dispose()
+
+    def _spawn(self, index: int) -> None:
+        self._slots[index].end()
+        child = self._ctx.Process(
+            target=self._target,
+            args=(self._slots[index], self.max_jobs, self.max_rss_mb),
+            name=f"rq-worker-{index + 1}",
+            daemon=False,
+        )
+        child.start()
+        self._children[index] = child
+        logger.info("WORKER_FORKED slot=%d pid=%s", index + 1, child.pid)
+
+    def start(self) -> None:
+        for index in range(self.processes):
+            self._spawn(index)
+
+    def check_once(self, now: Optional[float] = None) -> None:
+        """Kill overdue children and replace exited ones."""
+        for index, child in enumerate(self._children):
+            slot = self._slots[index]
+            overdue_job = slot.overdue(now)
+            if child is not None and child.is_alive() and overdue_job:
+                _, started, _ = slot.current()
+                elapsed = (now if now is not None else time.time()) - started
+                logger.error(
+                    "WORKER_HARD_TIMEOUT slot=%d pid=%s job_id=%s elapsed_s=%.0f; killing",
+                    index + 1,
+                    child.pid,
+                    overdue_job,
+                    elapsed,
+                )
+                child.kill()
+                child.join()
+                self.kills += 1
+                self._record_killed_job(overdue_job, elapsed)
+            if child is not None and not child.is_alive():
+                child.join()
+                logger.info("WORKER_EXITED slot=%d pid=%s exitcode=%s", index + 1, child.pid, child.exitcode)
+                self._children[index] = None
+                if not self._stopping:
+                    self.restarts += 1
+                    self._spawn(index)
+
+    def alive_count(self) -> int:
+        return sum(1 for child in self._children if child is not None and child.is_alive())
+
+    def stop(self, timeout: float = 30.0) -> None:
+        """Warm shutdown: SIGTERM lets each child finish its job; stragglers are killed."""
+        self._stopping = True
+        children = [child for child in self._children if child is not None and child.is_alive()]
+        for child in children:
+            child.terminate()
+        deadline = time.monotonic() + timeout
+        for child in children:
+            child.join(max(0.0, deadline - time.monotonic()))
+            if child.is_alive():
+                child.kill()
+                child.join()
+
+    def run(self) -> None:
+        """Fork the children and supervise them until SIGTERM/SIGINT."""
+
+        def _request_stop(signum, frame):
+            logger.info("Supervisor received signal %s; stopping workers", signum)
+            self._stopping = True
+
+        signal.signal(signal.SIGTERM, _request_stop)
+        signal.signal(signal.SIGINT, _request_stop)
+        self.prepare()
+        self.start()
+        logger.info(
+            "WORKER_SUPERVISOR_STARTED processes=%d max_jobs=%s max_rss_mb=%s",
+            self.processes,
+            self.max_jobs or "unlimited",
+            self.max_rss_mb or "unlimited",
+        )
+        try:
+            while not self._stopping:
+                self.check_once()
+                time.sleep(self.poll_interval)
+        finally:
+            self.stop()
+            logger.info("WORKER_SUPERVISOR_STOPPED restarts=%d kills=%d", self.restarts, self.kills)
+
+
+def run_supervisor() -> None:
+    WorkerSupervisor(
+        settings.worker_processes,
+        max_jobs=settings.worker_max_jobs,
+        max_rss_mb=settings.worker_max_rss_mb,
+    ).run()
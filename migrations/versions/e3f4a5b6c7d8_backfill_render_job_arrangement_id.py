@@ -0,0 +1,66 @@
+"""Backfill render_jobs.arrangement_id and index latest job per arrangement
+
+GET /arrangements/{id} found its render job with a LIKE scan over
+params_json.  Jobs now record arrangement_id when they are enqueued; this
+migration copies it out of params_json for historical rows and adds a
+(arrangement_id, created_at) index for the "latest job" lookup.
+
+Revision ID: e3f4a5b6c7d8
+Revises: d2e3f4a5b6c7
+Create Date: 2026-10-17
+"""
+import json
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "e3f4a5b6c7d8"
+down_revision: Union[str, Sequence[str], None] = "d2e3f4a5b6c7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_BATCH_SIZE = 1000
+
+
+def _backfill_arrangement_ids() -> None:
+    bind = op.get_bind()
+    existing = {row[0] for row in bind.execute(sa.text("SELECT id FROM arrangements"))}
+    rows = bind.execute(
+        sa.text(
+            """
+            SELECT id, params_json FROM render_jobs
+            WHERE arrangement_id IS NULL AND params_json LIKE '%arrangement_id%'
+            """
+        )
+    ).fetchall()
+
+    updates = []
+    for job_id, params_json in rows:
+        try:
+            arrangement_id = int(json.loads(params_json or "{}").get("arrangement_id"))
+        except (TypeError, ValueError, AttributeError):
+            continue
+        # Skip links to deleted arrangements (foreign key).
+        if arrangement_id in existing:
+            updates.append({"job_id": job_id, "arrangement_id": arrangement_id})
+
+    statement = sa.text("UPDATE render_jobs SET arrangement_id = :arrangement_id WHERE id = :job_id")
+    for start in range(0, len(updates), _BATCH_SIZE):
+        bind.execute(statement, updates[start : start + _BATCH_SIZE])
+
+
+def upgrade() -> None:
+    _backfill_arrangement_ids()
+    op.create_index(
+        "ix_render_jobs_arrangement_created",
+        "render_jobs",
+        ["arrangement_id", "created_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_render_jobs_arrangement_created", table_name="render_jobs")
+    # Backfilled arrangement_id values are left in place; they match params_json.
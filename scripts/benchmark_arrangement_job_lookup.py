@@ -0,0 +1,133 @@
+"""Benchmark the arrangement -> latest render job lookup used by status polls.
+
+Seeds a temporary SQLite database with --jobs render jobs spread over
+--arrangements arrangements, then times the old params_json LIKE scan and the
+indexed ``job_service.get_latest_job_for_arrangement`` lookup, for
+arrangements with and without jobs, and counts the polls where the two
+disagree.
+
+Usage:
+    python scripts/benchmark_arrangement_job_lookup.py [--jobs 100000] [--arrangements 5000] [--polls 200]
+"""
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.models import arrangement as _arrangement  # noqa: E402,F401
+from app.models.base import Base  # noqa: E402
+from app.models.job import RenderJob  # noqa: E402
+from app.models.loop import Loop  # noqa: E402
+from app.services.job_service import get_latest_job_for_arrangement  # noqa: E402
+
+
+def _like_lookup(db, arrangement_id: int):
+    """The lookup GET /arrangements/{id} used before arrangement_id was indexed."""
+    return (
+        db.query(RenderJob)
+        .filter(RenderJob.params_json.like(f'%"arrangement_id": {arrangement_id}%'))
+        .order_by(RenderJob.created_at.desc())
+        .first()
+    )
+
+
+def _seed(session_factory, job_count: int, arrangement_count: int) -> None:
+    from app.models.arrangement import Arrangement
+
+    db = session_factory()
+    db.add(Loop(id=1, name="benchmark", file_key="uploads/benchmark.wav"))
+    db.flush()
+    db.execute(
+        insert(Arrangement),
+        [{"id": idx, "loop_id": 1, "status": "done", "target_seconds": 60} for idx in range(1, arrangement_count + 1)],
+    )
+    start = datetime.utcnow() - timedelta(days=30)
+    rows = []
+    for idx in range(job_count):
+        arrangement_id = random.randint(1, arrangement_count)
+        rows.append({
+            "id": str(uuid.uuid4()),
+            "loop_id": 1,
+            "job_type": "render_arrangement",
+            "status": "succeeded",
+            "progress": 100.0,
+            "retry_count": 0,
+            "params_json": json.dumps({"length_seconds": 60, "arrangement_id": arrangement_id}),
+            "arrangement_id": arrangement_id,
+            "created_at": start + timedelta(seconds=idx),
+        })
+    db.execute(insert(RenderJob), rows)
+    db.commit()
+    db.close()
+
+
+def _time(lookup, session_factory, arrangement_ids) -> tuple[list[float], list]:
+    db = session_factory()
+    timings, results = [], []
+    for arrangement_id in arrangement_ids:
+        started = time.perf_counter()
+        job = lookup(db, arrangement_id)
+        timings.append((time.perf_counter() - started) * 1000)
+        results.append(job.id if job else None)
+        db.expunge_all()
+    db.close()
+    return timings, results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=100_000)
+    parser.add_argument("--arrangements", type=int, default=5_000)
+    parser.add_argument("--polls", type=int, default=200, help="lookups timed per strategy")
+    args = parser.parse_args()
+
+    random.seed(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{tmp}/jobs.sqlite")
+        Base.metadata.create_all(bind=engine)
+        session_factory = sessionmaker(bind=engine)
+
+        started = time.perf_counter()
+        _seed(session_factory, args.jobs, args.arrangements)
+        print(f"seeded {args.jobs} jobs over {args.arrangements} arrangements in {time.perf_counter() - started:.1f}s")
+
+        arrangement_ids = [random.randint(1, args.arrangements) for _ in range(args.polls)]
+        like_ms, like_jobs = _time(_like_lookup, session_factory, arrangement_ids)
+        indexed_ms, indexed_jobs = _time(get_latest_job_for_arrangement, session_factory, arrangement_ids)
+        # Arrangements without any job (e.g. created before enqueueing): the
+        # LIKE scan has to read every row before giving up.
+        unlinked_ids = [args.arrangements + 1 + idx for idx in range(max(1, args.polls // 10))]
+        like_unlinked_ms, _ = _time(_like_lookup, session_factory, unlinked_ids)
+        indexed_unlinked_ms, _ = _time(get_latest_job_for_arrangement, session_factory, unlinked_ids)
+        engine.dispose()
+
+    print(f"{'case':>10} {'lookup':>8} {'p50_ms':>8} {'p95_ms':>8}")
+    for case, name, timings in (
+        ("linked", "like", like_ms),
+        ("linked", "indexed", indexed_ms),
+        ("unlinked", "like", like_unlinked_ms),
+        ("unlinked", "indexed", indexed_unlinked_ms),
+    ):
+        p95 = statistics.quantiles(timings, n=20)[-1] if len(timings) > 1 else timings[0]
+        print(f"{case:>10} {name:>8} {statistics.median(timings):>8.3f} {p95:>8.3f}")
+    # Prefix LIKE matches ("arrangement_id": 1 also matches 12, 123, ...) are
+    # one reason the old lookup could pick the wrong job.
+    mismatches = sum(1 for a, b in zip(like_jobs, indexed_jobs) if a != b)
+    print(f"lookups where LIKE returned a different job: {mismatches}/{len(arrangement_ids)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,108 @@
+"""Benchmark serial vs process-pool section rendering.
+
+Renders a synthetic four-stem ProducerArrangement with an increasing number of
+sections, once serially and once with RENDER_PARALLEL_SECTIONS enabled, and
+prints wall-clock time per run.  Also checks that both renders are
+byte-identical.
+
+Usage:
+    python scripts/benchmark_parallel_render.py [--sections 2 4 8 16] [--workers 0] [--repeat 1]
+"""
+
+import argparse
+import copy
+import logging
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+from pydub import AudioSegment
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.config import settings  # noqa: E402
+from app.services.arrangement_jobs import _render_producer_arrangement  # noqa: E402
+from app.services.section_render_pool import resolve_worker_count  # noqa: E402
+
+SECTION_CYCLE = [("Verse", "verse"), ("Pre-Hook", "pre_hook"), ("Hook", "hook"), ("Bridge", "bridge")]
+BPM = 120.0
+
+
+def _tone(freq_hz: float, duration_ms: int, amplitude: float = 0.4) -> AudioSegment:
+    t = np.arange(int(44100 * duration_ms / 1000)) / 44100
+    mono = (np.sin(2 * np.pi * freq_hz * t) * amplitude * 32767).astype(np.int16)
+    return AudioSegment(np.repeat(mono, 2).tobytes(), frame_rate=44100, sample_width=2, channels=2)
+
+
+def _plan(section_count: int, bars_per_section: int = 8) -> dict:
+    sections = []
+    for idx in range(section_count):
+        name, kind = SECTION_CYCLE[idx % len(SECTION_CYCLE)]
+        sections.append({
+            "name": f"{name} {idx + 1}",
+            "type": kind,
+            "bar_start": idx * bars_per_section,
+            "bars": bars_per_section,
+            "energy": 0.8,
+            "instruments": ["drums", "bass", "melody", "pads"],
+        })
+    return {
+        "sections": sections,
+        "tracks": [],
+        "transitions": [],
+        "total_bars": section_count * bars_per_section,
+    }
+
+
+def _time_render(parallel: bool, plan: dict, stems: dict, loop_audio: AudioSegment) -> tuple[float, bytes]:
+    settings.render_parallel_sections = parallel
+    start = time.perf_counter()
+    audio, _ = _render_producer_arrangement(
+        loop_audio=loop_audio,
+        producer_arrangement=copy.deepcopy(plan),
+        bpm=BPM,
+        stems=stems,
+    )
+    return time.perf_counter() - start, audio.raw_data
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sections", type=int, nargs="+", default=[2, 4, 8, 16])
+    parser.add_argument("--workers", type=int, default=0, help="pool size (0 = CPU count)")
+    parser.add_argument("--repeat", type=int, default=1, help="runs per point; the best time is reported")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    settings.render_parallel_workers = args.workers
+
+    stems = {
+        "drums": _tone(110.0, 8000),
+        "bass": _tone(55.0, 8000),
+        "melody": _tone(440.0, 8000, amplitude=0.2),
+        "pads": _tone(330.0, 8000, amplitude=0.2),
+    }
+    loop_audio = _tone(220.0, 16000)
+
+    print(f"{'sections':>8} {'workers':>7} {'serial_s':>9} {'parallel_s':>10} {'speedup':>7} identical")
+    for count in args.sections:
+        plan = _plan(count)
+        serial = parallel = float("inf")
+        identical = True
+        for _ in range(max(1, args.repeat)):
+            serial_s, serial_raw = _time_render(False, plan, stems, loop_audio)
+            parallel_s, parallel_raw = _time_render(True, plan, stems, loop_audio)
+            serial, parallel = min(serial, serial_s), min(parallel, parallel_s)
+            identical = identical and serial_raw == parallel_raw
+        print(
+            f"{count:>8} {resolve_worker_count(count):>7} {serial:>9.2f} {parallel:>10.2f} "
+            f"{serial / parallel:>6.2f}x {'yes' if identical else 'NO'}"
+        )
+        if not identical:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+"""Benchmark stem onset detection: pydub ``detect_nonsilent`` vs the vectorized envelope.
+
+Builds --stems synthetic stereo stems of --seconds each (noise bursts after a
+random lead-in of up to 2 s) and times, per stem, the previous onset step
+(``detect_nonsilent(min_silence_len=20)`` with the same silence threshold) and
+``stem_alignment.analyze_onset``, then the full ``align_stems`` call, which
+also cross-correlates every stem's envelope against the reference.  Prints
+the onset each method found so the results can be compared.
+
+Usage:
+    python scripts/benchmark_stem_alignment.py [--stems 8] [--seconds 180] [--skip-legacy]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+from pydub import AudioSegment
+from pydub.silence import detect_nonsilent
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.stem_alignment import align_stems, analyze_onset  # noqa: E402
+
+FRAME_RATE = 44100
+
+
+def _stem(rng: np.random.Generator, seconds: float) -> AudioSegment:
+    frames = int(FRAME_RATE * seconds)
+    signal = np.zeros(frames, dtype=np.float32)
+    start = int(rng.integers(0, 2 * FRAME_RATE))
+    while start < frames:
+        length = min(int(rng.integers(2000, 8000)), frames - start)
+        signal[start:start + length] = 0.4 * rng.standard_normal(length)
+        start += int(rng.integers(5000, 30000))
+    pcm = (np.repeat(signal[:, None], 2, axis=1) * 32767).astype("<i2")
+    return AudioSegment(data=pcm.tobytes(), sample_width=2, frame_rate=FRAME_RATE, channels=2)
+
+
+def _legacy_offset_ms(audio: AudioSegment) -> int:
+    silence_thresh = max(-60, int(audio.dBFS) - 22)
+    ranges = detect_nonsilent(audio, min_silence_len=20, silence_thresh=silence_thresh)
+    return int(ranges[0][0]) if ranges else 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--stems", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=180.0)
+    parser.add_argument("--skip-legacy", action="store_true", help="only time the vectorized path")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    stems = [(f"stem_{idx}.wav", _stem(rng, args.seconds)) for idx in range(args.stems)]
+    print(f"{args.stems} stems x {args.seconds:.0f}s, {FRAME_RATE} Hz stereo")
+    print(f"{'stem':>10} {'legacy_ms':>10} {'legacy_s':>9} {'onset_ms':>9} {'onset_frame':>12} {'vector_s':>9}")
+
+    legacy_total = vector_total = 0.0
+    for name, audio in stems:
+        legacy_ms, legacy_s = "-", 0.0
+        if not args.skip_legacy:
+            started = time.perf_counter()
+            legacy_ms = _legacy_offset_ms(audio)
+            legacy_s = time.perf_counter() - started
+        started = time.perf_counter()
+        onset = analyze_onset(audio)
+        vector_s = time.perf_counter() - started
+        legacy_total += legacy_s
+        vector_total += vector_s
+        print(f"{name:>10} {legacy_ms:>10} {legacy_s:>9.3f} {onset.offset_ms:>9} {onset.frame:>12} {vector_s:>9.3f}")
+
+    started = time.perf_counter()
+    result = align_stems(stems)
+    align_s = time.perf_counter() - started
+    if not args.skip_legacy:
+        print(f"onset detection total: legacy {legacy_total:.2f}s, vectorized {vector_total:.2f}s "
+              f"({legacy_total / vector_total:.0f}x)")
+    else:
+        print(f"onset detection total: vectorized {vector_total:.2f}s")
+    print(f"align_stems (onsets + correlation + trim/pad): {align_s:.2f}s, lags_ms={result.correlation_lags_ms}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
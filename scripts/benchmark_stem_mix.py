@@ -0,0 +1,110 @@
+"""Benchmark the pairwise pydub stem mix vs the vectorized mix kernel.
+
+Mixes synthetic 4- and 8-stem packs into sections of increasing length with
+``StemRenderExecutor._mix_stems_pairwise`` (DSP_BACKEND=pydub) and
+``StemRenderExecutor._mix_stems_vectorized`` (DSP_BACKEND=numpy) and prints the
+best wall-clock time per section for each.
+
+Usage:
+    python scripts/benchmark_stem_mix.py [--stems 4 8] [--bars 4 8 16] [--repeat 3]
+"""
+
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+from pydub import AudioSegment
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.stem_arrangement_engine import SectionConfig, StemRole, StemState  # noqa: E402
+from app.services.stem_render_executor import StemRenderExecutor  # noqa: E402
+
+ROLES = [
+    StemRole.DRUMS,
+    StemRole.BASS,
+    StemRole.MELODY,
+    StemRole.HARMONY,
+    StemRole.PADS,
+    StemRole.FX,
+    StemRole.PERCUSSION,
+    StemRole.VOCALS,
+]
+BPM = 120
+
+
+def _tone(freq_hz: float, duration_ms: int, amplitude: float = 0.3) -> AudioSegment:
+    t = np.arange(int(44100 * duration_ms / 1000)) / 44100
+    mono = (np.sin(2 * np.pi * freq_hz * t) * amplitude * 32767).astype(np.int16)
+    return AudioSegment(np.repeat(mono, 2).tobytes(), frame_rate=44100, sample_width=2, channels=2)
+
+
+def _executor(stem_count: int) -> StemRenderExecutor:
+    executor = StemRenderExecutor()
+    executor.stems_cache = {role: _tone(55.0 * (idx + 1), 8000) for idx, role in enumerate(ROLES[:stem_count])}
+    return executor
+
+
+def _section(executor: StemRenderExecutor, bars: int) -> SectionConfig:
+    roles = list(executor.stems_cache)
+    states = {
+        role: StemState(
+            role=role,
+            active=True,
+            gain_db=-1.5 * idx,
+            pan=(-0.3, 0.0, 0.3)[idx % 3],
+            filter_cutoff=4000.0 if idx % 2 else None,
+        )
+        for idx, role in enumerate(roles)
+    }
+    return SectionConfig(
+        name="Hook",
+        section_type="hook",
+        bar_start=0,
+        bars=bars,
+        active_stems=set(roles),
+        energy_level=0.8,
+        producer_moves=[],
+        stem_states=states,
+        bpm=BPM,
+    )
+
+
+def _best(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(max(1, repeat)):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--stems", type=int, nargs="+", default=[4, 8], choices=range(1, len(ROLES) + 1))
+    parser.add_argument("--bars", type=int, nargs="+", default=[4, 8, 16])
+    parser.add_argument("--repeat", type=int, default=3, help="runs per point; the best time is reported")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+
+    print(f"{'stems':>5} {'bars':>5} {'pairwise_ms':>11} {'vector_ms':>9} {'speedup':>7}")
+    for stem_count in args.stems:
+        executor = _executor(stem_count)
+        for bars in args.bars:
+            section = _section(executor, bars)
+            duration_ms = int((60000 * 4) / BPM * bars)
+            pairwise = _best(lambda: executor._mix_stems_pairwise(section, duration_ms), args.repeat)
+            vector = _best(lambda: executor._mix_stems_vectorized(section, duration_ms), args.repeat)
+            print(
+                f"{stem_count:>5} {bars:>5} {pairwise * 1000:>11.1f} {vector * 1000:>9.1f} "
+                f"{pairwise / vector:>6.2f}x"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,227 @@
+"""Load test: interactive render wait while the batch queue is saturated.
+
+Fills the batch queue with --batch-jobs jobs of --batch-seconds each (all for
+one loop), then submits single interactive renders at --rate per second for
+--duration seconds and reports how long they waited before a worker started
+them, for two policies:
+
+* ``fifo``      every job on one queue (the behaviour before queue routing)
+* ``weighted``  routed queues, weighted dequeue (QUEUE_WEIGHTS) and the
+                per-loop cap (QUEUE_FAIR_SHARE_MAX_ACTIVE)
+
+By default the run is a discrete-event simulation of --workers workers using
+the same queue ordering as app/workers/scheduling.py, so it needs no Redis.
+With --redis-url it enqueues ``time.sleep`` jobs on ``loadtest:*`` queues and
+runs real SchedulingWorker processes against that Redis instead (use a
+scratch database: the load-test queues are emptied first).
+
+Usage:
+    python scripts/loadtest_queue_fairness.py [--workers 4] [--batch-jobs 400] [--rate 0.5] [--duration 120]
+    python scripts/loadtest_queue_fairness.py --redis-url redis://localhost:6379/15 --batch-seconds 2 --duration 30
+"""
+
+import argparse
+import heapq
+import multiprocessing
+import random
+import statistics
+import sys
+import time
+from collections import deque
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.queue import (  # noqa: E402
+    BATCH_RENDER_QUEUE_NAME,
+    INTERACTIVE_QUEUE_NAME,
+    fair_share_meta,
+    queue_weights,
+)
+from app.workers.scheduling import weighted_order  # noqa: E402
+
+_BATCH_LOOP_ID = 0
+
+
+def _arrivals(rate: float, duration: float, rng: random.Random) -> list[float]:
+    times, now = [], 0.0
+    while True:
+        now += rng.expovariate(rate)
+        if now >= duration:
+            return times
+        times.append(now)
+
+
+def simulate(policy: str, args, weights: dict, arrivals: list[float], rng: random.Random) -> tuple[list[float], int]:
+    """Interactive waits (seconds) and batch jobs started before the last interactive job started."""
+    fifo = policy == "fifo"
+    cap = 0 if fifo else args.fair_share
+    queues = {INTERACTIVE_QUEUE_NAME: deque(), BATCH_RENDER_QUEUE_NAME: deque()}
+    batch_queue = INTERACTIVE_QUEUE_NAME if fifo else BATCH_RENDER_QUEUE_NAME
+    for _ in range(args.batch_jobs):
+        queues[batch_queue].append((0.0, "batch", f"loop:{_BATCH_LOOP_ID}"))
+
+    pending = deque(arrivals)
+    active: dict[str, int] = {}
+    running: dict[int, str] = {}
+    # (time, idle, worker): at equal times completions run before idle wake-ups.
+    workers = [(0.0, 0, idx) for idx in range(args.workers)]
+    heapq.heapify(workers)
+    waits: list[float] = []
+    batch_done = 0
+    submitted = 0
+
+    while workers and len(waits) < len(arrivals):
+        now, _, worker = heapq.heappop(workers)
+        key = running.pop(worker, None)
+        if key is not None:
+            active[key] -= 1
+        while pending and pending[0] <= now:
+            submitted += 1
+            queues[INTERACTIVE_QUEUE_NAME].append((pending.popleft(), "interactive", f"loop:{submitted}"))
+
+        names = [INTERACTIVE_QUEUE_NAME] if fifo else weighted_order(
+            ((name, weights.get(name, 1)) for name in queues if queues[name]), rng
+        )
+        job = None
+        for name in names:
+            queue = queues[name]
+            for position, candidate in enumerate(queue):
+                if not cap or active.get(candidate[2], 0) < cap:
+                    job = candidate
+                    del queue[position]
+                    break
+            if job:
+                break
+
+        if job is None:
+            # Idle until the next arrival or until another worker frees a slot.
+            wake = [pending[0]] if pending else []
+            wake += [t for t, _, other in workers if other in running]
+            if wake:
+                heapq.heappush(workers, (max(now, min(wake)), 1, worker))
+            continue
+
+        enqueued_at, kind, key = job
+        active[key] = active.get(key, 0) + 1
+        running[worker] = key
+        if kind == "interactive":
+            waits.append(now - enqueued_at)
+            service = args.interactive_seconds
+        else:
+            batch_done += 1
+            service = args.batch_seconds
+        heapq.heappush(workers, (now + service, 0, worker))
+    return waits, batch_done
+
+
+def _redis_worker(redis_url: str, queue_names: list[str], weights: dict, fair_share: int) -> None:
+    from redis import Redis
+
+    from app.workers.scheduling import FairShare, SchedulingWorker
+    from rq import Queue
+
+    conn = Redis.from_url(redis_url)
+    queues = [Queue(name, connection=conn) for name in queue_names]
+    worker = SchedulingWorker(
+        queues,
+        connection=conn,
+        weights=weights,
+        fair_share=FairShare(conn, fair_share) if fair_share else None,
+    )
+    worker.work(burst=True, with_scheduler=False)
+
+
+def run_redis(policy: str, args, weights: dict, arrivals: list[float]) -> tuple[list[float], int]:
+    from redis import Redis
+    from rq import Queue
+
+    conn = Redis.from_url(args.redis_url)
+    interactive = Queue(f"loadtest:{INTERACTIVE_QUEUE_NAME}", connection=conn)
+    batch = interactive if policy == "fifo" else Queue(f"loadtest:{BATCH_RENDER_QUEUE_NAME}", connection=conn)
+    for queue in {interactive.name: interactive, batch.name: batch}.values():
+        queue.empty()
+    prefixed_weights = {f"loadtest:{name}": weight for name, weight in weights.items()}
+
+    for _ in range(args.batch_jobs):
+        batch.enqueue(time.sleep, args.batch_seconds, job_timeout=-1, meta=fair_share_meta(_BATCH_LOOP_ID))
+
+    queue_names = sorted({interactive.name, batch.name})
+    ctx = multiprocessing.get_context("fork")
+    procs = [
+        ctx.Process(
+            target=_redis_worker,
+            args=(args.redis_url, queue_names, prefixed_weights, 0 if policy == "fifo" else args.fair_share),
+        )
+        for _ in range(args.workers)
+    ]
+    for proc in procs:
+        proc.start()
+
+    started = time.monotonic()
+    jobs = []
+    for idx, offset in enumerate(arrivals):
+        time.sleep(max(0.0, offset - (time.monotonic() - started)))
+        jobs.append(interactive.enqueue(time.sleep, args.interactive_seconds, job_timeout=-1, meta=fair_share_meta(idx + 1)))
+
+    # Interactive results are in once each job has started; stop the batch.
+    while any(job.get_status(refresh=True) in ("queued", "deferred") for job in jobs):
+        time.sleep(0.1)
+    batch_done = args.batch_jobs - batch.count
+    batch.empty()
+    for proc in procs:
+        proc.join()
+
+    waits = []
+    for job in jobs:
+        job.refresh()
+        if job.started_at and job.enqueued_at:
+            waits.append((job.started_at - job.enqueued_at).total_seconds())
+    return waits, batch_done
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--batch-jobs", type=int, default=400)
+    parser.add_argument("--batch-seconds", type=float, default=20.0, help="service time of one batch render")
+    parser.add_argument("--interactive-seconds", type=float, default=10.0, help="service time of one interactive render")
+    parser.add_argument("--rate", type=float, default=0.1, help="interactive renders submitted per second")
+    parser.add_argument("--duration", type=float, default=600.0, help="seconds of interactive submissions")
+    parser.add_argument("--fair-share", type=int, default=None, help="per-loop cap (default: QUEUE_FAIR_SHARE_MAX_ACTIVE)")
+    parser.add_argument("--redis-url", help="run real workers against this Redis instead of simulating")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    from app.config import settings
+
+    if args.fair_share is None:
+        args.fair_share = settings.queue_fair_share_max_active
+    weights = queue_weights()
+    rng = random.Random(args.seed)
+    arrivals = _arrivals(args.rate, args.duration, rng)
+    if not arrivals:
+        print("no interactive jobs in the window; raise --rate or --duration")
+        return 1
+    capacity_seconds = args.batch_jobs * args.batch_seconds / args.workers
+    if capacity_seconds < args.duration:
+        print(f"warning: batch backlog drains after ~{capacity_seconds:.0f}s, before --duration ends")
+
+    mode = "redis" if args.redis_url else "simulated"
+    print(
+        f"{mode}: {args.workers} workers, {args.batch_jobs} batch jobs x {args.batch_seconds}s, "
+        f"{len(arrivals)} interactive x {args.interactive_seconds}s, weights {weights}, fair share {args.fair_share}"
+    )
+    print(f"{'policy':>9} {'p50_wait_s':>11} {'p95_wait_s':>11} {'max_wait_s':>11} {'batch_started':>14}")
+    for policy in ("fifo", "weighted"):
+        if args.redis_url:
+            waits, batch_done = run_redis(policy, args, weights, arrivals)
+        else:
+            waits, batch_done = simulate(policy, args, weights, arrivals, random.Random(args.seed))
+        p95 = statistics.quantiles(waits, n=20)[-1] if len(waits) > 1 else waits[0]
+        print(f"{policy:>9} {statistics.median(waits):>11.1f} {p95:>11.1f} {max(waits):>11.1f} {batch_done:>14}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
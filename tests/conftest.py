@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+import copy
 from pathlib import Path
 import sys
+import uuid
 
 import pytest
 from sqlalchemy import create_engine
@@ -37,6 +39,62 @@ def _ensure_app_db_tables():
     # Nothing to tear down — we leave the tables in place for the whole session.
 
 
+@pytest.fixture(autouse=True)
+def _isolated_shared_stores(tmp_path_factory, monkeypatch):
+    """Give every test private instances of the default-on caches and stores.
+
+    The decoded-audio cache, PCM stem store, section memo, feature store,
+    render result cache and job-event client all stay enabled, as in
+    production; only their process-wide instances and on-disk directories are
+    per test, so one test's cached audio, features or renders never answer
+    another's lookups.  Tests that patch the code paths these stores
+    short-circuit opt out with ``no_shared_audio_stores``.
+    """
+    from app.config import settings
+    from app.services import audio_features, decoded_audio_cache, job_events, render_result_cache, section_render_memo
+    from app.services.storage import storage
+
+    stores = tmp_path_factory.mktemp("stores")
+    monkeypatch.setattr(settings, "decoded_audio_cache_dir", str(stores / "decoded_audio"))
+    monkeypatch.setattr(settings, "pcm_stem_store_dir", str(stores / "pcm_stems"))
+    monkeypatch.setattr(decoded_audio_cache, "_cache", None)
+    monkeypatch.setattr(section_render_memo, "_memo", None)
+    monkeypatch.setattr(job_events, "_client", None)
+
+    # Feature bundles persist through storage: give the store its own directory.
+    if not storage.use_s3:
+        feature_storage = copy.copy(storage)
+        feature_storage.upload_dir = stores / "features"
+        feature_storage.upload_dir.mkdir()
+        feature_store = audio_features.FeatureStore(
+            feature_storage, max_memory_entries=settings.feature_store_memory_entries
+        )
+        monkeypatch.setattr(audio_features, "_feature_store", feature_store)
+    else:
+        monkeypatch.setattr(audio_features, "_feature_store", None)
+
+    # Render-cache manifests live next to the renders in the shared upload
+    # directory; a per-test cache version keeps other tests' (and earlier
+    # runs') entries unreachable.
+    monkeypatch.setattr(settings, "render_result_cache_version", f"test-{uuid.uuid4().hex}")
+    monkeypatch.setattr(render_result_cache, "_cache", None)
+
+
+@pytest.fixture
+def no_shared_audio_stores(monkeypatch):
+    """Turn off the decoded-audio cache, PCM stem store, section memo and feature store.
+
+    For tests that mock downloads, decoders or render helpers which a store hit
+    would skip.
+    """
+    from app.config import settings
+
+    monkeypatch.setattr(settings, "decoded_audio_cache_enabled", False)
+    monkeypatch.setattr(settings, "pcm_stem_store_enabled", False)
+    monkeypatch.setattr(settings, "section_render_memo_enabled", False)
+    monkeypatch.setattr(settings, "feature_store_enabled", False)
+
+
 @pytest.fixture(scope="module")
 def fresh_sqlite_integration_db(tmp_path_factory: pytest.TempPathFactory):
     """Create a fresh temp SQLite DB, initialize schema, and clean up after tests."""
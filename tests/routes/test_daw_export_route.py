@@ -235,3 +235,35 @@ def test_daw_export_download_returns_404_for_missing_arrangement(client):
     response = client.get("/api/v1/arrangements/999999/daw-export/download")
     assert response.status_code == 404
 
+
+
+def test_daw_export_queues_a_job_instead_of_building_in_the_request(client, db, test_loop_for_export):
+    """With the queue available, GET /daw-export returns at once with the export job."""
+    from unittest.mock import MagicMock, patch
+
+    from app.services import job_service
+
+    arrangement = Arrangement(
+        loop_id=test_loop_for_export.id,
+        status="done",
+        target_seconds=30,
+        output_s3_key=f"arrangements/{test_loop_for_export.id}_queued.wav",
+    )
+    db.add(arrangement)
+    db.commit()
+    db.refresh(arrangement)
+
+    queue = MagicMock()
+    with patch.object(job_service, "get_queue", return_value=queue):
+        response = client.get(f"/api/v1/arrangements/{arrangement.id}/daw-export")
+        again = client.get(f"/api/v1/arrangements/{arrangement.id}/daw-export")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["ready_for_export"] is False
+    assert data["status"] == "exporting"
+    assert again.json()["export_job_id"] == data["export_job_id"]
+    assert queue.enqueue.call_count == 1
+
+    download = client.get(f"/api/v1/arrangements/{arrangement.id}/daw-export/download")
+    assert download.status_code == 409
@@ -110,6 +110,9 @@ def test_health_queue_debug_with_redis(client):
     assert data["redis_ok"] is True
     assert data["queue_depth"] == 3
     assert data["failed_queue_jobs"] == 1
+    assert set(data["queues"]) == {"render", "render_batch", "ingest", "analysis"}
+    assert data["queues"]["render"]["depth"] == 3
+    assert "oldest_job_age_seconds" in data["queues"]["render_batch"]
     assert "failed_db_jobs" in data
     assert "queued_db_jobs" in data
     assert "processing_db_jobs" in data
@@ -219,6 +219,15 @@ class TestHealthWorkerExtended:
         assert data["worker_count"] == 0
         assert "error" in data
 
+    def test_worker_health_reports_decoded_audio_cache_counters(self, client):
+        """Decoded-audio cache counters are reported even when Redis is down."""
+        with patch("app.routes.health.get_redis_conn", side_effect=RuntimeError("redis down")):
+            response = client.get("/api/v1/health/worker")
+
+        cache_stats = response.json()["decoded_audio_cache"]
+        for key in ("hits", "misses", "memory_hits", "disk_hits", "disk_bytes"):
+            assert key in cache_stats
+
     def test_worker_health_with_last_heartbeat(self, client):
         """Workers with a heartbeat timestamp populate last_heartbeat."""
         from datetime import datetime, timezone
@@ -4,8 +4,11 @@ Covers:
   POST /api/v1/loops/analyze-metadata
   POST /api/v1/loops/loops/{id}/analyze-metadata
   GET  /api/v1/loops/loops/{id}/metadata
+  POST /api/v1/loops/analyze-batch
 """
 
+import json
+
 import pytest
 from unittest.mock import patch, MagicMock
 from fastapi.testclient import TestClient
@@ -148,6 +151,26 @@ def test_analyze_existing_loop_with_genre_hint(client, sample_loop):
     assert response.status_code == 200
 
 
+def test_analyze_existing_loop_reads_features_by_saved_hash(client, db):
+    loop = Loop(name="untagged.wav", filename="untagged.wav", file_key="uploads/untagged.wav", bpm=140,
+                analysis_json=json.dumps({"bpm": 140, "content_hash": "ab12"}))
+    db.add(loop)
+    db.commit()
+    features = MagicMock()
+    with (
+        patch("app.routes.loop_analysis.find_audio_features_by_hash", return_value=features) as find,
+        patch("app.routes.loop_analysis.loop_analyzer.analyze_features",
+              return_value={"bpm": 140.0, "key": "Am", "bars": 4}) as analyze,
+        patch("app.services.storage.storage.read_file") as read_file,
+    ):
+        response = client.post(f"/api/v1/loops/loops/{loop.id}/analyze-metadata")
+
+    assert response.status_code == 200
+    find.assert_called_once_with("ab12")
+    analyze.assert_called_once_with(features)
+    read_file.assert_not_called()
+
+
 # ---------------------------------------------------------------------------
 # GET /api/v1/loops/loops/{id}/metadata
 # ---------------------------------------------------------------------------
@@ -170,3 +193,48 @@ def test_get_loop_metadata_returns_correct_values(client, sample_loop):
     data = response.json()
     assert data["bpm"] == sample_loop.bpm
     assert data["filename"] == sample_loop.filename
+
+
+# ---------------------------------------------------------------------------
+# POST /api/v1/loops/analyze-batch
+# ---------------------------------------------------------------------------
+
+@pytest.fixture
+def unanalyzed_loops(db):
+    loops = [Loop(name=f"take{idx}.wav", file_key=f"uploads/take{idx}.wav") for idx in range(3)]
+    db.add_all(loops)
+    db.commit()
+    return [loop.id for loop in loops]
+
+
+def test_analyze_batch_requires_a_selection(client):
+    response = client.post("/api/v1/loops/analyze-batch", json={})
+    assert response.status_code == 400
+
+
+def test_analyze_batch_enqueues_selected_loops(client, unanalyzed_loops, sample_loop):
+    with patch("app.routes.loop_analysis.enqueue_batch_analysis", return_value="rq-1") as enqueue:
+        response = client.post("/api/v1/loops/analyze-batch", json={"missing": "bpm", "limit": 2})
+
+    assert response.status_code == 202
+    assert response.json() == {"status": "queued", "loop_count": 2, "job_id": "rq-1"}
+    enqueue.assert_called_once_with(unanalyzed_loops[:2])
+
+
+def test_analyze_batch_without_queue_returns_503(client, unanalyzed_loops):
+    with (
+        patch("app.routes.loop_analysis.enqueue_batch_analysis", return_value=None),
+        patch("app.workers.backfill_analysis.batch_analysis_worker") as worker,
+    ):
+        response = client.post("/api/v1/loops/analyze-batch", json={"loop_ids": unanalyzed_loops[1:]})
+
+    assert response.status_code == 503
+    worker.assert_not_called()
+
+
+def test_analyze_batch_disabled(client, monkeypatch):
+    from app.config import settings
+
+    monkeypatch.setattr(settings, "batch_analysis_enabled", False)
+    response = client.post("/api/v1/loops/analyze-batch", json={"missing": "bpm"})
+    assert response.status_code == 503
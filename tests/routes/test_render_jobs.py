@@ -4,8 +4,11 @@ Tests for render job status polling endpoints.
 Covers:
   GET /api/v1/jobs/{job_id}          – fetch single job status
   GET /api/v1/loops/{loop_id}/jobs   – list jobs for a loop
+  GET /api/v1/jobs/{job_id}/events   – server-sent progress events
+  GET /api/v1/jobs/{job_id}/profile  – render timing profile
 """
 
+import json
 import uuid
 from datetime import datetime
 
@@ -15,6 +18,7 @@ from fastapi.testclient import TestClient
 import app.db as db_module
 from app.models.job import RenderJob
 from app.models.loop import Loop
+from app.services import render_timing
 from main import app
 
 
@@ -84,6 +88,31 @@ def completed_job(db, test_loop):
     return job
 
 
+# ---------------------------------------------------------------------------
+# GET /api/v1/jobs/{job_id}/events  and  /api/v1/jobs/{job_id}/ws
+# ---------------------------------------------------------------------------
+
+class TestJobEventStream:
+    """Push channel: the current state is sent first and terminal jobs close the stream."""
+
+    def test_unknown_job_id_returns_404(self, client):
+        response = client.get(f"/api/v1/jobs/{uuid.uuid4()}/events")
+        assert response.status_code == 404
+
+    def test_terminal_job_streams_single_event(self, client, completed_job):
+        response = client.get(f"/api/v1/jobs/{completed_job.id}/events")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        assert response.text.startswith("id: 0\nevent: terminal\ndata: ")
+        assert '"status":"completed"' in response.text
+
+    def test_websocket_sends_terminal_event(self, client, completed_job):
+        with client.websocket_connect(f"/api/v1/jobs/{completed_job.id}/ws") as ws:
+            message = ws.receive_json()
+        assert message["type"] == "terminal"
+        assert (message["job_id"], message["progress"]) == (completed_job.id, 100.0)
+
+
 # ---------------------------------------------------------------------------
 # GET /api/v1/jobs/{job_id}
 # ---------------------------------------------------------------------------
@@ -132,6 +161,39 @@ class TestGetJobStatus:
             assert field in data, f"Missing expected field '{field}' in job status response"
 
 
+# ---------------------------------------------------------------------------
+# GET /api/v1/jobs/{job_id}/profile
+# ---------------------------------------------------------------------------
+
+class TestGetJobProfile:
+    """GET /api/v1/jobs/{job_id}/profile – timing spans stored in render_metadata."""
+
+    def test_job_without_profile_returns_404(self, client, completed_job):
+        assert client.get(f"/api/v1/jobs/{uuid.uuid4()}/profile").status_code == 404
+        response = client.get(f"/api/v1/jobs/{completed_job.id}/profile")
+        assert response.status_code == 404
+        assert "no render profile" in response.json()["detail"]
+
+    def test_profile_summary_and_chrome_trace(self, client, db, completed_job):
+        with render_timing.profiling(completed_job.id) as profile:
+            with render_timing.span("mastering", "mastering"):
+                pass
+        completed_job.render_metadata_json = json.dumps({"worker_mode": "rq", "profile": profile.to_dict()})
+        db.commit()
+
+        summary = client.get(f"/api/v1/jobs/{completed_job.id}/profile")
+        assert summary.status_code == 200, summary.text
+        data = summary.json()
+        assert data["job_id"] == completed_job.id
+        assert [s["name"] for s in data["spans"]] == ["mastering"]
+        assert data["stages"]["mastering"]["count"] == 1
+
+        chrome = client.get(f"/api/v1/jobs/{completed_job.id}/profile", params={"format": "chrome"})
+        assert chrome.status_code == 200
+        assert "attachment" in chrome.headers["content-disposition"]
+        assert [e["name"] for e in chrome.json()["traceEvents"] if e["ph"] == "X"] == ["mastering"]
+
+
 # ---------------------------------------------------------------------------
 # GET /api/v1/loops/{loop_id}/jobs
 # ---------------------------------------------------------------------------
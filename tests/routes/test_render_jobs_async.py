@@ -452,7 +452,7 @@ class TestRenderAsyncEnqueue:
         )
 
     def test_queue_name_is_render(self, client, test_loop_with_file):
-        """get_queue must be called with name='render'."""
+        """The first variation goes to 'render'; the extra ones to 'render_batch'."""
         mock_queue = MagicMock()
         mock_queue.name = "render"
         mock_queue.enqueue.return_value = MagicMock(id=str(uuid.uuid4()))
@@ -464,12 +464,10 @@ class TestRenderAsyncEnqueue:
             )
 
         assert response.status_code == 202, response.text
-        call_kwargs = mock_get_queue.call_args
-        assert call_kwargs is not None
-        # get_queue is called as get_queue(name=DEFAULT_RENDER_QUEUE_NAME)
-        assert call_kwargs.kwargs.get("name") == "render", (
-            "Queue name passed to get_queue must be 'render'"
-        )
+        names = [call.kwargs.get("name") for call in mock_get_queue.call_args_list]
+        assert names, "get_queue was not called"
+        assert names[0] == "render", "First variation must be enqueued on 'render'"
+        assert all(name == "render_batch" for name in names[1:])
 
 
 # ---------------------------------------------------------------------------
@@ -7,6 +7,8 @@ Guards the critical production path:
 Ensures:
 - Successful upload creates a Loop DB record and returns the expected payload
   shape (loop_id, play_url, download_url).
+- Analysis and stem separation run in an ingest job whose progress is
+  reported through GET /api/v1/jobs/{job_id}.
 - Invalid file type is rejected with HTTP 400 before touching storage.
 - Storage (S3/local) failures return HTTP 500 and do not leave partial DB rows.
 """
@@ -63,13 +65,13 @@ class TestUploadSuccess:
         wav_bytes = _make_wav_bytes()
 
         mock_upload = MagicMock(return_value=("uploads/test-uuid.wav", "/uploads/test-uuid.wav"))
-        mock_analyze = AsyncMock(return_value={"bpm": 120, "key": "C", "duration": 0.1, "bars": 4})
+        mock_analyze = MagicMock(return_value={"bpm": 120, "key": "C", "duration": 0.1, "bars": 4})
 
         with (
             patch("app.services.loop_service.loop_service.upload_loop_file", mock_upload),
-            patch("app.services.loop_analyzer.loop_analyzer.analyze_from_s3", mock_analyze),
+            patch("app.services.loop_analyzer.loop_analyzer.analyze_content", mock_analyze),
             # Stem separation is non-critical for this test; stub it out
-            patch("app.routes.loops._build_stem_analysis_json", return_value="{}"),
+            patch("app.services.loop_ingest.build_stem_analysis_json", return_value="{}"),
         ):
             response = client.post(
                 "/api/v1/loops/upload",
@@ -97,16 +99,16 @@ class TestUploadSuccess:
         assert loop.file_key == "uploads/test-uuid.wav"
 
     def test_upload_creates_loop_with_analysis_data(self, client, db):
-        """Upload must persist BPM, key, and duration analysis into the Loop row."""
+        """The ingest job must persist BPM, key, and duration analysis into the Loop row."""
         wav_bytes = _make_wav_bytes()
 
         mock_upload = MagicMock(return_value=("uploads/bpm-test.wav", "/uploads/bpm-test.wav"))
-        mock_analyze = AsyncMock(return_value={"bpm": 140.0, "key": "Dm", "duration": 4.0, "bars": 8})
+        mock_analyze = MagicMock(return_value={"bpm": 140.0, "key": "Dm", "duration": 4.0, "bars": 8})
 
         with (
             patch("app.services.loop_service.loop_service.upload_loop_file", mock_upload),
-            patch("app.services.loop_analyzer.loop_analyzer.analyze_from_s3", mock_analyze),
-            patch("app.routes.loops._build_stem_analysis_json", return_value="{}"),
+            patch("app.services.loop_analyzer.loop_analyzer.analyze_content", mock_analyze),
+            patch("app.services.loop_ingest.build_stem_analysis_json", return_value="{}"),
         ):
             response = client.post(
                 "/api/v1/loops/upload",
@@ -114,14 +116,46 @@ class TestUploadSuccess:
             )
 
         assert response.status_code == 201, response.text
-        loop_id = response.json()["loop_id"]
+        data = response.json()
+        assert data["status"] == "processing"
+        assert data["poll_url"] == f"/api/v1/jobs/{data['job_id']}"
+        # Analysed in memory from the uploaded bytes, not re-downloaded.
+        mock_analyze.assert_called_once_with(wav_bytes, "loop_140.wav")
 
-        loop = db.query(Loop).filter(Loop.id == loop_id).first()
+        # Without Redis the ingest runs in-process once the response is sent.
+        loop = db.query(Loop).filter(Loop.id == data["loop_id"]).first()
         assert loop is not None
         # BPM is stored as a rounded integer per the upload route convention
         assert loop.bpm == 140
         assert loop.musical_key == "Dm"
         assert loop.duration_seconds == 4.0
+        assert loop.status == "complete"
+
+        job = client.get(data["poll_url"]).json()
+        assert (job["job_type"], job["status"], job["progress"]) == ("ingest_loop", "completed", 100.0)
+
+    def test_upload_analyzes_inline_when_async_ingest_disabled(self, client, db, monkeypatch):
+        """ASYNC_INGEST_ENABLED=false keeps the original synchronous analysis."""
+        from app.config import settings
+
+        monkeypatch.setattr(settings, "async_ingest_enabled", False)
+        mock_upload = MagicMock(return_value=("uploads/sync-test.wav", "/uploads/sync-test.wav"))
+        mock_analyze = AsyncMock(return_value={"bpm": 96.0, "key": "A", "duration": 2.0, "bars": 4})
+
+        with (
+            patch("app.services.loop_service.loop_service.upload_loop_file", mock_upload),
+            patch("app.services.loop_analyzer.loop_analyzer.analyze_from_s3", mock_analyze),
+            patch("app.routes.loops._build_stem_analysis_json", return_value="{}"),
+        ):
+            response = client.post(
+                "/api/v1/loops/upload",
+                files={"file": ("sync.wav", _make_wav_bytes(), "audio/wav")},
+            )
+
+        assert response.status_code == 201, response.text
+        assert "job_id" not in response.json()
+        loop = db.query(Loop).filter(Loop.id == response.json()["loop_id"]).first()
+        assert loop.bpm == 96
 
 
 # ---------------------------------------------------------------------------
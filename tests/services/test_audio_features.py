@@ -0,0 +1,163 @@
+"""Tests for the shared single-decode feature bundle (app/services/audio_features.py)."""
+
+import io
+import math
+import wave
+
+# Import the real modules before tests/test_render_variations.py stubs them.
+import librosa.core  # noqa: F401
+import librosa.effects  # noqa: F401
+import numpy as np
+import pytest
+import soundfile  # noqa: F401
+
+from app.services import audio_features
+from app.services.audio_features import AudioFeatures, FeatureStore, extract_features, feature_key
+
+
+def _wav_bytes(left, right=None, sample_rate=44100):
+    channels = np.stack([left, right], axis=1) if right is not None else left[:, None]
+    pcm = (np.clip(channels, -1.0, 1.0) * 32767).astype("<i2")
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as handle:
+        handle.setnchannels(pcm.shape[1])
+        handle.setsampwidth(2)
+        handle.setframerate(sample_rate)
+        handle.writeframes(pcm.tobytes())
+    return buf.getvalue()
+
+
+def _decoded(content):
+    samples, sample_rate, _ = audio_features.decode_audio(content)
+    return samples, sample_rate
+
+
+@pytest.fixture(scope="module")
+def stereo_clip():
+    """Clicks at 120 BPM over a two-tone pad, with a quieter right channel."""
+    sr = 44100
+    t = np.arange(int(sr * 6.05)) / sr
+    pad = 0.2 * np.sin(2 * np.pi * 220.0 * t) + 0.05 * np.sin(2 * np.pi * 3000.0 * t)
+    clicks = np.zeros_like(t)
+    for beat in np.arange(0, 6.0, 0.5):
+        start = int(beat * sr)
+        clicks[start : start + 400] = np.hanning(800)[400:] * 0.6
+    return _wav_bytes(pad + clicks, 0.5 * pad + clicks, sr)
+
+
+class _FakeStore:
+    def __init__(self):
+        self.objects = {}
+
+    def read_file(self, key):
+        return self.objects.get(key)
+
+    def upload_file(self, file_bytes, content_type, key):
+        self.objects[key] = file_bytes
+        return key
+
+
+class TestExtraction:
+    def test_bundle_describes_the_file(self, stereo_clip):
+        features = extract_features(stereo_clip, "clip.wav")
+        assert (features.sample_rate, features.channels, features.bit_depth) == (44100, 2, 16)
+        assert features.duration_seconds == pytest.approx(6.05, abs=1e-3)
+        assert features.chroma.shape[0] == 12
+        assert features.chroma.shape[1] == len(features.onset_envelope) == len(features.hf_ratio)
+        assert features.tempo == pytest.approx(120.0, rel=0.05)
+        assert features.tempo_candidates.shape[1] == 2
+        assert features.stereo.is_stereo and features.stereo.rms_right < features.stereo.rms_left
+
+    def test_npz_round_trip(self, stereo_clip):
+        features = extract_features(stereo_clip, "clip.wav")
+        restored = AudioFeatures.from_npz(features.to_npz())
+        assert restored.stereo == features.stereo
+        assert (restored.content_hash, restored.tempo) == (features.content_hash, features.tempo)
+        for name in AudioFeatures._ARRAY_FIELDS:
+            np.testing.assert_array_equal(getattr(restored, name), getattr(features, name))
+
+    def test_window_rms_matches_direct_computation(self, stereo_clip):
+        features = extract_features(stereo_clip, "clip.wav")
+        samples, sr = _decoded(stereo_clip)
+        mono = samples.mean(axis=0)
+        window, hop = int(2.0 * sr), int(1.0 * sr)
+        expected = [
+            math.sqrt(float(np.mean(mono[start : start + window].astype(np.float64) ** 2)))
+            for start in range(0, len(mono), hop)
+        ]
+        assert features.window_rms(2.0, 1.0) == pytest.approx(expected, rel=1e-6)
+
+    def test_empty_audio_is_rejected(self):
+        with pytest.raises(ValueError, match="empty"):
+            extract_features(_wav_bytes(np.zeros(0)), "empty.wav")
+
+
+class TestTrackQualityParity:
+    """Metrics read from the bundle equal the sample-based helpers."""
+
+    def test_loudness_peak_and_tonal_profile(self, stereo_clip):
+        from app.services import track_quality_analyzer as tq
+
+        features = extract_features(stereo_clip, "clip.wav")
+        samples, sr = _decoded(stereo_clip)
+        left, right = samples[0], samples[1]
+
+        assert tq._loudness_from_features(features) == tq._compute_integrated_loudness(left, right, sr)
+        assert tq._true_peak_dbfs(features.stereo.peak) == tq._compute_true_peak(left, right)
+        assert tq._tonal_profile_from_features(features) == tq._compute_tonal_profile(left, right, sr)
+        assert tq._stereo_field(features.stereo) == tq._compute_stereo_field(left, right)
+
+    def test_short_mono_file(self):
+        from app.services import track_quality_analyzer as tq
+
+        y = 0.3 * np.sin(2 * np.pi * 440.0 * np.arange(8000) / 44100)
+        content = _wav_bytes(y)
+        features = extract_features(content, "short.wav")
+        samples, sr = _decoded(content)
+        assert tq._loudness_from_features(features) == tq._compute_integrated_loudness(samples[0], None, sr)
+
+
+class TestFeatureStore:
+    def test_persists_by_content_hash_and_reuses_bundle(self, stereo_clip, monkeypatch):
+        store = _FakeStore()
+        decodes = []
+        real_decode = audio_features.decode_audio
+        monkeypatch.setattr(audio_features, "decode_audio", lambda *a: decodes.append(a) or real_decode(*a))
+
+        first = FeatureStore(store, max_memory_entries=4).get_or_extract(stereo_clip, "clip.wav")
+        assert list(store.objects) == [feature_key(first.content_hash)]
+
+        # Another process (empty memory tier) loads the persisted arrays.
+        other = FeatureStore(store, max_memory_entries=4)
+        second = other.get_or_extract(stereo_clip, "clip.wav")
+        assert len(decodes) == 1
+        assert second.tempo == first.tempo
+        assert other.stats()["storage_hits"] == 1
+
+    def test_corrupt_object_is_a_miss(self, stereo_clip):
+        store = _FakeStore()
+        digest = audio_features.content_hash(stereo_clip)
+        store.objects[feature_key(digest)] = b"not an npz"
+        cache = FeatureStore(store)
+        assert cache.get(digest) is None
+        assert cache.stats()["errors"] == 1
+
+    def test_analyzers_share_one_decode(self, stereo_clip, monkeypatch):
+        from app.config import settings
+        from app.services.loop_analyzer import LoopAnalyzer
+        from app.services.track_quality_analyzer import TrackQualityAnalyzer
+
+        monkeypatch.setattr(settings, "feature_store_enabled", True)
+        monkeypatch.setattr(audio_features, "_feature_store", FeatureStore(_FakeStore()))
+        decodes = []
+        real_decode = audio_features.decode_audio
+        monkeypatch.setattr(audio_features, "decode_audio", lambda *a: decodes.append(a) or real_decode(*a))
+
+        analysis = LoopAnalyzer().analyze_content(stereo_clip, "clip.wav")
+        quality = TrackQualityAnalyzer().analyze(stereo_clip, "clip.wav")
+        assert audio_features.find_audio_features(stereo_clip) is not None
+        assert audio_features.find_audio_features_by_hash(analysis["content_hash"]) is not None
+
+        assert len(decodes) == 1
+        assert analysis["bpm"] == pytest.approx(120.0, rel=0.05)
+        assert quality.sample_rate == 44100 and quality.stereo_field is not None
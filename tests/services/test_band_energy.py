@@ -0,0 +1,60 @@
+"""Tests for the shared STFT band-energy analyzer (app/services/band_energy.py)."""
+
+import numpy as np
+import pytest
+from pydub import AudioSegment
+
+from app.services import band_energy
+from app.services.band_energy import analyze_band_energies
+
+
+def _segment(mono: np.ndarray, frame_rate: int = 44100) -> AudioSegment:
+    pcm = (np.repeat(mono[:, None], 2, axis=1) * 32767).astype("<i2")
+    return AudioSegment(data=pcm.tobytes(), sample_width=2, frame_rate=frame_rate, channels=2)
+
+
+def _full_fft_level(audio: AudioSegment, low_hz: float, high_hz: float) -> float:
+    samples = np.array(audio.get_array_of_samples(), dtype=np.float32).reshape(-1, 2).mean(axis=1)
+    samples /= np.max(np.abs(samples))
+    spectrum = np.fft.rfft(samples)
+    freqs = np.fft.rfftfreq(samples.size, d=1.0 / audio.frame_rate)
+    band = np.abs(spectrum[(freqs >= low_hz) & (freqs < high_hz)])
+    return 20.0 * np.log10(np.sqrt(np.mean(np.square(band))))
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache():
+    band_energy.clear_band_energy_cache()
+    yield
+    band_energy.clear_band_energy_cache()
+
+
+def test_levels_match_the_full_length_transform():
+    audio = _segment(0.2 * np.random.default_rng(0).standard_normal(44100 * 3))
+
+    energies = analyze_band_energies(audio)
+
+    for name, (low_hz, high_hz) in band_energy.RENDER_BANDS.items():
+        assert energies[name] == pytest.approx(_full_fft_level(audio, low_hz, high_hz), abs=0.3)
+
+
+def test_custom_bands_keep_per_frame_timing():
+    t = np.arange(44100 * 2) / 44100
+    mono = np.where(t >= 1.0, 0.5 * np.sin(2 * np.pi * 100 * t), 0.5 * np.sin(2 * np.pi * 3000 * t))
+
+    energies = analyze_band_energies(_segment(mono), {"low": (50.0, 200.0), "high": (2000.0, 4000.0)})
+
+    low, high = energies.frame_levels_db["low"], energies.frame_levels_db["high"]
+    switch = int(1.0 / energies.hop_seconds)
+    assert low[: switch - 2].max() < low[switch + 2:].min() - 40
+    assert high[switch + 2:].max() < high[: switch - 2].min() - 40
+
+
+def test_results_are_cached_per_segment(monkeypatch):
+    audio = _segment(0.3 * np.sin(np.arange(8820) * 0.1))
+
+    first = analyze_band_energies(audio)
+    assert analyze_band_energies(audio._spawn(audio.raw_data)) is first
+
+    monkeypatch.setattr(band_energy.settings, "band_energy_cache_entries", 0)
+    assert analyze_band_energies(audio) is not first
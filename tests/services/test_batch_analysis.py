@@ -0,0 +1,138 @@
+"""Tests for batch loop analysis (app/services/batch_analysis.py, app/workers/backfill_analysis.py)."""
+
+import io
+import json
+import wave
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.models.base import Base
+from app.models.loop import Loop
+from app.services import batch_analysis
+from app.services.batch_analysis import run_batch_analysis, select_loop_ids
+
+
+@pytest.fixture
+def db(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'batch.sqlite'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+def _add_loops(db, count, **overrides):
+    loops = [
+        Loop(name=f"loop{idx}.wav", filename=f"loop{idx}.wav", file_key=f"uploads/loop{idx}.wav", **overrides)
+        for idx in range(count)
+    ]
+    db.add_all(loops)
+    db.commit()
+    return [loop.id for loop in loops]
+
+
+def _fake_analysis(content, filename):
+    if content == b"broken":
+        raise Exception("Audio analysis failed: bad header")
+    return {"bpm": 92.6, "key": "Am", "duration": 8.0, "bars": 4}
+
+
+class TestSelectLoopIds:
+    def test_missing_filter_and_limit(self, db):
+        analyzed = _add_loops(db, 2, bpm=120)
+        pending = _add_loops(db, 3)
+        db.add(Loop(name="no file"))
+        db.commit()
+
+        assert select_loop_ids(db, missing="bpm") == pending
+        assert select_loop_ids(db, missing="bpm", limit=2) == pending[:2]
+        assert select_loop_ids(db, loop_ids=analyzed + pending[:1]) == analyzed + pending[:1]
+
+    def test_unknown_filter(self, db):
+        with pytest.raises(ValueError, match="Unknown filter"):
+            select_loop_ids(db, missing="tempo")
+
+
+class TestRunBatchAnalysis:
+    def test_writes_results_in_bulk_and_keeps_other_analysis(self, db):
+        ids = _add_loops(db, 5)
+        db.query(Loop).filter(Loop.id == ids[0]).update(
+            {"analysis_json": json.dumps({"stem_separation": {"succeeded": True}})}
+        )
+        db.commit()
+        flushes = []
+
+        with (
+            patch("app.services.storage.storage.read_file", return_value=b"RIFF"),
+            patch.object(batch_analysis, "_analyze_task", side_effect=_fake_analysis),
+        ):
+            result = run_batch_analysis(
+                db, ids, workers=1, prefetch=2, update_batch=2, progress=lambda r: flushes.append(r.analyzed)
+            )
+
+        assert (result.requested, result.analyzed, result.failed) == (5, 5, 0)
+        assert result.bytes_read == 20 and result.loops_per_second > 0
+        assert flushes == [2, 4]
+        db.expire_all()
+        loops = db.query(Loop).order_by(Loop.id).all()
+        assert [(loop.bpm, loop.musical_key, loop.bars) for loop in loops] == [(93, "Am", 4)] * 5
+        assert json.loads(loops[0].analysis_json) == {
+            "stem_separation": {"succeeded": True},
+            "bpm": 92.6,
+            "key": "Am",
+            "duration": 8.0,
+            "bars": 4,
+        }
+
+    def test_unreadable_and_unanalyzable_loops_are_left_untouched(self, db):
+        ids = _add_loops(db, 3)
+        objects = {"uploads/loop0.wav": b"RIFF", "uploads/loop1.wav": b"broken"}
+
+        with (
+            patch("app.services.storage.storage.read_file", side_effect=objects.get),
+            patch.object(batch_analysis, "_analyze_task", side_effect=_fake_analysis),
+        ):
+            result = run_batch_analysis(db, ids, workers=1)
+
+        assert (result.analyzed, result.failed) == (1, 2)
+        assert "bad header" in result.errors[ids[1]] and "not found" in result.errors[ids[2]]
+        db.expire_all()
+        assert [loop.bpm for loop in db.query(Loop).order_by(Loop.id)] == [93, None, None]
+
+    def test_process_pool_analyzes_real_audio(self, db):
+        sr = 22050
+        t = np.arange(sr * 2) / sr
+        pcm = (0.3 * np.sin(2 * np.pi * 220.0 * t) * 32767).astype("<i2")
+        buf = io.BytesIO()
+        with wave.open(buf, "wb") as handle:
+            handle.setnchannels(1)
+            handle.setsampwidth(2)
+            handle.setframerate(sr)
+            handle.writeframes(pcm.tobytes())
+        ids = _add_loops(db, 3)
+
+        with patch("app.services.storage.storage.read_file", return_value=buf.getvalue()):
+            result = run_batch_analysis(db, ids, workers=2, prefetch=2)
+
+        assert (result.analyzed, result.failed) == (3, 0)
+        db.expire_all()
+        assert all(loop.duration_seconds == pytest.approx(2.0, abs=0.01) for loop in db.query(Loop))
+
+
+class TestBackfillCli:
+    def test_dry_run_reports_selection(self, db, capsys):
+        _add_loops(db, 2)
+        session_factory = sessionmaker(bind=db.get_bind())
+        with (
+            patch("app.db.SessionLocal", session_factory),
+            patch("app.workers.render_worker._ensure_db_models"),
+        ):
+            from app.workers.backfill_analysis import main
+
+            assert main(["--missing", "bpm", "--dry-run"]) == 0
+        assert "selected 2 loops" in capsys.readouterr().out
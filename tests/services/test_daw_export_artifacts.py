@@ -64,3 +64,71 @@ def test_build_export_zip_creates_real_artifacts():
     assert contents["metadata"] == ["markers.csv", "tempo_map.json", "README.txt"]
     assert set(contents["stems"]) == expected_stems
     assert contents["midi"] == []
+
+
+class _WriteOnlySink:
+    """An upload-stream-like sink: write() only, no seek/tell."""
+
+    def __init__(self):
+        self._buffer = io.BytesIO()
+
+    def write(self, data):
+        return self._buffer.write(data)
+
+    def getvalue(self):
+        return self._buffer.getvalue()
+
+
+def test_role_bus_stems_follow_sections_and_crossfades():
+    import numpy as np
+
+    from app.services.daw_export import BusSection, role_bus_stems
+
+    drums = np.full((10, 2), 1000, dtype="<i2")
+    bass = np.full((10, 2), -2000, dtype="<i2")
+    sections = [
+        BusSection(frame_count=40, role_gains_db={"drums": 0.0}),
+        BusSection(frame_count=40, role_gains_db={"drums": 0.0, "bass": 0.0}),
+    ]
+
+    stems = role_bus_stems({"drums": drums, "bass": bass}, sections, frame_rate=44100, crossfade_frames=8)
+
+    assert {stem.frame_count for stem in stems.values()} == {72}
+    drum_bus = np.concatenate(list(stems["drums"].chunks()))
+    bass_bus = np.concatenate(list(stems["bass"].chunks()))
+    assert drum_bus.shape == bass_bus.shape == (72, 2)
+    assert (drum_bus == 1000).all()
+    assert (bass_bus[:32] == 0).all() and (bass_bus[40:] == -2000).all()
+    # The bass fades in over the crossfade, as RenderBuffer.append joins sections.
+    assert list(bass_bus[32:40, 0]) == [round(-2000 * i / 8) for i in range(8)]
+
+
+def test_write_export_zip_streams_flac_stems_into_a_write_only_sink():
+    import numpy as np
+    import soundfile
+
+    from app.services.daw_export import BusSection, role_bus_stems
+
+    source = (np.arange(-300, 300, dtype="<i2").reshape(-1, 2) * 50).astype("<i2")
+    stems = role_bus_stems(
+        {"melody": source}, [BusSection(frame_count=1000, role_gains_db={"melody": 0.0})], frame_rate=44100
+    )
+    sink = _WriteOnlySink()
+
+    contents = DAWExporter.write_export_zip(
+        sink,
+        arrangement_id=7,
+        stems=stems,
+        bpm=120.0,
+        musical_key="C",
+        sections=[{"name": "Intro", "bar_start": 0, "bars": 1}],
+        stem_format="flac",
+    )
+
+    assert contents["stems"] == ["stems/melody.flac"]
+    archive = zipfile.ZipFile(io.BytesIO(sink.getvalue()))
+    assert archive.getinfo("stems/melody.flac").compress_type == zipfile.ZIP_STORED
+    decoded, rate = soundfile.read(io.BytesIO(archive.read("stems/melody.flac")), dtype="int16")
+    assert rate == 44100
+    assert np.array_equal(decoded, np.tile(source, (4, 1))[:1000])
+    assert "one per stem role" in archive.read("README.txt").decode()
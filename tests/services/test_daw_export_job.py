@@ -0,0 +1,145 @@
+"""Tests for DAW export jobs (app/services/daw_export_job.py)."""
+
+import io
+import json
+import zipfile
+from unittest.mock import MagicMock, patch
+
+import pytest
+from pydub import AudioSegment
+from pydub.generators import Sine
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.models.arrangement import Arrangement
+from app.models.base import Base
+from app.models.job import RenderJob
+from app.models.loop import Loop
+from app.services import daw_export_job, job_service
+from app.services.storage import LocalUploadStream
+
+
+@pytest.fixture
+def db(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'export.sqlite'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+@pytest.fixture
+def arrangement(db):
+    stem_separation = {
+        "enabled": True,
+        "succeeded": True,
+        "stem_s3_keys": {"drums": "stems/1_drums.wav", "bass": "stems/1_bass.wav"},
+    }
+    loop = Loop(
+        name="loop.wav",
+        file_key="uploads/loop.wav",
+        bpm=120.0,
+        musical_key="A",
+        analysis_json=json.dumps({"stem_separation": stem_separation}),
+    )
+    db.add(loop)
+    db.commit()
+    timeline = {
+        "bpm": 120.0,
+        "sections": [
+            {"name": "Intro", "bars": 1, "runtime_active_stems": ["drums"]},
+            {"name": "Hook", "bars": 2, "runtime_active_stems": ["drums", "bass"]},
+        ],
+    }
+    arrangement = Arrangement(
+        loop_id=loop.id,
+        status="done",
+        target_seconds=6,
+        output_s3_key="arrangements/1.wav",
+        arrangement_json=json.dumps(timeline),
+    )
+    db.add(arrangement)
+    db.commit()
+    db.refresh(arrangement)
+    return arrangement
+
+
+def test_create_daw_export_job_reuses_the_running_job(db, arrangement):
+    queue = MagicMock()
+    with patch.object(job_service, "get_queue", return_value=queue):
+        job, enqueued = job_service.create_daw_export_job(db, arrangement)
+        again, _ = job_service.create_daw_export_job(db, arrangement)
+
+    assert enqueued is True
+    assert (job.job_type, job.status, job.arrangement_id) == ("daw_export", "queued", None)
+    assert again.id == job.id
+    assert queue.enqueue.call_count == 1
+    assert queue.enqueue.call_args.args[1:] == (job.id, arrangement.id)
+
+
+def test_role_bus_sections_split_executed_phrases():
+    plan = daw_export_job.role_bus_sections(
+        [
+            {
+                "bars": 4,
+                "runtime_active_stems": ["drums", "bass"],
+                "runtime_first_phrase_stems": ["drums"],
+                "runtime_second_phrase_stems": ["drums", "bass"],
+                "phrase_plan": {"split_bar": 1},
+            }
+        ],
+        bpm=120.0,
+    )
+
+    assert [section.frame_count for section in plan] == [88200, 264600]
+    assert [sorted(section.role_gains_db) for section in plan] == [["drums"], ["bass", "drums"]]
+
+
+def test_run_daw_export_job_streams_one_stem_per_role(db, arrangement, tmp_path):
+    job = RenderJob(id="export-1", loop_id=arrangement.loop_id, job_type="daw_export", status="queued")
+    db.add(job)
+    db.commit()
+    loaded = {
+        "drums": Sine(80).to_audio_segment(duration=500).set_channels(2),
+        "bass": Sine(55).to_audio_segment(duration=500).set_channels(2),
+    }
+    streams = []
+
+    def _open(key, content_type):
+        streams.append(LocalUploadStream(key, content_type, tmp_path))
+        return streams[-1]
+
+    with (
+        patch("app.services.stem_loader.load_stems_from_metadata", return_value=loaded),
+        patch.object(daw_export_job.storage, "open_upload_stream", side_effect=_open),
+        patch.object(daw_export_job.storage, "upload_file") as upload_file,
+        patch.object(daw_export_job.storage, "read_file", side_effect=AssertionError("mix must not be loaded")),
+    ):
+        contents = daw_export_job.run_daw_export_job(db, job.id, arrangement.id)
+
+    assert contents["stems"] == ["stems/drums.wav", "stems/bass.wav"]
+    archive = zipfile.ZipFile(tmp_path / f"{arrangement.id}.zip")
+    durations = {len(AudioSegment.from_wav(io.BytesIO(archive.read(path)))) for path in contents["stems"]}
+    assert durations == {6000 - 30}
+    assert json.loads(upload_file.call_args.kwargs["file_bytes"]) == contents
+
+    db.refresh(job)
+    db.refresh(arrangement)
+    assert job.status == "succeeded"
+    assert json.loads(job.output_files_json)[0]["s3_key"] == f"exports/{arrangement.id}.zip"
+    assert arrangement.stems_zip_url == f"/api/v1/arrangements/{arrangement.id}/daw-export/download"
+
+
+def test_run_daw_export_job_records_failure(db, arrangement):
+    arrangement.status = "processing"
+    job = RenderJob(id="export-2", loop_id=arrangement.loop_id, job_type="daw_export", status="queued")
+    db.add(job)
+    db.commit()
+
+    with pytest.raises(ValueError):
+        daw_export_job.run_daw_export_job(db, job.id, arrangement.id)
+
+    db.refresh(job)
+    assert job.status == "failed"
+    assert "not done" in job.error_message
@@ -0,0 +1,122 @@
+"""Tests for the two-tier decoded-audio cache."""
+
+from __future__ import annotations
+
+import os
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+from pydub import AudioSegment
+
+from app.config import settings
+from app.services import decoded_audio_cache as dac
+from app.services.decoded_audio_cache import DecodedAudioCache, cache_key, load_storage_audio
+
+
+def _audio(duration_ms: int = 200, seed: int = 1) -> AudioSegment:
+    rng = np.random.default_rng(seed)
+    frames = int(44100 * duration_ms / 1000)
+    samples = (rng.standard_normal((frames, 2)) * 2000).astype(np.int16)
+    return AudioSegment(samples.tobytes(), frame_rate=44100, sample_width=2, channels=2)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return DecodedAudioCache(tmp_path / "cache", max_disk_bytes=10_000_000, max_memory_bytes=10_000_000)
+
+
+class TestDecodedAudioCache:
+    def test_miss_then_memory_hit(self, cache):
+        loader = MagicMock(return_value=_audio())
+        first = cache.get_or_load("k", loader)
+        second = cache.get_or_load("k", loader)
+        assert loader.call_count == 1
+        assert second.raw_data == first.raw_data
+        stats = cache.stats()
+        assert stats["misses"] == 1
+        assert stats["memory_hits"] == 1
+        assert stats["disk_entries"] == 1
+
+    def test_disk_tier_survives_new_process(self, cache, tmp_path):
+        audio = _audio()
+        cache.put("k", audio)
+        fresh = DecodedAudioCache(cache.directory, max_disk_bytes=10_000_000, max_memory_bytes=10_000_000)
+        restored = fresh.get("k")
+        assert restored is not None
+        assert restored.raw_data == audio.raw_data
+        assert (restored.frame_rate, restored.channels, restored.sample_width) == (44100, 2, 2)
+        assert fresh.stats()["disk_hits"] == 1
+
+    def test_disk_lru_eviction_by_byte_budget(self, tmp_path):
+        entry_bytes = len(_audio().raw_data)
+        cache = DecodedAudioCache(tmp_path, max_disk_bytes=int(entry_bytes * 2.5), max_memory_bytes=0)
+        cache.put("a", _audio(seed=1))
+        cache.put("b", _audio(seed=2))
+        # Touch "a" so "b" becomes least recently used.
+        os.utime(cache._path("b"), (1, 1))
+        assert cache.get("a") is not None
+        cache.put("c", _audio(seed=3))
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.stats()["evictions"] == 1
+
+    def test_memory_tier_respects_byte_budget(self, tmp_path):
+        entry_bytes = len(_audio().raw_data)
+        cache = DecodedAudioCache(tmp_path, max_disk_bytes=0, max_memory_bytes=entry_bytes)
+        cache.put("a", _audio(seed=1))
+        cache.put("b", _audio(seed=2))
+        stats = cache.stats()
+        assert stats["memory_entries"] == 1
+        assert stats["memory_bytes"] == entry_bytes
+
+    def test_corrupt_disk_entry_is_discarded(self, cache):
+        cache.directory.mkdir(parents=True)
+        cache._path("k").write_bytes(b"not a wav")
+        assert cache.get("k") is None
+        assert not cache._path("k").exists()
+        assert cache.stats()["errors"] == 1
+
+    def test_cache_key_depends_on_version(self):
+        assert cache_key("uploads/a.wav", "etag:1") != cache_key("uploads/a.wav", "etag:2")
+
+
+class TestLoadStorageAudio:
+    @pytest.fixture(autouse=True)
+    def _enable(self, monkeypatch, cache):
+        monkeypatch.setattr(settings, "decoded_audio_cache_enabled", True)
+        monkeypatch.setattr(dac, "_cache", cache)
+
+    def test_hit_skips_loader(self, cache):
+        store = MagicMock()
+        store.get_object_version.return_value = "etag:abc"
+        loader = MagicMock(return_value=_audio())
+        load_storage_audio("uploads/loop.wav", loader, store=store)
+        load_storage_audio("uploads/loop.wav", loader, store=store)
+        assert loader.call_count == 1
+
+    def test_new_version_misses(self, cache):
+        store = MagicMock()
+        loader = MagicMock(return_value=_audio())
+        store.get_object_version.return_value = "etag:1"
+        load_storage_audio("uploads/loop.wav", loader, store=store)
+        store.get_object_version.return_value = "etag:2"
+        load_storage_audio("uploads/loop.wav", loader, store=store)
+        assert loader.call_count == 2
+
+    def test_unknown_version_bypasses_cache(self, cache):
+        store = MagicMock()
+        store.get_object_version.return_value = None
+        loader = MagicMock(return_value=_audio())
+        load_storage_audio("uploads/loop.wav", loader, store=store)
+        load_storage_audio("uploads/loop.wav", loader, store=store)
+        assert loader.call_count == 2
+        assert cache.stats()["bypassed"] == 2
+
+    def test_disabled_cache_calls_loader(self, monkeypatch):
+        monkeypatch.setattr(settings, "decoded_audio_cache_enabled", False)
+        store = MagicMock()
+        loader = MagicMock(return_value=_audio())
+        load_storage_audio("uploads/loop.wav", loader, store=store)
+        store.get_object_version.assert_not_called()
+        loader.assert_called_once()
@@ -0,0 +1,145 @@
+"""Tests for the Redis pub/sub job progress channel."""
+
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.services import job_events
+from app.services.job_events import JobEvent, JobEventHub, job_event_stream, publish_job_event, replay_job_events
+
+
+class _FakeRedis:
+    """Just enough of redis-py for publishing and replay."""
+
+    def __init__(self):
+        self.values: dict[str, int] = {}
+        self.lists: dict[str, list[str]] = {}
+        self.published: list[tuple[str, str]] = []
+
+    def incr(self, key):
+        self.values[key] = self.values.get(key, 0) + 1
+        return self.values[key]
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def pipeline(self, transaction=True):
+        return self
+
+    def execute(self):
+        return []
+
+    def rpush(self, key, value):
+        self.lists.setdefault(key, []).append(value)
+
+    def ltrim(self, key, start, end):
+        items = self.lists.get(key, [])
+        self.lists[key] = items[start:] if end == -1 else items[start : end + 1]
+
+    def expire(self, key, seconds):
+        pass
+
+    def publish(self, channel, payload):
+        self.published.append((channel, payload))
+
+    def lrange(self, key, start, end):
+        return list(self.lists.get(key, []))
+
+
+def _job(status="processing", progress=10.0, job_id="job-1"):
+    return SimpleNamespace(
+        id=job_id, status=status, progress=progress, progress_message=None, error_message=None, arrangement_id=None
+    )
+
+
+@pytest.fixture
+def redis_client(monkeypatch):
+    from app.config import settings
+
+    client = _FakeRedis()
+    monkeypatch.setattr(settings, "job_events_enabled", True)
+    monkeypatch.setattr(job_events, "get_events_client", lambda: client)
+    return client
+
+
+async def _collect(stream, limit=10):
+    events = []
+    async for event in stream:
+        events.append(event)
+        if len(events) >= limit:
+            break
+    return events
+
+
+class TestPublish:
+    def test_events_are_numbered_logged_and_published(self, redis_client):
+        first = publish_job_event(_job(progress=10.0))
+        second = publish_job_event(_job(status="succeeded", progress=100.0))
+        assert (first.event_id, second.event_id) == (1, 2)
+        assert second.status == "completed" and second.terminal
+        assert [channel for channel, _ in redis_client.published] == ["job-events:job-1"] * 2
+        assert [event.event_id for event in replay_job_events("job-1", 1)] == [2]
+
+    def test_history_is_bounded(self, redis_client, monkeypatch):
+        from app.config import settings
+
+        monkeypatch.setattr(settings, "job_events_history", 2)
+        for progress in (10.0, 20.0, 30.0):
+            publish_job_event(_job(progress=progress))
+        assert [event.progress for event in replay_job_events("job-1")] == [20.0, 30.0]
+
+    def test_disabled_or_failing_redis_never_raises(self, monkeypatch):
+        assert publish_job_event(_job()) is None
+
+        class _Broken(_FakeRedis):
+            def incr(self, key):
+                raise ConnectionError("redis down")
+
+        assert publish_job_event(_job(), client=_Broken()) is None
+
+    def test_sse_format(self):
+        event = JobEvent(job_id="job-1", event_id=7, status="failed", error_message="boom")
+        text = event.to_sse()
+        assert text.startswith("id: 7\nevent: terminal\ndata: {")
+        assert JobEvent.from_json(text.split("data: ", 1)[1]) == event
+
+
+class TestJobEventStream:
+    def test_replays_after_last_event_id_then_streams_live_events(self, redis_client):
+        for progress in (10.0, 20.0):
+            publish_job_event(_job(progress=progress))
+        hub = JobEventHub(client_factory=lambda: None)
+
+        async def scenario():
+            stream = job_event_stream("job-1", last_event_id=1, hub=hub, heartbeat_seconds=5)
+            replayed = await stream.__anext__()
+            # Live delivery through the hub, plus a duplicate that must be dropped.
+            hub.dispatch(publish_job_event(_job(status="succeeded", progress=100.0)).to_json())
+            hub.dispatch(JobEvent(job_id="job-1", event_id=2, status="processing").to_json())
+            return [replayed] + await _collect(stream)
+
+        events = asyncio.run(scenario())
+        assert [(event.event_id, event.status) for event in events] == [(2, "processing"), (3, "completed")]
+        assert hub.subscriber_count() == 0
+
+    def test_snapshot_is_sent_when_nothing_was_retained(self, redis_client):
+        hub = JobEventHub(client_factory=lambda: None)
+        snapshot = JobEvent(job_id="job-1", event_id=0, status="timeout")
+        events = asyncio.run(_collect(job_event_stream("job-1", snapshot=snapshot, hub=hub)))
+        assert events == [snapshot]
+
+    def test_heartbeat_catches_up_from_log(self, redis_client):
+        hub = JobEventHub(client_factory=lambda: None)
+
+        async def scenario():
+            stream = job_event_stream("job-1", last_event_id=0, hub=hub, heartbeat_seconds=0.01)
+            assert await stream.__anext__() is None
+            # Published while the subscription was down: only the log has it.
+            publish_job_event(_job(status="failed"))
+            return await _collect(stream)
+
+        events = asyncio.run(scenario())
+        assert [event.status for event in events] == ["failed"]
@@ -3,9 +3,10 @@
 Covers:
   _compute_dedupe_hash
   _find_existing_job
-  create_render_job (deduplication, validation, enqueue error)
+  create_render_job (deduplication, validation, enqueue error, arrangement link)
+  get_latest_job_for_arrangement
   update_job_status
-  get_job_status
+  get_job_status / get_job_status_async
   list_loop_jobs
 """
 
@@ -193,6 +194,67 @@ def test_create_render_job_enqueue_failure_marks_failed(db, test_loop):
     assert failed.status == "failed"
 
 
+def _make_arrangement(db, loop_id):
+    from app.models.arrangement import Arrangement
+
+    arrangement = Arrangement(loop_id=loop_id, status="queued", target_seconds=60)
+    db.add(arrangement)
+    db.commit()
+    db.refresh(arrangement)
+    return arrangement
+
+
+def test_create_render_job_links_arrangement_at_enqueue(db, test_loop):
+    arrangement = _make_arrangement(db, test_loop.id)
+    params = {"length_seconds": 60, "arrangement_id": arrangement.id}
+    with patch("app.services.job_service.get_queue"):
+        job, _ = job_service.create_render_job(db, test_loop.id, params)
+    assert job.arrangement_id == arrangement.id
+
+
+@pytest.mark.parametrize(
+    "variation_index, routing_enabled, expected",
+    [(None, True, "render"), (0, True, "render"), (2, True, "render_batch"), (2, False, "render")],
+)
+def test_create_render_job_routes_extra_variations_to_batch(
+    db, test_loop, monkeypatch, variation_index, routing_enabled, expected
+):
+    from app.config import settings
+
+    monkeypatch.setattr(settings, "queue_routing_enabled", routing_enabled)
+    params = {"genre": "route_" + uuid.uuid4().hex[:6], "variation_index": variation_index}
+    with patch("app.services.job_service.get_queue") as get_queue:
+        job_service.create_render_job(db, test_loop.id, params)
+
+    assert get_queue.call_args.kwargs["name"] == expected
+    assert get_queue.return_value.enqueue.call_args.kwargs["meta"] == {"fair_share_key": f"loop:{test_loop.id}"}
+
+
+def test_create_render_job_routes_full_render_after_preview_to_batch(db, test_loop, monkeypatch):
+    from app.config import settings
+
+    monkeypatch.setattr(settings, "queue_routing_enabled", True)
+    params = {"variation_index": 0, "quality": "full", "preview_job_id": "job-" + uuid.uuid4().hex[:6]}
+    with patch("app.services.job_service.get_queue") as get_queue:
+        job_service.create_render_job(db, test_loop.id, params)
+
+    assert get_queue.call_args.kwargs["name"] == "render_batch"
+
+
+def test_get_latest_job_for_arrangement_uses_column_not_params(db, test_loop):
+    arrangement = _make_arrangement(db, test_loop.id)
+    older = _make_job(db, test_loop.id, minutes_ago=10)
+    newer = _make_job(db, test_loop.id, minutes_ago=1)
+    # params_json that would have matched the old LIKE '%"arrangement_id": N%' scan.
+    decoy = _make_job(db, test_loop.id, minutes_ago=0)
+    decoy.params_json = json.dumps({"arrangement_id": int(f"{arrangement.id}0")})
+    older.arrangement_id = newer.arrangement_id = arrangement.id
+    db.commit()
+
+    assert job_service.get_latest_job_for_arrangement(db, arrangement.id).id == newer.id
+    assert job_service.get_latest_job_for_arrangement(db, 999999) is None
+
+
 # ---------------------------------------------------------------------------
 # update_job_status
 # ---------------------------------------------------------------------------
@@ -263,6 +325,26 @@ def test_get_job_status_parses_render_metadata(db, test_loop):
     assert response.render_metadata["worker_mode"] == "embedded"
 
 
+@pytest.mark.asyncio
+async def test_get_job_status_async_times_out_stale_processing_job(engine_and_session, db, test_loop):
+    from app.db.async_session import ThreadedSession
+
+    job = _make_job(db, test_loop.id, status="processing")
+    job.started_at = datetime.utcnow() - timedelta(hours=2)
+    db.commit()
+    _, Session = engine_and_session
+    session = ThreadedSession(Session(expire_on_commit=False))
+
+    with patch.object(job_service, "publish_job_event") as publish:
+        response = await job_service.get_job_status_async(session, job.id)
+    await session.close()
+
+    assert response.status == "timeout" and response.finished_at is not None
+    publish.assert_called_once()
+    db.expire_all()
+    assert db.get(RenderJob, job.id).status == "timeout"
+
+
 # ---------------------------------------------------------------------------
 # list_loop_jobs
 # ---------------------------------------------------------------------------
@@ -0,0 +1,112 @@
+"""Tests for the upload ingest job (app/services/loop_ingest.py)."""
+
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.models.base import Base
+from app.models.job import RenderJob
+from app.models.loop import Loop
+from app.services import job_service
+from app.services.loop_ingest import ingest_loop
+
+
+@pytest.fixture
+def db(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'ingest.sqlite'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+@pytest.fixture
+def loop(db):
+    loop = Loop(name="take.wav", filename="take.wav", file_key="uploads/take.wav", status="processing")
+    db.add(loop)
+    db.commit()
+    db.refresh(loop)
+    return loop
+
+
+class TestCreateIngestJob:
+    @pytest.mark.parametrize("size, inline", [(16, True), (64, False)])
+    def test_small_uploads_travel_with_the_job(self, db, loop, monkeypatch, size, inline):
+        from app.config import settings
+
+        monkeypatch.setattr(settings, "ingest_inline_max_bytes", 32)
+        queue = MagicMock()
+        with patch.object(job_service, "get_queue", return_value=queue):
+            job, enqueued = job_service.create_ingest_job(db, loop.id, b"x" * size)
+
+        assert enqueued is True
+        assert (job.job_type, job.status) == ("ingest_loop", "queued")
+        args = queue.enqueue.call_args.args
+        assert args[1:] == (job.id, loop.id, b"x" * size if inline else None)
+
+    def test_ingest_is_enqueued_with_a_real_timeout(self, db, loop, monkeypatch):
+        from app.config import settings
+        from app.workers.supervisor import hard_timeout_seconds
+
+        monkeypatch.setattr(settings, "ingest_job_timeout_seconds", 300)
+        queue = MagicMock()
+        with patch.object(job_service, "get_queue", return_value=queue):
+            job_service.create_ingest_job(db, loop.id, b"audio")
+
+        timeout = queue.enqueue.call_args.kwargs["job_timeout"]
+        assert timeout == 300
+        assert hard_timeout_seconds(MagicMock(func_name="app.workers.ingest_worker.ingest_loop_worker", timeout=timeout)) == 300
+
+    def test_unavailable_queue_leaves_job_for_caller(self, db, loop):
+        with patch.object(job_service, "get_queue", side_effect=RuntimeError("REDIS_URL is not configured")):
+            job, enqueued = job_service.create_ingest_job(db, loop.id, b"audio")
+        assert enqueued is False
+        assert job.status == "queued"
+
+
+class TestIngestLoop:
+    def _job(self, db, loop):
+        job = RenderJob(id="ingest-1", loop_id=loop.id, job_type="ingest_loop")
+        db.add(job)
+        db.commit()
+        return job
+
+    def test_reads_upload_from_storage_when_not_inline(self, db, loop):
+        self._job(db, loop)
+        analysis = {"bpm": 92.4, "key": "Am", "duration": 8.0, "bars": 4}
+        with (
+            patch("app.services.loop_ingest.storage.read_file", return_value=b"RIFF") as read_file,
+            patch("app.services.loop_ingest.loop_analyzer.analyze_content", return_value=analysis),
+            patch("app.services.loop_ingest.build_stem_analysis_json", return_value=json.dumps(analysis)),
+        ):
+            ingest_loop(db, "ingest-1", loop.id)
+
+        read_file.assert_called_once_with("uploads/take.wav")
+        assert (loop.status, loop.bpm, loop.bars) == ("complete", 92, 4)
+        job = db.get(RenderJob, "ingest-1")
+        assert (job.status, job.progress) == ("succeeded", 100.0)
+
+    def test_analysis_failure_is_not_fatal(self, db, loop):
+        self._job(db, loop)
+        with (
+            patch("app.services.loop_ingest.loop_analyzer.analyze_content", side_effect=Exception("bad audio")),
+            patch("app.services.loop_ingest.build_stem_analysis_json", return_value="{}") as separate,
+        ):
+            ingest_loop(db, "ingest-1", loop.id, b"RIFF")
+
+        separate.assert_called_once()
+        assert loop.status == "complete" and loop.bpm is None
+
+    def test_missing_upload_fails_job_and_loop(self, db, loop):
+        self._job(db, loop)
+        with patch("app.services.loop_ingest.storage.read_file", return_value=None):
+            with pytest.raises(FileNotFoundError):
+                ingest_loop(db, "ingest-1", loop.id)
+
+        assert loop.status == "failed"
+        job = db.get(RenderJob, "ingest-1")
+        assert job.status == "failed" and "not found" in job.error_message
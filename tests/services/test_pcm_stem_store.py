@@ -0,0 +1,222 @@
+"""Tests for the canonical memory-mapped PCM stem store."""
+
+from __future__ import annotations
+
+import json
+import pickle
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+from pydub import AudioSegment
+
+from app.config import settings
+from app.services.pcm_stem_store import (
+    PcmStem,
+    open_pcm_stem_for_key,
+    pcm_path_for_key,
+    persist_pcm_stems,
+    write_pcm_stem,
+)
+from app.services.storage import storage
+from app.services.stem_arrangement_engine import SectionConfig, StemRole
+from app.services.stem_render_executor import StemRenderExecutor
+
+
+def _noise(duration_ms: int = 500, *, channels: int = 2, frame_rate: int = 44100, seed: int = 4) -> AudioSegment:
+    rng = np.random.default_rng(seed)
+    frames = int(frame_rate * duration_ms / 1000)
+    samples = (rng.standard_normal((frames, channels)) * 2500).astype(np.int16)
+    return AudioSegment(samples.tobytes(), frame_rate=frame_rate, sample_width=2, channels=channels)
+
+
+@pytest.fixture
+def store_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "pcm_stem_store_enabled", True)
+    monkeypatch.setattr(settings, "pcm_stem_store_dir", str(tmp_path / "pcm"))
+    monkeypatch.setattr(storage, "use_s3", False)
+    monkeypatch.setattr(storage, "upload_dir", tmp_path / "storage")
+    return tmp_path / "pcm"
+
+
+class TestPcmStem:
+    def test_round_trip_is_lossless(self, tmp_path):
+        audio = _noise()
+        layout = write_pcm_stem(audio, tmp_path / "drums.pcm")
+        stem = PcmStem.open(layout["path"])
+        assert layout["frames"] == stem.frame_count
+        assert stem.to_segment().raw_data == audio.raw_data
+        assert len(stem) == len(audio)
+
+    def test_canonicalizes_mono_and_sample_rate(self, tmp_path):
+        layout = write_pcm_stem(_noise(channels=1, frame_rate=22050), tmp_path / "bass.pcm")
+        stem = PcmStem.open(layout["path"])
+        assert (layout["channels"], layout["frame_rate"]) == (2, 44100)
+        assert abs(len(stem) - 500) <= 1
+
+    def test_pads_and_trims_to_pack_duration(self, tmp_path):
+        short = PcmStem.open(write_pcm_stem(_noise(300), tmp_path / "a.pcm", duration_ms=500)["path"])
+        long = PcmStem.open(write_pcm_stem(_noise(800), tmp_path / "b.pcm", duration_ms=500)["path"])
+        assert short.frame_count == long.frame_count == int(0.5 * 44100)
+        assert not short.view(300, 500).any()
+
+    def test_view_is_zero_copy(self, tmp_path):
+        stem = PcmStem.open(write_pcm_stem(_noise(), tmp_path / "s.pcm")["path"])
+        view = stem.view(100, 200)
+        assert isinstance(view.base, np.memmap) or isinstance(view, np.memmap)
+        assert not view.flags.writeable
+
+    def test_slice_matches_pydub_slicing(self, tmp_path):
+        audio = _noise()
+        stem = PcmStem.open(write_pcm_stem(audio, tmp_path / "s.pcm")["path"])
+        assert stem.segment(123, 377).raw_data == audio[123:377].raw_data
+
+    def test_repeat_to_matches_pydub_loop(self, tmp_path):
+        audio = _noise(300)
+        stem = PcmStem.open(write_pcm_stem(audio, tmp_path / "s.pcm")["path"])
+        expected = (audio * 4)[:1000]
+        assert stem.repeat_to(1000).raw_data == expected.raw_data
+
+    def test_mapped_segment_behaves_like_the_decoded_stem(self, tmp_path):
+        audio = _noise(400)
+        mapped = PcmStem.open(write_pcm_stem(audio, tmp_path / "s.pcm")["path"]).mapped_segment()
+
+        assert not isinstance(mapped.raw_data, bytes)
+        assert isinstance(mapped[100:200].raw_data, bytes)
+        assert mapped[100:200].raw_data == audio[100:200].raw_data
+        assert (mapped + audio).raw_data == (audio + audio).raw_data
+        assert (mapped * 2).raw_data == (audio * 2).raw_data
+        assert mapped.overlay(audio).raw_data == audio.overlay(audio).raw_data
+        assert mapped.get_array_of_samples() == audio.get_array_of_samples()
+        assert mapped.apply_gain(-6).raw_data == audio.apply_gain(-6).raw_data
+        assert mapped == audio
+        assert pickle.loads(pickle.dumps(mapped)).raw_data == audio.raw_data
+
+
+class TestStoreHelpers:
+    def test_persist_and_open_by_key(self, store_dir):
+        layouts = persist_pcm_stems({"drums": "stems/loop_1_drums.wav"}, {"drums": _noise()}, duration_ms=500)
+        assert layouts["drums"]["key"] == "stems/loop_1_drums.pcm"
+        assert "path" not in layouts["drums"]
+        assert storage.file_exists("stems/loop_1_drums.pcm")
+        stem = open_pcm_stem_for_key("stems/loop_1_drums.wav")
+        assert stem is not None and stem.frame_count == layouts["drums"]["frames"]
+        assert stem.path == pcm_path_for_key(
+            "stems/loop_1_drums.wav", storage.get_object_version("stems/loop_1_drums.pcm")
+        )
+
+    def test_worker_without_a_local_copy_downloads_it_from_storage(self, store_dir, tmp_path, monkeypatch):
+        audio = _noise()
+        persist_pcm_stems({"drums": "stems/loop_3_drums.wav"}, {"drums": audio})
+        # A worker host has its own, empty cache directory.
+        monkeypatch.setattr(settings, "pcm_stem_store_dir", str(tmp_path / "worker_pcm"))
+
+        stem = open_pcm_stem_for_key("stems/loop_3_drums.wav")
+
+        assert stem is not None and stem.path.parent == tmp_path / "worker_pcm"
+        assert stem.to_segment().raw_data == audio.raw_data
+        assert open_pcm_stem_for_key("stems/loop_4_drums.wav") is None
+
+    def test_rewritten_stem_is_fetched_again(self, store_dir):
+        persist_pcm_stems({"drums": "stems/loop_5_drums.wav"}, {"drums": _noise(seed=1)})
+        first = open_pcm_stem_for_key("stems/loop_5_drums.wav")
+        replacement = _noise(seed=2)
+        persist_pcm_stems({"drums": "stems/loop_5_drums.wav"}, {"drums": replacement})
+
+        second = open_pcm_stem_for_key("stems/loop_5_drums.wav")
+
+        assert second.path != first.path
+        assert second.to_segment().raw_data == replacement.raw_data
+
+    def test_local_paths_keep_the_stem_extension(self):
+        assert pcm_path_for_key("stems/a.wav", "v1") != pcm_path_for_key("stems/a.mp3", "v1")
+        assert pcm_path_for_key("stems/a.wav", "v1") != pcm_path_for_key("stems/a.wav", "v2")
+
+    def test_cache_evicts_least_recently_used_copies(self, store_dir, monkeypatch):
+        import os
+
+        audio = _noise(500)
+        persist_pcm_stems({"drums": "stems/loop_6_drums.wav", "bass": "stems/loop_6_bass.wav"},
+                          {"drums": audio, "bass": audio})
+        drums = open_pcm_stem_for_key("stems/loop_6_drums.wav").path
+        bass = open_pcm_stem_for_key("stems/loop_6_bass.wav").path
+        os.utime(drums, (1, 1))
+        monkeypatch.setattr(settings, "pcm_stem_store_max_bytes", 2 * len(audio.raw_data))
+
+        persist_pcm_stems({"melody": "stems/loop_6_melody.wav"}, {"melody": audio})
+
+        assert not drums.exists() and bass.exists()
+        assert open_pcm_stem_for_key("stems/loop_6_drums.wav").to_segment().raw_data == audio.raw_data
+
+    def test_disabled_store_is_skipped(self, store_dir, monkeypatch):
+        monkeypatch.setattr(settings, "pcm_stem_store_enabled", False)
+        assert persist_pcm_stems({"drums": "stems/x.wav"}, {"drums": _noise()}) == {}
+        assert open_pcm_stem_for_key("stems/x.wav") is None
+
+    def test_stem_loader_prefers_pcm_store(self, store_dir):
+        from app.services.stem_loader import _load_stem_audio_from_storage
+
+        audio = _noise()
+        persist_pcm_stems({"bass": "stems/loop_2_bass.wav"}, {"bass": audio})
+        with patch("app.services.stem_loader._fetch_stem_audio_from_storage") as fetch:
+            loaded = _load_stem_audio_from_storage("stems/loop_2_bass.wav", 5.0)
+        fetch.assert_not_called()
+        assert not isinstance(loaded.raw_data, bytes)
+        assert loaded.raw_data == audio.raw_data
+
+
+class TestStemRenderExecutorPcm:
+    def test_pcm_render_matches_wav_render(self, tmp_path):
+        drums, bass = _noise(700, seed=1), _noise(700, seed=2)
+        drums.export(str(tmp_path / "drums.wav"), format="wav")
+        bass.export(str(tmp_path / "bass.wav"), format="wav")
+        write_pcm_stem(drums, tmp_path / "drums.pcm")
+        write_pcm_stem(bass, tmp_path / "bass.pcm")
+        sections = [
+            SectionConfig(
+                name="Verse",
+                section_type="verse",
+                bar_start=0,
+                bars=1,
+                active_stems={StemRole.DRUMS, StemRole.BASS},
+                energy_level=0.5,
+                producer_moves=[],
+                stem_states={},
+                bpm=120,
+            )
+        ]
+
+        def _render(suffix: str) -> AudioSegment:
+            executor = StemRenderExecutor()
+            return executor.render_from_stems(
+                stem_files={
+                    StemRole.DRUMS: tmp_path / f"drums{suffix}",
+                    StemRole.BASS: tmp_path / f"bass{suffix}",
+                },
+                sections=sections,
+                apply_master=False,
+            )
+
+        executor = StemRenderExecutor()
+        executor._load_stems({StemRole.DRUMS: tmp_path / "drums.pcm"})
+        assert isinstance(executor.stems_cache[StemRole.DRUMS], PcmStem)
+        assert _render(".pcm").raw_data == _render(".wav").raw_data
+
+    def test_router_prefers_pcm_copy_from_stem_files_json(self, store_dir):
+        from app.services.render_path_router import RenderPathRouter
+
+        layout = persist_pcm_stems({"drums": "stems/loop_1_drums.wav"}, {"drums": _noise()})["drums"]
+        local_copy = pcm_path_for_key("stems/loop_1_drums.wav", storage.get_object_version(layout["key"]))
+        local_copy.unlink()
+
+        class _Loop:
+            id = 1
+            stem_files_json = json.dumps({
+                "drums": {"file_key": "stems/loop_1_drums.wav", "pcm": layout},
+                "bass": {"file_key": "stems/loop_1_bass.wav", "pcm": {"key": "stems/loop_1_bass.pcm"}},
+            })
+
+        roles = RenderPathRouter.get_available_stem_roles(_Loop())
+        assert roles[StemRole.DRUMS] == str(local_copy)
+        assert roles[StemRole.BASS] == "stems/loop_1_bass.wav"
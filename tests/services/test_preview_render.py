@@ -0,0 +1,130 @@
+"""Tests for preview renders (app/services/preview_render.py and render_from_plan(preview=True))."""
+
+import json
+import subprocess
+
+from pydub import AudioSegment
+
+from app.services import preview_render, render_executor
+
+
+def _stereo(duration_ms=200, frame_rate=44100):
+    return AudioSegment.silent(duration=duration_ms, frame_rate=frame_rate).set_channels(2)
+
+
+def test_downsample_uses_preview_rate_and_channels(monkeypatch):
+    monkeypatch.setattr(preview_render.settings, "render_preview_frame_rate", 22050)
+    monkeypatch.setattr(preview_render.settings, "render_preview_channels", 1)
+
+    audio = preview_render.downsample(_stereo())
+
+    assert (audio.frame_rate, audio.channels) == (22050, 1)
+
+
+def test_encode_preview_falls_back_to_wav_without_ffmpeg(monkeypatch):
+    monkeypatch.setattr(preview_render, "_ffmpeg", lambda: None)
+
+    encoded = preview_render.encode_preview(_stereo())
+
+    assert (encoded.content_type, encoded.extension, encoded.codec) == ("audio/wav", ".wav", "wav")
+    assert encoded.data[:4] == b"RIFF"
+
+
+def test_encode_preview_pipes_pcm_through_ffmpeg(monkeypatch):
+    seen = {}
+
+    def _run(cmd, input, **kwargs):
+        seen["cmd"], seen["input"] = cmd, input
+        return subprocess.CompletedProcess(cmd, 0, stdout=b"OggS...", stderr=b"")
+
+    monkeypatch.setattr(preview_render, "_ffmpeg", lambda: "ffmpeg")
+    monkeypatch.setattr(preview_render.settings, "render_preview_format", "opus")
+    monkeypatch.setattr(preview_render.subprocess, "run", _run)
+    audio = _stereo(frame_rate=24000)
+
+    encoded = preview_render.encode_preview(audio)
+
+    assert (encoded.data, encoded.content_type, encoded.extension) == (b"OggS...", "audio/ogg", ".opus")
+    assert "libopus" in seen["cmd"] and seen["input"] == audio.raw_data
+
+
+def test_full_render_params_carry_the_planned_arrangement():
+    snapshot = {"render_plan": {"bpm": 120}, "producer_arrangement": {"sections": []}, "summary": {}}
+
+    params = preview_render.full_render_params(
+        {"quality": "preview", "variation_index": 0, "render_plan_json": "{}"},
+        preview_job_id="job-1",
+        arrangement_id=7,
+        snapshot=snapshot,
+    )
+
+    assert params["quality"] == "full" and params["variation_index"] == 0
+    assert params["preview_job_id"] == "job-1" and params["preview_arrangement_id"] == 7
+    assert params["planned_arrangement"] is snapshot
+
+
+def _stub_render_pipeline(monkeypatch, rendered):
+    def _render(loop_audio, producer_arrangement, **kwargs):
+        rendered.append((loop_audio, producer_arrangement))
+        timeline = {"sections": [{"name": "intro", "type": "intro"}], "events": []}
+        return loop_audio, json.dumps(timeline)
+
+    monkeypatch.setattr("app.services.arrangement_jobs._render_producer_arrangement", _render)
+    monkeypatch.setattr(render_executor, "_build_render_observability", lambda **kwargs: {})
+    monkeypatch.setattr(render_executor, "_assert_metric_recompute_pipeline", lambda obs: None)
+    monkeypatch.setattr(render_executor, "_assert_producer_runtime_not_noop", lambda **kwargs: None)
+    monkeypatch.setattr(render_executor, "_assert_dynamic_arrangement", lambda **kwargs: None)
+
+
+def test_preview_render_skips_mastering_and_reuses_the_plan(monkeypatch, tmp_path):
+    rendered = []
+    _stub_render_pipeline(monkeypatch, rendered)
+
+    def _no_mastering(*args, **kwargs):
+        raise AssertionError("preview must not master")
+
+    monkeypatch.setattr(render_executor, "apply_mastering", _no_mastering)
+    monkeypatch.setattr(preview_render.settings, "render_preview_frame_rate", 24000)
+    monkeypatch.setattr(preview_render.settings, "render_preview_channels", 1)
+    monkeypatch.setattr(preview_render, "_ffmpeg", lambda: None)
+    render_plan = {
+        "bpm": 120,
+        "key": "C",
+        "sections": [{"name": "intro", "type": "intro", "bars": 4}],
+        "events": [],
+        "render_profile": {},
+    }
+    output = tmp_path / "preview"
+
+    result = render_executor.render_from_plan(
+        render_plan_json=render_plan,
+        audio_source=_stereo(),
+        output_path=output,
+        preview=True,
+    )
+
+    loop_audio, planned_payload = rendered[0]
+    assert (loop_audio.frame_rate, loop_audio.channels) == (24000, 1)
+    assert result["postprocess"]["mastering"]["applied"] is False
+    assert (result["output_content_type"], result["output_extension"]) == ("audio/wav", ".wav")
+    assert output.read_bytes()[:4] == b"RIFF"
+
+    def _no_replanning(**kwargs):
+        raise AssertionError("full render must reuse the preview's arrangement")
+
+    monkeypatch.setattr(render_executor, "_build_producer_arrangement_from_render_plan", _no_replanning)
+
+    def _mastering(audio, genre=None):
+        return render_executor.MasteringResult(audio, "test", -1.0, -1.0, True)
+
+    monkeypatch.setattr(render_executor, "apply_mastering", _mastering)
+    full = render_executor.render_from_plan(
+        render_plan_json=render_plan,
+        audio_source=_stereo(),
+        output_path=tmp_path / "full.wav",
+        planned_arrangement=json.loads(json.dumps(result["planned_arrangement"])),
+    )
+
+    assert rendered[1][1] == planned_payload
+    assert rendered[1][0].frame_rate == 44100
+    assert full["output_content_type"] == "audio/wav"
@@ -0,0 +1,115 @@
+"""Tests for the preallocated render buffer used to assemble arrangements."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+from pydub import AudioSegment
+
+from app.services.dsp import RenderBuffer
+
+
+def _tone(duration_ms: int, *, channels: int = 2, frame_rate: int = 44100, seed: int = 3) -> AudioSegment:
+    rng = np.random.default_rng(seed)
+    frames = int(frame_rate * duration_ms / 1000)
+    samples = (rng.standard_normal((frames, channels)) * 3000).astype(np.int16)
+    return AudioSegment(samples.tobytes(), frame_rate=frame_rate, sample_width=2, channels=channels)
+
+
+def _samples(segment: AudioSegment) -> np.ndarray:
+    return np.frombuffer(segment.raw_data, dtype=np.int16).astype(np.int32)
+
+
+class TestRenderBufferWrites:
+    def test_append_without_crossfade_matches_concatenation(self):
+        parts = [_tone(250, seed=i) for i in range(4)]
+        buffer = RenderBuffer.like(parts[0], duration_ms=1000)
+        for part in parts:
+            buffer.append(part)
+        expected = parts[0] + parts[1] + parts[2] + parts[3]
+        assert buffer.to_segment().raw_data == expected.raw_data
+
+    def test_append_with_crossfade_matches_pydub_length_and_level(self):
+        first, second = _tone(500, seed=1), _tone(500, seed=2)
+        buffer = RenderBuffer.like(first)
+        buffer.append(first)
+        buffer.append(second, crossfade_ms=30)
+        result = buffer.to_segment()
+        reference = first.append(second, crossfade=30)
+        assert abs(len(result) - len(reference)) <= 1
+        assert abs(result.rms - reference.rms) / reference.rms < 0.02
+
+    def test_short_segments_skip_crossfade(self):
+        first, second = _tone(40, seed=1), _tone(40, seed=2)
+        buffer = RenderBuffer.like(first)
+        buffer.append(first)
+        buffer.append(second, crossfade_ms=30)
+        assert buffer.to_segment().raw_data == (first + second).raw_data
+
+    def test_write_at_with_gain_matches_chunked_pydub_loop(self):
+        audio = _tone(1000)
+        grid = 37
+        reference = AudioSegment.silent(duration=0)
+        buffer = RenderBuffer.like(audio)
+        for ms in range(0, len(audio), grid):
+            chunk = audio[ms: ms + grid]
+            gain = 4 if (ms // grid) % 2 == 0 else -3
+            reference += chunk + gain
+            buffer.write_at(ms, chunk, gain_db=gain)
+        result = buffer.to_segment()
+        assert len(result.raw_data) == len(reference.raw_data)
+        assert np.max(np.abs(_samples(result) - _samples(reference))) <= 1
+
+    def test_mix_at_sums_into_existing_audio(self):
+        base = _tone(500, seed=5)
+        layer = _tone(200, seed=6)
+        buffer = RenderBuffer.like(base)
+        buffer.append(base)
+        buffer.mix_at(100, layer)
+        reference = base.overlay(layer, position=100)
+        assert np.max(np.abs(_samples(buffer.to_segment()) - _samples(reference))) <= 1
+
+    def test_crossfade_at_blends_head_of_incoming_segment(self):
+        base = AudioSegment.silent(duration=200, frame_rate=44100).set_channels(2)
+        incoming = _tone(200, seed=9)
+        buffer = RenderBuffer.like(base)
+        buffer.append(base)
+        buffer.crossfade_at(100, incoming, crossfade_ms=50)
+        frames = buffer.peek()
+        start = int(100 * 44.1)
+        # Silence fades out under the incoming audio, so the first frame is muted
+        # and the level ramps up across the window.
+        assert np.all(frames[start] == 0.0)
+        assert buffer.length_frames == start + int(len(incoming.raw_data) / 4)
+
+
+class TestRenderBufferAllocation:
+    def test_for_arrangement_preallocates_total_bars(self):
+        template = _tone(10)
+        buffer = RenderBuffer.for_arrangement(total_bars=8, bar_duration_ms=2000, template=template)
+        assert buffer.capacity_frames == 8 * 2000 * 44100 // 1000
+        assert buffer.length_frames == 0
+        assert len(buffer) == 0
+
+    def test_buffer_grows_past_reservation(self):
+        template = _tone(100)
+        buffer = RenderBuffer.like(template, duration_ms=100)
+        for _ in range(5):
+            buffer.append(template)
+        assert len(buffer.to_segment()) == 500
+
+    @pytest.mark.parametrize("channels", [1, 2])
+    def test_converts_channel_count_and_frame_rate(self, channels):
+        template = _tone(100, channels=channels)
+        buffer = RenderBuffer.like(template)
+        buffer.append(_tone(100, channels=3 - channels, frame_rate=22050))
+        result = buffer.to_segment()
+        assert result.channels == channels
+        assert result.frame_rate == 44100
+        assert abs(len(result) - 100) <= 1
+
+    def test_empty_buffer_exports_empty_segment(self):
+        buffer = RenderBuffer(frame_rate=44100, channels=2)
+        result = buffer.to_segment()
+        assert len(result) == 0
+        assert result.channels == 2
@@ -0,0 +1,144 @@
+"""Tests for streaming WAV render output and storage upload streams."""
+
+from __future__ import annotations
+
+import io
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+from pydub import AudioSegment
+
+from app.services.render_output import StreamingWavWriter, stream_wav
+from app.services.storage import LocalUploadStream, S3MultipartUploadStream, S3StorageError, UploadStream
+
+MIB = 1024 * 1024
+
+
+def _noise(duration_ms: int = 300, *, sample_width: int = 2, seed: int = 7) -> AudioSegment:
+    rng = np.random.default_rng(seed)
+    frames = int(44100 * duration_ms / 1000)
+    dtype = {1: np.int8, 2: np.int16}[sample_width]
+    samples = (rng.standard_normal((frames, 2)) * (20 if sample_width == 1 else 3000)).astype(dtype)
+    return AudioSegment(samples.tobytes(), frame_rate=44100, sample_width=sample_width, channels=2)
+
+
+def _exported(audio: AudioSegment) -> bytes:
+    buf = io.BytesIO()
+    audio.export(buf, format="wav")
+    return buf.getvalue()
+
+
+def _s3_client() -> MagicMock:
+    client = MagicMock()
+    client.create_multipart_upload.return_value = {"UploadId": "up-1"}
+    client.upload_part.side_effect = lambda **kw: {"ETag": f"etag-{kw['PartNumber']}"}
+    return client
+
+
+def _uploaded_object(client: MagicMock) -> bytes:
+    bodies = {c.kwargs["PartNumber"]: c.kwargs["Body"] for c in client.upload_part.call_args_list}
+    parts = client.complete_multipart_upload.call_args.kwargs["MultipartUpload"]["Parts"]
+    return b"".join(bodies[p["PartNumber"]] for p in parts)
+
+
+class TestStreamingWavWriter:
+    @pytest.mark.parametrize("sample_width", [1, 2])
+    def test_matches_pydub_export(self, sample_width):
+        audio = _noise(sample_width=sample_width)
+        sink = io.BytesIO()
+        stream_wav(audio, sink, chunk_frames=1000)
+        assert sink.getvalue() == _exported(audio)
+
+    def test_incremental_writes_patch_header(self):
+        parts = [_noise(100, seed=i) for i in range(3)]
+        sink = io.BytesIO()
+        with StreamingWavWriter.like(parts[0], sink) as writer:
+            for part in parts:
+                writer.write_segment(part)
+        assert sink.getvalue() == _exported(parts[0] + parts[1] + parts[2])
+
+    def test_rejects_partial_frames(self):
+        writer = StreamingWavWriter(io.BytesIO(), frame_rate=44100, channels=2, sample_width=2)
+        with pytest.raises(ValueError):
+            writer.write_frames(b"\x00\x01\x02")
+
+
+def test_incomplete_upload_stream_fails_on_creation():
+    class _WriteOnly(UploadStream):
+        def write(self, data) -> int:
+            return len(data)
+
+    with pytest.raises(TypeError):
+        _WriteOnly("k.wav", "audio/wav")
+
+
+class TestLocalUploadStream:
+    def test_commits_on_close(self, tmp_path):
+        audio = _noise()
+        with LocalUploadStream("renders/job/arrangement.wav", "audio/wav", tmp_path) as stream:
+            stream_wav(audio, stream)
+        assert (tmp_path / "arrangement.wav").read_bytes() == _exported(audio)
+        assert not list(tmp_path.glob("*.part"))
+
+    def test_abort_leaves_nothing(self, tmp_path):
+        stream = LocalUploadStream("renders/job/arrangement.wav", "audio/wav", tmp_path)
+        stream.write(b"partial")
+        stream.abort()
+        assert list(Path(tmp_path).iterdir()) == []
+
+
+class TestS3MultipartUploadStream:
+    def test_parts_reassemble_to_exported_wav(self):
+        audio = _noise(duration_ms=70_000)  # ~12 MiB -> three 5 MiB parts
+        client = _s3_client()
+        stream = S3MultipartUploadStream(
+            "renders/job/arrangement.wav", "audio/wav", client=client, bucket="b", part_size=5 * MIB
+        )
+        stream_wav(audio, stream)
+        assert stream.close() == "renders/job/arrangement.wav"
+        assert client.upload_part.call_count == 3
+        assert _uploaded_object(client) == _exported(audio)
+        client.abort_multipart_upload.assert_not_called()
+
+    def test_small_object_is_single_part(self):
+        audio = _noise()
+        client = _s3_client()
+        stream = S3MultipartUploadStream("k.wav", "audio/wav", client=client, bucket="b")
+        stream_wav(audio, stream)
+        stream.close()
+        assert client.upload_part.call_count == 1
+        assert _uploaded_object(client) == _exported(audio)
+
+    def test_failed_part_aborts_upload(self):
+        client = _s3_client()
+        client.upload_part.side_effect = RuntimeError("boom")
+        stream = S3MultipartUploadStream(
+            "k.wav", "audio/wav", client=client, bucket="b", client_error=RuntimeError, part_attempts=2
+        )
+        stream.write(b"\x00" * 16)
+        with pytest.raises(S3StorageError):
+            stream.close()
+        assert client.upload_part.call_count == 2
+        client.abort_multipart_upload.assert_called_once()
+        client.complete_multipart_upload.assert_not_called()
+
+
+class TestRenderWorkerOutputStream:
+    def test_disabled_streaming_uses_temp_file_path(self, monkeypatch):
+        from app.config import settings
+        from app.workers import render_worker
+
+        monkeypatch.setattr(settings, "render_streaming_upload_enabled", False)
+        assert render_worker._open_render_output_stream("job", "arrangement.wav") is None
+
+    def test_opens_stream_under_render_key(self, monkeypatch):
+        from app.config import settings
+        from app.workers import render_worker
+
+        mock_storage = MagicMock()
+        monkeypatch.setattr(settings, "render_streaming_upload_enabled", True)
+        monkeypatch.setattr(render_worker, "storage", mock_storage)
+        render_worker._open_render_output_stream("job", "arrangement.wav")
+        mock_storage.open_upload_stream.assert_called_once_with("renders/job/arrangement.wav", "audio/wav")
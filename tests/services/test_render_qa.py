@@ -13,6 +13,8 @@ Tests:
 import os
 import tempfile
 import pytest
+from pydub.generators import Sine
+
 from app.services.producer_plan_builder import (
     ProducerPlanBuilderV2,
     SectionKind,
@@ -218,6 +220,33 @@ class TestScoreRenderOutput:
             os.unlink(path)
 
 
+class TestScoreSectionAudio:
+    """RenderQAService.score_section_audio tests."""
+
+    @staticmethod
+    def _mix(melody_db, rhythm_db=-2):
+        melody = Sine(1200).to_audio_segment(duration=1000).apply_gain(melody_db)
+        bass = Sine(90).to_audio_segment(duration=1000).apply_gain(rhythm_db)
+        drum = Sine(3500).to_audio_segment(duration=1000).apply_gain(rhythm_db)
+        return melody.overlay(bass).overlay(drum)
+
+    def test_buried_melody_in_melodic_section_is_flagged(self):
+        buried = self._mix(-30)
+        result = RenderQAService.score_section_audio(
+            [("Verse 1", "verse", buried), ("Intro", "intro", buried)]
+        )
+        assert "audio_melody_buried" in result.checks_run
+        assert result.score.clarity_score == 100.0 - RenderQAService._AUDIO_BALANCE_PENALTIES["audio_melody_buried"]
+        assert [w.split(":")[0] for w in result.score.warnings] == ["audio_melody_buried"]
+        assert "Verse 1" in result.score.warnings[0]
+        assert result.passed
+
+    def test_audible_melody_passes(self):
+        result = RenderQAService.score_section_audio([("Hook", "hook", self._mix(0, rhythm_db=-30))])
+        assert result.score.clarity_score == 100.0
+        assert not result.score.warnings
+
+
 class TestRegressionValidOutputsNotRejected:
     """Regression: valid, well-formed outputs should not be rejected."""
 
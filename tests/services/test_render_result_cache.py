@@ -0,0 +1,165 @@
+"""Tests for the fingerprint-keyed render result cache."""
+
+from __future__ import annotations
+
+import json
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from app.services import render_result_cache
+from app.services.render_result_cache import RenderResultCache, output_key, render_fingerprint
+
+PLAN = {
+    "bpm": 120,
+    "total_bars": 16,
+    "sections": [{"name": "Intro", "bars": 8}, {"name": "Hook", "bars": 8}],
+    "render_profile": {"genre_profile": "trap"},
+}
+FLAGS = {"feature_mastering_stage": True}
+STEMS = {"drums": "loops/1_drums.wav", "bass": "loops/1_bass.wav"}
+
+
+class _MemoryStore:
+    """Just enough of the storage service for the cache."""
+
+    def __init__(self):
+        self.objects: dict[str, bytes] = {}
+
+    def read_file(self, key):
+        return self.objects.get(key)
+
+    def upload_file(self, file_bytes, content_type, key):
+        self.objects[key] = file_bytes
+        return key
+
+    def delete_file(self, key):
+        self.objects.pop(key, None)
+
+    def file_exists(self, key):
+        return key in self.objects
+
+
+def _fingerprint(**overrides):
+    kwargs = dict(source_version="etag:abc", stem_keys=STEMS, render_plan=PLAN, feature_flags=FLAGS)
+    kwargs.update(overrides)
+    return render_fingerprint(**kwargs)
+
+
+def _cached(store: _MemoryStore, fingerprint: str) -> RenderResultCache:
+    cache = RenderResultCache(store)
+    store.upload_file(b"RIFF", "audio/wav", output_key(fingerprint))
+    cache.put(
+        fingerprint,
+        output_s3_key=output_key(fingerprint),
+        content_type="audio/wav",
+        render_result={"timeline_json": "{}", "postprocess": {"mastering": {"applied": True}}, "extra": object()},
+    )
+    return cache
+
+
+class TestRenderFingerprint:
+    def test_stable_across_key_order_and_encoding(self):
+        reordered = json.dumps(dict(reversed(list(PLAN.items()))))
+        assert _fingerprint() == _fingerprint(render_plan=reordered, stem_keys=dict(reversed(list(STEMS.items()))))
+
+    @pytest.mark.parametrize(
+        "overrides",
+        [
+            {"source_version": "etag:def"},
+            {"stem_keys": {"drums": "loops/1_drums.wav"}},
+            {"render_plan": {**PLAN, "bpm": 121}},
+            {"feature_flags": {"feature_mastering_stage": False}},
+            {"version": "0+0.0.0"},
+        ],
+    )
+    def test_every_input_changes_fingerprint(self, overrides):
+        assert _fingerprint(**overrides) != _fingerprint()
+
+    def test_post_render_fields_are_ignored(self):
+        annotated = {
+            **PLAN,
+            "_shadow_timings": {"groove": {"wall_ms": 12.5}},
+            "render_profile": {**PLAN["render_profile"], "postprocess": {"mastering": {}}},
+        }
+        assert _fingerprint(render_plan=annotated) == _fingerprint()
+
+    def test_cache_version_setting_changes_fingerprint(self, monkeypatch):
+        from app.config import settings
+
+        before = _fingerprint()
+        monkeypatch.setattr(settings, "render_result_cache_version", "flush-1")
+        assert _fingerprint() != before
+
+
+class TestRenderResultCache:
+    def test_round_trip_and_hit_accounting(self):
+        store = _MemoryStore()
+        fingerprint = _fingerprint()
+        cache = _cached(store, fingerprint)
+
+        entry = cache.lookup(fingerprint)
+        assert entry.output_s3_key == f"render-cache/{fingerprint}.wav"
+        assert entry.render_result == {"timeline_json": "{}", "postprocess": {"mastering": {"applied": True}}}
+        assert cache.lookup(_fingerprint(source_version="etag:other")) is None
+
+        stats = cache.stats()
+        assert (stats["hits"], stats["misses"], stats["stores"]) == (1, 1, 1)
+        assert stats["hit_ratio"] == 0.5
+
+    def test_engine_version_change_invalidates_entry(self):
+        store = _MemoryStore()
+        fingerprint = _fingerprint()
+        cache = _cached(store, fingerprint)
+
+        with patch.object(render_result_cache, "RENDER_ENGINE_VERSION", "999"):
+            assert cache.lookup(fingerprint) is None
+        assert cache.stats()["stale"] == 1
+        # The stale manifest is gone, so the next lookup is a plain miss.
+        assert cache.lookup(fingerprint) is None
+        assert cache.stats()["stale"] == 1
+
+    def test_missing_output_object_is_a_miss(self):
+        store = _MemoryStore()
+        fingerprint = _fingerprint()
+        cache = _cached(store, fingerprint)
+        store.delete_file(output_key(fingerprint))
+
+        assert cache.lookup(fingerprint) is None
+        assert cache.stats()["invalidations"] == 1
+
+    def test_storage_errors_are_misses(self):
+        class _BrokenStore(_MemoryStore):
+            def read_file(self, key):
+                raise RuntimeError("s3 down")
+
+        cache = RenderResultCache(_BrokenStore())
+        assert cache.lookup(_fingerprint()) is None
+        assert cache.stats()["errors"] == 1
+
+
+class TestWorkerFingerprint:
+    def test_disabled_cache_returns_none(self):
+        from app.workers import render_worker
+
+        loop = SimpleNamespace(id=1, file_key="uploads/loop.wav", file_url=None)
+        assert render_worker._render_fingerprint(loop, PLAN, None, FLAGS) is None
+
+    def test_unversioned_source_bypasses_cache(self, monkeypatch):
+        from app.config import settings
+        from app.workers import render_worker
+
+        monkeypatch.setattr(settings, "render_result_cache_enabled", True)
+        monkeypatch.setattr(render_worker.storage, "get_object_version", lambda key: None)
+        loop = SimpleNamespace(id=1, file_key="uploads/loop.wav", file_url=None)
+        before = render_worker.get_render_result_cache().stats()["bypassed"]
+        assert render_worker._render_fingerprint(loop, PLAN, None, FLAGS) is None
+        assert render_worker.get_render_result_cache().stats()["bypassed"] == before + 1
+
+    def test_stem_keys_follow_stem_loader_metadata(self):
+        from app.workers import render_worker
+
+        meta = {"enabled": True, "succeeded": True, "stem_s3_keys": {**STEMS, "vocals": None}}
+        assert render_worker._stem_keys_from_metadata(meta) == STEMS
+        assert render_worker._stem_keys_from_metadata({**meta, "succeeded": False}) == {}
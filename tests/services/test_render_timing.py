@@ -0,0 +1,103 @@
+"""Tests for render timing spans and profiles (app/services/render_timing.py)."""
+
+from __future__ import annotations
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.config import settings
+from app.services import render_timing
+
+
+def test_spans_nest_and_stage_totals_count_nested_spans_once():
+    with render_timing.profiling("job-1") as profile:
+        with render_timing.span("render_sections", "section"):
+            with render_timing.span("section:0", "section", bars=4):
+                with render_timing.span("dsp:chop", "dsp"):
+                    sum(range(20000))
+
+    data = profile.to_dict()
+    by_name = {s["name"]: s for s in data["spans"]}
+    assert data["label"] == "job-1"
+    assert by_name["section:0"]["parent"] == by_name["render_sections"]["id"]
+    assert by_name["dsp:chop"]["parent"] == by_name["section:0"]["id"]
+    assert by_name["section:0"]["attrs"] == {"bars": 4}
+    assert by_name["dsp:chop"]["cpu_ms"] >= 0.0
+    assert by_name["render_sections"]["wall_ms"] >= by_name["section:0"]["wall_ms"]
+    assert data["stages"]["section"]["count"] == 1
+    assert data["stages"]["section"]["wall_ms"] == by_name["render_sections"]["wall_ms"]
+    assert data["stages"]["dsp"]["count"] == 1
+
+
+def test_spans_are_noops_without_a_profile_or_when_disabled(monkeypatch):
+    calls = []
+
+    @render_timing.traced(lambda move_type: calls.append(move_type) or f"dsp:{move_type}", category="dsp")
+    def _move(move_type):
+        return move_type.upper()
+
+    assert _move("chop") == "CHOP"
+    assert calls == []
+    monkeypatch.setattr(settings, "render_timing_enabled", False)
+    with render_timing.profiling("job-1") as profile:
+        with render_timing.span("decode"):
+            pass
+    assert profile is None
+    assert render_timing.snapshot() is None
+
+
+def test_traced_records_errors_and_thread_pool_work_via_bind_context():
+    @render_timing.traced(lambda move_type: f"dsp:{move_type}", category="dsp")
+    def _move(move_type):
+        if move_type == "bad":
+            raise ValueError(move_type)
+        return move_type
+
+    with render_timing.profiling("job-1") as profile:
+        with render_timing.span("shadows", "shadow"):
+            with ThreadPoolExecutor(max_workers=1) as pool:
+                assert pool.submit(render_timing.bind_context(_move), "chop").result() == "chop"
+        with pytest.raises(ValueError):
+            _move("bad")
+
+    by_name = {s["name"]: s for s in profile.to_dict()["spans"]}
+    assert by_name["dsp:chop"]["parent"] == by_name["shadows"]["id"]
+    assert by_name["dsp:chop"]["tid"] != threading.get_native_id()
+    assert by_name["dsp:bad"]["error"] == "ValueError"
+
+
+def test_merge_and_max_spans(monkeypatch):
+    with render_timing.profiling("worker", enabled=True) as child:
+        with render_timing.span("section:3", "section"):
+            pass
+    exported = child.export()
+
+    monkeypatch.setattr(settings, "render_timing_max_spans", 2)
+    with render_timing.profiling("job-1") as profile:
+        with render_timing.span("parallel_sections", "section"):
+            profile.merge(exported)
+        with render_timing.span("upload", "upload"):
+            pass
+
+    data = profile.to_dict()
+    by_name = {s["name"]: s for s in data["spans"]}
+    assert by_name["section:3"]["parent"] == by_name["parallel_sections"]["id"]
+    assert "upload" not in by_name
+    assert data["dropped_spans"] == 1
+
+
+def test_chrome_trace_has_complete_events_and_thread_names():
+    with render_timing.profiling("job-1") as profile:
+        with render_timing.span("mastering", "mastering", profile_name="trap"):
+            pass
+
+    trace = render_timing.to_chrome_trace(profile.to_dict())
+    complete = [e for e in trace["traceEvents"] if e["ph"] == "X"]
+    meta = [e for e in trace["traceEvents"] if e["ph"] == "M"]
+    assert [(e["name"], e["cat"]) for e in complete] == [("mastering", "mastering")]
+    assert complete[0]["args"]["profile_name"] == "trap"
+    assert {"cpu_ms", "peak_rss_mb"} <= set(complete[0]["args"])
+    assert meta[0]["args"]["name"] == threading.current_thread().name
+    assert trace["otherData"]["label"] == "job-1"
@@ -0,0 +1,102 @@
+"""Tests for the section render memo shared across variations."""
+
+from __future__ import annotations
+
+import copy
+import json
+
+import numpy as np
+import pytest
+from pydub import AudioSegment
+
+from app.services import arrangement_jobs
+from app.services.arrangement_jobs import _render_producer_arrangement
+from app.services.section_render_memo import SectionRenderMemo, source_fingerprint
+
+
+def _tone(freq_hz: float, duration_ms: int, amplitude: float = 0.4) -> AudioSegment:
+    t = np.arange(int(44100 * duration_ms / 1000)) / 44100
+    mono = (np.sin(2 * np.pi * freq_hz * t) * amplitude * 32767).astype(np.int16)
+    return AudioSegment(np.repeat(mono, 2).tobytes(), frame_rate=44100, sample_width=2, channels=2)
+
+
+STEMS = {
+    "drums": _tone(110.0, 4000),
+    "bass": _tone(55.0, 4000),
+    "melody": _tone(440.0, 4000, amplitude=0.2),
+}
+LOOP = _tone(220.0, 8000)
+
+
+def _plan(hook_instruments=("drums", "bass", "melody")) -> dict:
+    sections = [
+        {"name": "Intro", "type": "intro", "bar_start": 0, "bars": 4, "energy": 0.4, "instruments": ["melody"]},
+        {"name": "Hook", "type": "hook", "bar_start": 4, "bars": 4, "energy": 0.9, "instruments": list(hook_instruments)},
+        {"name": "Outro", "type": "outro", "bar_start": 8, "bars": 4, "energy": 0.3, "instruments": ["melody"]},
+    ]
+    return {"sections": sections, "tracks": [], "transitions": [], "total_bars": 12}
+
+
+def _render(plan: dict) -> tuple[bytes, dict]:
+    audio, timeline_json = _render_producer_arrangement(
+        loop_audio=LOOP,
+        producer_arrangement=copy.deepcopy(plan),
+        bpm=120.0,
+        stems=STEMS,
+    )
+    return audio.raw_data, json.loads(timeline_json)
+
+
+@pytest.fixture
+def memo(monkeypatch):
+    memo = SectionRenderMemo(64 * 1024 * 1024)
+    monkeypatch.setattr(arrangement_jobs, "get_section_render_memo", lambda: memo)
+    return memo
+
+
+class TestSectionRenderMemo:
+    def test_lru_evicts_to_byte_budget(self):
+        section = _tone(100.0, 100)
+        size = len(section.raw_data)
+        memo = SectionRenderMemo(size * 2)
+        for key in ("a", "b", "c"):
+            memo.put(key, {"section_audio": section, "section_applied_events": []}, {"name": key})
+        assert memo.get("a") is None
+        result, annotated = memo.get("c")
+        assert result["section_audio"] is section
+        assert annotated == {"name": "c"}
+        stats = memo.stats()
+        assert (stats["entries"], stats["bytes"], stats["evictions"]) == (2, size * 2, 1)
+
+    def test_hits_are_isolated_copies(self):
+        memo = SectionRenderMemo(1024 * 1024)
+        memo.put("k", {"section_audio": _tone(100.0, 10), "section_applied_events": ["x"]}, {"name": "k"})
+        first, _ = memo.get("k")
+        first["section_applied_events"].append("mutated")
+        second, _ = memo.get("k")
+        assert second["section_applied_events"] == ["x"]
+
+    def test_source_fingerprint_tracks_audio_content(self):
+        base = source_fingerprint(STEMS, LOOP)
+        assert source_fingerprint(dict(reversed(list(STEMS.items()))), LOOP) == base
+        assert source_fingerprint({**STEMS, "bass": _tone(56.0, 4000)}, LOOP) != base
+
+
+class TestMemoisedArrangementRender:
+    def test_repeat_render_reuses_every_section(self, memo):
+        first_raw, first_timeline = _render(_plan())
+        second_raw, second_timeline = _render(_plan())
+        assert second_raw == first_raw
+        assert first_timeline["section_memo"]["reuse_ratio"] == 0.0
+        assert second_timeline["section_memo"] == {"enabled": True, "sections": 3, "reused": 3, "reuse_ratio": 1.0}
+
+    def test_variation_rerenders_only_changed_section(self, memo, monkeypatch):
+        _render(_plan())
+        variation = _plan(hook_instruments=("drums", "bass"))
+        memo_raw, timeline = _render(variation)
+        assert timeline["section_memo"]["reused"] == 2
+
+        monkeypatch.setattr(arrangement_jobs, "get_section_render_memo", lambda: None)
+        fresh_raw, fresh_timeline = _render(variation)
+        assert memo_raw == fresh_raw
+        assert fresh_timeline["section_memo"]["enabled"] is False
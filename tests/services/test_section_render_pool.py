@@ -0,0 +1,122 @@
+"""Tests for process-pool section rendering in _render_producer_arrangement."""
+
+from __future__ import annotations
+
+import copy
+
+import numpy as np
+import pytest
+from pydub import AudioSegment
+
+from app.config import settings
+from app.services import render_timing, section_render_pool
+from app.services.arrangement_jobs import _render_producer_arrangement
+from app.services.section_render_pool import SharedAudioBlocks, resolve_worker_count
+
+
+def _tone(freq_hz: float, duration_ms: int = 8000, amplitude: float = 0.4) -> AudioSegment:
+    t = np.arange(int(44100 * duration_ms / 1000)) / 44100
+    mono = (np.sin(2 * np.pi * freq_hz * t) * amplitude * 32767).astype(np.int16)
+    return AudioSegment(np.repeat(mono, 2).tobytes(), frame_rate=44100, sample_width=2, channels=2)
+
+
+def _plan() -> dict:
+    layout = [("Intro", "intro", 4), ("Verse", "verse", 8), ("Pre-Hook", "pre_hook", 4),
+              ("Hook", "hook", 8), ("Bridge", "bridge", 4), ("Outro", "outro", 4)]
+    sections, bar = [], 0
+    for name, kind, bars in layout:
+        sections.append({
+            "name": name,
+            "type": kind,
+            "bar_start": bar,
+            "bars": bars,
+            "energy": 0.4 if kind in ("intro", "outro") else 0.8,
+            "instruments": ["drums", "bass", "melody", "pads"],
+        })
+        bar += bars
+    return {"sections": sections, "tracks": [], "transitions": [], "total_bars": bar}
+
+
+@pytest.fixture
+def stems() -> dict[str, AudioSegment]:
+    return {
+        "drums": _tone(110.0),
+        "bass": _tone(55.0),
+        "melody": _tone(440.0, amplitude=0.2),
+        "pads": _tone(330.0, amplitude=0.2),
+    }
+
+
+def _render(monkeypatch, parallel: bool, **kwargs):
+    monkeypatch.setattr(settings, "render_parallel_sections", parallel)
+    monkeypatch.setattr(settings, "render_parallel_workers", 2)
+    return _render_producer_arrangement(
+        loop_audio=_tone(220.0, duration_ms=16000),
+        producer_arrangement=copy.deepcopy(_plan()),
+        bpm=120.0,
+        **kwargs,
+    )
+
+
+class TestParallelSectionRender:
+    # The section memo would serve the parallel run from the serial one.
+    @pytest.mark.usefixtures("no_shared_audio_stores")
+    def test_stem_render_is_byte_identical_to_serial(self, monkeypatch, stems):
+        calls = []
+        real = section_render_pool.render_sections_parallel
+
+        def _spy(*args, **kwargs):
+            calls.append(len(args[0]))
+            return real(*args, **kwargs)
+
+        monkeypatch.setattr(section_render_pool, "render_sections_parallel", _spy)
+        serial_audio, serial_timeline = _render(monkeypatch, False, stems=stems)
+        parallel_audio, parallel_timeline = _render(monkeypatch, True, stems=stems)
+        assert calls == [6]
+        assert parallel_audio.raw_data == serial_audio.raw_data
+        assert parallel_timeline == serial_timeline
+
+    def test_stereo_fallback_is_byte_identical_to_serial(self, monkeypatch):
+        serial_audio, _ = _render(monkeypatch, False)
+        parallel_audio, _ = _render(monkeypatch, True)
+        assert parallel_audio.raw_data == serial_audio.raw_data
+
+    def test_pool_failure_falls_back_to_serial(self, monkeypatch, stems):
+        serial_audio, _ = _render(monkeypatch, False, stems=stems)
+
+        def _broken(*args, **kwargs):
+            raise OSError("no shared memory")
+
+        monkeypatch.setattr(section_render_pool, "render_sections_parallel", _broken)
+        fallback_audio, _ = _render(monkeypatch, True, stems=stems)
+        assert fallback_audio.raw_data == serial_audio.raw_data
+
+    def test_worker_spans_are_merged_into_the_job_profile(self, monkeypatch, stems):
+        monkeypatch.setattr(settings, "section_render_memo_enabled", False)
+        with render_timing.profiling("job-1") as profile:
+            _render(monkeypatch, True, stems=stems)
+        spans = profile.to_dict()["spans"]
+
+        pool_span = next(s for s in spans if s["name"] == "parallel_sections")
+        sections = [s for s in spans if s["name"].startswith("section:")]
+        assert sorted(s["name"] for s in sections) == [f"section:{i}" for i in range(6)]
+        assert {s["parent"] for s in sections} == {pool_span["id"]}
+        assert all(s["pid"] != pool_span["pid"] for s in sections)
+
+
+class TestSharedAudioBlocks:
+    def test_round_trip_through_shared_memory(self):
+        audio = _tone(330.0, duration_ms=250)
+        with SharedAudioBlocks() as blocks:
+            handle = blocks.share(audio)
+            section_render_pool._attached.clear()
+            restored = section_render_pool._attach(handle)
+        assert restored.raw_data == audio.raw_data
+        assert (restored.frame_rate, restored.channels) == (44100, 2)
+        section_render_pool._attached.clear()
+
+    def test_worker_count_is_capped_by_section_count(self, monkeypatch):
+        monkeypatch.setattr(settings, "render_parallel_workers", 8)
+        assert resolve_worker_count(3) == 3
+        monkeypatch.setattr(settings, "render_parallel_workers", 0)
+        assert 1 <= resolve_worker_count(100)
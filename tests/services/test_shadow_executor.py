@@ -0,0 +1,178 @@
+"""Tests for the concurrent shadow-engine executor."""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.services.render_observability import assemble_render_metadata, extract_observability_from_arrangement
+from app.services.shadow_executor import ShadowExecutor
+
+
+def _store(key):
+    def _inner(plan, result):
+        plan[key] = result
+    return _inner
+
+
+def _timeline_shadow(render_plan, **kwargs):
+    return {"sections": len(render_plan["sections"])}
+
+
+def _pattern_shadow(render_plan, **kwargs):
+    # Reads the timeline shadow's output, as _run_pattern_variation_shadow does.
+    return {"saw_timeline": render_plan.get("_timeline_plan"), "sections": len(render_plan["sections"])}
+
+
+def _sleeping_shadow(render_plan, **kwargs):
+    time.sleep(30)
+    return {}
+
+
+def _wait_for(predicate, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+def _run_pipeline(executor: ShadowExecutor) -> dict:
+    plan = {"sections": [{"name": "Intro"}, {"name": "Hook"}]}
+    executor.submit("timeline", _timeline_shadow, render_plan=plan, store=_store("_timeline_plan"))
+    # A primary promotion between shadows mutates the live plan; the scheduled
+    # pattern shadow must still see the plan as it was at submission.
+    executor.submit(
+        "pattern_variation",
+        _pattern_shadow,
+        render_plan=plan,
+        store=_store("_pattern_variation_plans"),
+        depends_on=("timeline",),
+    )
+    plan["sections"].append({"name": "Outro"})
+    executor.collect(plan)
+    return plan
+
+
+class TestShadowExecutor:
+    def test_threaded_results_match_serial(self):
+        serial = _run_pipeline(ShadowExecutor(mode="serial"))
+        threaded = _run_pipeline(ShadowExecutor(mode="thread", max_workers=4))
+        assert threaded == serial
+        assert threaded["_pattern_variation_plans"] == {"saw_timeline": {"sections": 2}, "sections": 2}
+
+    def test_scheduled_shadows_run_concurrently(self):
+        barrier = threading.Barrier(2, timeout=5)
+
+        def _waits_for_peer(render_plan, **kwargs):
+            barrier.wait()
+            return {"ok": True}
+
+        executor = ShadowExecutor(mode="thread", max_workers=2)
+        plan: dict = {}
+        executor.submit("a", _waits_for_peer, render_plan=plan, store=_store("a"))
+        executor.submit("b", _waits_for_peer, render_plan=plan, store=_store("b"))
+        executor.collect(plan)
+        assert plan == {"a": {"ok": True}, "b": {"ok": True}}
+
+    def test_inline_shadow_sees_scheduled_dependency(self):
+        executor = ShadowExecutor(mode="thread", max_workers=2)
+        plan = {"sections": [{}]}
+        executor.submit("timeline", _timeline_shadow, render_plan=plan, store=_store("_timeline_plan"))
+        result = executor.submit(
+            "pattern_variation",
+            _pattern_shadow,
+            render_plan=plan,
+            store=_store("_pattern_variation_plans"),
+            inline=True,
+            depends_on=("timeline",),
+        )
+        assert result["saw_timeline"] == {"sections": 1}
+        assert plan["_timeline_plan"] == {"sections": 1}
+        assert executor.timings()["pattern_variation"]["mode"] == "inline"
+
+    def test_over_budget_shadow_is_recorded_as_fallback(self):
+        def _slow(render_plan, **kwargs):
+            time.sleep(0.5)
+            return {"plan": "late"}
+
+        executor = ShadowExecutor(mode="thread", max_workers=2, budget_seconds=0.05)
+        plan: dict = {}
+        executor.submit("motif", _slow, render_plan=plan, store=_store("_motif"))
+        timings = executor.collect(plan)
+        assert plan["_motif"]["fallback_used"] is True
+        assert timings["motif"]["timed_out"] is True
+        assert timings["motif"]["wall_ms"] < 500
+
+    def test_timed_out_thread_shadow_is_reported_still_running(self):
+        release = threading.Event()
+
+        def _stuck(render_plan, **kwargs):
+            release.wait(5)
+            return {"plan": "late"}
+
+        executor = ShadowExecutor(mode="thread", max_workers=2, budget_seconds=0.05)
+        executor.submit("motif", _stuck, render_plan={}, store=_store("_motif"))
+        timings = executor.collect({})
+        assert timings["motif"]["timed_out"] is True
+        assert timings["motif"]["still_running"] is True
+        release.set()
+
+    def test_over_budget_process_shadow_is_terminated(self):
+        executor = ShadowExecutor(mode="process", max_workers=2, budget_seconds=0.2)
+        plan: dict = {}
+        executor.submit("groove", _sleeping_shadow, render_plan=plan, store=_store("_groove"))
+        assert _wait_for(lambda: executor._compute is not None and executor._compute._processes)
+        workers = list(executor._compute._processes.values())
+
+        timings = executor.collect(plan)
+
+        assert plan["_groove"]["fallback_used"] is True
+        assert timings["groove"]["timed_out"] is True
+        assert _wait_for(lambda: not any(worker.is_alive() for worker in workers))
+
+    def test_failing_shadow_does_not_raise(self):
+        def _boom(render_plan, **kwargs):
+            raise RuntimeError("planner crashed")
+
+        executor = ShadowExecutor(mode="thread", max_workers=2)
+        plan: dict = {}
+        executor.submit("drop", _boom, render_plan=plan, store=_store("_drop"))
+        timings = executor.collect(plan)
+        assert plan["_drop"] == {"error": "planner crashed", "fallback_used": True}
+        assert timings["drop"]["error"] == "planner crashed"
+
+    @pytest.mark.parametrize("mode", [MagicMock(), "bogus"])
+    def test_unusable_settings_fall_back_to_serial(self, mode):
+        fake_settings = SimpleNamespace(
+            shadow_executor_mode=mode,
+            shadow_executor_workers=4,
+            shadow_engine_budget_seconds=30.0,
+        )
+        with patch("app.services.shadow_executor.settings", fake_settings):
+            assert ShadowExecutor.from_settings().mode == "serial"
+
+
+class TestShadowTimingsInRenderMetadata:
+    def test_timings_flow_from_render_plan_to_metadata(self):
+        timings = {"groove": {"mode": "thread", "wall_ms": 12.5, "queued_ms": 0.1, "timed_out": False, "error": None}}
+        row = SimpleNamespace(
+            arrangement_json=json.dumps({"sections": []}),
+            render_plan_json=json.dumps({"sections": [], "_shadow_timings": timings}),
+        )
+        obs = extract_observability_from_arrangement(row)
+        metadata = assemble_render_metadata(
+            worker_mode="embedded",
+            job_terminal_state="success_truthful",
+            failure_stage=None,
+            render_path_used="stereo_fallback",
+            source_quality_mode_used="stereo_fallback",
+            observability=obs,
+        )
+        assert metadata["shadow_timings"] == timings
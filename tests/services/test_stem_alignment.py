@@ -0,0 +1,100 @@
+"""Tests for vectorized onset detection and alignment (app/services/stem_alignment.py)."""
+
+import io
+
+import numpy as np
+import pytest
+import soundfile as sf
+from pydub import AudioSegment
+from pydub.silence import detect_nonsilent
+
+from app.services import stem_alignment
+from app.services.stem_alignment import StemAlignmentError, align_stems, analyze_onset
+
+
+def _stem(signal: np.ndarray, lead_frames: int = 0, frame_rate: int = 44100) -> AudioSegment:
+    mono = np.concatenate((np.zeros(lead_frames), signal))
+    pcm = (np.repeat(mono[:, None], 2, axis=1) * 32767).astype("<i2")
+    return AudioSegment(data=pcm.tobytes(), sample_width=2, frame_rate=frame_rate, channels=2)
+
+
+def _pulses(seconds: float = 2.0) -> np.ndarray:
+    """Noise bursts at irregular intervals."""
+    rng = np.random.default_rng(3)
+    signal = np.zeros(int(44100 * seconds))
+    burst = 0.5 * rng.standard_normal(1500)
+    start = 0
+    while start + burst.size < signal.size:
+        signal[start:start + burst.size] = burst
+        start += int(rng.integers(4000, 16000))
+    return signal
+
+
+def test_analyze_onset_matches_detect_nonsilent():
+    tone = 0.3 * np.sin(np.arange(44100) * 2 * np.pi * 220 / 44100)
+    audio = _stem(tone, lead_frames=13_337)
+
+    legacy = detect_nonsilent(audio, min_silence_len=20, silence_thresh=max(-60, int(audio.dBFS) - 22))
+    onset = analyze_onset(audio)
+
+    assert onset.detected is True
+    assert abs(onset.offset_ms - legacy[0][0]) <= 1
+
+
+@pytest.mark.parametrize("subtype", ["PCM_24", "PCM_32"])
+def test_analyze_onset_handles_24_and_32_bit_wavs(subtype):
+    rng = np.random.default_rng(5)
+    signal = np.concatenate((np.zeros(88200), 0.5 * rng.standard_normal(44100)))
+    buffer = io.BytesIO()
+    sf.write(buffer, np.repeat(signal[:, None], 2, axis=1), 44100, subtype=subtype, format="WAV")
+    audio = AudioSegment.from_wav(io.BytesIO(buffer.getvalue()))
+    assert audio.sample_width == 4
+
+    legacy = detect_nonsilent(audio, min_silence_len=20, silence_thresh=max(-60, int(audio.dBFS) - 22))
+    onset = analyze_onset(audio)
+
+    assert onset.detected is True
+    assert abs(onset.offset_ms - legacy[0][0]) <= 1
+    assert abs(onset.offset_ms - 2000) <= 1
+
+
+def test_frame_energy_is_independent_of_chunk_size(monkeypatch):
+    audio = _stem(_pulses(0.5), lead_frames=777)
+    whole = stem_alignment._frame_energy(audio)
+
+    monkeypatch.setattr(stem_alignment, "_ENERGY_CHUNK_FRAMES", 1000)
+    chunked = stem_alignment._frame_energy(audio)
+
+    assert chunked.shape == (audio.frame_count(),)
+    np.testing.assert_array_equal(chunked, whole)
+
+
+def test_analyze_onset_flags_silent_and_unbroken_stems():
+    assert analyze_onset(AudioSegment.silent(duration=500)).silent is True
+
+    steady = analyze_onset(_stem(0.3 * np.sin(np.arange(22050) * 0.05)))
+    assert (steady.frame, steady.detected) == (0, True)
+
+
+def test_align_stems_shifts_by_exact_frames():
+    signal = _pulses()
+    stems = [
+        ("kick.wav", _stem(signal, lead_frames=5000)),
+        ("snare.wav", _stem(signal, lead_frames=5037)),
+        ("hat.wav", _stem(signal, lead_frames=5000 + 11025)),
+    ]
+
+    result = align_stems(stems)
+
+    offsets = result.original_offsets_frames
+    assert offsets["snare.wav"] - offsets["kick.wav"] == 37
+    assert result.adjustments_ms["snare.wav"] == {"trim_ms": 0, "pad_ms": 0, "trim_frames": 0, "pad_frames": 0}
+    assert result.adjustments_ms["kick.wav"]["pad_frames"] == 37
+    assert result.adjustments_ms["hat.wav"]["trim_frames"] == 11025 - 37
+    assert len({audio.frame_count() for _, audio in result.stems}) == 1
+
+
+def test_align_stems_rejects_all_silent_stems():
+    silence = AudioSegment.silent(duration=1000).set_channels(2)
+    with pytest.raises(StemAlignmentError, match="silent"):
+        align_stems([("a.wav", silence), ("b.wav", silence)])
@@ -6,6 +6,7 @@ import pytest
 from app.services.stem_pack_extractor import (
     StemPackExtractionError,
     extract_stem_files_from_zip,
+    list_stem_members,
 )
 
 
@@ -35,3 +36,14 @@ def test_extract_stem_files_from_zip_reads_audio_files_only() -> None:
 def test_extract_stem_files_from_zip_rejects_invalid_archive() -> None:
     with pytest.raises(StemPackExtractionError, match="Invalid ZIP"):
         extract_stem_files_from_zip(b"not a zip")
+
+
+def test_list_stem_members_reads_only_the_directory_of_a_spooled_zip(tmp_path) -> None:
+    zip_path = tmp_path / "pack.zip"
+    zip_path.write_bytes(_zip_bytes({"pack/": b"", "pack/drums.wav": b"RIFF", "pack/notes.txt": b"x"}))
+
+    assert list_stem_members(zip_path) == ["pack/drums.wav"]
+
+    zip_path.write_bytes(_zip_bytes({"notes.txt": b"x"}))
+    with pytest.raises(StemPackExtractionError, match="supported audio"):
+        list_stem_members(zip_path)
@@ -1,10 +1,12 @@
 import io
+import zipfile
 
 import pytest
 from pydub import AudioSegment
 from pydub.generators import Sine
 
-from app.services.stem_pack_service import StemPackError, StemSourceFile, ingest_stem_files
+from app.services import stem_pack_service
+from app.services.stem_pack_service import StemPackError, StemSourceFile, ingest_stem_files, ingest_stem_zip
 
 
 def _wav_bytes(*, frequency: int, duration_ms: int, frame_rate: int = 44100) -> bytes:
@@ -145,3 +147,90 @@ def test_ingest_stem_files_downgrades_severe_duration_mismatch_to_warning() -> N
     assert result.duration_ms == 19000
     assert result.fallback_to_loop is True
     assert any("Severe stem duration mismatch" in warning for warning in result.validation_warnings)
+
+
+def test_ingest_stem_zip_decodes_members_in_parallel_from_a_spooled_file(tmp_path, monkeypatch) -> None:
+    members = {
+        "pack/kick.wav": _wav_bytes_with_lead_silence(frequency=80, duration_ms=1000, lead_ms=0, frame_rate=48000),
+        "pack/bass.wav": _wav_bytes_with_lead_silence(frequency=55, duration_ms=1000, lead_ms=120, frame_rate=48000),
+        "pack/readme.txt": b"ignored",
+    }
+    zip_path = tmp_path / "pack.zip"
+    with zipfile.ZipFile(zip_path, "w") as archive:
+        for name, content in members.items():
+            archive.writestr(name, content)
+    serial = ingest_stem_files(
+        [StemSourceFile(filename=name.split("/")[-1], content=content) for name, content in list(members.items())[:2]]
+    )
+
+    def _no_serial_detection(audio):
+        raise AssertionError("onsets must come from the decoding pass")
+
+    monkeypatch.setattr("app.services.stem_alignment.analyze_onset", _no_serial_detection)
+    result = ingest_stem_zip(zip_path, workers=2)
+
+    assert result.source_files == ["kick.wav", "bass.wav"]
+    assert result.roles_detected == serial.roles_detected == ["bass", "drums"]
+    assert (result.sample_rate, result.duration_ms) == (48000, serial.duration_ms)
+    assert result.alignment["original_offsets_ms"] == serial.alignment["original_offsets_ms"]
+    assert set(result.stem_timings) == {"kick.wav", "bass.wav"}
+    assert set(result.stem_timings["bass.wav"]) == {"read", "decode", "analyze", "write", "total"}
+    assert result.to_metadata(loop_id=1, stem_s3_keys={})["ingest_timings_ms"] == result.stem_timings
+
+
+def test_concurrent_ingests_share_one_forkserver_pool(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(stem_pack_service, "_pool", None)
+    monkeypatch.setattr(stem_pack_service.settings, "stem_ingest_workers", 2)
+    zip_path = tmp_path / "pack.zip"
+    with zipfile.ZipFile(zip_path, "w") as archive:
+        archive.writestr("kick.wav", _wav_bytes(frequency=80, duration_ms=500))
+        archive.writestr("bass.wav", _wav_bytes(frequency=55, duration_ms=500))
+
+    ingest_stem_zip(zip_path)
+    pool = stem_pack_service._pool
+    try:
+        ingest_stem_zip(zip_path)
+
+        assert stem_pack_service._pool is pool
+        assert pool._max_workers == 2
+        assert pool._mp_context.get_start_method() in {"forkserver", "spawn"}
+    finally:
+        pool.shutdown()
+
+
+def test_ingest_stem_zip_serial_path_when_parallel_ingest_disabled(monkeypatch) -> None:
+    monkeypatch.setattr(stem_pack_service.settings, "stem_ingest_parallel_enabled", False)
+    monkeypatch.setattr(stem_pack_service, "_ingest_spooled_zip", None)
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr("kick.wav", _wav_bytes(frequency=80, duration_ms=1000))
+        archive.writestr("bass.wav", _wav_bytes(frequency=55, duration_ms=1000))
+
+    result = ingest_stem_zip(buffer.getvalue())
+
+    assert result.roles_detected == ["bass", "drums"]
+    assert result.stem_timings == {}
+
+
+def test_ingest_stem_zip_keeps_the_native_layout_of_members(tmp_path) -> None:
+    members = {
+        "kick.wav": _wav_bytes(frequency=80, duration_ms=1000, frame_rate=48000),
+        "bass.wav": _wav_bytes(frequency=55, duration_ms=1000, frame_rate=48000),
+    }
+    zip_path = tmp_path / "pack.zip"
+    with zipfile.ZipFile(zip_path, "w") as archive:
+        for name, content in members.items():
+            archive.writestr(name, content)
+    serial = ingest_stem_files([StemSourceFile(filename=name, content=content) for name, content in members.items()])
+
+    result = ingest_stem_zip(zip_path, workers=1)
+
+    assert result.sample_rate == serial.sample_rate == 48000
+    for role, audio in result.role_stems.items():
+        expected = serial.role_stems[role]
+        assert (audio.frame_rate, audio.channels, audio.sample_width) == (
+            expected.frame_rate,
+            expected.channels,
+            expected.sample_width,
+        )
+        assert audio.raw_data == expected.raw_data
@@ -103,6 +103,28 @@ def test_delete_file_missing_file_does_not_raise(tmp_path):
     storage.delete_file("uploads/ghost.wav")
 
 
+# ---------------------------------------------------------------------------
+# download_file – local mode
+# ---------------------------------------------------------------------------
+
+def test_download_file_copies_local_object(tmp_path):
+    storage = _make_local_storage(tmp_path)
+    (tmp_path / "loop_1_drums.pcm").write_bytes(b"pcm bytes")
+
+    dest = tmp_path / "cache" / "loop_1_drums.pcm"
+    assert storage.download_file("stems/loop_1_drums.pcm", dest) is True
+    assert dest.read_bytes() == b"pcm bytes"
+
+
+def test_download_file_missing_object_returns_false(tmp_path):
+    storage = _make_local_storage(tmp_path)
+
+    dest = tmp_path / "cache" / "ghost.pcm"
+    assert storage.download_file("stems/ghost.pcm", dest) is False
+    assert not dest.exists()
+    assert list(dest.parent.iterdir()) == []
+
+
 # ---------------------------------------------------------------------------
 # create_presigned_get_url – local mode
 # ---------------------------------------------------------------------------
@@ -64,7 +64,7 @@ class TestAnalyzeLoopTask:
              patch("app.services.task_service.audio_service") as mock_audio:
 
             mock_storage.get_file_path.return_value = mock_file_path
-            mock_audio.analyze_loop.return_value = mock_analysis
+            mock_audio.analyze_content.return_value = mock_analysis
 
             svc.analyze_loop_task(loop_id)
 
@@ -0,0 +1,82 @@
+"""Tests for the async read sessions (app/db/async_session.py)."""
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from app.db import async_session
+from app.db.async_session import ThreadedSession, async_connect_args, async_database_url
+from app.db.session import pool_options
+from app.models.base import Base
+from app.models.loop import Loop
+
+
+@pytest.mark.parametrize(
+    "url, expected",
+    [
+        ("postgres://u:p@db:5432/app", "postgresql+asyncpg://u:p@db:5432/app"),
+        ("postgresql+psycopg2://u@db/app", "postgresql+asyncpg://u@db/app"),
+        ("sqlite:///./test.db", "sqlite+aiosqlite:///./test.db"),
+        ("mysql://u@db/app", None),
+    ],
+)
+def test_async_database_url(url, expected):
+    assert async_database_url(url) == expected
+
+
+def test_async_database_url_translates_libpq_query_params():
+    url = "postgresql://u:p@db:5432/app?sslmode=require&sslrootcert=/etc/ca.pem&application_name=api"
+
+    assert async_database_url(url) == "postgresql+asyncpg://u:p@db:5432/app"
+    assert async_connect_args(url) == {"ssl": "require", "server_settings": {"application_name": "api"}}
+    assert async_connect_args("postgresql://u@db/app") == {}
+    assert async_connect_args("sqlite:///./test.db?mode=ro") == {}
+    assert async_database_url("sqlite:///./test.db?mode=ro") == "sqlite+aiosqlite:///./test.db?mode=ro"
+
+
+def test_pool_options_size_postgres_only(monkeypatch):
+    from app.config import settings
+
+    monkeypatch.setattr(settings, "db_pool_size", 15)
+    monkeypatch.setattr(settings, "db_max_overflow", 5)
+
+    assert pool_options("sqlite:///./test.db") == {}
+    options = pool_options("postgresql://u@db/app")
+    assert (options["pool_size"], options["max_overflow"]) == (15, 5)
+
+
+@pytest.mark.parametrize("enabled, driver_installed", [(False, True), (True, False)])
+def test_threadpool_fallback_without_async_driver(monkeypatch, enabled, driver_installed):
+    from app.config import settings
+
+    monkeypatch.setattr(settings, "async_db_enabled", enabled)
+    monkeypatch.setattr(async_session, "async_driver_available", lambda url: driver_installed)
+
+    assert async_session.get_async_sessionmaker() is None
+
+
+@pytest.fixture
+def sync_session(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'async.sqlite'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine, expire_on_commit=False)()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_threaded_session_matches_async_session_api(sync_session):
+    sync_session.add(Loop(id=1, name="threaded", file_key="uploads/threaded.wav"))
+    sync_session.commit()
+    sync_session.expunge_all()
+    session = ThreadedSession(sync_session)
+
+    loop = await session.get(Loop, 1)
+    rows = await session.execute(text("SELECT id, name FROM loops"))
+    count = await session.scalar(text("SELECT COUNT(*) FROM loops"))
+    await session.close()
+
+    assert loop.file_key == "uploads/threaded.wav"
+    assert [tuple(row) for row in rows] == [(1, "threaded")]
+    assert count == 1
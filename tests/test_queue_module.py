@@ -10,19 +10,26 @@ Covers:
 - get_queue() calls get_redis_conn() when conn=None
 - get_queue() uses supplied conn without calling get_redis_conn()
 - DEFAULT_RENDER_QUEUE_NAME constant value
+- queue_weights() / resolve_queue_name() / oldest_job_age_seconds()
 """
 
 from __future__ import annotations
 
+from datetime import datetime, timedelta, timezone
 from unittest.mock import MagicMock, patch
 
 import pytest
 
+from app.config import settings
 from app.queue import (
     DEFAULT_RENDER_QUEUE_NAME,
+    INGEST_QUEUE_NAME,
     get_queue,
     get_redis_conn,
     is_redis_available,
+    oldest_job_age_seconds,
+    queue_weights,
+    resolve_queue_name,
 )
 
 
@@ -185,3 +192,30 @@ class TestGetQueue:
         get_queue(conn=mock_conn, name="custom_queue")
         args, kwargs = mock_queue_cls.call_args
         assert args[0] == "custom_queue"
+
+
+# ---------------------------------------------------------------------------
+# Queue routing
+# ---------------------------------------------------------------------------
+
+
+class TestQueueRouting:
+    def test_weights_parse_and_default_missing_queues(self, monkeypatch):
+        monkeypatch.setattr(settings, "queue_weights", "render=10, render_batch=0,bogus,ingest=x")
+        assert queue_weights() == {"render": 10, "ingest": 1, "render_batch": 0, "analysis": 1}
+
+    def test_resolve_queue_name_honours_kill_switch(self, monkeypatch):
+        monkeypatch.setattr(settings, "queue_routing_enabled", True)
+        assert resolve_queue_name(INGEST_QUEUE_NAME) == "ingest"
+        monkeypatch.setattr(settings, "queue_routing_enabled", False)
+        assert resolve_queue_name(INGEST_QUEUE_NAME) == DEFAULT_RENDER_QUEUE_NAME
+
+    def test_oldest_job_age(self):
+        now = datetime(2026, 1, 1, 12, 0, 30, tzinfo=timezone.utc)
+        queue = MagicMock()
+        queue.get_job_ids.return_value = ["job-1"]
+        queue.fetch_job.return_value.enqueued_at = (now - timedelta(seconds=30)).replace(tzinfo=None)
+        assert oldest_job_age_seconds(queue, now=now) == 30.0
+
+        queue.get_job_ids.return_value = []
+        assert oldest_job_age_seconds(queue, now=now) is None
@@ -0,0 +1,104 @@
+"""render_loop_worker with quality="preview": compressed upload, then the full job is queued."""
+
+from __future__ import annotations
+
+import json
+from unittest.mock import MagicMock, patch
+
+from app.models.job import RenderJob
+
+_RENDER_PLAN = json.dumps(
+    {
+        "bpm": 120,
+        "key": "C",
+        "total_bars": 4,
+        "render_profile": {"genre_profile": "trap"},
+        "sections": [{"name": "A", "type": "verse", "bar_start": 0, "bars": 4}],
+        "events": [],
+        "tracks": [],
+    }
+)
+
+
+def _loop():
+    loop = MagicMock()
+    loop.id = 85
+    loop.file_key = "loops/85.wav"
+    loop.file_url = None
+    return loop
+
+
+def _run_preview_job(create_render_job, preview_arrangement=None):
+    from app.workers import render_worker
+
+    job = RenderJob(id="job-preview", loop_id=85, job_type="render_arrangement", status="queued", retry_count=0)
+    db = MagicMock()
+    db.query.return_value.filter.return_value.first.side_effect = [job, _loop(), preview_arrangement]
+    snapshot = {"render_plan": {"bpm": 120}, "producer_arrangement": {"sections": []}, "summary": {}}
+    render_result = {
+        "timeline_json": "{}",
+        "postprocess": {},
+        "render_observability": {"fallback_triggered_count": 0},
+        "planned_arrangement": snapshot,
+        "output_content_type": "audio/ogg",
+        "output_extension": ".opus",
+    }
+    params = {"quality": "preview", "variation_index": 0, "render_plan_json": _RENDER_PLAN}
+
+    with (
+        patch.object(render_worker, "_ensure_db_models"),
+        patch.object(render_worker, "SessionLocal", return_value=db),
+        patch.object(render_worker, "_resolve_app_job_id", return_value="job-preview"),
+        patch.object(render_worker, "_download_loop_audio", return_value="/tmp/loop.wav"),
+        patch("pydub.AudioSegment.from_file", return_value=MagicMock()),
+        patch.object(render_worker, "score_and_reject"),
+        patch.object(render_worker, "_run_with_timeout", return_value=render_result) as run,
+        patch.object(
+            render_worker, "_upload_render_output", return_value=("renders/job-preview/preview.opus", "audio/ogg")
+        ) as upload,
+        patch.object(render_worker, "_open_render_output_stream") as open_stream,
+        patch.object(render_worker, "update_job_status") as update,
+        patch.object(render_worker, "create_render_job", create_render_job),
+        patch.object(render_worker, "_parse_stem_metadata_from_loop", return_value=None),
+        patch.object(render_worker.storage, "create_presigned_get_url", return_value="https://cdn/preview.opus"),
+        patch.object(render_worker.settings, "render_preview_enabled", True),
+        patch("rq.get_current_job", side_effect=Exception("no rq")),
+    ):
+        render_worker.render_loop_worker("job-preview", 85, params)
+
+    return db, run, upload, open_stream, update, snapshot
+
+
+def test_preview_uploads_compressed_output_and_queues_full_render():
+    full_job = MagicMock(id="job-full")
+    create = MagicMock(return_value=(full_job, False))
+
+    db, _run, upload, open_stream, update, snapshot = _run_preview_job(create)
+
+    open_stream.assert_not_called()
+    assert upload.call_args.args[1] == "preview.opus"
+    assert upload.call_args.kwargs["content_type"] == "audio/ogg"
+
+    preview_arrangement = db.add.call_args.args[0]
+    assert preview_arrangement.status == "processing"
+    assert preview_arrangement.output_s3_key == "renders/job-preview/preview.opus"
+
+    full_params = create.call_args.args[2]
+    assert full_params["quality"] == "full"
+    assert full_params["preview_job_id"] == "job-preview"
+    assert full_params["planned_arrangement"] == snapshot
+
+    succeeded = [c for c in update.call_args_list if c.args[2] == "succeeded"][-1]
+    assert succeeded.kwargs["output_files"][0].content_type == "audio/ogg"
+    assert succeeded.kwargs["render_metadata"]["preview"]["full_job_id"] == "job-full"
+
+
+def test_preview_still_succeeds_when_full_render_cannot_be_queued():
+    create = MagicMock(side_effect=RuntimeError("redis down"))
+    preview_arrangement = MagicMock(status="processing")
+
+    _db, _run, _upload, _open_stream, update, _snapshot = _run_preview_job(create, preview_arrangement)
+
+    assert [c for c in update.call_args_list if c.args[2] == "succeeded"]
+    assert not [c for c in update.call_args_list if c.args[2] == "failed"]
+    assert preview_arrangement.status == "done"
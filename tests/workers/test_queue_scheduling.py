@@ -0,0 +1,168 @@
+"""Tests for weighted queue order and per-loop fair share (app/workers/scheduling.py)."""
+
+from __future__ import annotations
+
+import random
+import sys
+from collections import Counter
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+from rq import Queue, SimpleWorker
+
+from app.workers.scheduling import FairShare, SchedulingWorker, weighted_order
+
+
+class _SortedSets:
+    """The handful of sorted-set commands FairShare uses, in memory."""
+
+    def __init__(self):
+        self.sets: dict[str, dict[str, float]] = {}
+        self._ops = []
+
+    def pipeline(self):
+        self._ops = []
+        return self
+
+    def zremrangebyscore(self, key, low, high):
+        self._ops.append(lambda: self._zremrange(key, float(high)))
+
+    def _zremrange(self, key, high):
+        members = self.sets.setdefault(key, {})
+        for member in [m for m, score in members.items() if score <= high]:
+            del members[member]
+
+    def zadd(self, key, mapping):
+        self._ops.append(lambda: self.sets.setdefault(key, {}).update(mapping))
+
+    def zcard(self, key):
+        if self._ops is None:
+            return len(self.sets.get(key, {}))
+        self._ops.append(lambda: len(self.sets.get(key, {})))
+
+    def expire(self, key, seconds):
+        self._ops.append(lambda: True)
+
+    def execute(self):
+        ops, self._ops = self._ops, None
+        return [op() for op in ops]
+
+    def zrem(self, key, member):
+        self.sets.get(key, {}).pop(member, None)
+
+
+def _connection():
+    conn = MagicMock()
+    conn.connection_pool.connection_kwargs = {"socket_timeout": None}
+    return conn
+
+
+def _job(job_id, loop_id=7):
+    return SimpleNamespace(
+        id=job_id,
+        meta={"fair_share_key": f"loop:{loop_id}"},
+        func_name="app.workers.render_worker.render_loop_worker",
+        timeout=-1,
+    )
+
+
+class TestWeightedOrder:
+    def test_first_choice_follows_weights(self):
+        rng = random.Random(0)
+        firsts = Counter(weighted_order([("render", 8), ("render_batch", 2)], rng)[0] for _ in range(10_000))
+        assert firsts["render"] / 10_000 == pytest.approx(0.8, abs=0.02)
+
+    def test_zero_weight_goes_last(self):
+        assert weighted_order([("analysis", 0), ("render", 1), ("ingest", 1)])[-1] == "analysis"
+
+
+class TestFairShare:
+    def test_caps_active_jobs_per_key(self):
+        fair_share = FairShare(_SortedSets(), max_active=2)
+        assert fair_share.acquire("loop:1", "a") and fair_share.acquire("loop:1", "b")
+        assert not fair_share.acquire("loop:1", "c")
+        assert fair_share.acquire("loop:2", "d")
+
+        fair_share.release("loop:1", "a")
+        assert fair_share.acquire("loop:1", "c")
+        assert fair_share.active("loop:1") == 2
+
+    def test_leaked_entries_expire_after_lease(self):
+        fair_share = FairShare(_SortedSets(), max_active=1)
+        with patch("app.workers.scheduling.time.time", return_value=1_000.0):
+            assert fair_share.acquire("loop:1", "killed", lease_seconds=60)
+        with patch("app.workers.scheduling.time.time", return_value=1_061.0):
+            assert fair_share.acquire("loop:1", "next", lease_seconds=60)
+
+
+class TestSchedulingWorker:
+    def _worker(self, fair_share=None):
+        conn = _connection()
+        queues = [Queue(name, connection=conn) for name in ("render", "render_batch", "analysis")]
+        return SchedulingWorker(
+            queues,
+            connection=conn,
+            weights={"render": 8, "render_batch": 2, "analysis": 0},
+            fair_share=fair_share,
+            rng=random.Random(1),
+        )
+
+    def test_reorders_by_weight_after_each_job(self):
+        worker = self._worker()
+        firsts = Counter()
+        for _ in range(2_000):
+            worker.reorder_queues(reference_queue=worker.queues[0])
+            firsts[worker._ordered_queues[0].name] += 1
+            assert worker._ordered_queues[-1].name == "analysis"
+        assert firsts["render"] / 2_000 == pytest.approx(0.8, abs=0.04)
+
+    def test_over_cap_job_is_pushed_back_without_running(self):
+        fair_share = FairShare(_SortedSets(), max_active=1)
+        worker = self._worker(fair_share)
+        queue = MagicMock(key="rq:queue:render_batch")
+        queue.name = "render_batch"
+        fair_share.acquire("loop:7", "running-elsewhere")
+
+        with (
+            patch.object(SimpleWorker, "execute_job") as execute,
+            patch("app.workers.scheduling.time.sleep") as sleep,
+        ):
+            worker.execute_job(_job("job-2"), queue)
+
+        execute.assert_not_called()
+        queue.push_job_id.assert_called_once_with("job-2")
+        sleep.assert_called_once()
+        assert worker.deferred_jobs == 1 and fair_share.active("loop:7") == 1
+
+    def test_deferral_works_without_rq2_intermediate_queue(self):
+        fair_share = FairShare(_SortedSets(), max_active=1)
+        worker = self._worker(fair_share)
+        queue = MagicMock(key="rq:queue:render_batch")
+        queue.name = "render_batch"
+        fair_share.acquire("loop:7", "running-elsewhere")
+
+        with (
+            patch.dict(sys.modules, {"rq.intermediate_queue": None}),
+            patch.object(SimpleWorker, "execute_job") as execute,
+            patch("app.workers.scheduling.time.sleep"),
+        ):
+            worker.execute_job(_job("job-2"), queue)
+
+        execute.assert_not_called()
+        queue.push_job_id.assert_called_once_with("job-2")
+
+    def test_slot_is_released_after_the_job(self):
+        fair_share = FairShare(_SortedSets(), max_active=1)
+        worker = self._worker(fair_share)
+        queue = MagicMock()
+
+        with patch.object(SimpleWorker, "execute_job", side_effect=RuntimeError("boom")):
+            with pytest.raises(RuntimeError):
+                worker.execute_job(_job("job-1"), queue)
+        with patch.object(SimpleWorker, "execute_job") as execute:
+            worker.execute_job(_job("job-3"), queue)
+
+        execute.assert_called_once()
+        queue.push_job_id.assert_not_called()
+        assert fair_share.active("loop:7") == 0
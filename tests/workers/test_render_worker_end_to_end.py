@@ -0,0 +1,215 @@
+"""End-to-end render of an uploaded stem pack with every default-on store enabled.
+
+Upload (ZIP ingest, PCM store, feature store) -> render job -> render_loop_worker
+(decoded-audio cache, PCM stem reads, section memo, streaming upload, job
+events) -> a second job for the same loop and plan served by the render result
+cache.  Redis is replaced by an in-memory stand-in for the queue and the
+job-event channel, and S3 by the local storage backend in a temporary
+directory (the worker's loop download is pointed at it).
+"""
+
+from __future__ import annotations
+
+import io
+import json
+import zipfile
+from unittest.mock import MagicMock
+
+import pytest
+from fastapi.testclient import TestClient
+from pydub import AudioSegment
+from pydub.generators import Sine, WhiteNoise
+
+from app.config import settings
+
+pytestmark = pytest.mark.usefixtures("fresh_sqlite_integration_db")
+
+_DEFAULT_ON = (
+    "decoded_audio_cache_enabled",
+    "pcm_stem_store_enabled",
+    "section_render_memo_enabled",
+    "feature_store_enabled",
+    "render_streaming_upload_enabled",
+    "render_result_cache_enabled",
+    "job_events_enabled",
+)
+
+
+class _EventChannel:
+    """The redis-py calls publish_job_event makes, in memory."""
+
+    def __init__(self):
+        self.sequence: dict[str, int] = {}
+        self.published: list[tuple[str, dict]] = []
+
+    def incr(self, key):
+        self.sequence[key] = self.sequence.get(key, 0) + 1
+        return self.sequence[key]
+
+    def pipeline(self, transaction=True):
+        return self
+
+    def rpush(self, key, value):
+        pass
+
+    def ltrim(self, key, start, end):
+        pass
+
+    def expire(self, key, seconds):
+        pass
+
+    def publish(self, channel, payload):
+        self.published.append((channel, json.loads(payload)))
+
+    def execute(self):
+        return []
+
+
+def _wav(segment: AudioSegment) -> bytes:
+    buffer = io.BytesIO()
+    segment.export(buffer, format="wav")
+    return buffer.getvalue()
+
+
+def _stem_pack() -> bytes:
+    bars_ms = 4 * 2000  # 4 bars at 120 BPM
+    kick = Sine(60).to_audio_segment(duration=120).fade_out(100) - 3
+    drums = AudioSegment.silent(duration=bars_ms)
+    for beat in range(0, bars_ms, 500):
+        drums = drums.overlay(kick, position=beat)
+    hats = AudioSegment.silent(duration=bars_ms)
+    for beat in range(250, bars_ms, 500):
+        hats = hats.overlay(WhiteNoise().to_audio_segment(duration=40) - 24, position=beat)
+    members = {
+        "pack/drums.wav": drums.overlay(hats),
+        "pack/bass.wav": Sine(55).to_audio_segment(duration=bars_ms) - 12,
+        "pack/melody.wav": Sine(660).to_audio_segment(duration=bars_ms) - 18,
+    }
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for name, audio in members.items():
+            archive.writestr(name, _wav(audio.set_frame_rate(44100)))
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def local_storage(tmp_path, monkeypatch):
+    from app.services.storage import storage
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(storage, "use_s3", False)
+    monkeypatch.setattr(storage, "upload_dir", tmp_path / "uploads")
+    storage.upload_dir.mkdir()
+    return storage
+
+
+@pytest.fixture
+def events(monkeypatch):
+    from app.services import job_events
+
+    channel = _EventChannel()
+    monkeypatch.setattr(settings, "redis_url", "redis://events.test:6379/0")
+    monkeypatch.setattr(job_events, "_client", channel)
+    return channel
+
+
+@pytest.fixture
+def queue(monkeypatch):
+    from app.routes import render_jobs
+    from app.services import job_service
+
+    queue = MagicMock()
+    monkeypatch.setattr(render_jobs, "is_redis_available", lambda: True)
+    monkeypatch.setattr(job_service, "get_queue", lambda name=None: queue)
+    return queue
+
+
+def _run_enqueued(queue) -> str:
+    func, *args = queue.enqueue.call_args.args
+    func(*args)
+    return queue.enqueue.call_args.kwargs["job_id"]
+
+
+def _job(job_id: str):
+    import app.db as db_module
+    from app.models.job import RenderJob
+
+    db = db_module.SessionLocal()
+    try:
+        return db.get(RenderJob, job_id)
+    finally:
+        db.close()
+
+
+def _statuses(events: _EventChannel, job_id: str) -> list[str]:
+    return [payload["status"] for channel, payload in events.published if channel.endswith(job_id)]
+
+
+def test_stem_pack_renders_with_every_default_on(monkeypatch, tmp_path, local_storage, events, queue):
+    import app.db as db_module
+    from app.models.loop import Loop
+    from app.services import job_service
+    from app.services.audio_features import get_feature_store
+    from app.services.decoded_audio_cache import get_decoded_audio_cache
+    from app.services.pcm_stem_store import pcm_key_for
+    from app.services.render_result_cache import get_render_result_cache
+    from app.services.section_render_memo import get_section_render_memo
+    from app.workers import render_worker
+    from main import app
+
+    assert all(getattr(settings, name) for name in _DEFAULT_ON)
+    monkeypatch.setattr(render_worker, "SessionLocal", db_module.SessionLocal)
+
+    def _download_loop_audio(loop, temp_dir):
+        target = temp_dir / f"input_{loop.id}.wav"
+        assert local_storage.download_file(loop.file_key, target)
+        return target
+
+    monkeypatch.setattr(render_worker, "_download_loop_audio", _download_loop_audio)
+    client = TestClient(app)
+
+    response = client.post(
+        "/api/v1/loops/with-file",
+        files={"stem_zip": ("pack.zip", io.BytesIO(_stem_pack()), "application/zip")},
+        data={"loop_in": json.dumps({"name": "E2E Pack", "bpm": 120})},
+    )
+    assert response.status_code == 201, response.text
+    loop_id = response.json()["id"]
+    db = db_module.SessionLocal()
+    stem_files = json.loads(db.get(Loop, loop_id).stem_files_json)
+    db.close()
+    assert set(stem_files) == {"drums", "bass", "melody"}
+    assert all(local_storage.file_exists(pcm_key_for(info["file_key"])) for info in stem_files.values())
+    assert get_feature_store().stats()["stores"] == 1
+
+    response = client.post(
+        f"/api/v1/loops/{loop_id}/render-async",
+        json={"variation_count": 1, "variation_seed": 7, "target_length_seconds": 32},
+    )
+    assert response.status_code == 202, response.text
+    first_id = _run_enqueued(queue)
+
+    first = _job(first_id)
+    assert first.status == "succeeded", first.error_message
+    (output,) = json.loads(first.output_files_json)
+    assert output["s3_key"].startswith("render-cache/")
+    assert local_storage.download_file(output["s3_key"], tmp_path / "render.wav")
+    rendered = AudioSegment.from_wav(tmp_path / "render.wav")
+    assert len(rendered) > 10_000
+    assert _statuses(events, first_id)[-1] == "completed"
+    # Stems are served from the PCM store, so the decode cache is never consulted.
+    assert get_decoded_audio_cache().stats()["misses"] == 0
+    memo = get_section_render_memo().stats()
+    assert memo["stores"] > 0 and memo["hits"] == 0
+
+    db = db_module.SessionLocal()
+    second, _ = job_service.create_render_job(db, loop_id, json.loads(first.params_json), dedupe_window_minutes=0)
+    db.close()
+    assert _run_enqueued(queue) == second.id
+
+    second = _job(second.id)
+    assert second.status == "succeeded", second.error_message
+    assert json.loads(second.output_files_json)[0]["s3_key"] == output["s3_key"]
+    assert get_render_result_cache().stats()["hits"] == 1
+    assert get_section_render_memo().stats()["stores"] == memo["stores"]
+    assert _statuses(events, second.id)[-1] == "completed"
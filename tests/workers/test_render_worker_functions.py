@@ -108,12 +108,65 @@ class TestBuildDevFallbackRenderPlan:
 
 
 class TestEnsureDbModels:
-    def test_does_not_raise(self):
-        # Just verifies the function runs without error in test env
-        with patch("app.workers.render_worker.engine"):
-            with patch("app.models.base.Base.metadata") as mock_meta:
-                mock_meta.create_all = MagicMock()
+    @pytest.fixture(autouse=True)
+    def _fresh_process(self, monkeypatch):
+        monkeypatch.setattr(render_worker, "_schema_status", None)
+
+    def _status(self, current, head="head-rev", known=True):
+        from app.db.worker_setup import SchemaStatus
+
+        return SchemaStatus(head=head, current=current, known=known)
+
+    def test_up_to_date_schema_is_checked_once(self):
+        with (
+            patch.object(render_worker, "check_schema", return_value=self._status("head-rev")) as check,
+            patch("app.models.base.Base.metadata") as mock_meta,
+        ):
+            first = render_worker._ensure_db_models()
+            second = render_worker._ensure_db_models()
+
+        assert first is second and first.up_to_date
+        check.assert_called_once()
+        mock_meta.create_all.assert_not_called()
+
+    def test_unstamped_database_falls_back_to_create_all(self):
+        with (
+            patch.object(render_worker, "check_schema", return_value=self._status(None)),
+            patch("app.workers.render_worker.engine"),
+            patch("app.models.base.Base.metadata") as mock_meta,
+        ):
+            render_worker._ensure_db_models()
+        mock_meta.create_all.assert_called_once()
+
+    def test_schema_behind_head_is_fatal_in_production(self, monkeypatch):
+        monkeypatch.setattr(render_worker.settings, "environment", "production")
+        with patch.object(render_worker, "check_schema", return_value=self._status("old-rev")):
+            with pytest.raises(RuntimeError, match="alembic upgrade head"):
                 render_worker._ensure_db_models()
+        assert render_worker._schema_status is None
+
+    def test_unknown_revision_is_tolerated(self, monkeypatch):
+        monkeypatch.setattr(render_worker.settings, "environment", "production")
+        with patch.object(render_worker, "check_schema", return_value=self._status("newer-rev", known=False)):
+            assert render_worker._ensure_db_models().current == "newer-rev"
+
+    def test_job_session_setup_time_is_recorded(self):
+        from app.db.worker_setup import DbSetupStats
+
+        stats = DbSetupStats()
+        with (
+            patch.object(render_worker, "check_schema", return_value=self._status("head-rev")),
+            patch.object(render_worker, "SessionLocal") as session_local,
+            patch.object(render_worker, "get_db_setup_stats", return_value=stats),
+        ):
+            db = render_worker._open_job_session()
+            render_worker._open_job_session()
+
+        session_local.return_value.connection.assert_called()
+        assert db is session_local.return_value
+        summary = stats.stats()
+        assert summary["jobs"] == 2 and summary["mean_ms"] >= 0
+        assert summary["schema"] == {"head": "head-rev", "current": "head-rev", "up_to_date": True}
 
 
 # ===========================================================================
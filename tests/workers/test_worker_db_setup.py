@@ -0,0 +1,52 @@
+"""Tests for worker schema verification (app/db/worker_setup.py)."""
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from app.db.worker_setup import DbSetupStats, alembic_head, check_schema
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'schema.sqlite'}")
+    yield engine
+    engine.dispose()
+
+
+def _stamp(engine, revision):
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE IF NOT EXISTS alembic_version (version_num VARCHAR(32) NOT NULL)"))
+        connection.execute(text("DELETE FROM alembic_version"))
+        connection.execute(text("INSERT INTO alembic_version VALUES (:rev)"), {"rev": revision})
+
+
+def test_unstamped_database(engine):
+    status = check_schema(engine)
+    assert status.current is None and not status.up_to_date and not status.behind
+
+
+def test_database_at_head(engine):
+    _stamp(engine, alembic_head())
+    assert check_schema(engine).up_to_date
+
+
+def test_database_behind_head(engine):
+    _stamp(engine, "d2e3f4a5b6c7")
+    status = check_schema(engine)
+    assert status.behind and status.known
+
+
+def test_database_at_unknown_revision(engine):
+    _stamp(engine, "ffffffffffff")
+    status = check_schema(engine)
+    assert not status.known and not status.behind
+
+
+def test_setup_stats_summary():
+    stats = DbSetupStats(window=4)
+    assert stats.stats()["jobs"] == 0 and stats.stats()["mean_ms"] is None
+    for elapsed in (1.0, 2.0, 3.0, 10.0, 4.0):
+        stats.record(elapsed)
+    summary = stats.stats()
+    assert (summary["jobs"], summary["max_ms"], summary["last_ms"]) == (5, 10.0, 4.0)
+    assert summary["mean_ms"] == pytest.approx(4.0)
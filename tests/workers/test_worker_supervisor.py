@@ -0,0 +1,210 @@
+"""Tests for the prefork worker supervisor (app/workers/supervisor.py)."""
+
+from __future__ import annotations
+
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.workers import supervisor
+from app.workers.supervisor import JobSlot, WorkerSupervisor, hard_timeout_seconds
+
+pytestmark = pytest.mark.skipif(not supervisor.fork_available(), reason="requires fork")
+
+
+def _hanging_child(slot, max_jobs, max_rss_mb):
+    slot.begin("job-stuck", 0.2)
+    time.sleep(60)
+
+
+def _exiting_child(slot, max_jobs, max_rss_mb):
+    # Stands in for a worker that hit WORKER_MAX_JOBS / WORKER_MAX_RSS_MB.
+    return None
+
+
+def _idle_child(slot, max_jobs, max_rss_mb):
+    time.sleep(60)
+
+
+def _wait_for(predicate, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+class TestJobSlot:
+    def test_reports_overdue_job_until_cleared(self):
+        import multiprocessing
+
+        slot = JobSlot(multiprocessing.get_context("fork"))
+        assert slot.current() == (None, 0.0, 0.0)
+
+        slot.begin("job-1", 5.0)
+        job_id, started, deadline = slot.current()
+        assert job_id == "job-1" and deadline == pytest.approx(started + 5.0)
+        assert slot.overdue(started + 1) is None
+        assert slot.overdue(started + 6) == "job-1"
+
+        slot.begin("job-2", None)
+        assert slot.overdue(time.time() + 10_000) is None
+        slot.end()
+        assert slot.current()[0] is None
+
+
+class TestHardTimeout:
+    def test_render_jobs_use_render_job_timeout(self):
+        from app.workers.render_worker import _JOB_TIMEOUT_SECONDS
+
+        job = SimpleNamespace(func_name="app.workers.render_worker.render_loop_worker", timeout=-1)
+        assert hard_timeout_seconds(job) == _JOB_TIMEOUT_SECONDS
+
+    @pytest.mark.parametrize("timeout, expected", [(30, 30.0), (-1, None), (None, None)])
+    def test_other_jobs_use_rq_timeout(self, timeout, expected):
+        job = SimpleNamespace(func_name="app.workers.ingest_worker.ingest_loop_worker", timeout=timeout)
+        assert hard_timeout_seconds(job) == expected
+
+
+class TestWorkerSupervisor:
+    def test_kills_overdue_child_and_replaces_it(self):
+        killed = []
+        sup = WorkerSupervisor(1, target=_hanging_child, record_killed_job=lambda *a: killed.append(a))
+        sup.start()
+        try:
+            first = sup._children[0]
+            assert _wait_for(lambda: sup._slots[0].overdue() is not None)
+            sup.check_once()
+
+            assert not first.is_alive() and first.exitcode == -9
+            assert killed[0][0] == "job-stuck" and killed[0][1] >= 0.2
+            assert (sup.kills, sup.restarts) == (1, 1)
+            assert sup._children[0] is not first and sup._children[0].is_alive()
+        finally:
+            sup.stop(timeout=1)
+        assert sup.alive_count() == 0
+
+    def test_replaces_recycled_children(self):
+        sup = WorkerSupervisor(2, target=_exiting_child)
+        sup.start()
+        try:
+            assert _wait_for(lambda: all(not child.is_alive() for child in sup._children))
+            sup.check_once()
+            assert sup.restarts == 2
+        finally:
+            sup.stop(timeout=1)
+
+    def test_stop_terminates_idle_children(self):
+        sup = WorkerSupervisor(2, target=_idle_child)
+        sup.start()
+        assert sup.alive_count() == 2
+        sup.stop(timeout=5)
+        sup.check_once()
+        assert sup.alive_count() == 0 and sup.restarts == 0
+
+
+@pytest.mark.usefixtures("fresh_sqlite_integration_db")
+def test_killed_job_is_marked_timed_out():
+    import app.db as db_module
+    from app.models.arrangement import Arrangement
+    from app.models.job import RenderJob
+    from app.models.loop import Loop
+
+    db = db_module.SessionLocal()
+    loop = Loop(name="loop.wav", file_key="uploads/loop.wav")
+    db.add(loop)
+    db.commit()
+    arrangement = Arrangement(loop_id=loop.id, status="processing", target_seconds=60)
+    db.add(arrangement)
+    db.commit()
+    db.add(RenderJob(id="job-killed", loop_id=loop.id, status="processing", arrangement_id=arrangement.id))
+    db.commit()
+
+    supervisor._record_killed_job("job-killed", 901.0)
+    supervisor._record_killed_job("rq-only-job", 5.0)
+
+    db.expire_all()
+    job = db.get(RenderJob, "job-killed")
+    assert job.status == "timeout" and "killed" in job.error_message
+    assert db.get(Arrangement, arrangement.id).status == "failed"
+    db.close()
+
+
+@pytest.mark.usefixtures("fresh_sqlite_integration_db")
+def test_killed_ingest_job_fails_its_loop():
+    import app.db as db_module
+    from app.models.job import RenderJob
+    from app.models.loop import Loop
+
+    db = db_module.SessionLocal()
+    loop = Loop(name="take.wav", file_key="uploads/take.wav", status="processing")
+    db.add(loop)
+    db.commit()
+    db.add(RenderJob(id="ingest-killed", loop_id=loop.id, job_type="ingest_loop", status="processing"))
+    db.commit()
+
+    supervisor._record_killed_job("ingest-killed", 601.0)
+
+    db.expire_all()
+    assert db.get(RenderJob, "ingest-killed").status == "timeout"
+    assert db.get(Loop, loop.id).status == "failed"
+    db.close()
+
+
+def test_killed_job_moves_to_failed_job_registry():
+    from rq.job import JobStatus
+
+    connection = MagicMock()
+    pipeline = connection.pipeline.return_value.__enter__.return_value
+    job = SimpleNamespace(origin="render", failure_ttl=3600, set_status=MagicMock())
+    with (
+        patch("rq.job.Job.fetch", return_value=job) as fetch,
+        patch("rq.registry.StartedJobRegistry") as started,
+        patch("rq.registry.FailedJobRegistry") as failed,
+    ):
+        supervisor._fail_rq_job("job-killed", "killed", connection=connection)
+
+    fetch.assert_called_once_with("job-killed", connection=connection)
+    started.assert_called_once_with("render", connection=connection)
+    started.return_value.remove_executions.assert_called_once_with(job, pipeline=pipeline)
+    job.set_status.assert_called_once_with(JobStatus.FAILED, pipeline=pipeline)
+    failed.return_value.add.assert_called_once_with(job, ttl=3600, exc_string="killed", pipeline=pipeline)
+    pipeline.execute.assert_called_once_with()
+
+
+def test_unknown_rq_job_is_left_alone():
+    from rq.exceptions import NoSuchJobError
+
+    connection = MagicMock()
+    with patch("rq.job.Job.fetch", side_effect=NoSuchJobError("gone")):
+        supervisor._fail_rq_job("job-gone", "killed", connection=connection)
+
+    connection.pipeline.assert_not_called()
+
+
+class TestSupervisedMode:
+    def test_run_with_timeout_runs_inline_when_supervised(self, monkeypatch):
+        from app.workers.render_worker import _run_with_timeout
+
+        monkeypatch.setattr(supervisor, "_supervised", True)
+        assert _run_with_timeout(threading.current_thread) is threading.current_thread()
+
+    def test_run_worker_uses_supervisor_when_processes_configured(self, monkeypatch):
+        import app.workers.main as workers_main
+        from app.config import settings
+
+        monkeypatch.setattr(settings, "worker_processes", 3)
+        with (
+            patch.object(settings, "validate_startup"),
+            patch("app.workers.main.threading.Thread"),
+            patch("app.workers.supervisor.run_supervisor") as run_supervisor,
+            patch("app.workers.main._run_rq_worker") as run_single,
+        ):
+            workers_main.run_worker()
+
+        run_supervisor.assert_called_once()
+        run_single.assert_not_called()
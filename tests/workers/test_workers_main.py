@@ -59,7 +59,7 @@ class TestRunRqWorker:
             patch("app.workers.render_worker._ensure_db_models") as mock_ensure,
             patch("app.queue.get_redis_conn", return_value=MagicMock()),
             patch("app.queue.get_queue", return_value=mock_queue),
-            patch("rq.SimpleWorker", return_value=mock_worker),
+            patch("app.workers.scheduling.build_worker", return_value=mock_worker),
         ):
             workers_main._run_rq_worker()
 
@@ -76,12 +76,25 @@ class TestRunRqWorker:
             patch("app.workers.render_worker._ensure_db_models"),
             patch("app.queue.get_redis_conn", return_value=MagicMock()),
             patch("app.queue.get_queue", return_value=mock_queue),
-            patch("rq.SimpleWorker", return_value=mock_worker),
+            patch("app.workers.scheduling.build_worker", return_value=mock_worker),
         ):
             workers_main._run_rq_worker()
 
         mock_worker.work.assert_called_once_with(with_scheduler=False)
 
+    def test_listens_on_every_queue(self):
+        import app.workers.main as workers_main
+        from app.queue import WORKER_QUEUE_NAMES
+
+        with (
+            patch("app.workers.render_worker._ensure_db_models"),
+            patch("app.queue.get_redis_conn", return_value=MagicMock()),
+            patch("app.workers.scheduling.build_worker", return_value=MagicMock()) as build_worker,
+        ):
+            workers_main._run_rq_worker()
+
+        assert build_worker.call_args.args[1] == WORKER_QUEUE_NAMES
+
 
 # ===========================================================================
 # run_worker
@@ -129,3 +142,45 @@ class TestRunWorker:
         ):
             with pytest.raises(RuntimeError, match="Redis unavailable"):
                 workers_main.run_worker()
+
+    def test_supervisor_used_on_main_thread(self):
+        import app.workers.main as workers_main
+
+        with (
+            patch.object(workers_main.settings, "validate_startup"),
+            patch.object(workers_main.settings, "worker_processes", 2),
+            patch("app.workers.supervisor.fork_available", return_value=True),
+            patch("app.workers.supervisor.run_supervisor") as run_supervisor,
+            patch("app.workers.main._run_rq_worker") as run_rq_worker,
+        ):
+            workers_main.run_worker()
+
+        run_supervisor.assert_called_once()
+        run_rq_worker.assert_not_called()
+
+    def test_embedded_thread_falls_back_to_plain_worker(self):
+        """The API's embedded worker thread cannot install signal handlers."""
+        import app.workers.main as workers_main
+
+        errors = []
+
+        with (
+            patch.object(workers_main.settings, "validate_startup"),
+            patch.object(workers_main.settings, "worker_processes", 2),
+            patch("app.workers.supervisor.fork_available", return_value=True),
+            patch("app.workers.supervisor.run_supervisor") as run_supervisor,
+            patch("app.workers.main._run_rq_worker") as run_rq_worker,
+        ):
+            def _target():
+                try:
+                    workers_main.run_worker()
+                except Exception as exc:  # pragma: no cover - surfaced below
+                    errors.append(exc)
+
+            thread = threading.Thread(target=_target, name="embedded-rq-worker-1")
+            thread.start()
+            thread.join(timeout=10)
+
+        assert errors == []
+        run_supervisor.assert_not_called()
+        run_rq_worker.assert_called_once()